@@ -0,0 +1,38 @@
+"""Benchmarks de l'API, exécutés hors de la suite de tests.
+
+Chaque module s'exécute avec ``python -m benchmarks.<module>`` depuis le
+répertoire ``Exercice_Django``, sur la base configurée par les settings.
+"""
+
+import os
+import statistics
+from collections.abc import Sequence
+
+
+def setup_django() -> None:
+    """Configure Django pour un script autonome."""
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    django.setup()
+
+
+def percentiles(samples: Sequence[float]) -> dict[str, float]:
+    """Résume une série de durées (en secondes) en millisecondes.
+
+    Args:
+        samples: Durées mesurées.
+
+    Returns:
+        dict[str, float]: ``p50``, ``p95``, ``p99`` et ``max``.
+    """
+    if len(samples) < 2:
+        value = samples[0] * 1000 if samples else 0.0
+        return {"p50": value, "p95": value, "p99": value, "max": value}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {
+        "p50": cuts[49] * 1000,
+        "p95": cuts[94] * 1000,
+        "p99": cuts[98] * 1000,
+        "max": max(samples) * 1000,
+    }
@@ -0,0 +1,401 @@
+"""Mesure les chemins critiques de l'API des prescriptions à volume réaliste.
+
+Le jeu de données (``--size`` : 10k, 1m ou 10m prescriptions) est généré
+une fois par ``seed_demo --bulk`` avec une graine fixe, sauvegardé en
+instantané SQLite (``bench-<size>`` dans ``MEDICAL_SNAPSHOT_DIR``), puis
+restauré avant chaque exécution : toutes les mesures partent des mêmes
+données. La base de travail (``--db``) est distincte de la base de
+développement.
+
+Pour chaque scénario (listes filtrées par ``PrescriptionFilter``, pages
+profondes, détail, création, modification partielle), le script relève les
+percentiles de latence, le nombre de requêtes SQL par appel et le pic de
+mémoire Python d'un appel. Les résultats sont écrits en JSON et peuvent être
+comparés à une référence : le code de sortie vaut 1 si un scénario régresse
+au-delà de ``--tolerance``.
+
+Exemple::
+
+    python -m benchmarks.api_hot_paths --size 10k \\
+        --baseline benchmarks/baselines/10k.json --json var/bench/10k.json
+    python -m benchmarks.api_hot_paths --size 1m --workers 4 --json var/bench/1m.json
+
+Une référence n'a de sens que sur la machine qui l'a produite : la
+régénérer (``--json benchmarks/baselines/<size>.json``) en changeant de
+machine.
+"""
+
+import argparse
+import json
+import platform
+import random
+import sqlite3
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from benchmarks import percentiles, setup_django
+
+# Patients, médicaments et prescriptions de chaque jeu de données.
+SIZES = {
+    "10k": (1_000, 200, 10_000),
+    "1m": (100_000, 5_000, 1_000_000),
+    "10m": (1_000_000, 20_000, 10_000_000),
+}
+SEED = 42
+PAGE_SIZE = 50
+
+
+class Scenario(NamedTuple):
+    """Appel mesuré.
+
+    Attributes:
+        name: Nom du scénario dans les résultats.
+        method: Méthode HTTP.
+        request: Construit ``(chemin, corps)`` d'un appel à partir du
+            générateur aléatoire, pour varier les identifiants.
+    """
+
+    name: str
+    method: str
+    request: Callable[[random.Random], tuple[str, dict[str, Any] | None]]
+
+
+def use_database(path: Path) -> None:
+    """Redirige la connexion par défaut vers ``path`` et la migre.
+
+    Doit être appelé avant la première requête SQL.
+
+    Args:
+        path: Fichier SQLite de travail.
+    """
+    from django.core.management import call_command
+    from django.db import connections
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = connections["default"]
+    if connection.vendor != "sqlite":
+        sys.exit("Le benchmark requiert SQLite (instantanés).")
+    connection.close()
+    connection.settings_dict["NAME"] = str(path)
+    call_command("migrate", verbosity=0)
+
+
+def prepare_dataset(size: str, workers: int, reseed: bool) -> None:
+    """Restaure le jeu de données ``size``, en le générant au besoin.
+
+    Args:
+        size: Clé de ``SIZES``.
+        workers: Processus d'insertion lors de la génération.
+        reseed: Régénérer même si l'instantané existe.
+    """
+    from django.core.management import call_command
+
+    from medical.datasets import restore_database, snapshot_database, snapshot_path
+
+    path = snapshot_path(f"bench-{size}")
+    if path.is_file() and not reseed:
+        restore_database(path)
+        return
+    patients, medications, prescriptions = SIZES[size]
+    call_command(
+        "seed_demo",
+        "--bulk",
+        "--seed",
+        str(SEED),
+        "--patients",
+        str(patients),
+        "--medications",
+        str(medications),
+        "--prescriptions",
+        str(prescriptions),
+        "--workers",
+        str(workers),
+        verbosity=0,
+    )
+    snapshot_database(path)
+
+
+def build_scenarios() -> list[Scenario]:
+    """Construit les scénarios à partir des bornes du jeu de données.
+
+    Returns:
+        list[Scenario]: Scénarios, dans l'ordre d'exécution.
+    """
+    from django.db.models import Max, Min, Model
+
+    from medical.models import Medication, Patient, Prescription
+
+    def bounds(model: type[Model]) -> tuple[int, int]:
+        ids = model._default_manager.aggregate(low=Min("id"), high=Max("id"))
+        return ids["low"], ids["high"]
+
+    patients = bounds(Patient)
+    medications = bounds(Medication)
+    prescriptions = bounds(Prescription)
+    active = list(
+        Medication.objects.filter(status=Medication.STATUS_ACTIF).values_list(
+            "id", flat=True
+        )
+    )
+    last_page = max(1, -(-Prescription.objects.count() // PAGE_SIZE))
+    base = f"/api/prescriptions?page_size={PAGE_SIZE}"
+
+    def listing(query: str) -> Callable[[random.Random], tuple[str, None]]:
+        return lambda rng: (base + query, None)
+
+    def create(rng: random.Random) -> tuple[str, dict[str, Any]]:
+        return "/api/prescriptions", {
+            "patient": rng.randint(*patients),
+            "medication": rng.choice(active),
+            "start_date": "2026-01-01",
+            "end_date": "2026-03-31",
+            "status": "en_attente",
+            "comment": "Benchmark",
+        }
+
+    return [
+        Scenario("list", "GET", listing("")),
+        Scenario("list_status", "GET", listing("&status=valide")),
+        Scenario(
+            "list_date_range",
+            "GET",
+            listing("&start_date_gte=2025-01-01&end_date_lte=2025-12-31"),
+        ),
+        Scenario(
+            "list_patient",
+            "GET",
+            lambda rng: (f"{base}&patient={rng.randint(*patients)}", None),
+        ),
+        Scenario(
+            "list_medication_status",
+            "GET",
+            lambda rng: (
+                f"{base}&medication={rng.randint(*medications)}&status=valide",
+                None,
+            ),
+        ),
+        Scenario(
+            "list_patient_dates",
+            "GET",
+            lambda rng: (
+                f"{base}&patient={rng.randint(*patients)}"
+                "&start_date_gte=2023-01-01&status=valide",
+                None,
+            ),
+        ),
+        Scenario(
+            "list_deep_page",
+            "GET",
+            lambda rng: (f"{base}&page={rng.randint(last_page // 2, last_page)}", None),
+        ),
+        Scenario(
+            "retrieve",
+            "GET",
+            lambda rng: (f"/api/prescriptions/{rng.randint(*prescriptions)}", None),
+        ),
+        Scenario("create", "POST", create),
+        Scenario(
+            "partial_update",
+            "PATCH",
+            lambda rng: (
+                f"/api/prescriptions/{rng.randint(*prescriptions)}",
+                {"comment": f"Benchmark {rng.random():.6f}"},
+            ),
+        ),
+    ]
+
+
+def measure(
+    scenario: Scenario, requests: int, warmup: int, rng: random.Random
+) -> dict[str, Any]:
+    """Exécute un scénario et résume ses mesures.
+
+    Les latences sont mesurées sans instrumentation ; un appel
+    supplémentaire relève le nombre de requêtes SQL et le pic de mémoire
+    (``tracemalloc`` ralentit fortement l'exécution).
+
+    Args:
+        scenario: Scénario à exécuter.
+        requests: Appels mesurés.
+        warmup: Appels préalables non mesurés (caches, catalogue).
+        rng: Générateur aléatoire des identifiants.
+
+    Returns:
+        dict[str, Any]: ``requests``, ``latency_ms``, ``queries`` et
+        ``peak_memory_kb``.
+
+    Raises:
+        RuntimeError: Si un appel échoue.
+    """
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+
+    client = Client()
+
+    def call() -> None:
+        path, body = scenario.request(rng)
+        response = client.generic(
+            scenario.method,
+            path,
+            json.dumps(body) if body is not None else "",
+            content_type="application/json",
+        )
+        # Les réponses en flux ne sont produites qu'à la lecture.
+        for _chunk in getattr(response, "streaming_content", ()):
+            pass
+        if response.status_code >= 400:
+            raise RuntimeError(f"{scenario.method} {path}: {response.status_code}")
+
+    for _ in range(warmup):
+        call()
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - started)
+    with CaptureQueriesContext(connection) as queries:
+        tracemalloc.start()
+        try:
+            call()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return {
+        "requests": requests,
+        "latency_ms": percentiles(latencies),
+        "queries": len(queries),
+        "peak_memory_kb": peak / 1024,
+    }
+
+
+def compare(
+    results: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    """Liste les régressions par rapport à une exécution de référence.
+
+    Une latence p95 ou un pic de mémoire régresse au-delà de ``tolerance``
+    (fraction) ; un nombre de requêtes SQL régresse dès qu'il augmente. Les
+    scénarios absents de la référence sont ignorés.
+
+    Args:
+        results: Résultats courants.
+        baseline: Résultats de référence (même format).
+        tolerance: Dégradation relative tolérée.
+
+    Returns:
+        list[str]: Description des régressions.
+    """
+    regressions = []
+    for name, current in results["scenarios"].items():
+        reference = baseline["scenarios"].get(name)
+        if reference is None:
+            continue
+        metrics = (
+            (
+                "p95",
+                current["latency_ms"]["p95"],
+                reference["latency_ms"]["p95"],
+                tolerance,
+            ),
+            ("queries", current["queries"], reference["queries"], 0.0),
+            (
+                "peak_memory_kb",
+                current["peak_memory_kb"],
+                reference["peak_memory_kb"],
+                tolerance,
+            ),
+        )
+        for metric, value, expected, allowed in metrics:
+            if value > expected * (1 + allowed):
+                regressions.append(f"{name}: {metric} {expected:.1f} -> {value:.1f}")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> dict[str, Any]:
+    """Point d'entrée du benchmark.
+
+    Args:
+        argv: Arguments de ligne de commande.
+
+    Returns:
+        dict[str, Any]: Métadonnées et résultats par scénario.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", choices=SIZES, default="10k")
+    parser.add_argument("--db", type=Path, help="Working SQLite database")
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--scenarios", nargs="+", help="Scenario names to run")
+    parser.add_argument("--workers", type=int, default=1, help="Seeding processes")
+    parser.add_argument("--reseed", action="store_true")
+    parser.add_argument("--with-cache", action="store_true")
+    parser.add_argument("--json", type=Path)
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    options = parser.parse_args(argv)
+
+    setup_django()
+    import django
+    from django.conf import settings
+
+    from medical.models import Patient, Prescription
+
+    # Conditions de production : pas de journal des requêtes de DEBUG, et le
+    # cache des réponses masquerait le coût des vues mesurées.
+    settings.DEBUG = False
+    settings.MEDICAL_RESPONSE_CACHE_ENABLED = options.with_cache
+    use_database(options.db or settings.VAR_DIR / "benchmarks" / "api.sqlite3")
+    started = time.perf_counter()
+    prepare_dataset(options.size, options.workers, options.reseed)
+    print(f"Jeu de données {options.size} prêt en {time.perf_counter() - started:.1f}s")
+
+    rng = random.Random(SEED)
+    results: dict[str, Any] = {
+        "meta": {
+            "size": options.size,
+            "patients": Patient.objects.count(),
+            "prescriptions": Prescription.objects.count(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "with_cache": options.with_cache,
+        },
+        "scenarios": {},
+    }
+    print(
+        f"{'scenario':<24}{'p50':>9}{'p95':>9}{'p99':>9}{'queries':>9}{'peak kB':>10}"
+    )
+    for scenario in build_scenarios():
+        if options.scenarios and scenario.name not in options.scenarios:
+            continue
+        result = measure(scenario, options.requests, options.warmup, rng)
+        results["scenarios"][scenario.name] = result
+        latency = result["latency_ms"]
+        print(
+            f"{scenario.name:<24}{latency['p50']:9.1f}{latency['p95']:9.1f}"
+            f"{latency['p99']:9.1f}{result['queries']:9d}"
+            f"{result['peak_memory_kb']:10.0f}"
+        )
+    if options.json:
+        options.json.parent.mkdir(parents=True, exist_ok=True)
+        options.json.write_text(json.dumps(results, indent=2))
+    if options.baseline:
+        baseline = json.loads(options.baseline.read_text())
+        if baseline["meta"]["size"] != options.size:
+            print(f"Référence d'une autre taille ({baseline['meta']['size']}).")
+        regressions = compare(results, baseline, options.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print("Aucune régression par rapport à la référence.")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""Compare le débit des lectures sous WSGI et sous ASGI (vues sync et async).
+
+Les applications sont appelées en mémoire, sans serveur HTTP, afin d'isoler
+le coût du modèle d'exécution :
+
+- ``wsgi`` : l'application WSGI servie par un pool de ``--threads`` threads,
+  comme un worker gthread ; un client lent immobilise le thread pendant
+  l'écriture de la réponse (``--client-delay``) ;
+- ``asgi-sync`` : les ViewSets DRF derrière l'application ASGI ;
+- ``asgi-async`` : les vues ``/api/async/...`` derrière l'application ASGI ;
+  un client lent n'occupe que la boucle d'événements.
+
+Exemple::
+
+    python manage.py seed_demo --patients 2500 --medications 150
+    python -m benchmarks.asgi_vs_wsgi --requests 400 --concurrency 50 \\
+        --client-delay 0.05 --json var/asgi_vs_wsgi.json
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import sys
+import time
+from collections.abc import Callable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+from benchmarks import percentiles, setup_django
+
+MODES = ("wsgi", "asgi-sync", "asgi-async")
+
+
+def wsgi_environ(path: str) -> dict[str, Any]:
+    """Construit l'environnement WSGI d'une requête GET.
+
+    Args:
+        path: Chemin et paramètres de la requête.
+
+    Returns:
+        dict[str, Any]: Environnement WSGI.
+    """
+    url = urlsplit(path)
+    return {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": url.path,
+        "QUERY_STRING": url.query,
+        "SERVER_NAME": "localhost",
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_HOST": "localhost",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": "http",
+        "wsgi.input": io.BytesIO(),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+
+
+def run_wsgi(
+    path: str, requests: int, threads: int, client_delay: float
+) -> tuple[list[float], float]:
+    """Exécute ``requests`` requêtes sur l'application WSGI.
+
+    Args:
+        path: Chemin requêté.
+        requests: Nombre de requêtes.
+        threads: Taille du pool de threads.
+        client_delay: Durée d'écriture simulée vers un client lent (s).
+
+    Returns:
+        tuple[list[float], float]: Latences et durée totale (s).
+    """
+    from django.core.wsgi import get_wsgi_application
+
+    application = get_wsgi_application()
+
+    def call(submitted: float) -> float:
+        statuses: list[str] = []
+
+        def start_response(
+            status: str, headers: list[tuple[str, str]], exc_info: Any = None
+        ) -> Callable[[bytes], object]:
+            statuses.append(status)
+            return lambda data: None
+
+        body = application(wsgi_environ(path), start_response)
+        try:
+            for _chunk in body:
+                pass
+        finally:
+            body.close()
+        time.sleep(client_delay)
+        if not statuses[0].startswith("200"):
+            raise RuntimeError(f"{path}: {statuses[0]}")
+        return time.perf_counter() - submitted
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        futures = [pool.submit(call, time.perf_counter()) for _ in range(requests)]
+        latencies = [future.result() for future in futures]
+    return latencies, time.perf_counter() - started
+
+
+def run_asgi(
+    path: str, requests: int, concurrency: int, client_delay: float
+) -> tuple[list[float], float]:
+    """Exécute ``requests`` requêtes sur l'application ASGI.
+
+    Args:
+        path: Chemin requêté.
+        requests: Nombre de requêtes.
+        concurrency: Nombre de connexions simultanées.
+        client_delay: Durée d'écriture simulée vers un client lent (s).
+
+    Returns:
+        tuple[list[float], float]: Latences et durée totale (s).
+    """
+    from django.core.asgi import get_asgi_application
+
+    application = get_asgi_application()
+    url = urlsplit(path)
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": url.path,
+        "raw_path": url.path.encode(),
+        "query_string": url.query.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 0),
+        "server": ("localhost", 80),
+    }
+
+    async def call(semaphore: asyncio.Semaphore) -> float:
+        async with semaphore:
+            submitted = time.perf_counter()
+            statuses: list[int] = []
+            sent = False
+
+            async def receive() -> dict[str, Any]:
+                nonlocal sent
+                if sent:
+                    await asyncio.Event().wait()
+                sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+
+            async def send(message: Mapping[str, Any]) -> None:
+                if message["type"] == "http.response.start":
+                    statuses.append(message["status"])
+                elif not message.get("more_body", False):
+                    await asyncio.sleep(client_delay)
+
+            await application(dict(scope), receive, send)
+            if statuses[0] != 200:
+                raise RuntimeError(f"{path}: {statuses[0]}")
+            return time.perf_counter() - submitted
+
+    async def main() -> list[float]:
+        semaphore = asyncio.Semaphore(concurrency)
+        return await asyncio.gather(*(call(semaphore) for _ in range(requests)))
+
+    started = time.perf_counter()
+    latencies = asyncio.run(main())
+    return latencies, time.perf_counter() - started
+
+
+def main(argv: list[str] | None = None) -> dict[str, Any]:
+    """Point d'entrée du benchmark.
+
+    Args:
+        argv: Arguments de ligne de commande.
+
+    Returns:
+        dict[str, Any]: Résultats par mode.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--path", default="/api/prescriptions?page_size=50")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--client-delay", type=float, default=0.05)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--with-cache", action="store_true")
+    parser.add_argument("--json", type=Path)
+    options = parser.parse_args(argv)
+
+    setup_django()
+    from django.conf import settings
+
+    from medical.models import Prescription
+
+    # Le cache des réponses masquerait le coût des vues mesurées.
+    settings.MEDICAL_RESPONSE_CACHE_ENABLED = options.with_cache
+    if not Prescription.objects.exists():
+        print("Base vide : lancer d'abord `python manage.py seed_demo`.")
+
+    results: dict[str, Any] = {}
+    for mode in options.modes:
+        path = options.path
+        if mode == "asgi-async":
+            path = path.replace("/api/", "/api/async/", 1)
+        if mode == "wsgi":
+            latencies, elapsed = run_wsgi(
+                path, options.requests, options.threads, options.client_delay
+            )
+        else:
+            latencies, elapsed = run_asgi(
+                path, options.requests, options.concurrency, options.client_delay
+            )
+        results[mode] = {
+            "path": path,
+            "requests": options.requests,
+            "throughput": options.requests / elapsed,
+            "latency_ms": percentiles(latencies),
+        }
+        latency = results[mode]["latency_ms"]
+        print(
+            f"{mode:<11} {results[mode]['throughput']:8.1f} req/s  "
+            f"p50 {latency['p50']:7.1f} ms  p95 {latency['p95']:7.1f} ms  "
+            f"p99 {latency['p99']:7.1f} ms"
+        )
+    if options.json:
+        options.json.parent.mkdir(parents=True, exist_ok=True)
+        options.json.write_text(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == "__main__":
+    main()
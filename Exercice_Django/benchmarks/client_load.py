@@ -0,0 +1,582 @@
+"""Génère une charge synthétique calquée sur le trafic du client React.
+
+Chaque session virtuelle reproduit l'application ``Exercice_Front`` :
+au chargement, ``usePatients`` (``/api/patients?page_size=1000``),
+``useMedications`` (``/api/medications?status=actif&page_size=1000``) et
+``usePrescriptions`` (``/api/prescriptions?page=1&page_size=20``) en
+parallèle, puis une suite d'actions séparées par un temps de réflexion :
+
+- ``filter`` : modification d'un filtre de ``PrescriptionFilters``
+  (patient, médicament, statut, date de début ou de fin avec un opérateur
+  ``=``, ``>=``, ``<=``, ``>``, ``<`` ou un intervalle), retour en page 1 ;
+- ``page`` / ``page_size`` : pagination et taille de page (10, 20, 50, 100) ;
+- ``create``, ``update``, ``delete`` : mutations de ``usePrescriptionLogic``
+  (POST, PATCH du formulaire complet, DELETE d'une prescription créée par la
+  session), suivies comme dans le client du rechargement de la liste.
+
+Les sessions arrivent selon un processus de Poisson (``--rate`` par
+seconde, au plus ``--concurrency`` simultanées : les arrivées au-delà sont
+comptées comme refusées) ou, avec ``--rate 0``, ``--concurrency``
+utilisateurs enchaînent les sessions jusqu'à la fin de ``--duration``. Le
+débit et les percentiles de latence sont rapportés par appel.
+
+Le serveur doit tourner à part, sur une base peuplée ; les mutations
+modifient cette base. Exemple::
+
+    python manage.py runserver --noreload
+    python -m benchmarks.client_load --url http://127.0.0.1:8000 \\
+        --rate 5 --concurrency 50 --duration 60 --json var/bench/load.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import ssl
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlencode, urlsplit
+
+from benchmarks import percentiles
+
+# Proportions par défaut des actions d'une session.
+MIX = {
+    "filter": 45,
+    "page": 25,
+    "page_size": 5,
+    "create": 10,
+    "update": 10,
+    "delete": 5,
+}
+STATUSES = ("valide", "en_attente", "suppr")
+PAGE_SIZES = (10, 20, 50, 100)
+DATE_OPERATORS = ("", "_gte", "_lte", "_gt", "_lt", "interval")
+# Délai de regroupement des saisies de filtres dans le client (s).
+DEBOUNCE = 0.4
+
+
+class HttpError(Exception):
+    """Réponse inattendue du serveur (statut HTTP ou connexion)."""
+
+
+class Connection:
+    """Connexion HTTP/1.1 persistante, rouverte au besoin.
+
+    Attributes:
+        host: Hôte du serveur.
+        port: Port du serveur.
+        tls: Connexion chiffrée.
+    """
+
+    def __init__(self, host: str, port: int, tls: bool) -> None:
+        self.host = host
+        self.port = port
+        self.tls = tls
+        self.reader: asyncio.StreamReader | None = None
+        self.writer: asyncio.StreamWriter | None = None
+
+    async def close(self) -> None:
+        """Ferme la connexion si elle est ouverte."""
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+    async def request(
+        self, method: str, path: str, body: dict[str, Any] | None = None
+    ) -> tuple[int, bytes]:
+        """Envoie une requête et lit la réponse complète.
+
+        Args:
+            method: Méthode HTTP.
+            path: Chemin et paramètres.
+            body: Corps JSON éventuel.
+
+        Returns:
+            tuple[int, bytes]: Statut et corps de la réponse.
+
+        Raises:
+            HttpError: Si la connexion est interrompue.
+        """
+        payload = json.dumps(body).encode() if body is not None else b""
+        head = [
+            f"{method} {path} HTTP/1.1",
+            f"Host: {self.host}:{self.port}",
+            "Accept: application/json",
+            f"Content-Length: {len(payload)}",
+        ]
+        if body is not None:
+            head.append("Content-Type: application/json")
+        try:
+            if self.writer is None:
+                self.reader, self.writer = await asyncio.open_connection(
+                    self.host,
+                    self.port,
+                    ssl=ssl.create_default_context() if self.tls else None,
+                )
+            assert self.reader is not None
+            self.writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + payload)
+            await self.writer.drain()
+            status_line = await self.reader.readline()
+            if not status_line:
+                raise ConnectionResetError("connexion fermée par le serveur")
+            status = int(status_line.split()[1])
+            headers: dict[str, str] = {}
+            while (line := await self.reader.readline()) not in (b"\r\n", b""):
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            if headers.get("transfer-encoding") == "chunked":
+                content = bytearray()
+                while size := int((await self.reader.readline()).split(b";")[0], 16):
+                    content += await self.reader.readexactly(size + 2)
+                    del content[-2:]
+                await self.reader.readline()
+            elif "content-length" in headers:
+                content = bytearray(
+                    await self.reader.readexactly(int(headers["content-length"]))
+                )
+            else:
+                content = bytearray(await self.reader.read())
+                headers["connection"] = "close"
+        except (OSError, ValueError, IndexError, asyncio.IncompleteReadError) as error:
+            await self.close()
+            raise HttpError(f"{method} {path}: {error}") from error
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, bytes(content)
+
+
+class Recorder:
+    """Latences et statuts par appel.
+
+    Attributes:
+        latencies: Durées (s) des réponses de chaque appel.
+        statuses: Statuts HTTP (``error`` : connexion) de chaque appel.
+        sessions: Sessions démarrées.
+        rejected: Arrivées refusées faute de place (``--concurrency``).
+    """
+
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.statuses: dict[str, Counter[str]] = defaultdict(Counter)
+        self.sessions = 0
+        self.rejected = 0
+
+    def report(self, elapsed: float) -> dict[str, Any]:
+        """Résume les mesures.
+
+        Args:
+            elapsed: Durée de la charge (s).
+
+        Returns:
+            dict[str, Any]: Totaux, débit et percentiles global et par appel.
+        """
+        calls: dict[str, dict[str, Any]] = {
+            name: {
+                "requests": sum(self.statuses[name].values()),
+                "throughput": sum(self.statuses[name].values()) / elapsed,
+                "statuses": dict(self.statuses[name]),
+                "latency_ms": percentiles(self.latencies[name]),
+            }
+            for name in sorted(self.statuses)
+        }
+        requests = sum(call["requests"] for call in calls.values())
+        errors = sum(
+            count
+            for statuses in self.statuses.values()
+            for status, count in statuses.items()
+            if status == "error" or int(status) >= 400
+        )
+        return {
+            "elapsed": elapsed,
+            "sessions": self.sessions,
+            "rejected": self.rejected,
+            "requests": requests,
+            "errors": errors,
+            "throughput": requests / elapsed,
+            "latency_ms": percentiles(
+                [value for values in self.latencies.values() for value in values]
+            ),
+            "calls": calls,
+        }
+
+
+class Session:
+    """Utilisateur virtuel de l'application de prescriptions.
+
+    Attributes:
+        connections: Connexions HTTP de la session (trois au chargement,
+            comme un navigateur ; la première ensuite).
+        rng: Générateur aléatoire de la session.
+        recorder: Mesures partagées.
+        think: Temps de réflexion moyen entre deux actions (s).
+    """
+
+    def __init__(
+        self,
+        connections: list[Connection],
+        rng: random.Random,
+        recorder: Recorder,
+        think: float,
+    ) -> None:
+        self.connections = connections
+        self.rng = rng
+        self.recorder = recorder
+        self.think = think
+        self.patients: list[int] = []
+        self.medications: list[int] = []
+        self.filters: dict[str, Any] = {}
+        self.page = 1
+        self.page_size = 20
+        self.count = 0
+        self.results: list[dict[str, Any]] = []
+        self.dates: list[date] = []
+        self.created: list[int] = []
+
+    async def call(
+        self,
+        name: str,
+        method: str,
+        path: str,
+        body: dict[str, Any] | None = None,
+        connection: int = 0,
+    ) -> Any:
+        """Exécute et mesure un appel.
+
+        Args:
+            name: Nom de l'appel dans les résultats.
+            method: Méthode HTTP.
+            path: Chemin et paramètres.
+            body: Corps JSON éventuel.
+            connection: Indice de la connexion utilisée.
+
+        Returns:
+            Any: Corps JSON décodé, ``None`` s'il est vide ou en erreur.
+        """
+        started = time.perf_counter()
+        try:
+            status, content = await self.connections[connection].request(
+                method, path, body
+            )
+        except HttpError:
+            self.recorder.statuses[name]["error"] += 1
+            return None
+        self.recorder.latencies[name].append(time.perf_counter() - started)
+        self.recorder.statuses[name][str(status)] += 1
+        if status >= 400 or not content:
+            return None
+        return json.loads(content)
+
+    async def load_prescriptions(self) -> None:
+        """Recharge la liste courante (``usePrescriptions``)."""
+        params = {**self.filters, "page": self.page, "page_size": self.page_size}
+        data = await self.call(
+            "prescriptions", "GET", f"/api/prescriptions?{urlencode(params)}"
+        )
+        if data is None:
+            return
+        self.count = data["count"]
+        self.results = data["results"]
+        self.dates.extend(
+            date.fromisoformat(item["start_date"]) for item in self.results[:5]
+        )
+        del self.dates[:-50]
+
+    async def open(self) -> None:
+        """Chargement de l'application : listes de référence et prescriptions."""
+        patients, medications, _ = await asyncio.gather(
+            self.call("patients", "GET", "/api/patients?page_size=1000", connection=1),
+            self.call(
+                "medications",
+                "GET",
+                "/api/medications?status=actif&page_size=1000",
+                connection=2,
+            ),
+            self.load_prescriptions(),
+        )
+        self.patients = [item["id"] for item in (patients or {}).get("results", [])]
+        self.medications = [
+            item["id"] for item in (medications or {}).get("results", [])
+        ]
+
+    def random_date(self) -> str:
+        """Date proche de celles des prescriptions déjà affichées."""
+        around = self.rng.choice(self.dates) if self.dates else date.today()
+        return (around + timedelta(days=self.rng.randint(-180, 180))).isoformat()
+
+    def form(self) -> dict[str, Any]:
+        """Données saisies dans le formulaire de prescription."""
+        start = date.fromisoformat(self.random_date())
+        return {
+            "patient": self.rng.choice(self.patients),
+            "medication": self.rng.choice(self.medications),
+            "start_date": start.isoformat(),
+            "end_date": (start + timedelta(days=self.rng.randint(1, 90))).isoformat(),
+            "status": self.rng.choice(STATUSES[:2]),
+            "comment": self.rng.choice(["", "", "Renouvellement", "À jeun"]),
+        }
+
+    def change_filter(self) -> None:
+        """Modifie un contrôle de ``PrescriptionFilters`` (ou le vide)."""
+        field = self.rng.choice(
+            ["patient", "medication", "status", "start_date", "end_date"]
+        )
+        for key in [key for key in self.filters if key.startswith(field)]:
+            del self.filters[key]
+        if self.rng.random() < 0.2:
+            return
+        if field == "patient" and self.patients:
+            self.filters["patient"] = self.rng.choice(self.patients)
+        elif field == "medication" and self.medications:
+            self.filters["medication"] = self.rng.choice(self.medications)
+        elif field == "status":
+            self.filters["status"] = self.rng.choice(STATUSES)
+        elif field in ("start_date", "end_date"):
+            operator = self.rng.choice(DATE_OPERATORS)
+            if operator == "interval":
+                first, second = sorted([self.random_date(), self.random_date()])
+                self.filters[f"{field}_gte"] = first
+                self.filters[f"{field}_lte"] = second
+            else:
+                self.filters[f"{field}{operator}"] = self.random_date()
+
+    async def act(self, action: str) -> None:
+        """Exécute une action de l'utilisateur.
+
+        Args:
+            action: Clé de ``MIX``.
+        """
+        pages = max(1, -(-self.count // self.page_size))
+        if action == "page" and pages > 1:
+            if self.page == pages or (self.page > 1 and self.rng.random() < 0.3):
+                self.page -= 1
+            else:
+                self.page += 1
+            await self.load_prescriptions()
+        elif action == "page_size":
+            self.page_size = self.rng.choice(PAGE_SIZES)
+            self.page = 1
+            await self.load_prescriptions()
+        elif action == "create" and self.patients and self.medications:
+            data = await self.call(
+                "prescription-create", "POST", "/api/prescriptions", self.form()
+            )
+            if data is not None:
+                self.created.append(data["id"])
+            await self.load_prescriptions()
+        elif action == "update" and self.results and self.patients and self.medications:
+            target = self.rng.choice(self.results)["id"]
+            await self.call(
+                "prescription-update",
+                "PATCH",
+                f"/api/prescriptions/{target}",
+                self.form(),
+            )
+            await self.load_prescriptions()
+        elif action == "delete" and self.created:
+            target = self.created.pop(self.rng.randrange(len(self.created)))
+            await self.call(
+                "prescription-delete", "DELETE", f"/api/prescriptions/{target}"
+            )
+            await self.load_prescriptions()
+        else:
+            self.change_filter()
+            self.page = 1
+            await asyncio.sleep(DEBOUNCE)
+            await self.load_prescriptions()
+
+    async def run(self, actions: int, mix: dict[str, int], deadline: float) -> None:
+        """Déroule une session complète.
+
+        Args:
+            actions: Nombre d'actions après le chargement.
+            mix: Poids des actions.
+            deadline: Heure (``perf_counter``) après laquelle s'arrêter.
+        """
+        self.recorder.sessions += 1
+        try:
+            await self.open()
+            names, weights = list(mix), list(mix.values())
+            for _ in range(actions):
+                await asyncio.sleep(
+                    self.rng.expovariate(1 / self.think) if self.think else 0
+                )
+                if time.perf_counter() >= deadline:
+                    break
+                await self.act(self.rng.choices(names, weights)[0])
+        finally:
+            for connection in self.connections:
+                await connection.close()
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    """Lit ``--mix`` (``filter=50,page=30,create=0``) en complétant ``MIX``.
+
+    Args:
+        value: Poids séparés par des virgules.
+
+    Returns:
+        dict[str, int]: Poids de chaque action.
+
+    Raises:
+        argparse.ArgumentTypeError: Action inconnue ou poids invalide.
+    """
+    mix = dict(MIX)
+    for item in filter(None, value.split(",")):
+        name, _, weight = item.partition("=")
+        if name not in MIX or not weight.isdigit():
+            raise argparse.ArgumentTypeError(
+                f"{item!r} : attendu <action>=<poids>, actions {', '.join(MIX)}"
+            )
+        mix[name] = int(weight)
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError("au moins un poids doit être non nul")
+    return mix
+
+
+async def check(url: str) -> None:
+    """Vérifie que le serveur répond avant de lancer la charge.
+
+    Args:
+        url: URL de base du serveur.
+
+    Raises:
+        HttpError: Serveur injoignable ou réponse en erreur.
+    """
+    address = urlsplit(url)
+    tls = address.scheme == "https"
+    connection = Connection(
+        address.hostname or "127.0.0.1", address.port or (443 if tls else 80), tls
+    )
+    try:
+        status, _ = await connection.request("GET", "/api/patients?page_size=1")
+    finally:
+        await connection.close()
+    if status != 200:
+        raise HttpError(f"GET /api/patients : statut {status}")
+
+
+async def generate(options: argparse.Namespace) -> dict[str, Any]:
+    """Lance les sessions pendant ``--duration`` secondes.
+
+    Args:
+        options: Options de la ligne de commande.
+
+    Returns:
+        dict[str, Any]: Rapport de ``Recorder.report``.
+    """
+    url = urlsplit(options.url)
+    tls = url.scheme == "https"
+    host, port = url.hostname or "127.0.0.1", url.port or (443 if tls else 80)
+    recorder = Recorder()
+    rng = random.Random(options.seed)
+    running: set[asyncio.Task[None]] = set()
+
+    def start(deadline: float) -> asyncio.Task[None]:
+        session = Session(
+            [Connection(host, port, tls) for _ in range(3)],
+            random.Random(rng.random()),
+            recorder,
+            options.think,
+        )
+        task = asyncio.create_task(session.run(options.actions, options.mix, deadline))
+        running.add(task)
+        task.add_done_callback(running.discard)
+        return task
+
+    started = time.perf_counter()
+    deadline = started + options.duration
+    if options.rate > 0:
+        arrival = started
+        while True:
+            arrival += rng.expovariate(options.rate)
+            if arrival >= deadline:
+                break
+            await asyncio.sleep(max(0.0, arrival - time.perf_counter()))
+            if len(running) >= options.concurrency:
+                recorder.rejected += 1
+            else:
+                start(deadline)
+    else:
+
+        async def user() -> None:
+            while time.perf_counter() < deadline:
+                await start(deadline)
+
+        await asyncio.gather(*(user() for _ in range(options.concurrency)))
+    if running:
+        await asyncio.gather(*running)
+    return recorder.report(time.perf_counter() - started)
+
+
+def main(argv: list[str] | None = None) -> dict[str, Any]:
+    """Point d'entrée du générateur de charge.
+
+    Args:
+        argv: Arguments de ligne de commande.
+
+    Returns:
+        dict[str, Any]: Configuration et résultats.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument(
+        "--rate", type=float, default=2.0, help="Sessions par seconde (0 : fermé)"
+    )
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--actions", type=int, default=10)
+    parser.add_argument("--think", type=float, default=2.0, help="Moyenne (s)")
+    parser.add_argument("--mix", type=parse_mix, default=dict(MIX))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", type=Path)
+    options = parser.parse_args(argv)
+
+    try:
+        asyncio.run(check(options.url))
+    except HttpError as error:
+        sys.exit(f"Serveur injoignable ({options.url}) : {error}")
+    results = asyncio.run(generate(options))
+    print(
+        f"{results['sessions']} sessions ({results['rejected']} refusées), "
+        f"{results['requests']} requêtes, {results['errors']} erreurs, "
+        f"{results['throughput']:.1f} req/s en {results['elapsed']:.1f} s"
+    )
+    for name, call in [("total", results), *results["calls"].items()]:
+        latency = call["latency_ms"]
+        print(
+            f"{name:<20} {call['requests']:7d}  "
+            f"p50 {latency['p50']:7.1f} ms  p95 {latency['p95']:7.1f} ms  "
+            f"p99 {latency['p99']:7.1f} ms  max {latency['max']:7.1f} ms"
+        )
+    output = {
+        "config": {
+            key: getattr(options, key)
+            for key in (
+                "url",
+                "rate",
+                "concurrency",
+                "duration",
+                "actions",
+                "think",
+                "mix",
+                "seed",
+            )
+        },
+        **results,
+    }
+    if options.json:
+        options.json.parent.mkdir(parents=True, exist_ok=True)
+        options.json.write_text(json.dumps(output, indent=2))
+    return output
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,11 @@
+from typing import Any, cast
+
+from django.conf import settings
+from django.core.paginator import InvalidPage, Page
+from django.db.models import QuerySet
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.request import Request
 
 
 class StandardPagination(PageNumberPagination):
@@ -13,3 +20,83 @@ class StandardPagination(PageNumberPagination):
     page_size = 20
     page_size_query_param = "page_size"
     max_page_size = 100
+
+    def get_page_size(self, request: Request) -> int:
+        """Retourne la taille de page demandée, bornée à ``max_page_size``.
+
+        Args:
+            request: Requête DRF (paramètre ``page_size``).
+
+        Returns:
+            int: Taille demandée, ou ``page_size`` par défaut.
+        """
+        return super().get_page_size(request) or StandardPagination.page_size
+
+    def get_page(self) -> Page:
+        """Retourne la page courante.
+
+        Returns:
+            Page: Page calculée par la dernière pagination.
+
+        Raises:
+            RuntimeError: Si aucune page n'a encore été calculée.
+        """
+        if self.page is None:
+            raise RuntimeError("Aucune page : la liste n'a pas été paginée.")
+        return self.page
+
+
+class StreamingPagination(StandardPagination):
+    """Pagination des listes rendues en flux, pour les grandes pages.
+
+    Mêmes paramètres et même enveloppe que ``StandardPagination``, mais la page
+    est retournée sous forme de QuerySet non évalué (parcouru ensuite par
+    morceaux) et sa taille peut aller jusqu'à ``MEDICAL_STREAM_MAX_PAGE_SIZE``.
+
+    Attributes:
+        max_page_size (int): Taille maximale autorisée par page.
+    """
+
+    max_page_size = settings.MEDICAL_STREAM_MAX_PAGE_SIZE
+
+    def paginate_queryset_lazily(
+        self, queryset: QuerySet, request: Request
+    ) -> QuerySet:
+        """Retourne la page demandée sans l'évaluer (seul le total est compté).
+
+        Args:
+            queryset: QuerySet filtré et ordonné.
+            request: Requête DRF (paramètres ``page`` et ``page_size``).
+
+        Returns:
+            QuerySet: Tranche de ``queryset`` correspondant à la page.
+
+        Raises:
+            NotFound: Si le numéro de page est invalide ou hors limites.
+        """
+        self.request = request
+        paginator = self.django_paginator_class(queryset, self.get_page_size(request))
+        page_number = self.get_page_number(request, paginator)
+        try:
+            page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(
+                self.invalid_page_message.format(
+                    page_number=page_number, message=str(exc)
+                )
+            )
+        self.page = page
+        # La page d'un QuerySet est une tranche non évaluée de ce QuerySet.
+        return cast(QuerySet, page.object_list)
+
+    def get_envelope_head(self) -> dict[str, Any]:
+        """Retourne l'enveloppe de la page, sans ``results``.
+
+        Returns:
+            dict[str, Any]: ``count``, ``next`` et ``previous``.
+        """
+        return {
+            "count": self.get_page().paginator.count,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+        }
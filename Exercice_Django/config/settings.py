@@ -26,6 +26,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "medical.middleware.ServerTimingMiddleware",
+    "medical.middleware.MetricsMiddleware",
+    "medical.middleware.QueryViewMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -34,6 +37,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "medical.middleware.ProfilingMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -88,6 +92,9 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Répertoire des fichiers d'exécution (caches partagés, exports, journaux...)
+VAR_DIR = Path(os.environ.get("DJANGO_VAR_DIR", BASE_DIR / "var"))
+
 # Disable automatic slash appending to keep endpoints without trailing slash
 APPEND_SLASH = False
 
@@ -99,6 +106,129 @@ CORS_ALLOWED_ORIGINS = [
 ]
 
 
+# Caches : "locmem" (par processus) ou "file" (disque local, partagé entre workers)
+CACHE_BACKEND = os.environ.get("DJANGO_CACHE_BACKEND", "locmem")
+RESPONSE_CACHE_BACKEND = os.environ.get("DJANGO_RESPONSE_CACHE_BACKEND", CACHE_BACKEND)
+# Catalogue des médicaments : partagé entre workers par défaut, afin qu'un seul
+# worker relise la table après chaque modification.
+CATALOG_CACHE_BACKEND = os.environ.get("DJANGO_CATALOG_CACHE_BACKEND", "file")
+CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+}
+
+
+def _cache_config(alias: str, backend: str, **extra: object) -> dict[str, object]:
+    """Construit la configuration d'un cache Django pour le backend choisi."""
+    location = str(VAR_DIR / "cache" / alias) if backend == "file" else alias
+    return {"BACKEND": CACHE_BACKENDS[backend], "LOCATION": location, **extra}
+
+
+CACHES = {
+    "default": _cache_config("default", CACHE_BACKEND),
+    # Instantanés du catalogue des médicaments (lignes indexées par version)
+    "catalog": _cache_config("catalog", CATALOG_CACHE_BACKEND),
+    # Réponses des endpoints de liste (corps compressés en gzip)
+    "responses": _cache_config(
+        "responses",
+        RESPONSE_CACHE_BACKEND,
+        TIMEOUT=int(os.environ.get("MEDICAL_RESPONSE_CACHE_TIMEOUT", "300")),
+        OPTIONS={"MAX_ENTRIES": 1000},
+    ),
+}
+
+MEDICAL_RESPONSE_CACHE_ENABLED = (
+    os.environ.get("MEDICAL_RESPONSE_CACHE_ENABLED", "1") == "1"
+)
+
+# Regroupement des requêtes de liste identiques concurrentes : SHARED étend le
+# regroupement aux autres workers (verrou fichier ; nécessite un cache des
+# réponses partagé, ``DJANGO_RESPONSE_CACHE_BACKEND=file``), TIMEOUT borne
+# l'attente.
+MEDICAL_SINGLEFLIGHT_SHARED = os.environ.get("MEDICAL_SINGLEFLIGHT_SHARED", "0") == "1"
+MEDICAL_SINGLEFLIGHT_TIMEOUT = float(
+    os.environ.get("MEDICAL_SINGLEFLIGHT_TIMEOUT", "5.0")
+)
+
+# Durée (secondes) pendant laquelle un worker réutilise les compteurs de version
+# lus en base avant de les relire.
+MEDICAL_VERSION_TTL = float(os.environ.get("MEDICAL_VERSION_TTL", "1.0"))
+
+# Listes rendues en flux (``?stream=1``) : lignes lues et sérialisées par
+# morceau, et taille de page maximale.
+MEDICAL_STREAM_CHUNK_SIZE = int(os.environ.get("MEDICAL_STREAM_CHUNK_SIZE", "500"))
+MEDICAL_STREAM_MAX_PAGE_SIZE = int(
+    os.environ.get("MEDICAL_STREAM_MAX_PAGE_SIZE", "10000")
+)
+
+# Exports en arrière-plan : répertoire des fichiers, nombre de threads du
+# pool (0 : exécution immédiate, après validation de la transaction), durée
+# de conservation des fichiers et délai sans progression au-delà duquel un
+# job en attente ou en cours est considéré abandonné (secondes).
+MEDICAL_EXPORT_DIR = Path(os.environ.get("MEDICAL_EXPORT_DIR", VAR_DIR / "exports"))
+MEDICAL_EXPORT_WORKERS = int(os.environ.get("MEDICAL_EXPORT_WORKERS", "2"))
+MEDICAL_EXPORT_TTL = int(os.environ.get("MEDICAL_EXPORT_TTL", "86400"))
+MEDICAL_EXPORT_TIMEOUT = int(os.environ.get("MEDICAL_EXPORT_TIMEOUT", "3600"))
+
+# Instantanés SQLite des jeux de données (``snapshot_db``).
+MEDICAL_SNAPSHOT_DIR = Path(
+    os.environ.get("MEDICAL_SNAPSHOT_DIR", VAR_DIR / "snapshots")
+)
+
+# Flux SSE des changements de prescriptions : intervalle (secondes) des
+# messages de maintien, événements conservés pour la reprise (Last-Event-ID)
+# et taille de la file de chaque client.
+MEDICAL_EVENTS_HEARTBEAT = float(os.environ.get("MEDICAL_EVENTS_HEARTBEAT", "15.0"))
+MEDICAL_EVENTS_HISTORY = int(os.environ.get("MEDICAL_EVENTS_HISTORY", "1000"))
+MEDICAL_EVENTS_QUEUE_SIZE = int(os.environ.get("MEDICAL_EVENTS_QUEUE_SIZE", "1000"))
+
+# En-tête Server-Timing et journal ``medical.timing`` : durées SQL, de
+# sérialisation et de rendu de chaque requête.
+MEDICAL_SERVER_TIMING = os.environ.get("MEDICAL_SERVER_TIMING", "0") == "1"
+
+# Métriques Prometheus (/metrics). Avec plusieurs workers, définir
+# PROMETHEUS_MULTIPROC_DIR (répertoire partagé, vidé au démarrage du serveur)
+# pour agréger les valeurs de tous les processus, et lancer gunicorn avec
+# ``gunicorn.conf.py``. Désactivées par défaut : chaque requête SQL est mesurée.
+MEDICAL_METRICS_ENABLED = os.environ.get("MEDICAL_METRICS_ENABLED", "0") == "1"
+# Hors DEBUG, /metrics n'est servi qu'aux comptes staff et aux collecteurs
+# présentant ce jeton (``Authorization: Bearer <jeton>``) ; vide : aucun.
+MEDICAL_METRICS_TOKEN = os.environ.get("MEDICAL_METRICS_TOKEN", "")
+
+# Journal des requêtes SQL lentes : seuil en millisecondes (0 : désactivé),
+# fichier JSON lines (plan EXPLAIN compris) et rotation (taille, archives).
+# Désactivé par défaut : le journal contient les paramètres bruts des requêtes,
+# donc des données de santé nominatives ; le fichier doit être protégé comme
+# la base elle-même.
+MEDICAL_SLOW_QUERY_MS = float(os.environ.get("MEDICAL_SLOW_QUERY_MS", "0"))
+MEDICAL_SLOW_QUERY_LOG = Path(
+    os.environ.get("MEDICAL_SLOW_QUERY_LOG", VAR_DIR / "logs" / "slow_queries.jsonl")
+)
+MEDICAL_SLOW_QUERY_LOG_BYTES = int(
+    os.environ.get("MEDICAL_SLOW_QUERY_LOG_BYTES", str(10 * 1024 * 1024))
+)
+MEDICAL_SLOW_QUERY_LOG_BACKUPS = int(
+    os.environ.get("MEDICAL_SLOW_QUERY_LOG_BACKUPS", "5")
+)
+
+# Statistiques par empreinte de requête SQL (``query_stats``,
+# /debug/query-stats) : empreintes suivies au plus, et intervalle (secondes)
+# d'écriture des valeurs de chaque processus dans un répertoire partagé.
+# Désactivées par défaut : chaque requête SQL prend un verrou du processus.
+MEDICAL_QUERY_STATS = os.environ.get("MEDICAL_QUERY_STATS", "0") == "1"
+MEDICAL_QUERY_STATS_MAX = int(os.environ.get("MEDICAL_QUERY_STATS_MAX", "5000"))
+MEDICAL_QUERY_STATS_FLUSH = float(os.environ.get("MEDICAL_QUERY_STATS_FLUSH", "10"))
+MEDICAL_QUERY_STATS_DIR = Path(
+    os.environ.get("MEDICAL_QUERY_STATS_DIR", VAR_DIR / "query_stats")
+)
+
+# Profilage à la demande (en-tête X-Profile: 1 ou ?profile=1, DEBUG ou staff) :
+# répertoire des profils et nombre de profils conservés.
+MEDICAL_PROFILING = os.environ.get("MEDICAL_PROFILING", "0") == "1"
+MEDICAL_PROFILE_DIR = Path(os.environ.get("MEDICAL_PROFILE_DIR", VAR_DIR / "profiles"))
+MEDICAL_PROFILE_KEEP = int(os.environ.get("MEDICAL_PROFILE_KEEP", "50"))
+
+
 REST_FRAMEWORK = {
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
@@ -108,3 +238,16 @@ REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "config.pagination.StandardPagination",
     "PAGE_SIZE": 20,
 }
+
+# Journaux de l'application (``medical.*``) sur la sortie d'erreur.
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        "medical": {
+            "handlers": ["console"],
+            "level": os.environ.get("MEDICAL_LOG_LEVEL", "INFO"),
+        },
+    },
+}
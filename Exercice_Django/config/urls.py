@@ -1,7 +1,17 @@
 from django.contrib import admin
 from django.urls import path, include
 
+from medical.views import MetricsView, ProfileView, QueryStatsView
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("medical.urls")),
+    path("metrics", MetricsView.as_view(), name="metrics"),
+    path("debug/query-stats", QueryStatsView.as_view(), name="query-stats"),
+    path("debug/profiles", ProfileView.as_view(), name="profile-list"),
+    path(
+        "debug/profiles/<slug:profile_id>",
+        ProfileView.as_view(),
+        name="profile-detail",
+    ),
 ]
@@ -0,0 +1,19 @@
+"""Configuration de gunicorn (``gunicorn -c gunicorn.conf.py config.wsgi``).
+
+Avec ``PROMETHEUS_MULTIPROC_DIR``, chaque worker écrit ses métriques dans le
+répertoire partagé ; les jauges d'un worker terminé doivent en être retirées.
+"""
+
+from typing import Any
+
+from medical.metrics import worker_exited
+
+
+def child_exit(server: Any, worker: Any) -> None:
+    """Retire les jauges d'un worker terminé.
+
+    Args:
+        server: Arbitre gunicorn.
+        worker: Worker terminé.
+    """
+    worker_exited(worker.pid)
@@ -1,6 +1,24 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class MedicalConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "medical"
+
+    def ready(self) -> None:
+        """Connecte les handlers de signaux (caches, résumés des patients) et
+        enregistre les vérifications de configuration.
+
+        Installe aussi le journal des requêtes lentes et les statistiques par
+        empreinte, pour que les commandes de gestion soient instrumentées
+        comme les requêtes HTTP.
+        """
+        from medical import checks, handlers  # noqa: F401
+        from medical.query_stats import enable_query_stats
+        from medical.slow_queries import enable_slow_query_log
+
+        if settings.MEDICAL_SLOW_QUERY_MS > 0:
+            enable_slow_query_log()
+        if settings.MEDICAL_QUERY_STATS:
+            enable_query_stats()
@@ -0,0 +1,23 @@
+from medical.cache.catalog import MedicationCatalog, clear_catalog, get_catalog
+from medical.cache.responses import clear_response_cache
+from medical.cache.versions import (
+    TableState,
+    bump_version,
+    forget_versions,
+    get_table_states,
+    get_version,
+    get_versions,
+)
+
+__all__ = [
+    "MedicationCatalog",
+    "get_catalog",
+    "clear_catalog",
+    "clear_response_cache",
+    "TableState",
+    "get_table_states",
+    "get_version",
+    "get_versions",
+    "bump_version",
+    "forget_versions",
+]
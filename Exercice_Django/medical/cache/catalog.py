@@ -0,0 +1,132 @@
+import threading
+from typing import Any
+
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+
+from medical.cache.versions import get_version
+from medical.metrics import CACHE_REQUESTS
+from medical.models.medication import Medication
+
+CATALOG_TABLE = "medication"
+CATALOG_CACHE_ALIAS = "catalog"
+CATALOG_FIELDS = ("id", "code", "label", "status")
+SNAPSHOT_KEY = "medical:catalog:{version}"
+SNAPSHOT_TIMEOUT = 24 * 60 * 60
+
+
+class MedicationCatalog:
+    """Instantané en mémoire du catalogue des médicaments, indexé par id et par code.
+
+    L'instantané est partagé entre requêtes sous forme de lignes : chaque
+    lecture construit une nouvelle instance ``Medication`` (partielle, limitée
+    à ``CATALOG_FIELDS``), que l'appelant peut modifier sans effet sur les autres.
+
+    Attributes:
+        version (int): Version de la table ``medication`` correspondant à l'instantané.
+    """
+
+    def __init__(self, version: int, rows: list[tuple[Any, ...]]) -> None:
+        """Construit les index à partir des lignes ``CATALOG_FIELDS``.
+
+        Args:
+            version: Version de la table ``medication``.
+            rows: Tuples ``(id, code, label, status)``.
+        """
+        self.version = version
+        self._by_id: dict[int, tuple[Any, ...]] = {row[0]: row for row in rows}
+        self._by_code: dict[str, tuple[Any, ...]] = {row[1]: row for row in rows}
+
+    def __len__(self) -> int:
+        """Retourne le nombre de médicaments du catalogue."""
+        return len(self._by_id)
+
+    def get(self, pk: Any) -> Medication | None:
+        """Retourne le médicament d'identifiant ``pk``.
+
+        Args:
+            pk: Identifiant du médicament (entier ou chaîne numérique).
+
+        Returns:
+            Medication | None: Le médicament, ou ``None`` s'il est inconnu.
+        """
+        try:
+            return _medication(self._by_id.get(int(pk)))
+        except (TypeError, ValueError):
+            return None
+
+    def get_by_code(self, code: str) -> Medication | None:
+        """Retourne le médicament de code ``code``.
+
+        Args:
+            code: Code unique du médicament.
+
+        Returns:
+            Medication | None: Le médicament, ou ``None`` s'il est inconnu.
+        """
+        return _medication(self._by_code.get(code))
+
+
+def _medication(row: tuple[Any, ...] | None) -> Medication | None:
+    """Construit une instance ``Medication`` à partir d'une ligne du catalogue."""
+    if row is None:
+        return None
+    return Medication.from_db(DEFAULT_DB_ALIAS, CATALOG_FIELDS, row)
+
+
+_lock = threading.Lock()
+_catalog: MedicationCatalog | None = None
+
+
+def load_rows(version: int) -> list[tuple[Any, ...]]:
+    """Charge les lignes du catalogue depuis le cache partagé ou la base.
+
+    L'instantané est publié dans le cache ``catalog`` sous une clé versionnée :
+    ce cache est partagé entre workers par défaut
+    (``DJANGO_CATALOG_CACHE_BACKEND=file``), si bien qu'un seul worker relit la
+    table après chaque modification et que les autres réutilisent son instantané.
+
+    Args:
+        version: Version de la table ``medication`` attendue.
+
+    Returns:
+        list[tuple]: Tuples ``(id, code, label, status)``.
+    """
+    key = SNAPSHOT_KEY.format(version=version)
+    snapshots = caches[CATALOG_CACHE_ALIAS]
+    rows: list[tuple[Any, ...]] | None = snapshots.get(key)
+    if rows is None:
+        rows = list(Medication.objects.order_by().values_list(*CATALOG_FIELDS))
+        snapshots.set(key, rows, SNAPSHOT_TIMEOUT)
+    return rows
+
+
+def get_catalog() -> MedicationCatalog:
+    """Retourne le catalogue courant, reconstruit si la table a changé.
+
+    Returns:
+        MedicationCatalog: Instantané correspondant à la version courante.
+    """
+    global _catalog
+    version = get_version(CATALOG_TABLE)
+    catalog = _catalog
+    if catalog is not None and catalog.version == version:
+        CACHE_REQUESTS.labels("catalog", "hit").inc()
+        return catalog
+    CACHE_REQUESTS.labels("catalog", "miss").inc()
+    with _lock:
+        if _catalog is None or _catalog.version != version:
+            _catalog = MedicationCatalog(version, load_rows(version))
+        return _catalog
+
+
+def clear_catalog() -> None:
+    """Oublie l'instantané du processus courant et vide le cache ``catalog``.
+
+    Utile pour les tests : les versions repartent de zéro avec chaque base de
+    test, un instantané publié par un test précédent serait sinon réutilisé.
+    """
+    global _catalog
+    with _lock:
+        _catalog = None
+    caches[CATALOG_CACHE_ALIAS].clear()
@@ -0,0 +1,89 @@
+import gzip
+import hashlib
+from collections.abc import Iterable
+from typing import Any, TypedDict
+
+from django.core.cache import caches
+
+from medical.cache.versions import get_versions
+
+RESPONSE_CACHE_ALIAS = "responses"
+GZIP_LEVEL = 6
+
+
+class CachedResponse(TypedDict):
+    """Réponse mise en cache.
+
+    Attributes:
+        content_type: En-tête ``Content-Type``.
+        body: Corps compressé en gzip.
+        headers: En-têtes de validation (``ETag``, ``Last-Modified``...).
+    """
+
+    content_type: str
+    body: bytes
+    headers: dict[str, str]
+
+
+def response_cache_key(
+    view: str, tables: Iterable[str], query: list[tuple[str, str]]
+) -> str:
+    """Construit la clé de cache d'une réponse de liste.
+
+    La clé inclut la version de chaque table lue : une écriture sur l'une de
+    ces tables rend les entrées précédentes inaccessibles, qui expirent ensuite
+    d'elles-mêmes.
+
+    Args:
+        view: Identifiant de la vue (nom de route et format de rendu).
+        tables: Tables dont dépend la réponse.
+        query: Paramètres de requête normalisés (triés).
+
+    Returns:
+        str: Clé de cache.
+    """
+    versions = sorted(get_versions(tables).items())
+    digest = hashlib.blake2b(repr(query).encode(), digest_size=16).hexdigest()
+    stamp = ".".join(f"{table}{version}" for table, version in versions)
+    return f"medical:response:{view}:{stamp}:{digest}"
+
+
+def get_cached_response(key: str) -> CachedResponse | None:
+    """Retourne la réponse mise en cache sous ``key``.
+
+    Args:
+        key: Clé construite par ``response_cache_key``.
+
+    Returns:
+        CachedResponse | None: L'entrée, ou ``None`` en cas d'absence.
+    """
+    entry: CachedResponse | None = caches[RESPONSE_CACHE_ALIAS].get(key)
+    return entry
+
+
+def set_cached_response(
+    key: str, content_type: str, content: bytes, headers: dict[str, Any]
+) -> CachedResponse:
+    """Compresse et met en cache le corps d'une réponse.
+
+    Args:
+        key: Clé construite par ``response_cache_key``.
+        content_type: En-tête ``Content-Type`` de la réponse.
+        content: Corps rendu de la réponse.
+        headers: En-têtes à restituer avec le corps.
+
+    Returns:
+        CachedResponse: L'entrée mise en cache.
+    """
+    entry: CachedResponse = {
+        "content_type": content_type,
+        "body": gzip.compress(content, compresslevel=GZIP_LEVEL, mtime=0),
+        "headers": {name: str(value) for name, value in headers.items()},
+    }
+    caches[RESPONSE_CACHE_ALIAS].set(key, entry)
+    return entry
+
+
+def clear_response_cache() -> None:
+    """Vide le cache des réponses."""
+    caches[RESPONSE_CACHE_ALIAS].clear()
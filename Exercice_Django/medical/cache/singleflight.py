@@ -0,0 +1,206 @@
+import hashlib
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Generic, TypeVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+from medical.cache.responses import RESPONSE_CACHE_ALIAS
+
+T = TypeVar("T")
+
+ORIGIN_LEADER = "leader"
+ORIGIN_LOCAL = "local"
+ORIGIN_PEER = "peer"
+
+PEER_POLL_INTERVAL = 0.05
+
+# Backends dont les entrées ne sont visibles que du processus qui les écrit.
+PROCESS_LOCAL_BACKENDS = (LocMemCache, DummyCache)
+
+
+class SingleFlightTimeout(TimeoutError):
+    """Le leader d'une clé n'a pas terminé dans le délai d'attente."""
+
+
+class _Call(Generic[T]):
+    """Exécution en cours pour une clé, partagée par les appelants concurrents."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: T | None = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight(Generic[T]):
+    """Regroupe les appels concurrents d'une même clé en une seule exécution.
+
+    Le premier appelant (leader) exécute la fonction ; les appelants arrivés
+    pendant l'exécution attendent et reçoivent le même résultat (ou la même
+    exception). Rien n'est mémorisé une fois l'exécution terminée.
+    """
+
+    def __init__(self) -> None:
+        """Initialise le registre des exécutions en cours."""
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call[T]] = {}
+
+    def do(
+        self, key: str, fn: Callable[[], T], timeout: float | None = None
+    ) -> tuple[T, bool]:
+        """Exécute ``fn`` ou attend l'exécution en cours pour ``key``.
+
+        Args:
+            key: Clé identifiant le calcul.
+            fn: Calcul à exécuter.
+            timeout: Attente maximale d'un autre appelant, en secondes (sans
+                limite si ``None``).
+
+        Returns:
+            tuple[T, bool]: Résultat et ``True`` s'il provient d'un autre appelant.
+
+        Raises:
+            SingleFlightTimeout: Si l'exécution en cours dépasse ``timeout``.
+            BaseException: L'exception levée par ``fn`` chez le leader.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+        if not leader:
+            if not call.done.wait(timeout):
+                raise SingleFlightTimeout(key)
+            if call.error is not None:
+                raise call.error
+            return call.result, True  # type: ignore[return-value]
+        try:
+            call.result = fn()
+            return call.result, False
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+@contextmanager
+def _peer_lock(key: str, timeout: float) -> Iterator[bool]:
+    """Verrou inter-processus par fichier créé avec ``O_EXCL``.
+
+    Un verrou plus ancien que ``timeout`` est considéré comme abandonné (worker
+    arrêté pendant le calcul) et remplacé.
+
+    Args:
+        key: Clé identifiant le calcul.
+        timeout: Durée de validité du verrou, en secondes.
+
+    Yields:
+        bool: ``True`` si le verrou a été obtenu.
+    """
+    directory = Path(settings.VAR_DIR) / "locks"
+    directory.mkdir(parents=True, exist_ok=True)
+    path = (
+        directory / f"{hashlib.blake2b(key.encode(), digest_size=16).hexdigest()}.lock"
+    )
+    try:
+        if time.time() - path.stat().st_mtime > timeout:
+            path.unlink(missing_ok=True)
+    except FileNotFoundError:
+        pass
+    try:
+        os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+    except FileExistsError:
+        yield False
+        return
+    try:
+        yield True
+    finally:
+        path.unlink(missing_ok=True)
+
+
+def _wait_for_peer(load: Callable[[], T | None], timeout: float) -> T | None:
+    """Attend que le résultat d'un autre worker soit publié.
+
+    Args:
+        load: Lecture du résultat publié (``None`` s'il est absent).
+        timeout: Attente maximale, en secondes.
+
+    Returns:
+        T | None: Le résultat publié, ou ``None`` à l'expiration du délai.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = load()
+        if result is not None:
+            return result
+        time.sleep(PEER_POLL_INTERVAL)
+    return None
+
+
+def peers_share_cache() -> bool:
+    """Indique si le cache des réponses est visible des autres workers.
+
+    Sans cela, un worker ne verrait jamais le résultat publié par un autre et
+    attendrait ``MEDICAL_SINGLEFLIGHT_TIMEOUT`` pour rien.
+
+    Returns:
+        bool: ``False`` pour un cache propre au processus (``locmem``).
+    """
+    return not isinstance(caches[RESPONSE_CACHE_ALIAS], PROCESS_LOCAL_BACKENDS)
+
+
+_flight: SingleFlight = SingleFlight()
+
+
+def run_once(
+    key: str, compute: Callable[[], T], load: Callable[[], T | None]
+) -> tuple[T, str]:
+    """Exécute ``compute`` une seule fois pour les requêtes concurrentes de ``key``.
+
+    Dans un worker, les appels concurrents partagent une exécution ; un
+    appelant qui attend plus de ``MEDICAL_SINGLEFLIGHT_TIMEOUT`` secondes
+    (leader bloqué sur une requête lente) calcule lui-même le résultat. Si
+    ``MEDICAL_SINGLEFLIGHT_SHARED`` est actif, le leader prend aussi un verrou
+    fichier : les leaders des autres workers attendent que le résultat soit
+    publié (``load``) au lieu de le recalculer, dans la limite de
+    ``MEDICAL_SINGLEFLIGHT_TIMEOUT`` secondes. Avec un cache des réponses
+    propre au processus, le regroupement reste local au worker.
+
+    Args:
+        key: Clé identifiant le calcul.
+        compute: Calcul qui produit et publie le résultat.
+        load: Lecture du résultat publié par un autre worker.
+
+    Returns:
+        tuple[T, str]: Résultat et origine (``leader``, ``local`` ou ``peer``).
+    """
+
+    def lead() -> tuple[T, str]:
+        if not settings.MEDICAL_SINGLEFLIGHT_SHARED or not peers_share_cache():
+            return compute(), ORIGIN_LEADER
+        timeout = settings.MEDICAL_SINGLEFLIGHT_TIMEOUT
+        with _peer_lock(key, timeout) as acquired:
+            if acquired:
+                return compute(), ORIGIN_LEADER
+        result = _wait_for_peer(load, timeout)
+        if result is not None:
+            return result, ORIGIN_PEER
+        return compute(), ORIGIN_LEADER
+
+    try:
+        (result, origin), shared = _flight.do(
+            key, lead, timeout=settings.MEDICAL_SINGLEFLIGHT_TIMEOUT
+        )
+    except SingleFlightTimeout:
+        return compute(), ORIGIN_LEADER
+    return result, ORIGIN_LOCAL if shared else origin
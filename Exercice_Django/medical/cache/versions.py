@@ -0,0 +1,122 @@
+import threading
+import time
+from collections.abc import Iterable
+from datetime import datetime
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from medical.metrics import CACHE_REQUESTS
+from medical.models.table_version import TableVersion
+
+_lock = threading.Lock()
+_local_states: dict[str, tuple[float, "TableState"]] = {}
+
+
+class TableState(NamedTuple):
+    """État d'une table : version courante et date de la dernière écriture.
+
+    Attributes:
+        version: Version courante (0 si la table n'a jamais été modifiée).
+        updated_at: Date de la dernière écriture, ``None`` si inconnue.
+    """
+
+    version: int
+    updated_at: datetime | None
+
+
+def get_table_states(tables: Iterable[str]) -> dict[str, TableState]:
+    """Retourne l'état courant de chaque table demandée.
+
+    Les états lus en base sont mémorisés dans le processus pendant
+    ``MEDICAL_VERSION_TTL`` secondes : la plupart des appels ne coûtent donc
+    aucune requête SQL. Une lecture faite dans une transaction n'est pas
+    mémorisée, car elle peut voir une version non encore validée.
+
+    Args:
+        tables: Noms logiques des tables.
+
+    Returns:
+        dict[str, TableState]: État par table.
+    """
+    tables = list(tables)
+    now = time.monotonic()
+    states: dict[str, TableState] = {}
+    missing: list[str] = []
+    with _lock:
+        for table in tables:
+            cached = _local_states.get(table)
+            if cached is not None and cached[0] > now:
+                states[table] = cached[1]
+            else:
+                missing.append(table)
+    if len(missing) < len(tables):
+        CACHE_REQUESTS.labels("versions", "hit").inc(len(tables) - len(missing))
+    if missing:
+        CACHE_REQUESTS.labels("versions", "miss").inc(len(missing))
+        fetched = {
+            table: TableState(version, updated_at)
+            for table, version, updated_at in TableVersion.objects.filter(
+                table__in=missing
+            ).values_list("table", "version", "updated_at")
+        }
+        expires_at = now + settings.MEDICAL_VERSION_TTL
+        remember = not connection.in_atomic_block
+        with _lock:
+            for table in missing:
+                states[table] = fetched.get(table, TableState(0, None))
+                if remember:
+                    _local_states[table] = (expires_at, states[table])
+    return states
+
+
+def get_versions(tables: Iterable[str]) -> dict[str, int]:
+    """Retourne la version courante de chaque table demandée.
+
+    Args:
+        tables: Noms logiques des tables.
+
+    Returns:
+        dict[str, int]: Version par table (0 si la table n'a jamais été modifiée).
+    """
+    return {table: state.version for table, state in get_table_states(tables).items()}
+
+
+def get_version(table: str) -> int:
+    """Retourne la version courante d'une table.
+
+    Args:
+        table: Nom logique de la table.
+
+    Returns:
+        int: Version courante de la table.
+    """
+    return get_versions([table])[table]
+
+
+def forget_versions(*tables: str) -> None:
+    """Oublie les versions mémorisées localement (toutes si aucune table n'est donnée).
+
+    Args:
+        *tables: Noms logiques des tables à oublier.
+    """
+    with _lock:
+        if not tables:
+            _local_states.clear()
+        for table in tables:
+            _local_states.pop(table, None)
+
+
+def bump_version(table: str) -> None:
+    """Incrémente la version d'une table et invalide la copie locale.
+
+    La copie locale est oubliée immédiatement puis une seconde fois au commit,
+    afin qu'une lecture concurrente faite avant le commit ne reste pas en cache.
+
+    Args:
+        table: Nom logique de la table modifiée.
+    """
+    TableVersion.bump(table)
+    forget_versions(table)
+    transaction.on_commit(lambda: forget_versions(table))
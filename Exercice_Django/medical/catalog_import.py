@@ -0,0 +1,187 @@
+import csv
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from typing import NamedTuple, TextIO
+
+from django.db import transaction
+from django.utils import timezone
+
+from medical.cache.versions import bump_version
+from medical.models import Medication
+
+CATALOG_BATCH_SIZE = 1000
+CATALOG_STATUSES = {status for status, _ in Medication.STATUS_CHOICES}
+
+
+class CatalogRow(NamedTuple):
+    """Ligne d'un catalogue de médicaments.
+
+    Attributes:
+        code: Code unique du médicament.
+        label: Libellé.
+        status: ``actif`` ou ``suppr``.
+    """
+
+    code: str
+    label: str
+    status: str
+
+
+class CatalogSync(NamedTuple):
+    """Bilan d'une synchronisation du catalogue.
+
+    Attributes:
+        created: Médicaments ajoutés.
+        updated: Médicaments dont le libellé ou le statut a changé.
+        retired: Médicaments absents du fichier passés au statut ``suppr``.
+        unchanged: Médicaments identiques en base et dans le fichier.
+    """
+
+    created: int
+    updated: int
+    retired: int
+    unchanged: int
+
+    @property
+    def changed(self) -> bool:
+        """Indique si la table a été modifiée."""
+        return bool(self.created or self.updated or self.retired)
+
+
+def read_catalog_csv(stream: TextIO, delimiter: str = ",") -> Iterator[CatalogRow]:
+    """Lit un catalogue CSV (colonnes ``code``, ``label`` et ``status`` optionnelle).
+
+    Args:
+        stream: Flux texte du fichier.
+        delimiter: Séparateur de colonnes.
+
+    Yields:
+        CatalogRow: Lignes du catalogue (statut ``actif`` par défaut).
+
+    Raises:
+        ValueError: Si une colonne manque, si une ligne est invalide ou si un
+            code apparaît deux fois.
+    """
+    reader = csv.DictReader(stream, delimiter=delimiter)
+    missing = {"code", "label"} - set(reader.fieldnames or ())
+    if missing:
+        raise ValueError(f"Colonnes manquantes : {', '.join(sorted(missing))}.")
+    seen: set[str] = set()
+    for row in reader:
+        line = reader.line_num
+        code = (row["code"] or "").strip()
+        label = (row["label"] or "").strip()
+        status = (row.get("status") or Medication.STATUS_ACTIF).strip()
+        if not code or not label:
+            raise ValueError(f"Ligne {line} : code et libellé sont obligatoires.")
+        if len(code) > 64 or len(label) > 255:
+            raise ValueError(f"Ligne {line} : code ou libellé trop long.")
+        if status not in CATALOG_STATUSES:
+            raise ValueError(f"Ligne {line} : statut inconnu « {status} ».")
+        if code in seen:
+            raise ValueError(f"Ligne {line} : code « {code} » en double.")
+        seen.add(code)
+        yield CatalogRow(code, label, status)
+
+
+def _batches(rows: Iterable[CatalogRow], size: int) -> Iterator[list[CatalogRow]]:
+    """Découpe le flux en listes de ``size`` lignes."""
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def sync_catalog(
+    rows: Iterable[CatalogRow],
+    retire_missing: bool = False,
+    batch_size: int = CATALOG_BATCH_SIZE,
+    dry_run: bool = False,
+) -> CatalogSync:
+    """Aligne la table des médicaments sur un catalogue.
+
+    Les lignes existantes sont chargées une fois (``code`` → libellé et
+    statut) et comparées en mémoire : seules les différences sont écrites,
+    par lots. Les nouveaux codes passent par ``bulk_create`` en mode
+    « upsert » sur ``code`` (une insertion concurrente du même code devient
+    une mise à jour), les modifications par ``bulk_update``. Une
+    synchronisation sans différence n'écrit rien et n'invalide pas le
+    catalogue en mémoire.
+
+    Args:
+        rows: Lignes du catalogue, codes uniques.
+        retire_missing: Passer au statut ``suppr`` les médicaments actifs
+            absents du catalogue.
+        batch_size: Lignes écrites par requête.
+        dry_run: Calculer le bilan sans rien écrire.
+
+    Returns:
+        CatalogSync: Bilan de la synchronisation.
+    """
+    existing = {
+        code: (pk, label, status)
+        for pk, code, label, status in Medication.objects.values_list(
+            "id", "code", "label", "status"
+        ).iterator(chunk_size=batch_size)
+    }
+    created = updated = unchanged = 0
+    seen: set[str] = set()
+    with transaction.atomic():
+        for batch in _batches(rows, batch_size):
+            now = timezone.now()
+            to_create: list[Medication] = []
+            to_update: list[Medication] = []
+            for row in batch:
+                seen.add(row.code)
+                current = existing.get(row.code)
+                if current is None:
+                    to_create.append(
+                        Medication(code=row.code, label=row.label, status=row.status)
+                    )
+                elif current[1:] != (row.label, row.status):
+                    to_update.append(
+                        Medication(
+                            pk=current[0],
+                            code=row.code,
+                            label=row.label,
+                            status=row.status,
+                            updated_at=now,
+                        )
+                    )
+                else:
+                    unchanged += 1
+            created += len(to_create)
+            updated += len(to_update)
+            if dry_run:
+                continue
+            if to_create:
+                Medication.objects.bulk_create(
+                    to_create,
+                    update_conflicts=True,
+                    unique_fields=["code"],
+                    update_fields=["label", "status", "updated_at"],
+                )
+            if to_update:
+                Medication.objects.bulk_update(
+                    to_update, ["label", "status", "updated_at"]
+                )
+        retired_ids = (
+            [
+                pk
+                for code, (pk, _, status) in existing.items()
+                if code not in seen and status != Medication.STATUS_SUPPR
+            ]
+            if retire_missing
+            else []
+        )
+        if not dry_run:
+            now = timezone.now()
+            for start in range(0, len(retired_ids), batch_size):
+                Medication.objects.filter(
+                    pk__in=retired_ids[start : start + batch_size]
+                ).update(status=Medication.STATUS_SUPPR, updated_at=now)
+        result = CatalogSync(created, updated, len(retired_ids), unchanged)
+        # Les écritures en masse n'émettent pas ``post_save`` : la version de la
+        # table (ETags, catalogue en mémoire) est incrémentée ici.
+        if result.changed and not dry_run:
+            bump_version("medication")
+    return result
@@ -0,0 +1,131 @@
+from collections.abc import Iterable
+from datetime import datetime
+from typing import NamedTuple
+
+from django.db import transaction
+from django.db.models import Max, Min
+
+from medical.models import PrescriptionChangeLog
+from medical.signals import OPERATION_DELETE, PrescriptionChange
+
+CHANGES_PAGE_SIZE = 500
+CHANGES_MAX_PAGE_SIZE = 5000
+
+
+class ChangeWindow(NamedTuple):
+    """Écritures postérieures à un curseur.
+
+    Attributes:
+        cursor: Curseur à renvoyer à la prochaine synchronisation.
+        reset: ``True`` si le curseur reçu ne permet pas de reprendre (journal
+            purgé, curseur d'une autre base) : le client doit tout recharger
+            puis reprendre depuis ``cursor``.
+        has_more: ``True`` si d'autres écritures suivent ``cursor``.
+        entries: Dernière écriture de chaque prescription, dans l'ordre de ``seq``.
+    """
+
+    cursor: int
+    reset: bool
+    has_more: bool
+    entries: list[PrescriptionChangeLog]
+
+
+def record_changes(changes: Iterable[PrescriptionChange]) -> None:
+    """Ajoute des écritures au journal.
+
+    Doit être appelé dans la transaction qui a incrémenté la version
+    ``prescription`` : le verrou de cette ligne ordonne les ``seq`` comme les
+    validations, si bien qu'un client ne peut pas dépasser une écriture encore
+    en cours.
+
+    Args:
+        changes: Écritures notifiées par ``prescriptions_changed``.
+    """
+    PrescriptionChangeLog.objects.bulk_create(
+        PrescriptionChangeLog(
+            prescription_id=change.id,
+            patient_id=change.patient_id,
+            operation=change.operation,
+        )
+        for change in changes
+    )
+
+
+def changes_since(since: int | None, limit: int = CHANGES_PAGE_SIZE) -> ChangeWindow:
+    """Retourne les écritures postérieures au curseur ``since``.
+
+    Sans curseur, seule la position courante du journal est renvoyée (avec
+    ``reset``) : le client la mémorise, charge la liste complète, puis
+    synchronise depuis cette position. Plusieurs écritures d'une même
+    prescription dans la fenêtre sont réduites à la dernière.
+
+    Args:
+        since: Dernier curseur reçu, ou ``None`` pour une première synchronisation.
+        limit: Nombre maximal d'écritures lues dans le journal.
+
+    Returns:
+        ChangeWindow: Écritures et nouveau curseur.
+    """
+    bounds = PrescriptionChangeLog.objects.aggregate(first=Min("seq"), last=Max("seq"))
+    head = bounds["last"] or 0
+    # Le journal commence juste avant sa plus ancienne ligne conservée.
+    floor = bounds["first"] - 1 if bounds["first"] is not None else 0
+    if since is None or not floor <= since <= head:
+        return ChangeWindow(head, True, False, [])
+    rows = list(PrescriptionChangeLog.objects.filter(seq__gt=since)[: limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    latest = {row.prescription_id: row for row in rows}
+    entries = sorted(latest.values(), key=lambda row: row.seq)
+    return ChangeWindow(rows[-1].seq if rows else since, False, has_more, entries)
+
+
+def prune_changes(before: datetime) -> int:
+    """Supprime les écritures antérieures à ``before``.
+
+    La dernière écriture est toujours conservée pour que les curseurs récents
+    restent valides. Les clients dont le curseur est antérieur à la purge
+    recevront ``reset``.
+
+    Args:
+        before: Date limite des écritures à supprimer.
+
+    Returns:
+        int: Nombre d'écritures supprimées.
+    """
+    head = PrescriptionChangeLog.objects.aggregate(last=Max("seq"))["last"]
+    if head is None:
+        return 0
+    deleted, _ = PrescriptionChangeLog.objects.filter(
+        created_at__lt=before, seq__lt=head
+    ).delete()
+    return deleted
+
+
+def reset_changes(after: int = 0) -> None:
+    """Vide le journal en invalidant tous les curseurs déjà distribués.
+
+    Utilisé après un rechargement complet des prescriptions sans
+    journalisation (données de démonstration, restauration) : chaque client
+    doit alors recevoir ``reset``. Deux lignes sont insérées et seule la
+    seconde est conservée ; le plancher du journal (``min(seq) - 1``)
+    dépasse ainsi l'ancienne tête, si bien qu'aucun curseur antérieur n'est
+    plus accepté. La ligne conservée ne décrit aucune prescription et n'est
+    renvoyée à aucun client.
+
+    Args:
+        after: Curseur le plus élevé déjà distribué, quand il peut dépasser
+            la tête du journal (base restaurée depuis un instantané SQLite,
+            seul cas où ``seq`` est alors fixé explicitement).
+    """
+    with transaction.atomic():
+        marker = PrescriptionChangeLog.objects.create(
+            prescription_id=0, patient_id=0, operation=OPERATION_DELETE
+        )
+        marker = PrescriptionChangeLog.objects.create(
+            seq=after + 2 if marker.seq <= after else None,
+            prescription_id=0,
+            patient_id=0,
+            operation=OPERATION_DELETE,
+        )
+        PrescriptionChangeLog.objects.filter(seq__lt=marker.seq).delete()
@@ -0,0 +1,29 @@
+from typing import Any
+
+from django.conf import settings
+from django.core.checks import CheckMessage, Warning, register
+
+
+@register()
+def check_singleflight_cache(**kwargs: Any) -> list[CheckMessage]:
+    """Signale ``MEDICAL_SINGLEFLIGHT_SHARED`` sans cache des réponses partagé.
+
+    Args:
+        **kwargs: Arguments du framework de vérification (non utilisés).
+
+    Returns:
+        list[CheckMessage]: Un avertissement si le regroupement entre workers
+        est demandé avec un cache propre au processus.
+    """
+    from medical.cache.singleflight import peers_share_cache
+
+    if not settings.MEDICAL_SINGLEFLIGHT_SHARED or peers_share_cache():
+        return []
+    return [
+        Warning(
+            "MEDICAL_SINGLEFLIGHT_SHARED requires a response cache shared by "
+            "the workers; coalescing stays local to each worker.",
+            hint="Set DJANGO_RESPONSE_CACHE_BACKEND=file.",
+            id="medical.W001",
+        )
+    ]
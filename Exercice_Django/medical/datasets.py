@@ -0,0 +1,162 @@
+import re
+import sqlite3
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.color import no_style
+from django.db import NotSupportedError, connection, connections, transaction
+from django.db.transaction import TransactionManagementError
+from django.db.models import Max
+
+from medical.cache import clear_catalog, clear_response_cache, forget_versions
+from medical.cache.versions import bump_version
+from medical.changelog import reset_changes
+from medical.models import (
+    Medication,
+    Patient,
+    PatientPrescriptionSummary,
+    Prescription,
+    PrescriptionChangeLog,
+)
+
+# Tables métier, des dépendantes vers leurs références. Le journal des
+# écritures et les versions de tables ne sont jamais vidés : leurs compteurs
+# doivent rester croissants pour que les curseurs et ETags déjà distribués
+# soient invalidés plutôt que réutilisés.
+MEDICAL_MODELS = (PatientPrescriptionSummary, Prescription, Patient, Medication)
+
+VERSIONED_TABLES = ("patient", "medication", "prescription")
+
+SNAPSHOT_NAME = re.compile(r"[\w.-]+")
+
+
+def data_replaced(after_seq: int = 0) -> None:
+    """Invalide tout ce qui dérive des données après leur remplacement complet.
+
+    Les caches du processus (versions, catalogue des médicaments, réponses)
+    sont vidés, les versions des tables incrémentées (ETags, caches des autres
+    processus) et le journal des écritures réinitialisé pour que chaque client
+    de la synchronisation incrémentale recharge tout.
+
+    Args:
+        after_seq: Curseur de journal le plus élevé déjà distribué, s'il
+            dépasse la tête actuelle du journal (après une restauration).
+    """
+    forget_versions()
+    clear_catalog()
+    clear_response_cache()
+    with transaction.atomic():
+        for table in VERSIONED_TABLES:
+            bump_version(table)
+        reset_changes(after_seq)
+
+
+def flush_medical_data(reset_sequences: bool = True) -> None:
+    """Vide les tables métier par des requêtes ensemblistes.
+
+    ``QuerySet.delete()`` charge chaque ligne (cascades et signaux) en
+    Python ; ici, une seule requête par table est émise via
+    ``connection.ops.sql_flush`` (``DELETE`` sous SQLite, ``TRUNCATE`` sous
+    PostgreSQL), sans signal. Les identifiants repartent de 1 si
+    ``reset_sequences``.
+
+    Args:
+        reset_sequences: Réinitialiser les séquences des clés primaires.
+    """
+    statements = connection.ops.sql_flush(
+        no_style(),
+        [model._meta.db_table for model in MEDICAL_MODELS],
+        reset_sequences=reset_sequences,
+    )
+    connection.ops.execute_sql_flush(statements)
+    data_replaced()
+
+
+def _sqlite_connection() -> sqlite3.Connection:
+    """Retourne la connexion ``sqlite3`` sous-jacente.
+
+    Raises:
+        NotSupportedError: Si la base n'est pas SQLite.
+    """
+    if connection.vendor != "sqlite":
+        raise NotSupportedError("Snapshots require the SQLite backup API.")
+    connection.ensure_connection()
+    raw: sqlite3.Connection = connection.connection
+    return raw
+
+
+def snapshot_database(path: Path) -> int:
+    """Copie la base courante dans ``path`` avec l'API de sauvegarde SQLite.
+
+    La copie est cohérente même si d'autres processus écrivent pendant la
+    sauvegarde. Elle est écrite à côté puis renommée : un instantané visible
+    est toujours complet.
+
+    Args:
+        path: Fichier de l'instantané (remplacé s'il existe).
+
+    Returns:
+        int: Taille de l'instantané, en octets.
+    """
+    source = _sqlite_connection()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    part = path.with_name(f"{path.name}.part")
+    target = sqlite3.connect(part)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+    part.replace(path)
+    return path.stat().st_size
+
+
+def restore_database(path: Path) -> None:
+    """Remplace la base courante par un instantané.
+
+    L'instantané doit provenir du même schéma (mêmes migrations). Les
+    connexions du processus sont fermées avant et après la copie, pour
+    qu'aucune ne garde l'état de l'ancienne base. Les données dérivées sont
+    ensuite invalidées comme après un rechargement : caches du processus
+    vidés, versions restaurées, plus anciennes, dépassées et curseurs du
+    journal distribués depuis l'instantané refusés. Un serveur en cours
+    d'exécution ne voit les nouvelles versions qu'après
+    ``MEDICAL_VERSION_TTL`` : l'arrêter pendant la restauration.
+
+    Args:
+        path: Fichier de l'instantané.
+
+    Raises:
+        FileNotFoundError: Si l'instantané n'existe pas.
+        TransactionManagementError: Si une transaction est en cours.
+    """
+    if not path.is_file():
+        raise FileNotFoundError(path)
+    if connection.in_atomic_block:
+        raise TransactionManagementError("Cannot restore inside a transaction.")
+    head = PrescriptionChangeLog.objects.aggregate(last=Max("seq"))["last"] or 0
+    connections.close_all()
+    target = _sqlite_connection()
+    source = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        source.backup(target)
+    finally:
+        source.close()
+        connections.close_all()
+    data_replaced(after_seq=head)
+
+
+def snapshot_path(name: str) -> Path:
+    """Retourne le fichier d'un instantané nommé de ``MEDICAL_SNAPSHOT_DIR``.
+
+    Args:
+        name: Nom de l'instantané (lettres, chiffres, ``-``, ``_``, ``.``).
+
+    Returns:
+        Path: Chemin ``<MEDICAL_SNAPSHOT_DIR>/<name>.sqlite3``.
+
+    Raises:
+        ValueError: Si le nom est vide ou contient un séparateur de chemin.
+    """
+    if not SNAPSHOT_NAME.fullmatch(name):
+        raise ValueError(f"Invalid snapshot name: {name!r}")
+    return Path(settings.MEDICAL_SNAPSHOT_DIR) / f"{name}.sqlite3"
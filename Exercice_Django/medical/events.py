@@ -0,0 +1,222 @@
+import asyncio
+import secrets
+import threading
+from collections import deque
+from collections.abc import Iterable
+from typing import Any, NamedTuple
+
+from django.conf import settings
+
+from medical.signals import PrescriptionChange
+
+
+class ChangeEvent(NamedTuple):
+    """Changement de prescription numéroté, diffusé aux abonnés.
+
+    Attributes:
+        seq: Numéro d'ordre dans le processus (strictement croissant).
+        change: Écriture notifiée par ``prescriptions_changed``.
+    """
+
+    seq: int
+    change: PrescriptionChange
+
+    def payload(self) -> dict[str, Any]:
+        """Retourne la représentation JSON de l'événement.
+
+        Returns:
+            dict[str, Any]: ``id``, ``operation``, ``status``, ``patient`` et
+            ``previous_patient`` (patient d'origine si la prescription a changé
+            de patient, sinon ``None``).
+        """
+        return {
+            "id": self.change.id,
+            "operation": self.change.operation,
+            "status": self.change.status,
+            "patient": self.change.patient_id,
+            "previous_patient": self.change.previous_patient_id,
+        }
+
+    def concerns(self, patient_id: int) -> bool:
+        """Indique si l'événement touche les prescriptions d'un patient.
+
+        Args:
+            patient_id: Identifiant du patient.
+
+        Returns:
+            bool: ``True`` si le patient est celui d'avant ou d'après l'écriture.
+        """
+        return patient_id in (self.change.patient_id, self.change.previous_patient_id)
+
+
+class Subscription:
+    """File d'événements d'un abonné, consommée dans sa boucle asyncio.
+
+    Si l'abonné ne consomme pas assez vite, la file déborde : les événements
+    en attente sont abandonnés et ``overflowed`` passe à ``True`` pour que le
+    client recharge ses données.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int) -> None:
+        """Crée une file vide rattachée à ``loop``.
+
+        Args:
+            loop: Boucle d'événements de l'abonné.
+            maxsize: Nombre maximal d'événements en attente.
+        """
+        self.loop = loop
+        self.queue: asyncio.Queue[ChangeEvent] = asyncio.Queue(maxsize)
+        self.overflowed = False
+
+    def push(self, event: ChangeEvent) -> None:
+        """Ajoute un événement (appelé dans la boucle de l'abonné).
+
+        Args:
+            event: Événement à transmettre.
+        """
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+
+    async def get(self, timeout: float) -> ChangeEvent | None:
+        """Attend le prochain événement.
+
+        Args:
+            timeout: Attente maximale, en secondes.
+
+        Returns:
+            ChangeEvent | None: L'événement, ou ``None`` à l'expiration du délai.
+        """
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except TimeoutError:
+            return None
+
+
+class ChangeBroadcaster:
+    """Diffuse les changements de prescriptions aux abonnés du processus.
+
+    ``publish`` peut être appelé depuis n'importe quel thread (thread de
+    l'ORM, worker WSGI) : les événements sont remis dans la boucle asyncio de
+    chaque abonné via ``call_soon_threadsafe``. Les derniers événements sont
+    conservés pour qu'un client reconnecté reprenne là où il s'était arrêté
+    (``Last-Event-ID``). Les identifiants sont préfixés par une époque tirée
+    au démarrage : un identifiant d'un autre processus, ou trop ancien,
+    impose un rechargement complet.
+
+    La diffusion est locale au processus : avec plusieurs workers, un client
+    ne reçoit que les écritures traitées par le worker qui le sert.
+    """
+
+    def __init__(self, history: int = 1000, queue_size: int = 1000) -> None:
+        """Initialise un diffuseur sans abonné.
+
+        Args:
+            history: Nombre d'événements conservés pour la reprise.
+            queue_size: Taille maximale de la file de chaque abonné.
+        """
+        self.epoch = secrets.token_hex(4)
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._history: deque[ChangeEvent] = deque(maxlen=history)
+        self._subscribers: set[Subscription] = set()
+
+    def event_id(self, event: ChangeEvent) -> str:
+        """Retourne l'identifiant SSE d'un événement.
+
+        Args:
+            event: Événement diffusé.
+
+        Returns:
+            str: ``<époque>-<seq>``.
+        """
+        return f"{self.epoch}-{event.seq}"
+
+    def publish(self, changes: Iterable[PrescriptionChange]) -> list[ChangeEvent]:
+        """Numérote et diffuse des changements.
+
+        Args:
+            changes: Écritures à diffuser.
+
+        Returns:
+            list[ChangeEvent]: Événements créés.
+        """
+        with self._lock:
+            events = []
+            for change in changes:
+                self._seq += 1
+                events.append(ChangeEvent(self._seq, change))
+            self._history.extend(events)
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            for event in events:
+                try:
+                    subscription.loop.call_soon_threadsafe(subscription.push, event)
+                except RuntimeError:
+                    # Boucle fermée : l'abonné a disparu sans se désinscrire.
+                    self.unsubscribe(subscription)
+                    break
+        return events
+
+    def subscribe(
+        self, last_event_id: str | None = None
+    ) -> tuple[Subscription, list[ChangeEvent] | None]:
+        """Inscrit un abonné dans la boucle asyncio courante.
+
+        Args:
+            last_event_id: Dernier identifiant reçu par le client, s'il reprend.
+
+        Returns:
+            tuple[Subscription, list[ChangeEvent] | None]: L'abonnement et les
+            événements manqués, ou ``None`` si la reprise est impossible.
+        """
+        subscription = Subscription(asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscribers.add(subscription)
+            replay = self._replay(last_event_id)
+        return subscription, replay
+
+    def _replay(self, last_event_id: str | None) -> list[ChangeEvent] | None:
+        """Retourne les événements postérieurs à ``last_event_id`` (verrou tenu).
+
+        Args:
+            last_event_id: Dernier identifiant reçu par le client.
+
+        Returns:
+            list[ChangeEvent] | None: Événements manqués, ou ``None`` si
+            l'identifiant est inconnu ou sorti de l'historique.
+        """
+        if not last_event_id:
+            return []
+        epoch, _, seq = last_event_id.partition("-")
+        if epoch != self.epoch or not seq.isdigit() or int(seq) > self._seq:
+            return None
+        last = int(seq)
+        oldest = self._history[0].seq if self._history else self._seq + 1
+        if last < oldest - 1:
+            return None
+        return [event for event in self._history if event.seq > last]
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Désinscrit un abonné.
+
+        Args:
+            subscription: Abonnement retourné par ``subscribe``.
+        """
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    @property
+    def subscriber_count(self) -> int:
+        """Nombre d'abonnés inscrits."""
+        return len(self._subscribers)
+
+
+broadcaster = ChangeBroadcaster(
+    history=settings.MEDICAL_EVENTS_HISTORY,
+    queue_size=settings.MEDICAL_EVENTS_QUEUE_SIZE,
+)
@@ -0,0 +1,32 @@
+from medical.exports.columns import PRESCRIPTION_COLUMNS, ExportColumn, export_rows
+from medical.exports.jobs import (
+    delete_export,
+    fail_stale_exports,
+    purge_expired_exports,
+    run_export,
+    submit_export,
+)
+from medical.exports.ranges import RangeNotSatisfiable, parse_range
+from medical.exports.writers import (
+    gzip_stream,
+    iter_csv,
+    iter_parquet,
+    parquet_available,
+)
+
+__all__ = [
+    "ExportColumn",
+    "PRESCRIPTION_COLUMNS",
+    "export_rows",
+    "iter_csv",
+    "iter_parquet",
+    "gzip_stream",
+    "parquet_available",
+    "submit_export",
+    "run_export",
+    "delete_export",
+    "fail_stale_exports",
+    "purge_expired_exports",
+    "parse_range",
+    "RangeNotSatisfiable",
+]
@@ -0,0 +1,98 @@
+from collections.abc import Iterator
+from datetime import datetime
+from typing import Any, NamedTuple
+
+from django.db.models import QuerySet
+
+from medical.models import Prescription
+
+EXPORT_CHUNK_SIZE = 2000
+
+KIND_INT = "int"
+KIND_STR = "str"
+KIND_DATE = "date"
+KIND_DATETIME = "datetime"
+
+
+class ExportColumn(NamedTuple):
+    """Colonne d'un extrait.
+
+    Attributes:
+        name: En-tête de la colonne.
+        lookup: Chemin ORM lu par ``values_list``.
+        kind: Type de la valeur (``int``, ``str``, ``date``, ``datetime``).
+    """
+
+    name: str
+    lookup: str
+    kind: str
+
+
+# Une ligne par prescription, patient et médicament aplatis.
+PRESCRIPTION_COLUMNS: tuple[ExportColumn, ...] = (
+    ExportColumn("id", "id", KIND_INT),
+    ExportColumn("patient_id", "patient_id", KIND_INT),
+    ExportColumn("patient_last_name", "patient__last_name", KIND_STR),
+    ExportColumn("patient_first_name", "patient__first_name", KIND_STR),
+    ExportColumn("patient_birth_date", "patient__birth_date", KIND_DATE),
+    ExportColumn("medication_id", "medication_id", KIND_INT),
+    ExportColumn("medication_code", "medication__code", KIND_STR),
+    ExportColumn("medication_label", "medication__label", KIND_STR),
+    ExportColumn("medication_status", "medication__status", KIND_STR),
+    ExportColumn("start_date", "start_date", KIND_DATE),
+    ExportColumn("end_date", "end_date", KIND_DATE),
+    ExportColumn("status", "status", KIND_STR),
+    ExportColumn("comment", "comment", KIND_STR),
+    ExportColumn("created_at", "created_at", KIND_DATETIME),
+    ExportColumn("updated_at", "updated_at", KIND_DATETIME),
+)
+
+
+def export_rows(
+    queryset: QuerySet[Prescription],
+    columns: tuple[ExportColumn, ...] = PRESCRIPTION_COLUMNS,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> Iterator[tuple[Any, ...]]:
+    """Lit les lignes d'un extrait sans instancier de modèle.
+
+    Les lignes sont lues par paquets de ``chunk_size`` dans l'ordre des
+    identifiants (parcours de la clé primaire).
+
+    Args:
+        queryset: Prescriptions filtrées.
+        columns: Colonnes à lire.
+        chunk_size: Nombre de lignes lues par aller-retour en base.
+
+    Returns:
+        Iterator[tuple[Any, ...]]: Un tuple de valeurs par prescription.
+    """
+    return (
+        queryset.order_by("id")
+        .values_list(*(column.lookup for column in columns))
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def format_datetimes(
+    rows: Iterator[tuple[Any, ...]], columns: tuple[ExportColumn, ...]
+) -> Iterator[tuple[Any, ...]]:
+    """Convertit les horodatages en ISO 8601 (``T`` comme séparateur).
+
+    Args:
+        rows: Lignes lues par ``export_rows``.
+        columns: Colonnes des lignes.
+
+    Yields:
+        tuple[Any, ...]: Lignes dont les ``datetime`` sont des chaînes ISO.
+    """
+    positions = [i for i, column in enumerate(columns) if column.kind == KIND_DATETIME]
+    if not positions:
+        yield from rows
+        return
+    for row in rows:
+        values = list(row)
+        for i in positions:
+            value = values[i]
+            if isinstance(value, datetime):
+                values[i] = value.isoformat()
+        yield tuple(values)
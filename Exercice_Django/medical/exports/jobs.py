@@ -0,0 +1,237 @@
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+from medical.exports.columns import PRESCRIPTION_COLUMNS, export_rows
+from medical.exports.writers import gzip_stream, iter_csv, iter_parquet
+from medical.filters import PrescriptionFilter
+from medical.models import ExportJob, Prescription
+
+# Fréquence (en lignes) de la mise à jour de l'avancement en base.
+PROGRESS_ROWS = 5000
+
+# Message des jobs abandonnés (serveur arrêté pendant l'export).
+STALE_ERROR = "Export interrompu avant la fin (délai dépassé)."
+
+# Extension des fichiers produits, par format demandé.
+FILE_SUFFIXES = {"csv": "csv.gz", "parquet": "parquet"}
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def job_queryset(filters: dict[str, Any]) -> QuerySet[Prescription]:
+    """Construit le queryset d'un job à partir de ses filtres.
+
+    Args:
+        filters: Paramètres de ``PrescriptionFilter``, validés à la soumission.
+
+    Returns:
+        QuerySet[Prescription]: Prescriptions à exporter.
+    """
+    queryset: QuerySet[Prescription] = PrescriptionFilter(
+        data=filters, queryset=Prescription.objects.all()
+    ).qs
+    return queryset
+
+
+def submit_export(file_format: str, filters: dict[str, Any]) -> ExportJob:
+    """Crée un job d'export et le confie au pool une fois la transaction validée.
+
+    Les fichiers expirés sont purgés au passage.
+
+    Args:
+        file_format: ``csv`` ou ``parquet``.
+        filters: Paramètres validés de ``PrescriptionFilter``.
+
+    Returns:
+        ExportJob: Job créé, en attente.
+    """
+    purge_expired_exports()
+    job = ExportJob.objects.create(file_format=file_format, filters=filters)
+    transaction.on_commit(partial(_dispatch, job.pk))
+    return job
+
+
+def _dispatch(job_id: Any) -> None:
+    """Confie un job au pool, ou l'exécute immédiatement sans pool."""
+    workers = settings.MEDICAL_EXPORT_WORKERS
+    if workers <= 0:
+        run_export(job_id)
+        return
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="medical-export"
+            )
+    _executor.submit(_run_in_worker, job_id)
+
+
+def _run_in_worker(job_id: Any) -> None:
+    """Exécute un job dans un thread du pool puis ferme ses connexions."""
+    try:
+        run_export(job_id)
+    finally:
+        connections.close_all()
+
+
+class _Progress:
+    """Itérateur de lignes qui publie régulièrement leur nombre sur le job."""
+
+    def __init__(self, job_id: Any, rows: Iterator[tuple[Any, ...]]) -> None:
+        """Enveloppe ``rows``.
+
+        Args:
+            job_id: Identifiant du job à tenir à jour.
+            rows: Lignes lues par ``export_rows``.
+        """
+        self.job_id = job_id
+        self.rows = rows
+        self.written = 0
+
+    def __iter__(self) -> Iterator[tuple[Any, ...]]:
+        """Produit les lignes en comptant celles consommées."""
+        for row in self.rows:
+            yield row
+            self.written += 1
+            if self.written % PROGRESS_ROWS == 0:
+                ExportJob.objects.filter(pk=self.job_id).update(
+                    rows_written=self.written, progressed_at=timezone.now()
+                )
+
+
+def run_export(job_id: Any) -> None:
+    """Exécute un job d'export en attente.
+
+    Le job est réservé par une mise à jour conditionnelle (un seul worker le
+    traite). Les lignes sont écrites par blocs dans un fichier ``.part``,
+    renommé une fois complet : un fichier visible est toujours entier. Le CSV
+    est stocké compressé en gzip. En cas d'erreur, le job passe en échec avec
+    le message de l'exception.
+
+    Args:
+        job_id: Identifiant du job.
+    """
+    claimed = ExportJob.objects.filter(
+        pk=job_id, status=ExportJob.STATUS_PENDING
+    ).update(
+        status=ExportJob.STATUS_RUNNING,
+        started_at=timezone.now(),
+        progressed_at=timezone.now(),
+    )
+    if not claimed:
+        return
+    job = ExportJob.objects.get(pk=job_id)
+    directory = Path(settings.MEDICAL_EXPORT_DIR)
+    file_name = f"{job.pk.hex}.{FILE_SUFFIXES[job.file_format]}"
+    part = directory / f"{file_name}.part"
+    try:
+        queryset = job_queryset(job.filters)
+        ExportJob.objects.filter(pk=job_id).update(
+            total_rows=queryset.count(), progressed_at=timezone.now()
+        )
+        rows = _Progress(job_id, export_rows(queryset))
+        if job.file_format == "parquet":
+            chunks = iter_parquet(iter(rows), PRESCRIPTION_COLUMNS)
+        else:
+            chunks = gzip_stream(iter_csv(iter(rows), PRESCRIPTION_COLUMNS))
+        directory.mkdir(parents=True, exist_ok=True)
+        with part.open("wb") as file:
+            for chunk in chunks:
+                file.write(chunk)
+        path = part.replace(directory / file_name)
+    except Exception as exc:
+        part.unlink(missing_ok=True)
+        now = timezone.now()
+        ExportJob.objects.filter(pk=job_id, status=ExportJob.STATUS_RUNNING).update(
+            status=ExportJob.STATUS_FAILED,
+            error=str(exc) or type(exc).__name__,
+            finished_at=now,
+            expires_at=now + timedelta(seconds=settings.MEDICAL_EXPORT_TTL),
+        )
+        return
+    now = timezone.now()
+    updated = ExportJob.objects.filter(
+        pk=job_id, status=ExportJob.STATUS_RUNNING
+    ).update(
+        status=ExportJob.STATUS_DONE,
+        rows_written=rows.written,
+        size=path.stat().st_size,
+        file_name=file_name,
+        finished_at=now,
+        expires_at=now + timedelta(seconds=settings.MEDICAL_EXPORT_TTL),
+    )
+    if not updated:
+        # Job supprimé ou déclaré abandonné pendant l'écriture : le fichier n'a
+        # plus de propriétaire.
+        path.unlink(missing_ok=True)
+
+
+def delete_export(job: ExportJob) -> None:
+    """Supprime un job et son fichier.
+
+    Args:
+        job: Job à supprimer.
+    """
+    if job.path is not None:
+        job.path.unlink(missing_ok=True)
+    job.delete()
+
+
+def fail_stale_exports() -> int:
+    """Passe en échec les jobs restés en attente ou en cours trop longtemps.
+
+    Un job interrompu par l'arrêt du serveur n'est jamais repris et n'a pas
+    d'expiration : s'il n'a pas progressé (``progressed_at``, renseigné à la
+    soumission, au démarrage puis tous les ``PROGRESS_ROWS`` lignes) depuis
+    ``MEDICAL_EXPORT_TIMEOUT``, il est marqué en échec avec une expiration et
+    son fichier ``.part`` supprimé. Un long export qui avance n'est pas touché.
+
+    Returns:
+        int: Nombre de jobs passés en échec.
+    """
+    now = timezone.now()
+    stale = Q(
+        status__in=(ExportJob.STATUS_PENDING, ExportJob.STATUS_RUNNING),
+        progressed_at__lt=now - timedelta(seconds=settings.MEDICAL_EXPORT_TIMEOUT),
+    )
+    directory = Path(settings.MEDICAL_EXPORT_DIR)
+    failed = 0
+    for job in ExportJob.objects.filter(stale):
+        # Le filtre est repris : un job qui a progressé entre-temps est épargné.
+        if ExportJob.objects.filter(stale, pk=job.pk).update(
+            status=ExportJob.STATUS_FAILED,
+            error=STALE_ERROR,
+            finished_at=now,
+            expires_at=now + timedelta(seconds=settings.MEDICAL_EXPORT_TTL),
+        ):
+            failed += 1
+            part = directory / f"{job.pk.hex}.{FILE_SUFFIXES[job.file_format]}.part"
+            part.unlink(missing_ok=True)
+    return failed
+
+
+def purge_expired_exports() -> int:
+    """Supprime les jobs expirés et leurs fichiers.
+
+    Les jobs abandonnés sont d'abord passés en échec (``fail_stale_exports``)
+    pour expirer à leur tour.
+
+    Returns:
+        int: Nombre de jobs supprimés.
+    """
+    fail_stale_exports()
+    expired = list(ExportJob.objects.filter(expires_at__lt=timezone.now()))
+    for job in expired:
+        delete_export(job)
+    return len(expired)
@@ -0,0 +1,42 @@
+import re
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(Exception):
+    """La plage demandée ne recouvre aucun octet du fichier (réponse 416)."""
+
+
+def parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """Interprète un en-tête ``Range`` portant sur une seule plage d'octets.
+
+    Les formes ``bytes=a-b``, ``bytes=a-`` et ``bytes=-n`` (derniers ``n``
+    octets) sont acceptées. Un en-tête absent, mal formé ou multi-plages est
+    ignoré, comme le permet la RFC 9110 : le fichier est alors servi en entier.
+
+    Args:
+        header: Valeur de l'en-tête ``Range``.
+        size: Taille du fichier, en octets.
+
+    Returns:
+        tuple[int, int] | None: Premier et dernier octets (inclus), ou ``None``.
+
+    Raises:
+        RangeNotSatisfiable: Si la plage commence au-delà du fichier.
+    """
+    match = _RANGE.match((header or "").strip())
+    if match is None or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if not first:
+        length = int(last)
+        if not length or not size:
+            raise RangeNotSatisfiable
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable
+    return start, end
@@ -0,0 +1,150 @@
+import csv
+import importlib.util
+import io
+import zlib
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from typing import Any
+
+from medical.exports.columns import (
+    KIND_DATE,
+    KIND_DATETIME,
+    KIND_INT,
+    KIND_STR,
+    ExportColumn,
+    format_datetimes,
+)
+
+CSV_FLUSH_ROWS = 2000
+PARQUET_ROW_GROUP_SIZE = 20_000
+GZIP_LEVEL = 6
+
+
+def iter_csv(
+    rows: Iterator[tuple[Any, ...]], columns: tuple[ExportColumn, ...]
+) -> Iterator[bytes]:
+    """Encode des lignes en CSV (UTF-8, en-tête inclus), par blocs.
+
+    Args:
+        rows: Lignes lues par ``export_rows``.
+        columns: Colonnes des lignes.
+
+    Yields:
+        bytes: Blocs de ``CSV_FLUSH_ROWS`` lignes au plus.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow([column.name for column in columns])
+    rows = format_datetimes(rows, columns)
+    while True:
+        chunk = list(islice(rows, CSV_FLUSH_ROWS))
+        writer.writerows(chunk)
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+        if len(chunk) < CSV_FLUSH_ROWS:
+            return
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def gzip_stream(chunks: Iterable[bytes], level: int = GZIP_LEVEL) -> Iterator[bytes]:
+    """Compresse un flux d'octets en gzip au fil de l'eau.
+
+    Args:
+        chunks: Blocs à compresser.
+        level: Niveau de compression zlib.
+
+    Yields:
+        bytes: Blocs du fichier gzip.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def parquet_available() -> bool:
+    """Indique si ``pyarrow`` (dépendance optionnelle) est installé."""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+class _Sink(io.RawIOBase):
+    """Fichier en écriture seule qui accumule les octets jusqu'à leur envoi."""
+
+    def __init__(self) -> None:
+        """Initialise un tampon vide."""
+        super().__init__()
+        self._parts: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        """Le tampon accepte les écritures."""
+        return True
+
+    def write(self, data: Any) -> int:
+        """Ajoute ``data`` au tampon.
+
+        Args:
+            data: Octets écrits par ``pyarrow``.
+
+        Returns:
+            int: Nombre d'octets écrits.
+        """
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        """Retourne le nombre total d'octets écrits."""
+        return self._position
+
+    def drain(self) -> bytes:
+        """Retourne et oublie les octets écrits depuis le dernier appel."""
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def iter_parquet(
+    rows: Iterator[tuple[Any, ...]],
+    columns: tuple[ExportColumn, ...],
+    row_group_size: int | None = None,
+) -> Iterator[bytes]:
+    """Encode des lignes en Parquet, un groupe de lignes à la fois.
+
+    Chaque groupe est converti en colonnes Arrow puis écrit et envoyé avant
+    la lecture du suivant ; le pied de fichier est envoyé en dernier.
+
+    Args:
+        rows: Lignes lues par ``export_rows``.
+        columns: Colonnes des lignes.
+        row_group_size: Nombre de lignes par groupe (``PARQUET_ROW_GROUP_SIZE``
+            par défaut).
+
+    Yields:
+        bytes: Blocs du fichier Parquet.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {
+        KIND_INT: pa.int64(),
+        KIND_STR: pa.string(),
+        KIND_DATE: pa.date32(),
+        KIND_DATETIME: pa.timestamp("us", tz="UTC"),
+    }
+    schema = pa.schema([(column.name, types[column.kind]) for column in columns])
+    size = row_group_size or PARQUET_ROW_GROUP_SIZE
+    sink = _Sink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        while chunk := list(islice(rows, size)):
+            arrays = [
+                pa.array(values, type=field.type)
+                for values, field in zip(zip(*chunk), schema)
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
@@ -0,0 +1,35 @@
+from medical.fhir.bulk import export_bulk, id_ranges, iter_ndjson, iter_resources
+from medical.fhir.ingest import (
+    IngestReport,
+    Rejection,
+    ingest_medication_requests,
+    to_prescription,
+)
+from medical.fhir.resources import (
+    MEDICATION_CODE_SYSTEM,
+    RESOURCE_TYPES,
+    ResourceType,
+    medication_request_resource,
+    medication_resource,
+    patient_resource,
+)
+from medical.fhir.streams import iter_bundle_resources, iter_ndjson_resources
+
+__all__ = [
+    "MEDICATION_CODE_SYSTEM",
+    "RESOURCE_TYPES",
+    "ResourceType",
+    "patient_resource",
+    "medication_resource",
+    "medication_request_resource",
+    "id_ranges",
+    "iter_resources",
+    "iter_ndjson",
+    "export_bulk",
+    "iter_bundle_resources",
+    "iter_ndjson_resources",
+    "ingest_medication_requests",
+    "to_prescription",
+    "IngestReport",
+    "Rejection",
+]
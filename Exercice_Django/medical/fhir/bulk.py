@@ -0,0 +1,186 @@
+import json
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+from django.db import connections
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from medical.fhir.resources import RESOURCE_TYPES, ResourceType
+
+# Nombre de ressources par fichier NDJSON (plage d'identifiants).
+BULK_CHUNK_SIZE = 100_000
+# Lignes lues par aller-retour en base et encodées par bloc.
+NDJSON_BATCH_SIZE = 2000
+
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+# Plage à écrire : type de ressource, bornes ``[début, fin[`` et fichier.
+_Task = tuple[ResourceType, tuple[int, int], Path]
+
+
+def id_ranges(
+    resource_type: ResourceType,
+    chunk_size: int = BULK_CHUNK_SIZE,
+    since: datetime | None = None,
+) -> list[tuple[int, int]]:
+    """Découpe la table d'un type de ressource en plages d'identifiants.
+
+    Les plages sont calculées sur ``[min(id), max(id)]`` : une table aux
+    identifiants clairsemés donne des plages moins remplies, jamais plus.
+
+    Args:
+        resource_type: Type de ressource.
+        chunk_size: Largeur des plages.
+        since: Ne retenir que les lignes modifiées depuis cette date.
+
+    Returns:
+        list[tuple[int, int]]: Bornes ``[début, fin[`` des plages.
+    """
+    queryset = resource_type.model._default_manager.all()
+    if since is not None:
+        queryset = queryset.filter(updated_at__gte=since)
+    bounds = queryset.aggregate(first=Min("id"), last=Max("id"))
+    if bounds["first"] is None:
+        return []
+    return [
+        (start, min(start + chunk_size, bounds["last"] + 1))
+        for start in range(bounds["first"], bounds["last"] + 1, chunk_size)
+    ]
+
+
+def iter_resources(
+    resource_type: ResourceType,
+    id_range: tuple[int, int] | None = None,
+    since: datetime | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Lit les ressources d'un type, sans instancier de modèle.
+
+    Args:
+        resource_type: Type de ressource.
+        id_range: Bornes ``[début, fin[`` des identifiants, ou toute la table.
+        since: Ne retenir que les lignes modifiées depuis cette date.
+
+    Yields:
+        dict[str, Any]: Ressources FHIR, dans l'ordre des identifiants.
+    """
+    queryset = resource_type.model._default_manager.order_by("id")
+    if id_range is not None:
+        queryset = queryset.filter(id__gte=id_range[0], id__lt=id_range[1])
+    if since is not None:
+        queryset = queryset.filter(updated_at__gte=since)
+    build = resource_type.build
+    for row in queryset.values_list(*resource_type.fields).iterator(
+        chunk_size=NDJSON_BATCH_SIZE
+    ):
+        yield build(row)
+
+
+def iter_ndjson(resources: Iterable[dict[str, Any]]) -> Iterator[bytes]:
+    """Encode des ressources en NDJSON (une ressource JSON par ligne).
+
+    La mémoire consommée est bornée par un bloc de ``NDJSON_BATCH_SIZE``
+    lignes, quelle que soit la taille de l'extrait.
+
+    Args:
+        resources: Ressources FHIR.
+
+    Yields:
+        bytes: Blocs de lignes UTF-8 terminées par ``\\n``.
+    """
+    resources = iter(resources)
+    encode = _encoder.encode
+    while True:
+        batch = list(islice(resources, NDJSON_BATCH_SIZE))
+        if not batch:
+            return
+        yield "".join(encode(resource) + "\n" for resource in batch).encode()
+
+
+def _write_chunk(
+    resource_type: ResourceType,
+    id_range: tuple[int, int],
+    path: Path,
+    since: datetime | None,
+) -> int:
+    """Écrit une plage d'identifiants dans un fichier NDJSON.
+
+    Returns:
+        int: Nombre de ressources écrites.
+    """
+    count = 0
+
+    def counted() -> Iterator[dict[str, Any]]:
+        nonlocal count
+        for resource in iter_resources(resource_type, id_range, since):
+            count += 1
+            yield resource
+
+    with path.open("wb") as file:
+        for block in iter_ndjson(counted()):
+            file.write(block)
+    if not count:
+        path.unlink()
+    return count
+
+
+def _write_chunk_in_worker(task: _Task, since: datetime | None) -> int:
+    """Écrit une plage dans un thread du pool puis ferme ses connexions."""
+    try:
+        return _write_chunk(*task, since=since)
+    finally:
+        connections.close_all()
+
+
+def export_bulk(
+    directory: Path,
+    types: Sequence[str] = tuple(RESOURCE_TYPES),
+    chunk_size: int = BULK_CHUNK_SIZE,
+    workers: int = 4,
+    since: datetime | None = None,
+) -> dict[str, Any]:
+    """Exporte des ressources FHIR en fichiers NDJSON, à la manière de ``$export``.
+
+    Chaque type est découpé en plages d'identifiants écrites en parallèle,
+    un fichier ``<Type>.<n>.ndjson`` par plage non vide. Le manifeste
+    retourné suit le format de réponse de FHIR Bulk Data (``output``).
+
+    Args:
+        directory: Répertoire de sortie (créé au besoin).
+        types: Types de ressources à exporter.
+        chunk_size: Largeur des plages d'identifiants.
+        workers: Nombre de threads d'écriture (``1`` : dans le thread appelant).
+        since: Ne retenir que les ressources modifiées depuis cette date.
+
+    Returns:
+        dict[str, Any]: Manifeste (``transactionTime``, ``output``).
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    transaction_time = timezone.now()
+    tasks: list[_Task] = []
+    for name in types:
+        resource_type = RESOURCE_TYPES[name]
+        for n, id_range in enumerate(id_ranges(resource_type, chunk_size, since)):
+            tasks.append(
+                (resource_type, id_range, directory / f"{name}.{n:04d}.ndjson")
+            )
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            counts = list(pool.map(partial(_write_chunk_in_worker, since=since), tasks))
+    else:
+        counts = [_write_chunk(*task, since=since) for task in tasks]
+    return {
+        "transactionTime": transaction_time.isoformat(),
+        "requiresAccessToken": False,
+        "output": [
+            {"type": resource_type.name, "url": path.name, "count": count}
+            for (resource_type, _, path), count in zip(tasks, counts)
+            if count
+        ],
+        "error": [],
+    }
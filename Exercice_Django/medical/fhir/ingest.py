@@ -0,0 +1,281 @@
+import hashlib
+import json
+import time
+from collections.abc import Callable, Iterable, Iterator
+from datetime import date
+from itertools import islice
+from typing import Any, NamedTuple
+
+from django.db import transaction
+
+from medical.cache.catalog import MedicationCatalog, get_catalog
+from medical.fhir.resources import MEDICATION_CODE_SYSTEM
+from medical.models import Patient, Prescription
+
+# Ressources traitées par transaction.
+INGEST_CHUNK_SIZE = 1000
+
+# Statuts FHIR R4 de ``MedicationRequest`` vers les statuts des prescriptions.
+PRESCRIPTION_STATUSES_IN = {
+    "active": Prescription.STATUS_VALIDE,
+    "completed": Prescription.STATUS_VALIDE,
+    "draft": Prescription.STATUS_EN_ATTENTE,
+    "on-hold": Prescription.STATUS_EN_ATTENTE,
+    "cancelled": Prescription.STATUS_SUPPR,
+    "stopped": Prescription.STATUS_SUPPR,
+    "entered-in-error": Prescription.STATUS_SUPPR,
+}
+
+# Champs réécrits quand une prescription de même ``external_id`` existe déjà.
+UPSERT_FIELDS = [
+    "patient",
+    "medication",
+    "start_date",
+    "end_date",
+    "status",
+    "comment",
+    "updated_at",
+]
+
+
+class Rejection(NamedTuple):
+    """Ressource écartée par l'ingestion.
+
+    Attributes:
+        position: Rang de la ressource dans le flux (à partir de 1).
+        resource_id: Identifiant de la ressource, s'il est connu.
+        reason: Motif du rejet.
+    """
+
+    position: int
+    resource_id: str | None
+    reason: str
+
+
+class IngestReport:
+    """Bilan d'une ingestion.
+
+    Attributes:
+        read: Ressources lues.
+        upserted: Prescriptions insérées ou mises à jour.
+        skipped: Ressources d'un autre type que ``MedicationRequest``.
+        rejected: Ressources rejetées.
+        elapsed: Durée de l'ingestion, en secondes.
+    """
+
+    def __init__(self) -> None:
+        """Initialise un bilan vide."""
+        self.read = 0
+        self.upserted = 0
+        self.skipped = 0
+        self.rejected = 0
+        self.elapsed = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Ressources lues par seconde."""
+        return self.read / self.elapsed if self.elapsed else 0.0
+
+
+def _reference_id(reference: Any, resource_type: str) -> int | None:
+    """Extrait l'identifiant numérique d'une référence ``<Type>/<id>``."""
+    if not isinstance(reference, dict):
+        return None
+    kind, _, value = str(reference.get("reference", "")).rpartition("/")
+    if kind.rpartition("/")[2] != resource_type or not value.isdigit():
+        return None
+    return int(value)
+
+
+def _medication_id(resource: dict[str, Any], catalog: MedicationCatalog) -> int | None:
+    """Résout le médicament par référence ou par code du catalogue."""
+    pk = _reference_id(resource.get("medicationReference"), "Medication")
+    if pk is not None:
+        medication = catalog.get(pk)
+        return medication.pk if medication is not None else None
+    concept = resource.get("medicationCodeableConcept") or {}
+    for coding in concept.get("coding") or ():
+        if coding.get("system") in (None, MEDICATION_CODE_SYSTEM):
+            medication = catalog.get_by_code(str(coding.get("code")))
+            if medication is not None:
+                return medication.pk
+    return None
+
+
+def _period(resource: dict[str, Any]) -> tuple[date, date]:
+    """Lit ``dosageInstruction[0].timing.repeat.boundsPeriod``.
+
+    Raises:
+        ValueError: Si la période manque ou est invalide.
+    """
+    try:
+        period = resource["dosageInstruction"][0]["timing"]["repeat"]["boundsPeriod"]
+        start = date.fromisoformat(period["start"][:10])
+        end = date.fromisoformat(period["end"][:10])
+    except (KeyError, IndexError, TypeError, ValueError) as exc:
+        raise ValueError("Période de prescription absente ou invalide.") from exc
+    if end < start:
+        raise ValueError("La date de fin précède la date de début.")
+    return start, end
+
+
+def _external_id(resource: dict[str, Any]) -> str:
+    """Retourne la clé d'upsert d'une ressource.
+
+    L'``id`` de la ressource est repris tel quel. À défaut, la clé est dérivée
+    de ses ``identifier`` (système et valeur), stables d'un envoi à l'autre :
+    réimporter le même flux met à jour les mêmes prescriptions.
+
+    Args:
+        resource: Ressource FHIR.
+
+    Returns:
+        str: Valeur de ``external_id``.
+
+    Raises:
+        ValueError: Si la ressource n'a ni ``id`` ni ``identifier``, ou si
+            son ``id`` dépasse 64 caractères.
+    """
+    resource_id = resource.get("id")
+    if resource_id is not None:
+        if len(str(resource_id)) > 64:
+            raise ValueError("Identifiant de plus de 64 caractères.")
+        return str(resource_id)
+    identifiers = sorted(
+        (str(identifier.get("system", "")), str(identifier["value"]))
+        for identifier in resource.get("identifier") or ()
+        if isinstance(identifier, dict) and identifier.get("value") is not None
+    )
+    if not identifiers:
+        raise ValueError("Ressource sans id ni identifier.")
+    digest = hashlib.sha1(json.dumps(identifiers).encode()).hexdigest()
+    return f"identifier:{digest}"
+
+
+def to_prescription(
+    resource: dict[str, Any], patient_ids: set[int], catalog: MedicationCatalog
+) -> Prescription:
+    """Convertit une ressource ``MedicationRequest`` en prescription non enregistrée.
+
+    Args:
+        resource: Ressource FHIR.
+        patient_ids: Patients existants parmi ceux référencés par le lot.
+        catalog: Catalogue des médicaments.
+
+    Returns:
+        Prescription: Prescription à insérer ou mettre à jour.
+
+    Raises:
+        ValueError: Si la ressource ne peut pas être importée.
+    """
+    patient_id = _reference_id(resource.get("subject"), "Patient")
+    if patient_id not in patient_ids:
+        raise ValueError(f"Patient inconnu : {resource.get('subject')}.")
+    medication_id = _medication_id(resource, catalog)
+    if medication_id is None:
+        raise ValueError("Médicament inconnu.")
+    status = PRESCRIPTION_STATUSES_IN.get(resource.get("status", ""))
+    if status is None:
+        raise ValueError(f"Statut non pris en charge : {resource.get('status')}.")
+    start_date, end_date = _period(resource)
+    return Prescription(
+        patient_id=patient_id,
+        medication_id=medication_id,
+        start_date=start_date,
+        end_date=end_date,
+        status=status,
+        comment="\n".join(
+            str(note["text"])
+            for note in resource.get("note") or ()
+            if isinstance(note, dict) and note.get("text")
+        ),
+        external_id=_external_id(resource),
+    )
+
+
+def _chunks(resources: Iterable[Any], size: int) -> Iterator[list[tuple[int, Any]]]:
+    """Découpe le flux en lots numérotés."""
+    numbered = enumerate(resources, 1)
+    while chunk := list(islice(numbered, size)):
+        yield chunk
+
+
+def ingest_medication_requests(
+    resources: Iterable[Any],
+    chunk_size: int = INGEST_CHUNK_SIZE,
+    on_reject: Callable[[Rejection], None] | None = None,
+    on_chunk: Callable[[IngestReport], None] | None = None,
+) -> IngestReport:
+    """Importe des ressources ``MedicationRequest`` en prescriptions.
+
+    Le flux est traité par lots de ``chunk_size`` ressources : les patients
+    référencés sont vérifiés en une requête, les médicaments résolus par le
+    catalogue en mémoire (référence ``Medication/<id>`` ou code), puis les
+    prescriptions sont écrites par un seul ``bulk_create`` par lot, dans une
+    transaction. Une ressource de même ``id`` qu'une prescription déjà
+    importée (``external_id``) la met à jour ; une ressource sans ``id`` est
+    rapprochée par ses ``identifier``. Les autres types de ressources
+    sont ignorés et les ressources invalides rejetées sans interrompre
+    l'import.
+
+    Args:
+        resources: Ressources décodées (dictionnaires).
+        chunk_size: Ressources par lot et par transaction.
+        on_reject: Appelé pour chaque ressource rejetée.
+        on_chunk: Appelé après chaque lot avec le bilan courant.
+
+    Returns:
+        IngestReport: Bilan de l'import.
+    """
+    report = IngestReport()
+    started = time.perf_counter()
+
+    def reject(position: int, resource: Any, reason: str) -> None:
+        report.rejected += 1
+        if on_reject is not None:
+            resource_id = resource.get("id") if isinstance(resource, dict) else None
+            on_reject(Rejection(position, resource_id, reason))
+
+    for chunk in _chunks(resources, chunk_size):
+        report.read += len(chunk)
+        requests = []
+        for position, resource in chunk:
+            if not isinstance(resource, dict):
+                reject(position, None, f"Ressource illisible : {resource}")
+            elif resource.get("resourceType") != "MedicationRequest":
+                report.skipped += 1
+            else:
+                requests.append((position, resource))
+        referenced = {
+            patient_id
+            for _, resource in requests
+            if (patient_id := _reference_id(resource.get("subject"), "Patient"))
+            is not None
+        }
+        patient_ids = set(
+            Patient.objects.filter(id__in=referenced).values_list("id", flat=True)
+        )
+        catalog = get_catalog()
+        prescriptions: dict[str | None, Prescription] = {}
+        for position, resource in requests:
+            try:
+                prescription = to_prescription(resource, patient_ids, catalog)
+            except ValueError as exc:
+                reject(position, resource, str(exc))
+                continue
+            # Une même ressource répétée dans le lot : la dernière version l'emporte.
+            prescriptions[prescription.external_id] = prescription
+        if prescriptions:
+            with transaction.atomic():
+                Prescription.objects.bulk_create(
+                    prescriptions.values(),
+                    update_conflicts=True,
+                    unique_fields=["external_id"],
+                    update_fields=UPSERT_FIELDS,
+                )
+            report.upserted += len(prescriptions)
+        report.elapsed = time.perf_counter() - started
+        if on_chunk is not None:
+            on_chunk(report)
+    report.elapsed = time.perf_counter() - started
+    return report
@@ -0,0 +1,178 @@
+from collections.abc import Callable
+from datetime import date, datetime
+from typing import Any, NamedTuple
+
+from django.db import models
+
+from medical.models import Medication, Patient, Prescription
+
+# Système de codage des médicaments (codes internes du catalogue).
+MEDICATION_CODE_SYSTEM = "urn:cohort360:medication-code"
+
+# Correspondance des statuts avec les jeux de valeurs FHIR R4.
+MEDICATION_STATUSES = {
+    Medication.STATUS_ACTIF: "active",
+    Medication.STATUS_SUPPR: "inactive",
+}
+PRESCRIPTION_STATUSES = {
+    Prescription.STATUS_VALIDE: "active",
+    Prescription.STATUS_EN_ATTENTE: "draft",
+    Prescription.STATUS_SUPPR: "cancelled",
+}
+
+
+class ResourceType(NamedTuple):
+    """Type de ressource FHIR produit à partir d'un modèle.
+
+    Attributes:
+        name: Nom FHIR de la ressource (``resourceType``).
+        model: Modèle source.
+        fields: Champs lus par ``values_list``, dans l'ordre attendu par ``build``.
+        build: Construit la ressource à partir d'une ligne.
+    """
+
+    name: str
+    model: type[models.Model]
+    fields: tuple[str, ...]
+    build: Callable[[tuple[Any, ...]], dict[str, Any]]
+
+
+def _instant(value: datetime) -> str:
+    """Formate un horodatage en ``instant`` FHIR."""
+    return value.isoformat()
+
+
+def _day(value: date | None) -> str | None:
+    """Formate une date en ``date`` FHIR."""
+    return value.isoformat() if value is not None else None
+
+
+def patient_resource(row: tuple[Any, ...]) -> dict[str, Any]:
+    """Construit une ressource ``Patient``.
+
+    Args:
+        row: ``(id, last_name, first_name, birth_date, updated_at)``.
+
+    Returns:
+        dict[str, Any]: Ressource FHIR.
+    """
+    pk, last_name, first_name, birth_date, updated_at = row
+    resource: dict[str, Any] = {
+        "resourceType": "Patient",
+        "id": str(pk),
+        "meta": {"lastUpdated": _instant(updated_at)},
+        "name": [{"family": last_name, "given": [first_name]}],
+    }
+    if birth_date is not None:
+        resource["birthDate"] = _day(birth_date)
+    return resource
+
+
+def medication_resource(row: tuple[Any, ...]) -> dict[str, Any]:
+    """Construit une ressource ``Medication``.
+
+    Args:
+        row: ``(id, code, label, status, updated_at)``.
+
+    Returns:
+        dict[str, Any]: Ressource FHIR.
+    """
+    pk, code, label, status, updated_at = row
+    return {
+        "resourceType": "Medication",
+        "id": str(pk),
+        "meta": {"lastUpdated": _instant(updated_at)},
+        "code": {
+            "coding": [
+                {"system": MEDICATION_CODE_SYSTEM, "code": code, "display": label}
+            ],
+            "text": label,
+        },
+        "status": MEDICATION_STATUSES.get(status, "entered-in-error"),
+    }
+
+
+def medication_request_resource(row: tuple[Any, ...]) -> dict[str, Any]:
+    """Construit une ressource ``MedicationRequest``.
+
+    La période de la prescription est portée par ``dosageInstruction.timing``
+    et le commentaire par ``note``.
+
+    Args:
+        row: ``(id, patient_id, medication_id, start_date, end_date, status,
+            comment, created_at, updated_at)``.
+
+    Returns:
+        dict[str, Any]: Ressource FHIR.
+    """
+    (
+        pk,
+        patient_id,
+        medication_id,
+        start_date,
+        end_date,
+        status,
+        comment,
+        created_at,
+        updated_at,
+    ) = row
+    resource = {
+        "resourceType": "MedicationRequest",
+        "id": str(pk),
+        "meta": {"lastUpdated": _instant(updated_at)},
+        "status": PRESCRIPTION_STATUSES.get(status, "unknown"),
+        "intent": "order",
+        "subject": {"reference": f"Patient/{patient_id}"},
+        "medicationReference": {"reference": f"Medication/{medication_id}"},
+        "authoredOn": _instant(created_at),
+        "dosageInstruction": [
+            {
+                "timing": {
+                    "repeat": {
+                        "boundsPeriod": {
+                            "start": _day(start_date),
+                            "end": _day(end_date),
+                        }
+                    }
+                }
+            }
+        ],
+    }
+    if comment:
+        resource["note"] = [{"text": comment}]
+    return resource
+
+
+RESOURCE_TYPES: dict[str, ResourceType] = {
+    resource_type.name: resource_type
+    for resource_type in (
+        ResourceType(
+            "Patient",
+            Patient,
+            ("id", "last_name", "first_name", "birth_date", "updated_at"),
+            patient_resource,
+        ),
+        ResourceType(
+            "Medication",
+            Medication,
+            ("id", "code", "label", "status", "updated_at"),
+            medication_resource,
+        ),
+        ResourceType(
+            "MedicationRequest",
+            Prescription,
+            (
+                "id",
+                "patient_id",
+                "medication_id",
+                "start_date",
+                "end_date",
+                "status",
+                "comment",
+                "created_at",
+                "updated_at",
+            ),
+            medication_request_resource,
+        ),
+    )
+}
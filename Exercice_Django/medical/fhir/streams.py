@@ -0,0 +1,140 @@
+import json
+from collections.abc import Iterator
+from typing import Any, TextIO
+
+# Caractères lus par appel à ``read`` lors du décodage d'un Bundle.
+READ_BLOCK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+class _JsonReader:
+    """Lecteur JSON incrémental d'un document trop gros pour être chargé.
+
+    Le tampon ne conserve que la partie non consommée du texte : la mémoire
+    est bornée par la taille de la plus grande valeur lue d'un bloc.
+    """
+
+    def __init__(self, stream: TextIO, block_size: int = READ_BLOCK_SIZE) -> None:
+        """Initialise le lecteur.
+
+        Args:
+            stream: Flux texte à décoder.
+            block_size: Caractères lus par appel à ``read``.
+        """
+        self.stream = stream
+        self.block_size = block_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        """Ajoute un bloc au tampon ; ``False`` en fin de flux."""
+        if self.eof:
+            return False
+        data = self.stream.read(self.block_size)
+        if not data:
+            self.eof = True
+            return False
+        if self.pos:
+            self.buffer = self.buffer[self.pos :]
+            self.pos = 0
+        self.buffer += data
+        return True
+
+    def peek(self) -> str:
+        """Retourne le prochain caractère significatif sans le consommer."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                raise ValueError("Fin de document JSON inattendue.")
+
+    def expect(self, char: str) -> None:
+        """Consomme ``char`` ou lève ``ValueError``."""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"JSON invalide : « {char} » attendu, « {found} » lu.")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Décode la prochaine valeur JSON, en lisant autant de blocs que nécessaire."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # Un nombre en fin de tampon peut être tronqué.
+            if end == len(self.buffer) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_bundle_resources(
+    stream: TextIO, block_size: int = READ_BLOCK_SIZE
+) -> Iterator[Any]:
+    """Lit les ressources d'un Bundle FHIR sans charger le document.
+
+    Seul le tableau ``entry`` est parcouru élément par élément ; les autres
+    membres de premier niveau sont décodés puis ignorés.
+
+    Args:
+        stream: Flux texte du Bundle.
+        block_size: Caractères lus par appel à ``read``.
+
+    Yields:
+        Any: Membre ``resource`` de chaque entrée (``None`` s'il manque).
+
+    Raises:
+        ValueError: Si le document n'est pas un objet JSON valide.
+    """
+    reader = _JsonReader(stream, block_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key == "entry":
+            reader.expect("[")
+            if reader.peek() == "]":
+                reader.pos += 1
+            else:
+                while True:
+                    entry = reader.value()
+                    yield entry.get("resource") if isinstance(entry, dict) else None
+                    if reader.peek() == "]":
+                        reader.pos += 1
+                        break
+                    reader.expect(",")
+        else:
+            reader.value()
+        if reader.peek() == "}":
+            return
+        reader.expect(",")
+
+
+def iter_ndjson_resources(stream: TextIO) -> Iterator[Any]:
+    """Lit des ressources NDJSON, une par ligne (lignes vides ignorées).
+
+    Args:
+        stream: Flux texte NDJSON.
+
+    Yields:
+        Any: Ressource décodée, ou l'exception ``ValueError`` d'une ligne
+        invalide (pour qu'elle soit rejetée sans interrompre la lecture).
+    """
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as exc:
+            yield exc
@@ -0,0 +1,196 @@
+from functools import partial
+from typing import Any
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from medical.cache.versions import bump_version
+from medical.changelog import record_changes
+from medical.events import broadcaster
+from medical.models import Medication, Patient, Prescription
+from medical.signals import (
+    OPERATION_CREATE,
+    OPERATION_DELETE,
+    OPERATION_UPDATE,
+    PrescriptionChange,
+    hold_changes,
+    prescriptions_changed,
+    release_changes,
+    send_prescription_changes,
+)
+from medical.summaries import (
+    mark_patient_deleting,
+    refresh_patient_summaries,
+    unmark_patient_deleting,
+)
+
+
+@receiver(post_save, sender=Medication)
+@receiver(post_delete, sender=Medication)
+@receiver(post_save, sender=Patient)
+@receiver(post_delete, sender=Patient)
+def table_changed(sender: type[Medication | Patient], **kwargs: Any) -> None:
+    """Incrémente la version de la table après toute écriture unitaire.
+
+    La version de ``medication`` invalide aussi le catalogue des médicaments.
+
+    Args:
+        sender: Classe du modèle modifié.
+        **kwargs: Arguments du signal (non utilisés).
+    """
+    bump_version(sender.__name__.lower())
+
+
+@receiver(post_save, sender=Prescription)
+def prescription_saved(
+    sender: type[Prescription], instance: Prescription, created: bool, **kwargs: Any
+) -> None:
+    """Traduit une sauvegarde unitaire en ``prescriptions_changed``.
+
+    Args:
+        sender: Classe du modèle sauvegardé.
+        instance: Prescription sauvegardée.
+        created: ``True`` pour une insertion.
+        **kwargs: Arguments du signal (non utilisés).
+    """
+    previous = instance._loaded_patient_id
+    instance._loaded_patient_id = instance.patient_id
+    send_prescription_changes(
+        sender,
+        [
+            PrescriptionChange(
+                instance.pk,
+                instance.patient_id,
+                OPERATION_CREATE if created else OPERATION_UPDATE,
+                instance.status,
+                previous if previous not in (None, instance.patient_id) else None,
+            )
+        ],
+    )
+
+
+@receiver(post_delete, sender=Prescription)
+def prescription_deleted(
+    sender: type[Prescription], instance: Prescription, **kwargs: Any
+) -> None:
+    """Traduit une suppression unitaire en ``prescriptions_changed``.
+
+    Args:
+        sender: Classe du modèle supprimé.
+        instance: Prescription supprimée.
+        **kwargs: Arguments du signal (non utilisés).
+    """
+    send_prescription_changes(
+        sender,
+        [PrescriptionChange(instance.pk, instance.patient_id, OPERATION_DELETE, None)],
+    )
+
+
+@receiver(pre_delete, sender=Medication)
+def medication_deleting(
+    sender: type[Medication], instance: Medication, **kwargs: Any
+) -> None:
+    """Regroupe les suppressions de prescriptions en cascade en un seul envoi.
+
+    Args:
+        sender: Classe du modèle supprimé.
+        instance: Médicament en cours de suppression.
+        **kwargs: Arguments du signal (non utilisés).
+    """
+    hold_changes()
+
+
+@receiver(post_delete, sender=Medication)
+def medication_deleted(
+    sender: type[Medication], instance: Medication, **kwargs: Any
+) -> None:
+    """Notifie les prescriptions supprimées en cascade avec le médicament.
+
+    Args:
+        sender: Classe du modèle supprimé.
+        instance: Médicament supprimé.
+        **kwargs: Arguments du signal (non utilisés).
+    """
+    release_changes(Prescription)
+
+
+@receiver(pre_delete, sender=Patient)
+def patient_deleting(sender: type[Patient], instance: Patient, **kwargs: Any) -> None:
+    """Exclut le patient supprimé des recalculs de résumé pendant la cascade.
+
+    Les suppressions de prescriptions en cascade sont regroupées en un seul envoi.
+
+    Args:
+        sender: Classe du modèle supprimé.
+        instance: Patient en cours de suppression.
+        **kwargs: Arguments du signal (non utilisés).
+    """
+    mark_patient_deleting(instance.pk)
+    hold_changes()
+
+
+@receiver(post_delete, sender=Patient)
+def patient_deleted(sender: type[Patient], instance: Patient, **kwargs: Any) -> None:
+    """Notifie la cascade puis réactive les recalculs de résumé du patient.
+
+    Args:
+        sender: Classe du modèle supprimé.
+        instance: Patient supprimé.
+        **kwargs: Arguments du signal (non utilisés).
+    """
+    release_changes(Prescription)
+    unmark_patient_deleting(instance.pk)
+
+
+@receiver(prescriptions_changed)
+def refresh_summaries(
+    sender: Any, changes: list[PrescriptionChange], **kwargs: Any
+) -> None:
+    """Met à jour les résumés des patients touchés par des écritures.
+
+    Args:
+        sender: Modèle à l'origine des écritures.
+        changes: Écritures notifiées.
+        **kwargs: Arguments du signal (non utilisés).
+    """
+    patient_ids = {change.patient_id for change in changes}
+    patient_ids.update(
+        change.previous_patient_id
+        for change in changes
+        if change.previous_patient_id is not None
+    )
+    refresh_patient_summaries(patient_ids)
+
+
+@receiver(prescriptions_changed)
+def bump_prescription_version(
+    sender: Any, changes: list[PrescriptionChange], **kwargs: Any
+) -> None:
+    """Incrémente la version de la table des prescriptions et journalise les écritures.
+
+    Les deux écritures partagent une transaction : le verrou pris sur la
+    version ordonne les ``seq`` du journal comme les validations.
+
+    Args:
+        sender: Modèle à l'origine des écritures.
+        changes: Écritures notifiées.
+        **kwargs: Arguments du signal (non utilisés).
+    """
+    with transaction.atomic():
+        bump_version("prescription")
+        record_changes(changes)
+
+
+@receiver(prescriptions_changed)
+def broadcast_changes(
+    sender: Any, changes: list[PrescriptionChange], **kwargs: Any
+) -> None:
+    """Diffuse les écritures aux clients du flux SSE une fois validées.
+
+    Args:
+        sender: Modèle à l'origine des écritures.
+        changes: Écritures notifiées.
+        **kwargs: Arguments du signal (non utilisés).
+    """
+    transaction.on_commit(partial(broadcaster.publish, changes))
@@ -0,0 +1,536 @@
+import itertools
+import re
+import tempfile
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, NamedTuple
+from urllib.parse import urlencode
+
+from django.apps import apps
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.models import Max, Min, Model
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from django_filters import DateFilter, FilterSet
+
+from medical.datasets import snapshot_database
+from medical.filters import MedicationFilter, PatientFilter, PrescriptionFilter
+from medical.query_stats import fingerprint
+from medical.slow_queries import read_records
+
+# Listes dont les combinaisons de filtres sont rejouées.
+FILTERED_LISTS: tuple[tuple[str, type[FilterSet]], ...] = (
+    ("prescription-list", PrescriptionFilter),
+    ("patient-list", PatientFilter),
+    ("medication-list", MedicationFilter),
+)
+# Une requête n'est améliorée (ou dégradée) qu'au-delà de cet écart relatif.
+NOISE = 0.1
+
+_COLUMN = r'"(\w+)"\."(\w+)"'
+# Comparaisons à un paramètre : les conditions de jointure sont ignorées.
+_EQUALITY = re.compile(_COLUMN + r" (?:= %s|IN \(%s)")
+_RANGE = re.compile(_COLUMN + r" (?:>=|<=|>|<|BETWEEN) %s")
+_ORDER_BY = re.compile(r" ORDER BY (.+?)(?: LIMIT | OFFSET |\)|$)")
+_ORDER_ITEM = re.compile(_COLUMN + r" (ASC|DESC)")
+_SCAN = re.compile(r"\bSCAN (\w+)")
+
+
+class WorkloadQuery(NamedTuple):
+    """Requête rejouée.
+
+    Attributes:
+        label: Origine lisible (route et paramètres, ou empreinte).
+        sql: Requête SQL (paramètres ``%s``).
+        params: Paramètres.
+        weight: Poids dans le bénéfice estimé (nombre d'occurrences).
+    """
+
+    label: str
+    sql: str
+    params: tuple
+    weight: float
+
+
+class Candidate(NamedTuple):
+    """Index candidat, au format de ``Meta.indexes`` (``-`` : ordre décroissant).
+
+    Attributes:
+        table: Table indexée.
+        columns: Colonnes, par exemple ``("status", "-start_date")``.
+    """
+
+    table: str
+    columns: tuple[str, ...]
+
+    @property
+    def name(self) -> str:
+        """Nom de l'index temporaire créé sur la copie."""
+        suffix = "_".join(column.lstrip("-") for column in self.columns)
+        return f"advisor_{self.table}_{suffix}"[:60]
+
+    def ddl(self) -> str:
+        """Retourne l'ordre ``CREATE INDEX``."""
+        columns = ", ".join(
+            f'"{column[1:]}" DESC' if column.startswith("-") else f'"{column}"'
+            for column in self.columns
+        )
+        return f'CREATE INDEX "{self.name}" ON "{self.table}" ({columns})'
+
+    def meta_index(self) -> str:
+        """Retourne la déclaration ``models.Index`` équivalente.
+
+        Les colonnes de clé étrangère (``patient_id``) sont rendues par le
+        nom du champ (``patient``).
+        """
+        model = _model_for(self.table)
+        fields = []
+        for column in self.columns:
+            prefix, name = ("-", column[1:]) if column.startswith("-") else ("", column)
+            if model is not None:
+                name = next(
+                    (
+                        field.name
+                        for field in model._meta.concrete_fields
+                        if field.column == name
+                    ),
+                    name,
+                )
+            fields.append(f'"{prefix}{name}"')
+        owner = model.__name__ if model is not None else self.table
+        return f"{owner}: models.Index(fields=[{', '.join(fields)}])"
+
+
+class Measure(NamedTuple):
+    """Plan et durée d'une requête sur la copie.
+
+    Attributes:
+        seconds: Meilleure durée sur les répétitions.
+        plan: Lignes de ``EXPLAIN QUERY PLAN``.
+    """
+
+    seconds: float
+    plan: tuple[str, ...]
+
+
+class Advice(NamedTuple):
+    """Index candidat évalué.
+
+    Attributes:
+        candidate: Index testé.
+        benefit: Secondes gagnées par exécution du workload (pondérée),
+            régressions déduites.
+        build_seconds: Durée de création de l'index sur la copie.
+        changes: ``(requête, avant, après)`` pour chaque requête dont la
+            durée a changé au-delà du bruit.
+    """
+
+    candidate: Candidate
+    benefit: float
+    build_seconds: float
+    changes: list[tuple[WorkloadQuery, Measure, Measure]]
+
+
+def _model_for(table: str) -> type[Model] | None:
+    """Retourne le modèle de l'application associé à une table."""
+    return next(
+        (
+            model
+            for model in apps.get_app_config("medical").get_models()
+            if model._meta.db_table == table
+        ),
+        None,
+    )
+
+
+def plan_issues(plan: Iterable[str]) -> list[str]:
+    """Relève les parcours complets et tris temporaires d'un plan SQLite.
+
+    Args:
+        plan: Lignes de ``EXPLAIN QUERY PLAN``.
+
+    Returns:
+        list[str]: Lignes ``SCAN ...`` et ``USE TEMP B-TREE ...``.
+    """
+    return [line for line in plan if _SCAN.search(line) or "TEMP B-TREE" in line]
+
+
+def candidate_indexes(sql: str, plan: Iterable[str]) -> list[Candidate]:
+    """Propose des index pour les tables parcourues ou triées d'une requête.
+
+    Pour chaque table concernée : colonnes d'égalité suivies de la première
+    colonne d'intervalle, colonnes d'égalité suivies des colonnes du tri, et
+    chaque colonne filtrée seule. La clé primaire finale est omise (SQLite
+    la range déjà dans chaque index).
+
+    Args:
+        sql: Requête SQL.
+        plan: Plan d'exécution de la requête.
+
+    Returns:
+        list[Candidate]: Index candidats, sans doublon.
+    """
+    plan = list(plan)
+    tables = {match.group(1) for line in plan for match in _SCAN.finditer(line)}
+    order = []
+    clause = _ORDER_BY.search(sql)
+    if clause is not None:
+        order = [
+            (table, f"-{column}" if direction == "DESC" else column)
+            for table, column, direction in _ORDER_ITEM.findall(clause.group(1))
+        ]
+        if any("TEMP B-TREE" in line for line in plan):
+            tables |= {table for table, _ in order}
+    candidates: list[Candidate] = []
+    for table in sorted(tables):
+        equalities = list(
+            dict.fromkeys(c for t, c in _EQUALITY.findall(sql) if t == table)
+        )
+        ranges = list(dict.fromkeys(c for t, c in _RANGE.findall(sql) if t == table))
+        shapes = [equalities + ranges[:1]]
+        if order and all(t == table for t, _ in order):
+            shapes.append(equalities + [column for _, column in order])
+        shapes.extend([column] for column in equalities + ranges)
+        for shape in shapes:
+            columns: list[str] = []
+            for column in shape:
+                if column.lstrip("-") not in {c.lstrip("-") for c in columns}:
+                    columns.append(column)
+            while columns and columns[-1].lstrip("-") == "id":
+                columns.pop()
+            candidate = Candidate(table, tuple(columns))
+            if columns and candidate not in candidates:
+                candidates.append(candidate)
+    return candidates
+
+
+def _sample_data(filterset: type[FilterSet]) -> dict[str, str]:
+    """Choisit une valeur réaliste pour chaque filtre, d'après la base.
+
+    Les dates prennent le milieu de l'intervalle présent en base, les autres
+    filtres la valeur (ou un extrait, pour ``icontains``) de la première
+    ligne.
+    """
+    model = filterset._meta.model
+    first = model._default_manager.order_by("pk").first()
+    data = {}
+    for name, filter_ in filterset.base_filters.items():
+        if first is None:
+            break
+        if filter_.method is not None:
+            pks = model._default_manager.order_by("pk").values_list("pk", flat=True)
+            data[name] = ",".join(str(pk) for pk in pks[:3])
+            continue
+        field = filter_.field_name
+        if isinstance(filter_, DateFilter):
+            bounds = model._default_manager.aggregate(low=Min(field), high=Max(field))
+            if bounds["low"] is not None:
+                data[name] = (
+                    bounds["low"] + (bounds["high"] - bounds["low"]) / 2
+                ).isoformat()
+            continue
+        value = model._default_manager.filter(pk=first.pk).values_list(
+            field, flat=True
+        )[0]
+        if value is not None:
+            text = str(value)
+            data[name] = text[:3] if filter_.lookup_expr == "icontains" else text
+    return data
+
+
+def filter_combinations(filterset: type[FilterSet]) -> list[dict[str, str]]:
+    """Énumère les filtres seuls et par paires (un filtre par champ).
+
+    Args:
+        filterset: FilterSet d'une liste.
+
+    Returns:
+        list[dict[str, str]]: Paramètres de requête, le premier vide (liste
+        non filtrée).
+    """
+    data = _sample_data(filterset)
+    by_field: dict[str, str] = {}
+    for name in data:
+        field = filterset.base_filters[name].field_name
+        # Pour les paires, l'intervalle ouvert (``_gte``) est le plus courant.
+        if field not in by_field or name.endswith("_gte"):
+            by_field[field] = name
+    combinations: list[dict[str, str]] = [{}]
+    combinations += [{name: value} for name, value in data.items()]
+    combinations += [
+        {first: data[first], second: data[second]}
+        for first, second in itertools.combinations(by_field.values(), 2)
+    ]
+    return combinations
+
+
+def filter_workload() -> list[WorkloadQuery]:
+    """Capture les requêtes SQL des listes pour chaque combinaison de filtres.
+
+    Chaque combinaison est demandée à l'API (client de test Django, cache
+    des réponses désactivé) et les ``SELECT`` exécutés sont relevés avec
+    leurs paramètres : le workload est exactement celui des vues.
+
+    Returns:
+        list[WorkloadQuery]: Requêtes distinctes, de poids 1.
+    """
+    client = Client()
+    queries: dict[tuple[str, tuple], WorkloadQuery] = {}
+
+    for route, filterset in FILTERED_LISTS:
+        for params in filter_combinations(filterset):
+            label = f"{route}?{urlencode(params)}" if params else route
+
+            def collect(
+                execute: Callable[..., Any],
+                sql: str,
+                sql_params: Any,
+                many: bool,
+                context: dict[str, Any],
+                label: str = label,
+            ) -> Any:
+                if sql.lstrip().upper().startswith("SELECT"):
+                    key = (sql, tuple(sql_params or ()))
+                    queries.setdefault(key, WorkloadQuery(label, *key, 1.0))
+                return execute(sql, sql_params, many, context)
+
+            # ``connection.execute_wrapper`` retire le dernier wrapper de la
+            # liste, qui peut avoir été ajouté pendant la requête (ouverture
+            # de connexion, premier passage dans les middlewares).
+            connection.execute_wrappers.append(collect)
+            try:
+                with override_settings(MEDICAL_RESPONSE_CACHE_ENABLED=False):
+                    client.get(reverse(route), params)
+            finally:
+                connection.execute_wrappers.remove(collect)
+    return list(queries.values())
+
+
+def recorded_workload() -> list[WorkloadQuery]:
+    """Reprend les ``SELECT`` du journal des requêtes lentes.
+
+    Les requêtes sont regroupées par empreinte ; les paramètres conservés
+    sont ceux de l'occurrence la plus lente, et le poids est le nombre
+    d'occurrences.
+
+    Returns:
+        list[WorkloadQuery]: Une requête par empreinte.
+    """
+    slowest: dict[str, dict[str, Any]] = {}
+    counts: dict[str, int] = {}
+    for record in read_records(include_rotated=True):
+        if record["executions"] != 1 or not record["sql"].lstrip().upper().startswith(
+            "SELECT"
+        ):
+            continue
+        key = fingerprint(record["sql"])
+        counts[key] = counts.get(key, 0) + 1
+        if key not in slowest or record["duration_ms"] > slowest[key]["duration_ms"]:
+            slowest[key] = record
+    return [
+        WorkloadQuery(
+            record["view"] or key[:60],
+            record["sql"],
+            tuple(record["params"] or ()),
+            float(counts[key]),
+        )
+        for key, record in slowest.items()
+    ]
+
+
+@contextmanager
+def scratch_database(path: Path | None = None) -> Iterator[BaseDatabaseWrapper]:
+    """Copie la base (API de sauvegarde SQLite) et ouvre une connexion dessus.
+
+    La connexion n'est pas instrumentée (journal des requêtes lentes,
+    statistiques) : les requêtes de l'évaluation ne polluent pas les
+    mesures du serveur.
+
+    Args:
+        path: Fichier de la copie, conservé ; par défaut un fichier
+            temporaire supprimé à la sortie.
+
+    Yields:
+        BaseDatabaseWrapper: Connexion Django à la copie.
+
+    Raises:
+        NotSupportedError: Si la base n'est pas SQLite.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = path or Path(directory) / "scratch.sqlite3"
+        snapshot_database(path)
+        default = connections[DEFAULT_DB_ALIAS]
+        scratch = type(default)(
+            {**default.settings_dict, "NAME": str(path)}, alias="index_advisor"
+        )
+        scratch.ensure_connection()
+        scratch.execute_wrappers.clear()
+        try:
+            yield scratch
+        finally:
+            scratch.close()
+
+
+def query_plan(scratch: BaseDatabaseWrapper, query: WorkloadQuery) -> tuple[str, ...]:
+    """Retourne les lignes de ``EXPLAIN QUERY PLAN`` d'une requête."""
+    with scratch.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {query.sql}", query.params)
+        return tuple(row[-1] for row in cursor.fetchall())
+
+
+def measure(
+    scratch: BaseDatabaseWrapper, query: WorkloadQuery, repeat: int = 3
+) -> Measure:
+    """Exécute une requête sur la copie et relève son plan.
+
+    Une première exécution, non comptée, charge les pages utiles en cache.
+
+    Args:
+        scratch: Connexion à la copie.
+        query: Requête à mesurer.
+        repeat: Nombre d'exécutions mesurées ; la plus rapide est retenue.
+
+    Returns:
+        Measure: Durée et plan.
+    """
+    best = float("inf")
+    with scratch.cursor() as cursor:
+        for run in range(repeat + 1):
+            started = time.perf_counter()
+            cursor.execute(query.sql, query.params)
+            cursor.fetchall()
+            if run:
+                best = min(best, time.perf_counter() - started)
+    return Measure(best, query_plan(scratch, query))
+
+
+def existing_indexes(scratch: BaseDatabaseWrapper, table: str) -> list[tuple[str, ...]]:
+    """Retourne les colonnes des index d'une table (``-`` : décroissant)."""
+    with scratch.cursor() as cursor:
+        cursor.execute(f'PRAGMA index_list("{table}")')
+        names = [row[1] for row in cursor.fetchall()]
+        indexes = []
+        for name in names:
+            cursor.execute(f'PRAGMA index_xinfo("{name}")')
+            indexes.append(
+                tuple(
+                    f"-{column}" if desc else column
+                    for _, _, column, desc, _, key in cursor.fetchall()
+                    if key and column is not None
+                )
+            )
+    return indexes
+
+
+def _covered(candidate: Candidate, indexes: list[tuple[str, ...]]) -> bool:
+    """Indique si un index existant commence par les colonnes du candidat."""
+    size = len(candidate.columns)
+    return any(index[:size] == candidate.columns for index in indexes)
+
+
+def evaluate(
+    scratch: BaseDatabaseWrapper,
+    candidate: Candidate,
+    current: dict[WorkloadQuery, Measure],
+    repeat: int = 3,
+) -> Advice:
+    """Crée un index sur la copie et mesure son effet sur le workload.
+
+    Seules les requêtes portant sur la table de l'index et dont le plan
+    change sont remesurées : un plan identique donne la même durée.
+
+    Args:
+        scratch: Connexion à la copie.
+        candidate: Index à tester.
+        current: Mesures des requêtes avec les index déjà retenus.
+        repeat: Exécutions par mesure.
+
+    Returns:
+        Advice: Bénéfice pondéré (régressions déduites) et requêtes modifiées.
+    """
+    with scratch.cursor() as cursor:
+        started = time.perf_counter()
+        cursor.execute(candidate.ddl())
+        build = time.perf_counter() - started
+        try:
+            benefit = 0.0
+            changes = []
+            for query, before in current.items():
+                if f'"{candidate.table}"' not in query.sql:
+                    continue
+                if query_plan(scratch, query) == before.plan:
+                    continue
+                after = measure(scratch, query, repeat)
+                if abs(before.seconds - after.seconds) > NOISE * before.seconds:
+                    benefit += query.weight * (before.seconds - after.seconds)
+                    changes.append((query, before, after))
+        finally:
+            cursor.execute(f'DROP INDEX "{candidate.name}"')
+    return Advice(candidate, benefit, build, changes)
+
+
+def advise(
+    workload: list[WorkloadQuery],
+    scratch: BaseDatabaseWrapper,
+    repeat: int = 3,
+    limit: int = 10,
+    min_benefit: float = 0.001,
+) -> tuple[dict[WorkloadQuery, Measure], list[Advice]]:
+    """Choisit des index pour le workload, par sélection gloutonne.
+
+    Les requêtes dont le plan comporte un parcours complet ou un tri
+    temporaire fournissent les candidats. À chaque tour, le candidat au
+    plus fort bénéfice est retenu et conservé sur la copie ; les suivants
+    sont mesurés avec lui, si bien que deux index servant les mêmes
+    requêtes ne sont pas proposés ensemble. Les bénéfices ne pouvant que
+    baisser d'un tour à l'autre, un candidat n'est réévalué que s'il
+    arrive en tête (sélection paresseuse).
+
+    Args:
+        workload: Requêtes à rejouer.
+        scratch: Connexion à la copie de la base.
+        repeat: Exécutions par mesure.
+        limit: Nombre maximal d'index proposés (0 : sans limite).
+        min_benefit: Bénéfice minimal d'un index (secondes par exécution
+            du workload).
+
+    Returns:
+        tuple: Mesures initiales par requête, et index retenus dans l'ordre
+        du choix, chacun avec son bénéfice marginal.
+    """
+    baseline = {query: measure(scratch, query, repeat) for query in workload}
+    current = dict(baseline)
+    candidates: list[Candidate] = []
+    for query, result in baseline.items():
+        if plan_issues(result.plan):
+            for candidate in candidate_indexes(query.sql, result.plan):
+                if candidate not in candidates and not _covered(
+                    candidate, existing_indexes(scratch, candidate.table)
+                ):
+                    candidates.append(candidate)
+    # Conseils en attente, avec le tour de leur dernière évaluation.
+    pending = [
+        (evaluate(scratch, candidate, current, repeat), 0) for candidate in candidates
+    ]
+    chosen: list[Advice] = []
+    while pending and (not limit or len(chosen) < limit):
+        pending.sort(key=lambda item: item[0].benefit, reverse=True)
+        best, evaluated_at = pending.pop(0)
+        if best.benefit < min_benefit:
+            break
+        if evaluated_at < len(chosen):
+            pending.append(
+                (evaluate(scratch, best.candidate, current, repeat), len(chosen))
+            )
+            continue
+        with scratch.cursor() as cursor:
+            cursor.execute(best.candidate.ddl())
+        current.update((query, after) for query, _, after in best.changes)
+        chosen.append(best)
+        indexes = existing_indexes(scratch, best.candidate.table)
+        pending = [item for item in pending if not _covered(item[0].candidate, indexes)]
+    return baseline, chosen
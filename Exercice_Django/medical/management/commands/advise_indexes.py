@@ -0,0 +1,140 @@
+import json
+from pathlib import Path
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import NotSupportedError
+
+from medical.index_advisor import (
+    advise,
+    filter_workload,
+    plan_issues,
+    recorded_workload,
+    scratch_database,
+)
+
+
+class Command(BaseCommand):
+    """Management command proposant des index à partir d'un workload rejoué.
+
+    Le workload est soit l'ensemble des combinaisons de filtres des listes
+    (``PrescriptionFilter``, ``PatientFilter``, ``MedicationFilter``, seuls et
+    par paires), soit les requêtes du journal des requêtes lentes. Les plans
+    sont inspectés sur une copie de la base (parcours complets, tris
+    temporaires), puis chaque index candidat y est créé et mesuré : la base
+    elle-même n'est jamais modifiée. Le bénéfice affiché est le temps gagné
+    par exécution du workload, compte tenu des index proposés avant. À
+    lancer sur une base peuplée (``seed_demo --bulk`` ou ``snapshot_db
+    restore``).
+
+    Example:
+        python manage.py advise_indexes
+        python manage.py advise_indexes --source slow-log --repeat 5 --json
+    """
+
+    help = "Propose indexes by replaying list filters or slow queries on a copy"
+
+    def add_arguments(self, parser: Any) -> None:
+        """Déclare les options de la commande.
+
+        Args:
+            parser: Parseur d'arguments fourni par Django.
+        """
+        parser.add_argument(
+            "--source", choices=["filters", "slow-log"], default="filters"
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=3, help="Runs per measurement (best kept)"
+        )
+        parser.add_argument(
+            "--limit", type=int, default=10, help="Indexes to propose (0: all)"
+        )
+        parser.add_argument(
+            "--min-benefit",
+            type=float,
+            default=1.0,
+            help="Minimum estimated benefit (ms per workload run)",
+        )
+        parser.add_argument(
+            "--scratch",
+            type=Path,
+            help="Keep the scratch copy, with the proposed indexes, at this path",
+        )
+        parser.add_argument("--json", action="store_true", help="Print JSON")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Rejoue le workload, évalue les candidats et affiche les conseils.
+
+        Args:
+            *args: Arguments positionnels (non utilisés).
+            **options: Options de la ligne de commande.
+
+        Raises:
+            CommandError: Workload vide ou base autre que SQLite.
+        """
+        if options["source"] == "filters":
+            workload = filter_workload()
+        else:
+            workload = recorded_workload()
+        if not workload:
+            raise CommandError("No query to replay (empty database or slow log).")
+        try:
+            with scratch_database(options["scratch"]) as scratch:
+                baseline, advice = advise(
+                    workload,
+                    scratch,
+                    repeat=options["repeat"],
+                    limit=options["limit"],
+                    min_benefit=options["min_benefit"] / 1000,
+                )
+        except NotSupportedError as error:
+            raise CommandError(str(error)) from error
+        issues = sum(1 for result in baseline.values() if plan_issues(result.plan))
+        if options["json"]:
+            self.stdout.write(
+                json.dumps(
+                    {
+                        "queries": len(workload),
+                        "with_issues": issues,
+                        "advice": [
+                            {
+                                "table": item.candidate.table,
+                                "columns": list(item.candidate.columns),
+                                "index": item.candidate.meta_index(),
+                                "benefit_ms": round(item.benefit * 1000, 3),
+                                "build_ms": round(item.build_seconds * 1000, 1),
+                                "changes": [
+                                    {
+                                        "query": query.label,
+                                        "before_ms": round(before.seconds * 1000, 3),
+                                        "after_ms": round(after.seconds * 1000, 3),
+                                        "plan": list(after.plan),
+                                    }
+                                    for query, before, after in item.changes
+                                ],
+                            }
+                            for item in advice
+                        ],
+                    }
+                )
+            )
+            return
+        self.stdout.write(
+            f"Replayed {len(workload)} queries ({options['source']}), "
+            f"{issues} with full scans or temporary B-trees."
+        )
+        if not advice:
+            self.stdout.write(self.style.SUCCESS("No index worth adding."))
+        for rank, item in enumerate(advice, start=1):
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{rank}. {item.candidate.meta_index()}  "
+                    f"benefit {item.benefit * 1000:.1f} ms/run, "
+                    f"built in {item.build_seconds * 1000:.0f} ms"
+                )
+            )
+            for query, before, after in item.changes:
+                self.stdout.write(
+                    f"   {before.seconds * 1000:8.2f} -> "
+                    f"{after.seconds * 1000:8.2f} ms  {query.label}"
+                )
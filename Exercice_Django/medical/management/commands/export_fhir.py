@@ -0,0 +1,77 @@
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from medical.fhir import RESOURCE_TYPES, export_bulk
+from medical.fhir.bulk import BULK_CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    """Management command exportant les données en NDJSON FHIR (``$export``).
+
+    Produit des fichiers ``Patient``, ``Medication`` et ``MedicationRequest``
+    découpés par plages d'identifiants et écrits en parallèle, ainsi qu'un
+    manifeste ``manifest.json`` au format FHIR Bulk Data.
+
+    Example:
+        python manage.py export_fhir --output var/fhir
+        python manage.py export_fhir --output var/fhir --type MedicationRequest \\
+            --since 2026-01-01T00:00:00+00:00 --workers 8
+    """
+
+    help = "Export Patient, Medication and MedicationRequest resources as NDJSON"
+
+    def add_arguments(self, parser: Any) -> None:
+        """Déclare les arguments de la commande.
+
+        Args:
+            parser: Parseur d'arguments fourni par Django.
+        """
+        parser.add_argument("--output", type=Path, required=True)
+        parser.add_argument(
+            "--type",
+            action="append",
+            dest="types",
+            choices=sorted(RESOURCE_TYPES),
+            help="Resource type to export (repeatable, all by default)",
+        )
+        parser.add_argument("--chunk-size", type=int, default=BULK_CHUNK_SIZE)
+        parser.add_argument("--workers", type=int, default=4)
+        parser.add_argument("--since", help="ISO 8601 timestamp (FHIR _since)")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Écrit les fichiers NDJSON et le manifeste.
+
+        Args:
+            *args: Arguments positionnels (non utilisés).
+            **options: Options de la ligne de commande.
+
+        Raises:
+            CommandError: Si ``--since`` n'est pas un horodatage ISO 8601.
+        """
+        since = None
+        if options["since"]:
+            since = parse_datetime(options["since"])
+            if since is None:
+                raise CommandError(f"Invalid --since: {options['since']}")
+        started = time.perf_counter()
+        manifest = export_bulk(
+            options["output"],
+            types=options["types"] or tuple(RESOURCE_TYPES),
+            chunk_size=options["chunk_size"],
+            workers=options["workers"],
+            since=since,
+        )
+        (options["output"] / "manifest.json").write_text(json.dumps(manifest, indent=2))
+        elapsed = time.perf_counter() - started
+        total = sum(entry["count"] for entry in manifest["output"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Exported {total} resources in {len(manifest['output'])} files "
+                f"({elapsed:.1f}s, {total / max(elapsed, 1e-9):.0f} resources/s)."
+            )
+        )
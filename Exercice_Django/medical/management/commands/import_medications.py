@@ -0,0 +1,67 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+from medical.catalog_import import CATALOG_BATCH_SIZE, read_catalog_csv, sync_catalog
+
+
+class Command(BaseCommand):
+    """Management command synchronisant les médicaments avec un catalogue CSV.
+
+    Le fichier (colonnes ``code``, ``label`` et ``status`` optionnelle) est
+    lu au fil de l'eau et comparé à la table par ``code`` : seules les
+    insertions et modifications sont écrites. Une réimportation sans
+    changement ne modifie rien.
+
+    Example:
+        python manage.py import_medications catalogue.csv
+        python manage.py import_medications catalogue.csv --retire-missing --dry-run
+    """
+
+    help = "Synchronize medications with a CSV catalog (code,label[,status])"
+
+    def add_arguments(self, parser: Any) -> None:
+        """Déclare les arguments de la commande.
+
+        Args:
+            parser: Parseur d'arguments fourni par Django.
+        """
+        parser.add_argument("path")
+        parser.add_argument("--delimiter", default=",")
+        parser.add_argument("--batch-size", type=int, default=CATALOG_BATCH_SIZE)
+        parser.add_argument(
+            "--retire-missing",
+            action="store_true",
+            help="Set medications absent from the file to 'suppr'",
+        )
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Synchronise le catalogue et affiche le bilan.
+
+        Args:
+            *args: Arguments positionnels (non utilisés).
+            **options: Options de la ligne de commande.
+
+        Raises:
+            CommandError: Si le fichier est introuvable ou invalide.
+        """
+        try:
+            with open(options["path"], encoding="utf-8-sig", newline="") as stream:
+                result = sync_catalog(
+                    read_catalog_csv(stream, options["delimiter"]),
+                    retire_missing=options["retire_missing"],
+                    batch_size=options["batch_size"],
+                    dry_run=options["dry_run"],
+                )
+        except FileNotFoundError as exc:
+            raise CommandError(f"No such file: {options['path']}") from exc
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+        prefix = "Dry run: " if options["dry_run"] else ""
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{prefix}{result.created} created, {result.updated} updated, "
+                f"{result.retired} retired, {result.unchanged} unchanged."
+            )
+        )
@@ -0,0 +1,133 @@
+import gzip
+import json
+import sys
+from contextlib import ExitStack
+from typing import Any, TextIO
+
+from django.core.management.base import BaseCommand, CommandError
+
+from medical.fhir import (
+    IngestReport,
+    Rejection,
+    ingest_medication_requests,
+    iter_bundle_resources,
+    iter_ndjson_resources,
+)
+from medical.fhir.ingest import INGEST_CHUNK_SIZE
+
+FORMAT_BUNDLE = "bundle"
+FORMAT_NDJSON = "ndjson"
+
+
+class Command(BaseCommand):
+    """Management command important des ``MedicationRequest`` FHIR.
+
+    Lit un Bundle JSON ou un fichier NDJSON (éventuellement compressé en
+    ``.gz``, ou ``-`` pour l'entrée standard) au fil de l'eau et écrit les
+    prescriptions par lots transactionnels. Les ressources rejetées peuvent
+    être consignées en NDJSON avec leur motif.
+
+    Example:
+        python manage.py ingest_fhir export/MedicationRequest.ndjson.gz
+        python manage.py ingest_fhir bundle.json --chunk-size 5000 \\
+            --rejects rejects.ndjson -v 2
+    """
+
+    help = "Import FHIR MedicationRequest resources from a Bundle or NDJSON file"
+
+    def add_arguments(self, parser: Any) -> None:
+        """Déclare les arguments de la commande.
+
+        Args:
+            parser: Parseur d'arguments fourni par Django.
+        """
+        parser.add_argument(
+            "path", help="Bundle/NDJSON file, .gz accepted, - for stdin"
+        )
+        parser.add_argument(
+            "--format",
+            dest="input_format",
+            choices=[FORMAT_BUNDLE, FORMAT_NDJSON],
+            help="Input format (guessed from the file name by default)",
+        )
+        parser.add_argument("--chunk-size", type=int, default=INGEST_CHUNK_SIZE)
+        parser.add_argument("--rejects", help="Write rejected resources to this file")
+
+    def open_input(self, path: str) -> TextIO:
+        """Ouvre le fichier d'entrée en texte UTF-8.
+
+        Args:
+            path: Chemin du fichier, ``-`` pour l'entrée standard.
+
+        Returns:
+            TextIO: Flux texte.
+
+        Raises:
+            CommandError: Si le fichier n'existe pas.
+        """
+        if path == "-":
+            return sys.stdin
+        try:
+            if path.endswith(".gz"):
+                return gzip.open(path, "rt", encoding="utf-8")
+            return open(path, encoding="utf-8")
+        except FileNotFoundError as exc:
+            raise CommandError(f"No such file: {path}") from exc
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Importe le fichier et affiche le bilan.
+
+        Args:
+            *args: Arguments positionnels (non utilisés).
+            **options: Options de la ligne de commande.
+        """
+        path = options["path"]
+        input_format = options["input_format"] or (
+            FORMAT_NDJSON
+            if path.removesuffix(".gz").endswith((".ndjson", ".jsonl"))
+            else FORMAT_BUNDLE
+        )
+        with ExitStack() as stack:
+            stream = self.open_input(path)
+            if stream is not sys.stdin:
+                stack.enter_context(stream)
+            rejects = (
+                stack.enter_context(open(options["rejects"], "w", encoding="utf-8"))
+                if options["rejects"]
+                else None
+            )
+            resources = (
+                iter_ndjson_resources(stream)
+                if input_format == FORMAT_NDJSON
+                else iter_bundle_resources(stream)
+            )
+
+            def on_reject(rejection: Rejection) -> None:
+                if rejects is not None:
+                    rejects.write(json.dumps(rejection._asdict()) + "\n")
+                if options["verbosity"] >= 2:
+                    self.stderr.write(
+                        f"Rejected #{rejection.position} "
+                        f"({rejection.resource_id}): {rejection.reason}"
+                    )
+
+            def on_chunk(report: IngestReport) -> None:
+                if options["verbosity"] >= 2:
+                    self.stdout.write(
+                        f"{report.read} read, {report.upserted} upserted, "
+                        f"{report.rejected} rejected ({report.rate:.0f} resources/s)"
+                    )
+
+            try:
+                report = ingest_medication_requests(
+                    resources, options["chunk_size"], on_reject, on_chunk
+                )
+            except ValueError as exc:
+                raise CommandError(f"Invalid {input_format}: {exc}") from exc
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Read {report.read} resources in {report.elapsed:.1f}s "
+                f"({report.rate:.0f} resources/s): {report.upserted} upserted, "
+                f"{report.rejected} rejected, {report.skipped} skipped."
+            )
+        )
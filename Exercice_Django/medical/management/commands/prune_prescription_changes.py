@@ -0,0 +1,38 @@
+from datetime import timedelta
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from medical.changelog import prune_changes
+
+
+class Command(BaseCommand):
+    """Management command purgeant le journal des écritures de prescriptions.
+
+    Les clients dont le curseur précède la purge reçoivent ``reset`` et
+    rechargent la liste complète.
+
+    Example:
+        python manage.py prune_prescription_changes --days 30
+    """
+
+    help = "Delete prescription change log entries older than N days"
+
+    def add_arguments(self, parser: Any) -> None:
+        """Déclare les arguments de la commande.
+
+        Args:
+            parser: Parseur d'arguments fourni par Django.
+        """
+        parser.add_argument("--days", type=int, default=30)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Purge le journal et affiche le nombre d'écritures supprimées.
+
+        Args:
+            *args: Arguments positionnels (non utilisés).
+            **options: Options de la ligne de commande (``days``).
+        """
+        deleted = prune_changes(timezone.now() - timedelta(days=options["days"]))
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} change log entries."))
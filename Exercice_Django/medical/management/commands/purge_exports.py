@@ -0,0 +1,28 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from medical.exports import purge_expired_exports
+
+
+class Command(BaseCommand):
+    """Management command supprimant les exports expirés et leurs fichiers.
+
+    Les exports expirés sont aussi purgés à chaque nouvelle soumission ; la
+    commande permet de le faire périodiquement (cron) sans attendre.
+
+    Example:
+        python manage.py purge_exports
+    """
+
+    help = "Delete expired export jobs and their files"
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Purge les exports expirés et affiche leur nombre.
+
+        Args:
+            *args: Arguments positionnels (non utilisés).
+            **options: Options de la ligne de commande (non utilisées).
+        """
+        deleted = purge_expired_exports()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired exports."))
@@ -0,0 +1,83 @@
+import json
+from datetime import datetime
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from medical.query_stats import SORT_KEYS, collect_stats, reset_stats, top_queries
+
+
+class Command(BaseCommand):
+    """Management command affichant les empreintes SQL les plus coûteuses.
+
+    Les requêtes exécutées sont regroupées par empreinte (littéraux et
+    paramètres retirés) ; les cumuls de tous les processus du serveur
+    (écrits périodiquement dans ``MEDICAL_QUERY_STATS_DIR``) sont additionnés,
+    comme dans ``pg_stat_statements``.
+
+    Example:
+        python manage.py query_stats --limit 10 --sort mean_ms
+        python manage.py query_stats --view prescription-list --by-view
+        python manage.py query_stats --reset
+    """
+
+    help = "Show the top SQL query fingerprints by total, mean or max time"
+
+    def add_arguments(self, parser: Any) -> None:
+        """Déclare les options de la commande.
+
+        Args:
+            parser: Parseur d'arguments fourni par Django.
+        """
+        parser.add_argument(
+            "--limit", type=int, default=20, help="Fingerprints to show (0: all)"
+        )
+        parser.add_argument("--sort", choices=SORT_KEYS, default="total_ms")
+        parser.add_argument("--view", help="Only queries run by this route")
+        parser.add_argument(
+            "--by-view", action="store_true", help="One line per fingerprint and route"
+        )
+        parser.add_argument("--json", action="store_true", help="Print JSON")
+        parser.add_argument(
+            "--reset", action="store_true", help="Reset the statistics of every process"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Affiche le classement ou remet les statistiques à zéro.
+
+        Args:
+            *args: Arguments positionnels (non utilisés).
+            **options: Options de la ligne de commande.
+        """
+        if options["reset"]:
+            reset_stats()
+            self.stdout.write(self.style.SUCCESS("Query statistics reset."))
+            return
+        stats = collect_stats()
+        queries = top_queries(
+            stats["entries"],
+            limit=options["limit"],
+            sort=options["sort"],
+            view=options["view"],
+            by_view=options["by_view"],
+        )
+        if options["json"]:
+            summary = {key: stats[key] for key in ("since", "processes", "dropped")}
+            self.stdout.write(json.dumps({**summary, "queries": queries}))
+            return
+        since = datetime.fromtimestamp(stats["since"]).isoformat(timespec="seconds")
+        self.stdout.write(
+            f"Since {since}, {stats['processes']} process(es), "
+            f"{stats['dropped']} untracked execution(s)."
+        )
+        for query in queries:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{query['id']}  total {query['total_ms']:.1f} ms "
+                    f"({query['share']:.0%})  calls {query['calls']}  "
+                    f"mean {query['mean_ms']:.2f} ms  max {query['max_ms']:.1f} ms  "
+                    f"rows {query['rows']}"
+                    + (f"  {query['view'] or '-'}" if options["by_view"] else "")
+                )
+            )
+            self.stdout.write(f"  {query['query']}")
@@ -0,0 +1,34 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from medical.summaries import SUMMARY_BATCH_SIZE, rebuild_patient_summaries
+
+
+class Command(BaseCommand):
+    """Management command recalculant tous les résumés de prescriptions des patients.
+
+    Example:
+        python manage.py rebuild_prescription_summaries
+        python manage.py rebuild_prescription_summaries --batch-size 2000
+    """
+
+    help = "Rebuild the per-patient prescription summary table"
+
+    def add_arguments(self, parser: Any) -> None:
+        """Déclare les arguments de la commande.
+
+        Args:
+            parser: Parseur d'arguments fourni par Django.
+        """
+        parser.add_argument("--batch-size", type=int, default=SUMMARY_BATCH_SIZE)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Recalcule les résumés et affiche le nombre de lignes écrites.
+
+        Args:
+            *args: Arguments positionnels (non utilisés).
+            **options: Options de la ligne de commande (``batch_size``).
+        """
+        written = rebuild_patient_summaries(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} patient summaries."))
@@ -0,0 +1,43 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from medical.datasets import flush_medical_data
+
+
+class Command(BaseCommand):
+    """Management command vidant les tables métier.
+
+    Patients, médicaments, prescriptions et résumés sont vidés par une
+    requête ensembliste par table, sans charger les lignes ni émettre de
+    signaux ; les identifiants repartent de 1. Les versions des tables sont
+    incrémentées et les curseurs du journal invalidés.
+
+    Example:
+        python manage.py reset_medical_data
+        python manage.py reset_medical_data --keep-sequences
+    """
+
+    help = "Empty the medical tables with set-based statements"
+
+    def add_arguments(self, parser: Any) -> None:
+        """Déclare les arguments de la commande.
+
+        Args:
+            parser: Parseur d'arguments fourni par Django.
+        """
+        parser.add_argument(
+            "--keep-sequences",
+            action="store_true",
+            help="Do not reset primary key sequences",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Vide les tables métier.
+
+        Args:
+            *args: Arguments positionnels (non utilisés).
+            **options: Options de la ligne de commande (``keep_sequences``).
+        """
+        flush_medical_data(reset_sequences=not options["keep_sequences"])
+        self.stdout.write(self.style.SUCCESS("Medical tables emptied."))
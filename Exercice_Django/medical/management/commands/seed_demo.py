@@ -1,237 +1,57 @@
 import random
-import string
-from datetime import date, timedelta
+import time
+from datetime import timedelta
 from typing import Any
 
 from django.core.management.base import BaseCommand
 
+from medical.datasets import flush_medical_data
 from medical.models import Medication, Patient, Prescription
-
-
-def random_date(start_year: int = 1940, end_year: int = 2025) -> date:
-    """Génère une date aléatoire entre start_year et end_year.
-
-    Args:
-        start_year: Année de début (incluse). Par défaut 1940.
-        end_year: Année de fin (incluse). Par défaut 2025.
-
-    Returns:
-        date: Une date aléatoire entre les deux années.
-    """
-    start_dt = date(start_year, 1, 1)
-    end_dt = date(end_year, 12, 31)
-    days = (end_dt - start_dt).days
-    return start_dt + timedelta(days=random.randint(0, days))
+from medical.seeding import (
+    COMMENTS,
+    DOSAGES,
+    FIRST_NAMES,
+    LAST_NAMES,
+    MEDICATION_LABELS,
+    PRESCRIPTION_MAX_DAYS,
+    PRESCRIPTION_MIN_DAYS,
+    PRESCRIPTION_STATUS_WEIGHTS,
+    PRESCRIPTION_STATUSES,
+    SEED_BATCH_SIZE,
+    UNITS,
+    PrescriptionPlan,
+    activity_weights,
+    bulk_medications,
+    bulk_patients,
+    bulk_prescriptions,
+    finish_bulk_seed,
+    medication_codes,
+    random_date,
+    zipf_weights,
+)
 
 
 class Command(BaseCommand):
     """Management command pour peupler la base avec des données de démonstration.
 
+    Par défaut, chaque ligne est créée individuellement (validation et
+    signaux compris). ``--bulk`` insère par lots, sans signaux, puis
+    reconstruit résumés, versions et journal : c'est le mode des grands
+    volumes, où la popularité des médicaments suit une loi de Zipf et le
+    nombre de prescriptions par patient une loi log-normale.
+
+    Les données existantes sont purgées ligne à ligne (signaux compris), ou
+    table par table avec ``--fast-reset``, toujours utilisé en mode massif.
+
     Example:
         python manage.py seed_demo
         python manage.py seed_demo --patients 50 --medications 20 --prescriptions 200
+        python manage.py seed_demo --bulk --seed 42 --patients 1000000 \\
+            --medications 20000 --prescriptions 10000000 --workers 4
     """
 
     help = "Seed the database with demo Patients, Medications, and Prescriptions"
 
-    LAST_NAMES = [
-        "Martin",
-        "Bernard",
-        "Thomas",
-        "Petit",
-        "Robert",
-        "Richard",
-        "Durand",
-        "Dubois",
-        "Moreau",
-        "Laurent",
-        "Michel",
-        "Garcia",
-        "David",
-        "Bertrand",
-        "Roux",
-        "Vincent",
-        "Fournier",
-        "Morel",
-        "Lefebvre",
-        "Mercier",
-        "Dupont",
-        "Lambert",
-        "Bonnet",
-        "Francois",
-        "Martinez",
-        "Legrand",
-        "Garnier",
-        "Faure",
-        "Andre",
-        "Rousseau",
-        "Simon",
-        "Leroy",
-        "Roux",
-        "Girard",
-        "Colin",
-        "Lefevre",
-        "Boyer",
-        "Chevalier",
-        "Robin",
-        "Masson",
-        "Picard",
-        "Blanc",
-        "Gautier",
-        "Nicolas",
-        "Henry",
-        "Perrin",
-        "Morin",
-        "Mathieu",
-        "Clement",
-        "Gauthier",
-        "Dumont",
-        "Lopez",
-        "Fontaine",
-        "Schmitt",
-        "Rodriguez",
-        "Dufour",
-        "Blanchard",
-        "Meunier",
-        "Brunet",
-        "Roy",
-    ]
-
-    FIRST_NAMES = [
-        "Jean",
-        "Jeanne",
-        "Marie",
-        "Luc",
-        "Lucie",
-        "Paul",
-        "Camille",
-        "Pierre",
-        "Sophie",
-        "Emma",
-        "Louis",
-        "Louise",
-        "Alice",
-        "Gabriel",
-        "Jules",
-        "Lucas",
-        "Hugo",
-        "Arthur",
-        "Adam",
-        "Raphael",
-        "Leo",
-        "Nathan",
-        "Tom",
-        "Zoe",
-        "Chloe",
-        "Ines",
-        "Lea",
-        "Lena",
-        "Eva",
-        "Nina",
-        "Ethan",
-        "Noah",
-        "Liam",
-        "Rose",
-        "Anna",
-        "Jade",
-        "Maeva",
-        "Sarah",
-        "Laura",
-        "Clara",
-        "Julie",
-        "Nicolas",
-        "Thomas",
-        "Antoine",
-        "Emilie",
-        "Mathilde",
-        "Charlotte",
-        "Manon",
-        "Julia",
-        "Elise",
-        "Victor",
-        "Alex",
-        "Samuel",
-        "Valentin",
-        "Axel",
-        "Simon",
-        "Romain",
-        "Vincent",
-        "Marc",
-        "David",
-    ]
-
-    MEDICATION_LABELS = [
-        "Paracetamol",
-        "Ibuprofen",
-        "Amoxicillin",
-        "Aspirin",
-        "Omeprazole",
-        "Metformin",
-        "Loratadine",
-        "Cetirizine",
-        "Azithromycin",
-        "Atorvastatin",
-        "Simvastatin",
-        "Lisinopril",
-        "Amlodipine",
-        "Metoprolol",
-        "Sertraline",
-        "Fluoxetine",
-        "Escitalopram",
-        "Gabapentin",
-        "Pregabalin",
-        "Tramadol",
-        "Oxycodone",
-        "Hydrocodone",
-        "Morphine",
-        "Diazepam",
-        "Alprazolam",
-        "Clonazepam",
-        "Zolpidem",
-        "Trazodone",
-        "Cyclobenzaprine",
-        "Meloxicam",
-        "Prednisone",
-        "Methylprednisolone",
-        "Hydrocortisone",
-        "Fluticasone",
-        "Montelukast",
-        "Albuterol",
-        "Fluconazole",
-        "Terbinafine",
-        "Metronidazole",
-        "Ciprofloxacin",
-        "Doxycycline",
-        "Cephalexin",
-        "Nitrofurantoin",
-        "Pantoprazole",
-        "Ranitidine",
-        "Famotidine",
-        "Dicyclomine",
-        "Ondansetron",
-        "Promethazine",
-        "Meclizine",
-    ]
-
-    DOSAGES = [15, 20, 25, 50, 100, 200, 250, 300, 400, 500, 800, 1000]
-    UNITS = ["mg", "g", "µg"]
-    COMMENTS = [
-        "À prendre pendant les repas",
-        "Traitement à suivre rigoureusement",
-        "En cas de douleur",
-        "Renouvellement prévu",
-        "Attention aux effets secondaires",
-        "Dosage à surveiller",
-        "",
-        "",
-        "",
-    ]
-
-    PRESCRIPTION_MIN_DAYS = 1
-    PRESCRIPTION_MAX_DAYS = 180
-    MEDICATION_CODE_MIN = 1000
-    MEDICATION_CODE_MAX = 9999
-
     def add_arguments(self, parser: Any) -> None:
         """Déclare les arguments de la commande.
 
@@ -241,12 +61,41 @@ class Command(BaseCommand):
         parser.add_argument("--patients", type=int, default=10)
         parser.add_argument("--medications", type=int, default=5)
         parser.add_argument("--prescriptions", type=int, default=30)
+        parser.add_argument("--seed", type=int, help="Seed for reproducible data")
+        parser.add_argument(
+            "--bulk", action="store_true", help="Insert in batches, without signals"
+        )
+        parser.add_argument(
+            "--fast-reset",
+            action="store_true",
+            help="Empty the tables with set-based statements and reset ids",
+        )
+        parser.add_argument("--batch-size", type=int, default=SEED_BATCH_SIZE)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Processes inserting prescriptions (bulk mode)",
+        )
+        parser.add_argument(
+            "--zipf",
+            type=float,
+            default=1.0,
+            help="Zipf exponent of medication popularity (bulk mode, 0 = uniform)",
+        )
+        parser.add_argument(
+            "--patient-skew",
+            type=float,
+            default=1.0,
+            help="Log-normal sigma of prescriptions per patient (bulk mode)",
+        )
 
-    def create_patients(self, n_patients: int) -> list[Patient]:
+    def create_patients(self, n_patients: int, rng: random.Random) -> list[Patient]:
         """Crée n patients avec des données aléatoires.
 
         Args:
             n_patients: Nombre de patients à créer.
+            rng: Générateur aléatoire.
 
         Returns:
             Liste des instances ``Patient`` créées en base.
@@ -254,34 +103,33 @@ class Command(BaseCommand):
         created_patients = []
         for _ in range(n_patients):
             patient = Patient.objects.create(
-                last_name=random.choice(self.LAST_NAMES),
-                first_name=random.choice(self.FIRST_NAMES),
-                birth_date=random_date(),
+                last_name=rng.choice(LAST_NAMES),
+                first_name=rng.choice(FIRST_NAMES),
+                birth_date=random_date(rng=rng),
             )
             created_patients.append(patient)
         return created_patients
 
-    def create_medications(self, n_medications: int) -> list[Medication]:
-        """Crée n médicaments avec des données aléatoires.
+    def create_medications(
+        self, n_medications: int, rng: random.Random
+    ) -> list[Medication]:
+        """Crée n médicaments aux codes distincts avec des données aléatoires.
 
         Args:
             n_medications: Nombre de médicaments à créer.
+            rng: Générateur aléatoire.
 
         Returns:
             Liste des instances ``Medication`` créées en base.
         """
         created_medications = []
-        for _ in range(n_medications):
-            code = (
-                f"MED{random.randint(self.MEDICATION_CODE_MIN, self.MEDICATION_CODE_MAX)}"
-                f"{random.choice(string.ascii_uppercase)}"
-            )
+        for code in medication_codes(n_medications, rng):
             label = (
-                f"{random.choice(self.MEDICATION_LABELS)} "
-                f"{random.choice(self.DOSAGES)}"
-                f"{random.choice(self.UNITS)}"
+                f"{rng.choice(MEDICATION_LABELS)} "
+                f"{rng.choice(DOSAGES)}"
+                f"{rng.choice(UNITS)}"
             )
-            status = random.choices(
+            status = rng.choices(
                 [Medication.STATUS_ACTIF, Medication.STATUS_SUPPR],
                 weights=[0.8, 0.2],
             )[0]
@@ -296,6 +144,7 @@ class Command(BaseCommand):
         n_prescriptions: int,
         patients: list[Patient],
         medications: list[Medication],
+        rng: random.Random,
     ) -> list[Prescription]:
         """Crée n prescriptions aléatoires à partir des listes fournies.
 
@@ -303,26 +152,20 @@ class Command(BaseCommand):
             n_prescriptions: Nombre de prescriptions à créer.
             patients: Liste des patients disponibles.
             medications: Liste des médicaments disponibles.
+            rng: Générateur aléatoire.
 
         Returns:
             Liste des instances ``Prescription`` créées en base.
         """
         created_prescriptions = []
         for _ in range(n_prescriptions):
-            patient = random.choice(patients)
-            medication = random.choice(medications)
-            start_date = random_date(start_year=2020, end_year=2026)
-            duration_days = random.randint(
-                self.PRESCRIPTION_MIN_DAYS, self.PRESCRIPTION_MAX_DAYS
-            )
+            patient = rng.choice(patients)
+            medication = rng.choice(medications)
+            start_date = random_date(start_year=2020, end_year=2026, rng=rng)
+            duration_days = rng.randint(PRESCRIPTION_MIN_DAYS, PRESCRIPTION_MAX_DAYS)
             end_date = start_date + timedelta(days=duration_days)
-            status = random.choices(
-                [
-                    Prescription.STATUS_VALIDE,
-                    Prescription.STATUS_EN_ATTENTE,
-                    Prescription.STATUS_SUPPR,
-                ],
-                weights=[0.6, 0.3, 0.1],
+            status = rng.choices(
+                PRESCRIPTION_STATUSES, weights=PRESCRIPTION_STATUS_WEIGHTS
             )[0]
             prescription = Prescription.objects.create(
                 patient=patient,
@@ -330,37 +173,86 @@ class Command(BaseCommand):
                 start_date=start_date,
                 end_date=end_date,
                 status=status,
-                comment=random.choice(self.COMMENTS),
+                comment=rng.choice(COMMENTS),
             )
             created_prescriptions.append(prescription)
         return created_prescriptions
 
+    def seed_bulk(self, rng: random.Random, **options: Any) -> tuple[int, int, int]:
+        """Charge les données par lots (mode ``--bulk``).
+
+        Args:
+            rng: Générateur aléatoire.
+            **options: Options de la ligne de commande.
+
+        Returns:
+            tuple[int, int, int]: Patients, médicaments et prescriptions créés.
+        """
+        batch_size = options["batch_size"]
+        flush_medical_data()
+        started = time.perf_counter()
+        patient_ids = bulk_patients(options["patients"], rng, batch_size)
+        medication_ids = bulk_medications(options["medications"], rng, batch_size)
+        n_prescriptions = (
+            options["prescriptions"] if patient_ids and medication_ids else 0
+        )
+        plan = PrescriptionPlan(
+            rng.randrange(2**32),
+            patient_ids,
+            activity_weights(len(patient_ids), options["patient_skew"], rng),
+            medication_ids,
+            zipf_weights(len(medication_ids), options["zipf"], rng),
+        )
+        created = bulk_prescriptions(
+            n_prescriptions, plan, batch_size, options["workers"]
+        )
+        loaded = time.perf_counter() - started
+        finish_bulk_seed()
+        if options["verbosity"] >= 2:
+            self.stdout.write(
+                f"Loaded in {loaded:.1f}s ({created / max(loaded, 1e-9):.0f} "
+                f"prescriptions/s), derived data rebuilt in "
+                f"{time.perf_counter() - started - loaded:.1f}s."
+            )
+        return len(patient_ids), len(medication_ids), created
+
     def handle(self, *args: Any, **options: Any) -> None:
         """Purge les données existantes puis insère les nouvelles données de démo.
 
         Args:
             *args: Arguments positionnels (non utilisés).
             **options: Options de la ligne de commande
-                (``patients``, ``medications``, ``prescriptions``).
+                (``patients``, ``medications``, ``prescriptions``, ``seed``,
+                ``bulk``, ``fast_reset``, ``batch_size``, ``workers``, ``zipf``, ``patient_skew``).
         """
-        Prescription.objects.all().delete()
-        Patient.objects.all().delete()
-        Medication.objects.all().delete()
-
-        n_patients = options["patients"]
-        n_medications = options["medications"]
-        n_prescriptions = options["prescriptions"]
+        rng = random.Random(options["seed"])
+        if options["bulk"]:
+            n_patients, n_medications, n_prescriptions = self.seed_bulk(rng, **options)
+        else:
+            if options["fast_reset"]:
+                flush_medical_data()
+            else:
+                Prescription.objects.all().delete()
+                Patient.objects.all().delete()
+                Medication.objects.all().delete()
 
-        created_patients = self.create_patients(n_patients)
-        created_medications = self.create_medications(n_medications)
-        created_prescriptions = self.create_prescriptions(
-            n_prescriptions, created_patients, created_medications
-        )
+            created_patients = self.create_patients(options["patients"], rng)
+            created_medications = self.create_medications(options["medications"], rng)
+            n_prescriptions = len(
+                self.create_prescriptions(
+                    options["prescriptions"],
+                    created_patients,
+                    created_medications,
+                    rng,
+                )
+            )
+            n_patients = len(created_patients)
+            n_medications = len(created_medications)
 
         self.stdout.write(
             self.style.SUCCESS(
-                f"Created {len(created_patients)} patients, "
-                f"{len(created_medications)} medications, "
-                f"and {len(created_prescriptions)} prescriptions."
+                f"Created {n_patients} patients, "
+                f"{n_medications} medications, "
+                f"and {n_prescriptions} prescriptions."
             )
         )
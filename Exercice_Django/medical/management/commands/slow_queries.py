@@ -0,0 +1,79 @@
+import json
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from medical.slow_queries import log_path, read_records
+
+
+class Command(BaseCommand):
+    """Management command affichant le journal des requêtes SQL lentes.
+
+    Chaque entrée indique la durée, la route appelante, la requête, ses
+    paramètres et le plan d'exécution capturé après coup. Les entrées sont
+    filtrées par route ou durée minimale, puis triées des plus récentes aux
+    plus anciennes (ou des plus lentes aux plus rapides).
+
+    Example:
+        python manage.py slow_queries --view prescription-list --sort duration
+        python manage.py slow_queries --all --min-ms 500 --json
+    """
+
+    help = "Show the slow SQL query log with captured EXPLAIN plans"
+
+    def add_arguments(self, parser: Any) -> None:
+        """Déclare les options de la commande.
+
+        Args:
+            parser: Parseur d'arguments fourni par Django.
+        """
+        parser.add_argument(
+            "--limit", type=int, default=20, help="Entries to show (0: all)"
+        )
+        parser.add_argument("--view", help="Only queries run by this route")
+        parser.add_argument(
+            "--min-ms", type=float, default=0.0, help="Minimum duration (ms)"
+        )
+        parser.add_argument("--sort", choices=["recent", "duration"], default="recent")
+        parser.add_argument(
+            "--all", action="store_true", help="Include rotated log files"
+        )
+        parser.add_argument("--json", action="store_true", help="Print raw JSON lines")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Affiche les entrées sélectionnées.
+
+        Args:
+            *args: Arguments positionnels (non utilisés).
+            **options: Options de la ligne de commande.
+        """
+        records = [
+            record
+            for record in read_records(include_rotated=options["all"])
+            if record["duration_ms"] >= options["min_ms"]
+            and (options["view"] is None or record["view"] == options["view"])
+        ]
+        records.reverse()
+        if options["sort"] == "duration":
+            records.sort(key=lambda record: record["duration_ms"], reverse=True)
+        if options["limit"]:
+            records = records[: options["limit"]]
+        if not records:
+            self.stdout.write(f"No slow queries in {log_path()}.")
+            return
+        for record in records:
+            if options["json"]:
+                self.stdout.write(json.dumps(record, ensure_ascii=False))
+                continue
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{record['at']}  {record['duration_ms']:.1f} ms  "
+                    f"{record['view'] or '-'}  x{record['executions']}"
+                )
+            )
+            self.stdout.write(f"  {record['sql']}")
+            self.stdout.write(f"  params: {json.dumps(record['params'])}")
+            for line in record.get("plan") or []:
+                self.stdout.write(f"  plan: {line}")
+            if record.get("plan_error"):
+                self.stdout.write(f"  plan error: {record['plan_error']}")
@@ -0,0 +1,68 @@
+import time
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import NotSupportedError
+
+from medical.datasets import restore_database, snapshot_database, snapshot_path
+
+
+class Command(BaseCommand):
+    """Management command sauvegardant ou restaurant la base SQLite.
+
+    Un jeu de données de référence (par exemple des millions de
+    prescriptions générées par ``seed_demo --bulk``) est copié page à page
+    par l'API de sauvegarde SQLite, puis restauré en quelques secondes au
+    lieu d'être régénéré. Les instantanés sont rangés dans
+    ``MEDICAL_SNAPSHOT_DIR`` et doivent provenir du même schéma.
+
+    Example:
+        python manage.py snapshot_db save bench-1m
+        python manage.py snapshot_db restore bench-1m
+        python manage.py snapshot_db list
+    """
+
+    help = "Save, restore or list SQLite snapshots of the database"
+
+    def add_arguments(self, parser: Any) -> None:
+        """Déclare les arguments de la commande.
+
+        Args:
+            parser: Parseur d'arguments fourni par Django.
+        """
+        parser.add_argument("action", choices=["save", "restore", "list"])
+        parser.add_argument("name", nargs="?", help="Snapshot name")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Exécute l'action demandée.
+
+        Args:
+            *args: Arguments positionnels (non utilisés).
+            **options: Options de la ligne de commande (``action``, ``name``).
+
+        Raises:
+            CommandError: Nom absent ou invalide, instantané introuvable, ou
+                base autre que SQLite.
+        """
+        if options["action"] == "list":
+            for path in sorted(settings.MEDICAL_SNAPSHOT_DIR.glob("*.sqlite3")):
+                self.stdout.write(f"{path.stem}\t{path.stat().st_size}")
+            return
+        if not options["name"]:
+            raise CommandError("A snapshot name is required.")
+        try:
+            path = snapshot_path(options["name"])
+            started = time.perf_counter()
+            if options["action"] == "save":
+                size = snapshot_database(path)
+                message = f"Saved {path} ({size} bytes)"
+            else:
+                restore_database(path)
+                message = f"Restored {path}"
+        except FileNotFoundError as error:
+            raise CommandError(f"Snapshot not found: {error}") from error
+        except (ValueError, NotSupportedError) as error:
+            raise CommandError(str(error)) from error
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"{message} in {elapsed:.1f}s."))
@@ -0,0 +1,86 @@
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Les étiquettes ``route`` sont les noms des routes (``prescription-list``),
+# jamais le chemin : leur nombre est borné par la configuration des URL.
+REQUEST_LATENCY = Histogram(
+    "medical_http_request_duration_seconds",
+    "Time until the response is returned (first byte for streamed responses)",
+    ["route", "method", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "medical_http_requests_in_flight",
+    "Requests being processed",
+    multiprocess_mode="livesum",
+)
+RESPONSE_SIZE = Histogram(
+    "medical_http_response_size_bytes",
+    "Response body size (responses of known length)",
+    ["route", "method"],
+    buckets=SIZE_BUCKETS,
+)
+DB_QUERIES = Histogram(
+    "medical_db_queries_per_request",
+    "SQL queries executed per request",
+    ["route"],
+    buckets=QUERY_BUCKETS,
+)
+DB_TIME = Histogram(
+    "medical_db_duration_seconds",
+    "SQL time per request",
+    ["route"],
+    buckets=LATENCY_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    "medical_cache_requests_total",
+    "Cache lookups by cache (response, catalog, versions) and result",
+    ["cache", "result"],
+)
+
+
+def render_metrics(directory: str | None = None) -> bytes:
+    """Retourne les métriques au format texte de Prometheus.
+
+    Avec plusieurs workers, chaque processus écrit ses valeurs (fichiers
+    mmap) dans ``PROMETHEUS_MULTIPROC_DIR`` et l'exposition les agrège, quel
+    que soit le worker qui répond.
+
+    Args:
+        directory: Répertoire multi-processus à agréger (par défaut
+            ``PROMETHEUS_MULTIPROC_DIR``) ; sans répertoire, le registre du
+            processus courant.
+
+    Returns:
+        bytes: Exposition ``text/plain; version=0.0.4``.
+    """
+    directory = directory or os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if not directory:
+        return generate_latest(REGISTRY)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path=directory)
+    return generate_latest(registry)
+
+
+def worker_exited(pid: int) -> None:
+    """Retire les jauges d'un worker terminé (hook ``child_exit`` de gunicorn).
+
+    Args:
+        pid: Identifiant du processus terminé.
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,405 @@
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest, HttpResponse, HttpResponseBase
+
+from medical.metrics import (
+    CACHE_REQUESTS,
+    DB_QUERIES,
+    DB_TIME,
+    REQUEST_LATENCY,
+    REQUESTS_IN_FLIGHT,
+    RESPONSE_SIZE,
+)
+from medical.profiling import profile_requested, run_profiled, save_profile
+from medical.timing import (
+    RequestTimings,
+    collect_timings,
+    current_timings,
+    enable_query_timing,
+    reset_current_view,
+    set_current_view,
+)
+
+timing_logger = logging.getLogger("medical.timing")
+profiling_logger = logging.getLogger("medical.profiling")
+
+
+class ServerTimingMiddleware:
+    """Décompose la durée de chaque requête dans l'en-tête ``Server-Timing``.
+
+    Mesure le temps SQL et le nombre de requêtes (wrapper d'exécution des
+    connexions), le temps de sérialisation (serializers DRF de l'application)
+    et le temps de rendu (``render()`` des réponses DRF), puis les émet dans
+    l'en-tête et dans une ligne du logger ``medical.timing``. Pour une
+    réponse en flux, seules les phases antérieures au premier octet sont
+    comptées.
+
+    Activée par ``MEDICAL_SERVER_TIMING`` ; désactivée, elle est retirée de la
+    chaîne au démarrage et aucun wrapper SQL n'est installé. À placer en tête
+    de ``MIDDLEWARE`` pour que ``total`` couvre toute la requête.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]) -> None:
+        """Installe la mesure des requêtes SQL.
+
+        Args:
+            get_response: Suite de la chaîne des middlewares.
+
+        Raises:
+            MiddlewareNotUsed: Si ``MEDICAL_SERVER_TIMING`` est désactivé.
+        """
+        if not settings.MEDICAL_SERVER_TIMING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        enable_query_timing()
+
+    def __call__(
+        self, request: HttpRequest
+    ) -> HttpResponseBase | Awaitable[HttpResponseBase]:
+        """Mesure la requête.
+
+        Args:
+            request: Requête HTTP.
+
+        Returns:
+            HttpResponseBase: Réponse portant l'en-tête ``Server-Timing``
+            (coroutine dans une chaîne asynchrone).
+        """
+        if self.is_async:
+            return self.__acall__(request)
+        with collect_timings() as timings:
+            response = self.get_response(request)
+        return self.report(request, response, timings)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponseBase:
+        """Variante asynchrone de ``__call__``.
+
+        Args:
+            request: Requête HTTP.
+
+        Returns:
+            HttpResponseBase: Réponse portant l'en-tête ``Server-Timing``.
+        """
+        with collect_timings() as timings:
+            response = await self.get_response(request)
+        return self.report(request, response, timings)
+
+    def process_template_response(self, request: HttpRequest, response: Any) -> Any:
+        """Mesure le rendu d'une réponse DRF, exécuté juste après ce hook.
+
+        Args:
+            request: Requête HTTP.
+            response: Réponse à rendre.
+
+        Returns:
+            Any: La même réponse.
+        """
+        timings = current_timings()
+        if timings is not None:
+            timings.start("render")
+            response.add_post_render_callback(lambda _: timings.stop("render"))
+        return response
+
+    def report(
+        self, request: HttpRequest, response: HttpResponseBase, timings: RequestTimings
+    ) -> HttpResponseBase:
+        """Ajoute l'en-tête ``Server-Timing`` et journalise les mesures.
+
+        Args:
+            request: Requête HTTP.
+            response: Réponse produite.
+            timings: Mesures de la requête.
+
+        Returns:
+            HttpResponseBase: La réponse complétée.
+        """
+        response["Server-Timing"] = timings.header()
+        data = timings.as_dict()
+        timing_logger.info(
+            "method=%s path=%s status=%s %s",
+            request.method,
+            request.path,
+            response.status_code,
+            " ".join(f"{key}={value}" for key, value in data.items()),
+            extra={"timings": data},
+        )
+        return response
+
+
+class MetricsMiddleware:
+    """Alimente les métriques Prometheus exposées par ``/metrics``.
+
+    Par requête : latence (jusqu'au retour de la réponse), taille du corps
+    quand elle est connue, nombre et durée des requêtes SQL, résultat du
+    cache des réponses (en-tête ``X-Cache`` : ``hit``, ``miss`` ou ``shared``)
+    et requêtes en cours. Les
+    étiquettes ``route`` sont les noms des routes (``prescription-detail``),
+    ``unmatched`` hors routage.
+
+    Activée par ``MEDICAL_METRICS_ENABLED`` ; désactivée, elle est retirée de
+    la chaîne au démarrage.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]) -> None:
+        """Installe la mesure des requêtes SQL.
+
+        Args:
+            get_response: Suite de la chaîne des middlewares.
+
+        Raises:
+            MiddlewareNotUsed: Si ``MEDICAL_METRICS_ENABLED`` est désactivé.
+        """
+        if not settings.MEDICAL_METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        enable_query_timing()
+
+    def __call__(
+        self, request: HttpRequest
+    ) -> HttpResponseBase | Awaitable[HttpResponseBase]:
+        """Mesure la requête.
+
+        Args:
+            request: Requête HTTP.
+
+        Returns:
+            HttpResponseBase: Réponse inchangée (coroutine dans une chaîne
+            asynchrone).
+        """
+        if self.is_async:
+            return self.__acall__(request)
+        started = time.perf_counter()
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            with collect_timings() as timings:
+                response: HttpResponseBase = self.get_response(request)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+        self.observe(request, response, timings, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponseBase:
+        """Variante asynchrone de ``__call__``.
+
+        Args:
+            request: Requête HTTP.
+
+        Returns:
+            HttpResponseBase: Réponse inchangée.
+        """
+        started = time.perf_counter()
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            with collect_timings() as timings:
+                response: HttpResponseBase = await self.get_response(request)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+        self.observe(request, response, timings, time.perf_counter() - started)
+        return response
+
+    def observe(
+        self,
+        request: HttpRequest,
+        response: HttpResponseBase,
+        timings: RequestTimings,
+        elapsed: float,
+    ) -> None:
+        """Enregistre les mesures d'une requête.
+
+        Args:
+            request: Requête HTTP.
+            response: Réponse produite.
+            timings: Mesures SQL de la requête.
+            elapsed: Durée de la requête (secondes).
+        """
+        match = request.resolver_match
+        route = match.view_name if match is not None else "unmatched"
+        method = request.method or ""
+        REQUEST_LATENCY.labels(
+            route, method, f"{response.status_code // 100}xx"
+        ).observe(elapsed)
+        if isinstance(response, HttpResponse):
+            RESPONSE_SIZE.labels(route, method).observe(len(response.content))
+        elif response.has_header("Content-Length"):
+            RESPONSE_SIZE.labels(route, method).observe(int(response["Content-Length"]))
+        DB_QUERIES.labels(route).observe(timings.queries)
+        DB_TIME.labels(route).observe(timings.durations["db"])
+        cache_status = response.get("X-Cache")
+        if cache_status is not None:
+            CACHE_REQUESTS.labels("response", cache_status.lower()).inc()
+
+
+class QueryViewMiddleware:
+    """Attribue les requêtes SQL à la route qui les a exécutées.
+
+    Le journal des requêtes lentes (``medical.slow_queries``) et les
+    statistiques par empreinte (``medical.query_stats``) enregistrent alors
+    le nom de la route (``prescription-list``) à côté de chaque requête.
+    Retirée de la chaîne au démarrage si ni l'un ni l'autre n'est actif.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]) -> None:
+        """Vérifie qu'une instrumentation par route est active.
+
+        Args:
+            get_response: Suite de la chaîne des middlewares.
+
+        Raises:
+            MiddlewareNotUsed: Si ``MEDICAL_SLOW_QUERY_MS`` vaut 0 et
+                ``MEDICAL_QUERY_STATS`` est désactivé.
+        """
+        if settings.MEDICAL_SLOW_QUERY_MS <= 0 and not settings.MEDICAL_QUERY_STATS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(
+        self, request: HttpRequest
+    ) -> HttpResponseBase | Awaitable[HttpResponseBase]:
+        """Traite la requête, puis oublie la route associée.
+
+        Args:
+            request: Requête HTTP.
+
+        Returns:
+            HttpResponseBase: Réponse inchangée (coroutine dans une chaîne
+            asynchrone).
+        """
+        if self.is_async:
+            return self.__acall__(request)
+        token = set_current_view(None)
+        try:
+            response: HttpResponseBase = self.get_response(request)
+        finally:
+            reset_current_view(token)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponseBase:
+        """Variante asynchrone de ``__call__``.
+
+        Args:
+            request: Requête HTTP.
+
+        Returns:
+            HttpResponseBase: Réponse inchangée.
+        """
+        token = set_current_view(None)
+        try:
+            response: HttpResponseBase = await self.get_response(request)
+        finally:
+            reset_current_view(token)
+        return response
+
+    def process_view(
+        self,
+        request: HttpRequest,
+        view_func: Callable[..., Any],
+        view_args: Any,
+        view_kwargs: Any,
+    ) -> None:
+        """Associe les requêtes SQL suivantes à la route résolue.
+
+        Args:
+            request: Requête HTTP.
+            view_func: Vue appelée.
+            view_args: Arguments positionnels de la vue.
+            view_kwargs: Arguments nommés de la vue.
+        """
+        match = request.resolver_match
+        if match is not None:
+            set_current_view(match.view_name or match._func_path)
+
+
+class ProfilingMiddleware:
+    """Profile les requêtes qui le demandent (en-tête ``X-Profile: 1`` ou ``?profile=1``).
+
+    La suite de la chaîne (vue, sérialisation, rendu) est exécutée sous
+    cProfile et tracemalloc ; le rapport (arbre d'appels, allocations) et le
+    profil brut sont enregistrés dans ``MEDICAL_PROFILE_DIR`` et la réponse,
+    inchangée par ailleurs, porte l'en-tête ``X-Profile-Id``
+    (``/debug/profiles/<id>``). Réservé à ``DEBUG`` et aux comptes ``staff`` :
+    la demande est ignorée sinon. Pour une réponse en flux, seule la
+    production du premier octet est profilée.
+
+    Activée par ``MEDICAL_PROFILING`` ; désactivée, elle est retirée de la
+    chaîne au démarrage. Synchrone uniquement : cProfile ne suit que le
+    thread courant, les profils se prennent sous ``runserver`` ou WSGI. À
+    placer en fin de ``MIDDLEWARE``, après ``AuthenticationMiddleware``.
+    """
+
+    sync_capable = True
+    async_capable = False
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]) -> None:
+        """Vérifie que le profilage est activé.
+
+        Args:
+            get_response: Suite de la chaîne des middlewares.
+
+        Raises:
+            MiddlewareNotUsed: Si ``MEDICAL_PROFILING`` est désactivé.
+        """
+        if not settings.MEDICAL_PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        """Traite la requête, sous profilage si elle le demande.
+
+        Args:
+            request: Requête HTTP.
+
+        Returns:
+            HttpResponseBase: Réponse, avec ``X-Profile-Id`` si profilée.
+        """
+        user = getattr(request, "user", None)
+        if not profile_requested(request) or not (
+            settings.DEBUG or (user is not None and user.is_staff)
+        ):
+            unprofiled: HttpResponseBase = self.get_response(request)
+            return unprofiled
+        response: HttpResponseBase
+        response, profiler, report = run_profiled(lambda: self.get_response(request))
+        match = request.resolver_match
+        report.update(
+            created=time.time(),
+            method=request.method,
+            path=request.get_full_path(),
+            view=match.view_name if match is not None else None,
+            status=response.status_code,
+        )
+        profile_id = save_profile(profiler, report)
+        response["X-Profile-Id"] = profile_id
+        profiling_logger.info(
+            "profile=%s method=%s path=%s status=%s duration_ms=%s peak_kb=%s",
+            profile_id,
+            request.method,
+            request.path,
+            response.status_code,
+            report["duration_ms"],
+            report["peak_kb"],
+        )
+        return response
@@ -0,0 +1,60 @@
+# Generated by Django 5.1.15 on 2026-10-19 09:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("medical", "0005_tableversion"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PatientPrescriptionSummary",
+            fields=[
+                (
+                    "patient",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="prescription_summary",
+                        serialize=False,
+                        to="medical.patient",
+                    ),
+                ),
+                ("valid_count", models.PositiveIntegerField(default=0)),
+                ("pending_count", models.PositiveIntegerField(default=0)),
+                ("active_until", models.DateField(blank=True, null=True)),
+                ("last_start_date", models.DateField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "last_medication",
+                    models.ForeignKey(
+                        blank=True,
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="medical.medication",
+                    ),
+                ),
+                (
+                    "last_prescription",
+                    models.ForeignKey(
+                        blank=True,
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="medical.prescription",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "résumé des prescriptions",
+                "verbose_name_plural": "résumés des prescriptions",
+            },
+        ),
+    ]
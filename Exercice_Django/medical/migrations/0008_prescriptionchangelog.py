@@ -0,0 +1,44 @@
+# Generated by Django 5.1.15 on 2026-10-19 09:33
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("medical", "0007_timestamps"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PrescriptionChangeLog",
+            fields=[
+                ("seq", models.BigAutoField(primary_key=True, serialize=False)),
+                ("prescription_id", models.BigIntegerField()),
+                ("patient_id", models.BigIntegerField()),
+                (
+                    "operation",
+                    models.CharField(
+                        choices=[
+                            ("create", "Création"),
+                            ("update", "Modification"),
+                            ("delete", "Suppression"),
+                        ],
+                        max_length=8,
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        db_index=True, default=django.utils.timezone.now
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "écriture de prescription",
+                "verbose_name_plural": "écritures de prescriptions",
+                "ordering": ["seq"],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.15 on 2026-10-19 09:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("medical", "0009_exportjob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="prescription",
+            name="external_id",
+            field=models.CharField(
+                blank=True,
+                help_text="Identifiant de la ressource dans le système source",
+                max_length=64,
+                null=True,
+                unique=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.15 on 2026-10-19 11:35
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("medical", "0010_prescription_external_id"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exportjob",
+            name="progressed_at",
+            field=models.DateTimeField(
+                db_index=True, default=django.utils.timezone.now
+            ),
+        ),
+    ]
@@ -1,5 +1,17 @@
+from medical.models.export_job import ExportJob
 from medical.models.medication import Medication
 from medical.models.patient import Patient
+from medical.models.patient_summary import PatientPrescriptionSummary
 from medical.models.prescription import Prescription
+from medical.models.prescription_change import PrescriptionChangeLog
+from medical.models.table_version import TableVersion
 
-__all__ = ["Patient", "Medication", "Prescription"]
+__all__ = [
+    "Patient",
+    "Medication",
+    "Prescription",
+    "PatientPrescriptionSummary",
+    "PrescriptionChangeLog",
+    "TableVersion",
+    "ExportJob",
+]
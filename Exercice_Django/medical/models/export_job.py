@@ -0,0 +1,86 @@
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+class ExportJob(models.Model):
+    """Extrait de prescriptions produit en arrière-plan.
+
+    Le fichier est écrit dans ``MEDICAL_EXPORT_DIR`` par ``medical.exports.jobs``
+    puis conservé jusqu'à ``expires_at``.
+
+    Attributes:
+        id (UUID): Identifiant public du job.
+        file_format (str): ``csv`` (stocké compressé en gzip) ou ``parquet``.
+        filters (dict): Paramètres de ``PrescriptionFilter``.
+        status (str): ``pending``, ``running``, ``done`` ou ``failed``.
+        total_rows (int | None): Nombre de lignes à écrire, une fois compté.
+        rows_written (int): Nombre de lignes écrites.
+        size (int | None): Taille du fichier produit, en octets.
+        file_name (str): Nom du fichier dans ``MEDICAL_EXPORT_DIR``.
+        error (str): Message d'erreur d'un job en échec.
+        created_at (datetime): Date de soumission.
+        started_at (datetime | None): Début du traitement.
+        finished_at (datetime | None): Fin du traitement.
+        progressed_at (datetime): Dernier signe de vie du job (soumission,
+            démarrage, avancement) ; un job en attente ou en cours qui n'a
+            pas progressé depuis ``MEDICAL_EXPORT_TIMEOUT`` est abandonné.
+        expires_at (datetime | None): Date de suppression du fichier.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "En attente"),
+        (STATUS_RUNNING, "En cours"),
+        (STATUS_DONE, "Terminé"),
+        (STATUS_FAILED, "En échec"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    file_format = models.CharField(max_length=16)
+    filters = models.JSONField(default=dict, blank=True)
+    status = models.CharField(
+        max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING
+    )
+    total_rows = models.PositiveBigIntegerField(null=True, blank=True)
+    rows_written = models.PositiveBigIntegerField(default=0)
+    size = models.PositiveBigIntegerField(null=True, blank=True)
+    file_name = models.CharField(max_length=255, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    progressed_at = models.DateTimeField(default=timezone.now, db_index=True)
+    expires_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    class Meta:
+        verbose_name = "export"
+        verbose_name_plural = "exports"
+        ordering = ["-created_at"]
+
+    def __str__(self) -> str:  # pragma: no cover
+        """Retourne la représentation textuelle du job."""
+        return f"Export {self.id} ({self.status})"
+
+    @property
+    def path(self) -> Path | None:
+        """Chemin du fichier produit, s'il existe."""
+        if not self.file_name:
+            return None
+        return Path(settings.MEDICAL_EXPORT_DIR) / self.file_name
+
+    @property
+    def progress(self) -> float | None:
+        """Avancement entre 0 et 1, une fois le nombre de lignes connu."""
+        if self.status == self.STATUS_DONE:
+            return 1.0
+        if not self.total_rows:
+            return None
+        return min(self.rows_written / self.total_rows, 1.0)
@@ -8,6 +8,8 @@ class Medication(models.Model):
         code (str): Code unique du médicament (max 64 caractères).
         label (str): Nom ou libellé du médicament (max 255 caractères).
         status (str): Statut parmi ``STATUS_ACTIF`` ou ``STATUS_SUPPR``.
+        created_at (datetime): Date de création.
+        updated_at (datetime): Date de dernière modification.
     """
 
     STATUS_ACTIF = "actif"
@@ -22,6 +24,8 @@ class Medication(models.Model):
     status = models.CharField(
         max_length=16, choices=STATUS_CHOICES, default=STATUS_ACTIF
     )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = "médicament"
@@ -8,11 +8,15 @@ class Patient(models.Model):
         last_name (str): Nom de famille (max 150 caractères).
         first_name (str): Prénom (max 150 caractères).
         birth_date (date | None): Date de naissance, optionnelle.
+        created_at (datetime): Date de création.
+        updated_at (datetime): Date de dernière modification.
     """
 
     last_name = models.CharField(max_length=150)
     first_name = models.CharField(max_length=150)
     birth_date = models.DateField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = "patient"
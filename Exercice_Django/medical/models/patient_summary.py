@@ -0,0 +1,67 @@
+from datetime import date
+
+from django.db import models
+
+from medical.models.medication import Medication
+from medical.models.patient import Patient
+from medical.models.prescription import Prescription
+
+
+class PatientPrescriptionSummary(models.Model):
+    """Résumé matérialisé des prescriptions d'un patient.
+
+    Maintenu à chaque écriture sur ``Prescription`` par ``medical.summaries`` ;
+    un patient sans prescription n'a pas forcément de ligne.
+
+    Attributes:
+        patient (Patient): Patient résumé (clé primaire).
+        valid_count (int): Nombre de prescriptions ``valide``.
+        pending_count (int): Nombre de prescriptions ``en_attente``.
+        active_until (date | None): Fin la plus tardive des prescriptions ``valide``.
+        last_start_date (date | None): Début le plus récent hors prescriptions ``suppr``.
+        last_prescription (Prescription | None): Dernière prescription hors ``suppr``.
+        last_medication (Medication | None): Médicament de cette dernière prescription.
+        updated_at (datetime): Date du dernier recalcul.
+    """
+
+    patient = models.OneToOneField(
+        Patient,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="prescription_summary",
+    )
+    valid_count = models.PositiveIntegerField(default=0)
+    pending_count = models.PositiveIntegerField(default=0)
+    active_until = models.DateField(null=True, blank=True)
+    last_start_date = models.DateField(null=True, blank=True)
+    # Pas de contrainte : le résumé est recalculé après suppression des lignes visées.
+    last_prescription = models.ForeignKey(
+        Prescription,
+        null=True,
+        blank=True,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+    last_medication = models.ForeignKey(
+        Medication,
+        null=True,
+        blank=True,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "résumé des prescriptions"
+        verbose_name_plural = "résumés des prescriptions"
+
+    def __str__(self) -> str:  # pragma: no cover
+        """Retourne la représentation textuelle du résumé."""
+        return f"Résumé patient {self.patient_id}"
+
+    @property
+    def is_active(self) -> bool:
+        """Indique si une prescription validée n'est pas encore terminée."""
+        return self.active_until is not None and self.active_until >= date.today()
@@ -1,10 +1,262 @@
-from typing import Any
+from collections.abc import Collection, Iterable, Iterator, Sequence
+from typing import Any, TypeVar
 
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 
 from medical.models.medication import Medication
 from medical.models.patient import Patient
+from medical.signals import (
+    OPERATION_CREATE,
+    OPERATION_DELETE,
+    OPERATION_UPDATE,
+    PrescriptionChange,
+    mute_changes,
+    send_prescription_changes,
+)
+
+# Nombre maximal d'identifiants par clause ``IN`` lors du suivi des écritures en masse.
+CHANGE_LOOKUP_BATCH_SIZE = 900
+
+_Prescription = TypeVar("_Prescription", bound="Prescription")
+
+
+def _batches(values: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    """Découpe ``values`` en tranches de ``size`` éléments."""
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+class PrescriptionQuerySet(models.QuerySet["Prescription"]):
+    """QuerySet des prescriptions qui notifie les écritures en masse.
+
+    ``bulk_create``, ``bulk_update``, ``update`` et ``delete`` n'émettent pas
+    les signaux unitaires de Django : ces surcharges émettent à la place un seul
+    ``prescriptions_changed`` décrivant toutes les lignes touchées, dans la
+    transaction de l'écriture pour que le journal des changements ne puisse
+    pas la manquer.
+    """
+
+    def bulk_create(
+        self: "PrescriptionQuerySet[_Prescription]",
+        objs: Iterable[_Prescription],
+        batch_size: int | None = None,
+        ignore_conflicts: bool = False,
+        update_conflicts: bool = False,
+        update_fields: Collection[str] | None = None,
+        unique_fields: Collection[str] | None = None,
+    ) -> list[_Prescription]:
+        """Insère les prescriptions puis notifie celles dont l'id est connu.
+
+        Avec ``update_conflicts=True``, les lignes en conflit sont lues avant
+        l'insertion : celles qui existaient déjà sont notifiées comme des mises
+        à jour (avec leur ancien patient si l'upsert le réécrit), les autres
+        comme des créations. Les lignes sans id (``ignore_conflicts=True``) ne
+        sont pas notifiées.
+
+        Args:
+            objs: Prescriptions à insérer.
+            batch_size: Taille des lots d'insertion.
+            ignore_conflicts: Ignore les lignes en conflit.
+            update_conflicts: Met à jour les lignes en conflit.
+            update_fields: Champs réécrits en cas de conflit.
+            unique_fields: Champs déterminant le conflit.
+
+        Returns:
+            list[Prescription]: Les prescriptions insérées.
+        """
+        with transaction.atomic(using=self.db):
+            objs = list(objs)
+            previous: dict[tuple[Any, ...], int] = {}
+            if update_conflicts and unique_fields:
+                previous = self._conflicting_patient_ids(objs, unique_fields)
+            moves = bool({"patient", "patient_id"} & set(update_fields or ()))
+            created = super().bulk_create(
+                objs,
+                batch_size=batch_size,
+                ignore_conflicts=ignore_conflicts,
+                update_conflicts=update_conflicts,
+                update_fields=update_fields,
+                unique_fields=unique_fields,
+            )
+            attnames = self._attnames(unique_fields or ())
+            changes = []
+            for obj in [obj for obj in created if obj.pk is not None]:
+                previous_patient_id = previous.get(_key(obj, attnames))
+                if previous_patient_id is None:
+                    changes.append(
+                        PrescriptionChange(
+                            obj.pk, obj.patient_id, OPERATION_CREATE, obj.status
+                        )
+                    )
+                    continue
+                changes.append(
+                    PrescriptionChange(
+                        obj.pk,
+                        obj.patient_id,
+                        OPERATION_UPDATE,
+                        obj.status,
+                        (
+                            _moved_from(previous_patient_id, obj.patient_id)
+                            if moves
+                            else None
+                        ),
+                    )
+                )
+            send_prescription_changes(self.model, changes)
+        return created
+
+    def bulk_update(
+        self: "PrescriptionQuerySet[_Prescription]",
+        objs: Iterable[_Prescription],
+        fields: Iterable[str],
+        batch_size: int | None = None,
+    ) -> int:
+        """Met à jour les prescriptions puis notifie les lignes touchées.
+
+        ``updated_at`` est ajouté aux champs écrits s'il n'y figure pas.
+
+        Args:
+            objs: Prescriptions modifiées en mémoire.
+            fields: Champs à écrire.
+            batch_size: Taille des lots de mise à jour.
+
+        Returns:
+            int: Nombre de lignes mises à jour.
+        """
+        with transaction.atomic(using=self.db):
+            objs = list(objs)
+            fields = list(fields)
+            if "updated_at" not in fields:
+                now = timezone.now()
+                for obj in objs:
+                    obj.updated_at = now
+                fields = [*fields, "updated_at"]
+            previous: dict[int, int] = {}
+            if {"patient", "patient_id"} & set(fields):
+                previous = self._patient_ids([obj.pk for obj in objs])
+            rows = super().bulk_update(objs, fields, batch_size=batch_size)
+            send_prescription_changes(
+                self.model,
+                [
+                    PrescriptionChange(
+                        obj.pk,
+                        obj.patient_id,
+                        OPERATION_UPDATE,
+                        obj.status,
+                        _moved_from(previous.get(obj.pk), obj.patient_id),
+                    )
+                    for obj in objs
+                ],
+            )
+        return rows
+
+    def update(self, **kwargs: Any) -> int:
+        """Met à jour les lignes du QuerySet puis notifie leur nouvel état.
+
+        ``updated_at`` est renseigné s'il ne figure pas dans ``kwargs``.
+
+        Args:
+            **kwargs: Valeurs à écrire.
+
+        Returns:
+            int: Nombre de lignes mises à jour.
+        """
+        with transaction.atomic(using=self.db):
+            kwargs.setdefault("updated_at", timezone.now())
+            previous = dict(self.values_list("pk", "patient_id"))
+            rows = super().update(**kwargs)
+            changes = []
+            for ids in _batches(list(previous), CHANGE_LOOKUP_BATCH_SIZE):
+                for pk, patient_id, status in self.model._base_manager.filter(
+                    pk__in=ids
+                ).values_list("pk", "patient_id", "status"):
+                    changes.append(
+                        PrescriptionChange(
+                            pk,
+                            patient_id,
+                            OPERATION_UPDATE,
+                            status,
+                            _moved_from(previous[pk], patient_id),
+                        )
+                    )
+            send_prescription_changes(self.model, changes)
+        return rows
+
+    def delete(self) -> tuple[int, dict[str, int]]:
+        """Supprime les lignes du QuerySet en une seule notification.
+
+        Returns:
+            tuple[int, dict[str, int]]: Résultat de ``QuerySet.delete``.
+        """
+        with transaction.atomic(using=self.db):
+            deleted = list(self.values_list("pk", "patient_id"))
+            with mute_changes():
+                result = super().delete()
+            send_prescription_changes(
+                self.model,
+                [
+                    PrescriptionChange(pk, patient_id, OPERATION_DELETE, None)
+                    for pk, patient_id in deleted
+                ],
+            )
+        return result
+
+    delete.alters_data = True  # type: ignore[attr-defined]
+    delete.queryset_only = True  # type: ignore[attr-defined]
+
+    def _attnames(self, fields: Collection[str]) -> list[str]:
+        """Retourne les noms de colonnes (``patient_id``) des champs donnés."""
+        attnames = {
+            field.name: field.attname for field in self.model._meta.concrete_fields
+        }
+        return [attnames.get(name, name) for name in fields]
+
+    def _conflicting_patient_ids(
+        self, objs: Sequence["Prescription"], unique_fields: Collection[str]
+    ) -> dict[tuple[Any, ...], int]:
+        """Retourne le patient en base des lignes avec lesquelles ``objs`` entrent en conflit.
+
+        Args:
+            objs: Prescriptions à insérer.
+            unique_fields: Champs déterminant le conflit.
+
+        Returns:
+            dict[tuple[Any, ...], int]: Patient courant par valeur des champs uniques.
+        """
+        attnames = self._attnames(unique_fields)
+        # Une valeur NULL n'entre jamais en conflit.
+        keys = [key for key in (_key(obj, attnames) for obj in objs) if None not in key]
+        first_values = sorted({key[0] for key in keys})
+        patient_ids: dict[tuple[Any, ...], int] = {}
+        for values in _batches(first_values, CHANGE_LOOKUP_BATCH_SIZE):
+            for *key, patient_id in self.model._base_manager.filter(
+                **{f"{attnames[0]}__in": values}
+            ).values_list(*attnames, "patient_id"):
+                patient_ids[tuple(key)] = patient_id
+        return patient_ids
+
+    def _patient_ids(self, pks: Sequence[int]) -> dict[int, int]:
+        """Retourne le patient courant (en base) de chaque prescription."""
+        patient_ids: dict[int, int] = {}
+        for ids in _batches(pks, CHANGE_LOOKUP_BATCH_SIZE):
+            patient_ids.update(
+                self.model._base_manager.filter(pk__in=ids).values_list(
+                    "pk", "patient_id"
+                )
+            )
+        return patient_ids
+
+
+def _key(obj: "Prescription", attnames: Sequence[str]) -> tuple[Any, ...]:
+    """Retourne les valeurs des colonnes ``attnames`` d'une prescription."""
+    return tuple(getattr(obj, attname) for attname in attnames)
+
+
+def _moved_from(previous_patient_id: int | None, patient_id: int) -> int | None:
+    """Retourne l'ancien patient s'il diffère du nouveau, sinon ``None``."""
+    return previous_patient_id if previous_patient_id != patient_id else None
 
 
 class Prescription(models.Model):
@@ -17,6 +269,13 @@ class Prescription(models.Model):
         end_date (date): Date de fin de la prescription.
         status (str): Statut parmi ``STATUS_VALIDE``, ``STATUS_EN_ATTENTE``, ``STATUS_SUPPR``.
         comment (str): Commentaire optionnel, vide par défaut.
+        external_id (str | None): Identifiant de la ressource dans le système
+            source, clé des ingestions FHIR.
+        created_at (datetime): Date de création.
+        updated_at (datetime): Date de dernière modification.
+
+    Toute écriture (unitaire ou en masse via ``PrescriptionQuerySet``) émet le
+    signal ``medical.signals.prescriptions_changed``.
     """
 
     STATUS_VALIDE = "valide"
@@ -53,6 +312,24 @@ class Prescription(models.Model):
         default="",
         help_text="Commentaire optionnel sur la prescription",
     )
+    external_id = models.CharField(
+        max_length=64,
+        unique=True,
+        null=True,
+        blank=True,
+        help_text="Identifiant de la ressource dans le système source",
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True, help_text="Date de création de la prescription"
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True, help_text="Date de dernière modification de la prescription"
+    )
+
+    objects = PrescriptionQuerySet.as_manager()
+
+    # Patient lu en base, pour détecter un changement de patient à la sauvegarde.
+    _loaded_patient_id: int | None = None
 
     class Meta:
         verbose_name = "prescription"
@@ -64,6 +341,29 @@ class Prescription(models.Model):
             models.Index(fields=["status", "start_date"]),
         ]
 
+    @classmethod
+    def from_db(
+        cls,
+        db: str | None,
+        field_names: Collection[str],
+        values: Collection[Any],
+        **kwargs: Any,
+    ) -> "Prescription":
+        """Instancie une prescription lue en base en mémorisant son patient.
+
+        Args:
+            db: Alias de la base de données.
+            field_names: Noms des champs chargés.
+            values: Valeurs des champs chargés.
+            **kwargs: Arguments nommés de ``Model.from_db``.
+
+        Returns:
+            Prescription: L'instance construite.
+        """
+        instance = super().from_db(db, field_names, values, **kwargs)
+        instance._loaded_patient_id = instance.__dict__.get("patient_id")
+        return instance
+
     def __str__(self) -> str:
         """Retourne la représentation textuelle de la prescription."""
         return (
@@ -93,4 +393,5 @@ class Prescription(models.Model):
             **kwargs: Arguments nommés transmis à ``super().save()``.
         """
         self.full_clean()
-        super().save(*args, **kwargs)
+        with transaction.atomic(using=kwargs.get("using")):
+            super().save(*args, **kwargs)
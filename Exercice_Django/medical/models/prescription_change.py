@@ -0,0 +1,44 @@
+from django.db import models
+from django.utils import timezone
+
+from medical.signals import OPERATION_CREATE, OPERATION_DELETE, OPERATION_UPDATE
+
+
+class PrescriptionChangeLog(models.Model):
+    """Journal des écritures sur ``Prescription``, ordonné par ``seq``.
+
+    Alimenté par ``medical.changelog`` à chaque ``prescriptions_changed`` ; les
+    suppressions y restent sous forme de pierres tombales. ``seq`` sert de
+    curseur de synchronisation : il est attribué pendant que la transaction
+    tient le verrou de la version ``prescription``, donc dans l'ordre des
+    validations, et n'est jamais réutilisé.
+
+    Attributes:
+        seq (int): Numéro d'ordre de l'écriture (clé primaire).
+        prescription_id (int): Prescription écrite (sans clé étrangère, pour
+            survivre à sa suppression).
+        patient_id (int): Patient de la prescription après l'écriture.
+        operation (str): ``create``, ``update`` ou ``delete``.
+        created_at (datetime): Date de l'écriture.
+    """
+
+    OPERATION_CHOICES = [
+        (OPERATION_CREATE, "Création"),
+        (OPERATION_UPDATE, "Modification"),
+        (OPERATION_DELETE, "Suppression"),
+    ]
+
+    seq = models.BigAutoField(primary_key=True)
+    prescription_id = models.BigIntegerField()
+    patient_id = models.BigIntegerField()
+    operation = models.CharField(max_length=8, choices=OPERATION_CHOICES)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        verbose_name = "écriture de prescription"
+        verbose_name_plural = "écritures de prescriptions"
+        ordering = ["seq"]
+
+    def __str__(self) -> str:  # pragma: no cover
+        """Retourne la représentation textuelle de l'écriture."""
+        return f"#{self.seq} {self.operation} prescription {self.prescription_id}"
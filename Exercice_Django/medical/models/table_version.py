@@ -0,0 +1,55 @@
+from django.db import models
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+
+class TableVersion(models.Model):
+    """Compteur de version incrémenté à chaque écriture sur une table métier.
+
+    Sert de clé d'invalidation pour les caches (catalogue des médicaments,
+    réponses HTTP) : toute donnée dérivée d'une table est valide tant que la
+    version de cette table n'a pas changé.
+
+    La version suit l'horloge (microsecondes) tout en restant strictement
+    croissante : un numéro attribué dans une transaction annulée n'est jamais
+    réattribué, ce qui évite de resservir un cache construit pendant celle-ci.
+
+    Attributes:
+        table (str): Nom logique de la table (``patient``, ``medication``...).
+        version (int): Numéro de version, strictement croissant.
+        updated_at (datetime): Date de la dernière incrémentation.
+    """
+
+    table = models.CharField(max_length=64, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "version de table"
+        verbose_name_plural = "versions de table"
+        ordering = ["table"]
+
+    def __str__(self) -> str:  # pragma: no cover
+        """Retourne la représentation textuelle de la version."""
+        return f"{self.table} v{self.version}"
+
+    @classmethod
+    def bump(cls, table: str) -> None:
+        """Incrémente la version de ``table`` (la crée au besoin).
+
+        Args:
+            table: Nom logique de la table modifiée.
+        """
+        now = timezone.now()
+        stamp = int(now.timestamp() * 1_000_000)
+        changes = {
+            "version": Greatest(F("version") + 1, Value(stamp)),
+            "updated_at": now,
+        }
+        if not cls.objects.filter(table=table).update(**changes):
+            _, created = cls.objects.get_or_create(
+                table=table, defaults={"version": stamp, "updated_at": now}
+            )
+            if not created:
+                cls.objects.filter(table=table).update(**changes)
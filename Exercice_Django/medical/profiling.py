@@ -0,0 +1,238 @@
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, TypeVar
+
+from django.conf import settings
+
+# En-tête et paramètre de requête déclenchant le profilage.
+PROFILE_HEADER = "X-Profile"
+PROFILE_PARAM = "profile"
+# Fonctions et lignes d'allocation conservées dans chaque rapport.
+TOP = 40
+# Appelées conservées par fonction dans l'arbre d'appels.
+CALLEES = 8
+
+T = TypeVar("T")
+
+# tracemalloc est global au processus : un seul profilage à la fois.
+_lock = threading.Lock()
+
+
+def profile_dir() -> Path:
+    """Répertoire des profils enregistrés (``MEDICAL_PROFILE_DIR``)."""
+    return Path(settings.MEDICAL_PROFILE_DIR)
+
+
+def profile_requested(request: Any) -> bool:
+    """Indique si la requête demande un profil.
+
+    Args:
+        request: Requête HTTP.
+
+    Returns:
+        bool: ``True`` si l'en-tête ``X-Profile`` ou le paramètre ``profile``
+        vaut ``1`` ou ``true``.
+    """
+    value = request.headers.get(PROFILE_HEADER) or request.GET.get(PROFILE_PARAM)
+    return value in ("1", "true")
+
+
+def _label(func: tuple[str, int, str]) -> str:
+    """Nom lisible d'une fonction de pstats, chemin relatif à ``sys.path``."""
+    filename, line, name = func
+    for prefix in sorted(sys.path, key=len, reverse=True):
+        if prefix and filename.startswith(prefix + os.sep):
+            filename = filename[len(prefix) + 1 :]
+            break
+    if filename == "~":
+        return name
+    return f"{filename}:{line}({name})"
+
+
+def call_tree(profiler: cProfile.Profile, limit: int = TOP) -> list[dict[str, Any]]:
+    """Résume un profil en fonctions les plus coûteuses et leurs appelées.
+
+    Args:
+        profiler: Profil cProfile arrêté.
+        limit: Nombre de fonctions retenues.
+
+    Returns:
+        list[dict[str, Any]]: Fonctions triées par temps cumulé, avec
+        ``calls``, ``own_ms``, ``cumulative_ms`` et les appelées principales.
+    """
+    stats = pstats.Stats(profiler).stats  # type: ignore[attr-defined]
+    callees: dict[tuple, list[tuple[tuple, tuple]]] = {}
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, timing in callers.items():
+            callees.setdefault(caller, []).append((func, timing))
+    ranked = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)
+    return [
+        {
+            "function": _label(func),
+            "calls": calls,
+            "own_ms": round(own * 1000, 3),
+            "cumulative_ms": round(cumulative * 1000, 3),
+            "callees": [
+                {
+                    "function": _label(callee),
+                    "calls": timing[1],
+                    "cumulative_ms": round(timing[3] * 1000, 3),
+                }
+                for callee, timing in sorted(
+                    callees.get(func, []), key=lambda item: item[1][3], reverse=True
+                )[:CALLEES]
+            ],
+        }
+        for func, (_, calls, own, cumulative, _) in ranked[:limit]
+    ]
+
+
+def top_allocations(
+    before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, limit: int = TOP
+) -> list[dict[str, Any]]:
+    """Lignes ayant alloué le plus de mémoire encore occupée entre deux instantanés.
+
+    Args:
+        before: Instantané pris avant la requête.
+        after: Instantané pris après la requête.
+        limit: Nombre de lignes retenues.
+
+    Returns:
+        list[dict[str, Any]]: ``location``, ``size_kb`` et ``count`` (écarts),
+        par écart de taille décroissant.
+    """
+    ignored = (tracemalloc.Filter(False, tracemalloc.__file__),)
+    differences = after.filter_traces(ignored).compare_to(
+        before.filter_traces(ignored), "lineno"
+    )
+    return [
+        {
+            "location": _label((frame.filename, frame.lineno, "")).rstrip("()"),
+            "size_kb": round(difference.size_diff / 1024, 1),
+            "count": difference.count_diff,
+        }
+        for difference in differences[:limit]
+        if difference.size_diff > 0
+        for frame in difference.traceback[:1]
+    ]
+
+
+def run_profiled(func: Callable[[], T]) -> tuple[T, cProfile.Profile, dict[str, Any]]:
+    """Exécute ``func`` sous cProfile et tracemalloc.
+
+    Les profilages sont sérialisés : tracemalloc trace tout le processus et
+    cProfile seulement le thread appelant, si bien que les requêtes servies
+    en parallèle par d'autres threads ralentissent mais n'apparaissent que
+    dans les allocations.
+
+    Args:
+        func: Fonction à profiler.
+
+    Returns:
+        tuple[T, cProfile.Profile, dict[str, Any]]: Résultat de ``func``,
+        profil et rapport (``duration_ms``, ``peak_kb``, ``functions``,
+        ``allocations``).
+    """
+    with _lock:
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        try:
+            tracemalloc.reset_peak()
+            before = tracemalloc.take_snapshot()
+            baseline = tracemalloc.get_traced_memory()[0]
+            profiler = cProfile.Profile()
+            started = time.perf_counter()
+            profiler.enable()
+            try:
+                result = func()
+            finally:
+                profiler.disable()
+                elapsed = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1]
+            after = tracemalloc.take_snapshot()
+        finally:
+            if not tracing:
+                tracemalloc.stop()
+    report = {
+        "duration_ms": round(elapsed * 1000, 3),
+        "peak_kb": round((peak - baseline) / 1024, 1),
+        "functions": call_tree(profiler),
+        "allocations": top_allocations(before, after),
+    }
+    return result, profiler, report
+
+
+def save_profile(profiler: cProfile.Profile, report: dict[str, Any]) -> str:
+    """Enregistre un profil et ne garde que les ``MEDICAL_PROFILE_KEEP`` derniers.
+
+    Le rapport est écrit en JSON (``<id>.json``) et le profil brut au format
+    pstats (``<id>.prof``, lisible par ``python -m pstats`` ou snakeviz).
+
+    Args:
+        profiler: Profil cProfile arrêté.
+        report: Rapport de ``run_profiled`` complété (route, statut...).
+
+    Returns:
+        str: Identifiant du profil.
+    """
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    profile_id = uuid.uuid4().hex[:12]
+    profiler.dump_stats(directory / f"{profile_id}.prof")
+    temporary = directory / f".{profile_id}.json.tmp"
+    temporary.write_text(json.dumps({"id": profile_id, **report}))
+    temporary.replace(directory / f"{profile_id}.json")
+    for path in sorted(
+        directory.glob("*.json"), key=lambda path: path.stat().st_mtime, reverse=True
+    )[settings.MEDICAL_PROFILE_KEEP :]:
+        path.unlink(missing_ok=True)
+        path.with_suffix(".prof").unlink(missing_ok=True)
+    return profile_id
+
+
+def load_profile(profile_id: str) -> dict[str, Any] | None:
+    """Relit un rapport enregistré.
+
+    Args:
+        profile_id: Identifiant renvoyé par ``save_profile``.
+
+    Returns:
+        dict[str, Any] | None: Rapport, ou ``None`` s'il n'existe pas.
+    """
+    path = profile_dir() / f"{profile_id}.json"
+    if not profile_id.isalnum() or not path.is_file():
+        return None
+    report: dict[str, Any] = json.loads(path.read_text())
+    return report
+
+
+def list_profiles() -> list[dict[str, Any]]:
+    """Profils enregistrés, du plus récent au plus ancien, sans leur détail.
+
+    Returns:
+        list[dict[str, Any]]: ``id``, ``created``, ``method``, ``path``,
+        ``status`` et ``duration_ms`` de chaque profil.
+    """
+    summaries = []
+    for path in profile_dir().glob("*.json"):
+        try:
+            report = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        summaries.append(
+            {
+                key: report.get(key)
+                for key in ("id", "created", "method", "path", "status", "duration_ms")
+            }
+        )
+    return sorted(summaries, key=lambda report: report["created"] or 0, reverse=True)
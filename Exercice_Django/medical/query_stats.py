@@ -0,0 +1,396 @@
+import atexit
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections.abc import Callable
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, cast
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+
+from medical.timing import current_view
+
+SORT_KEYS = ("total_ms", "calls", "mean_ms", "max_ms", "rows")
+# Fichier dont la date invalide les statistiques antérieures (``reset_stats``).
+RESET_MARKER = "reset"
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.\"])-?\d+(?:\.\d+)?(?:e[+-]?\d+)?\b", re.IGNORECASE)
+_PLACEHOLDER = re.compile(r"%(?:\(\w+\))?s")
+_SAVEPOINT = re.compile(r'(SAVEPOINT) "?\w+"?', re.IGNORECASE)
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_ROWS = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_SPACES = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(sql: str) -> str:
+    """Normalise une requête SQL en empreinte (forme indépendante des valeurs).
+
+    Les littéraux et paramètres deviennent ``?``, les listes (``IN (...)``,
+    lignes d'un ``INSERT`` en masse) ``(...)`` quelle que soit leur longueur,
+    et les noms de points de sauvegarde ``?``. Deux requêtes de même forme
+    ont ainsi la même empreinte, comme dans ``pg_stat_statements``.
+
+    Args:
+        sql: Requête SQL telle qu'exécutée.
+
+    Returns:
+        str: Empreinte de la requête.
+    """
+    sql = _STRING.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _SAVEPOINT.sub(r"\1 ?", sql)
+    sql = _LIST.sub("(...)", sql)
+    sql = _ROWS.sub("(...)", sql)
+    return _SPACES.sub(" ", sql).strip()
+
+
+@lru_cache(maxsize=4096)
+def fingerprint_id(fingerprint: str) -> str:
+    """Retourne un identifiant court et stable d'une empreinte."""
+    return hashlib.blake2b(fingerprint.encode(), digest_size=8).hexdigest()
+
+
+class QueryStat:
+    """Cumuls d'une empreinte pour une route.
+
+    Attributes:
+        calls: Nombre d'exécutions (``executemany`` compte une fois).
+        total: Durée cumulée (secondes).
+        max: Durée de l'exécution la plus longue (secondes).
+        rows: Lignes affectées ou renvoyées, quand le pilote les compte
+            (écritures sous SQLite, toutes les requêtes sous PostgreSQL).
+    """
+
+    __slots__ = ("calls", "total", "max", "rows")
+
+    def __init__(self) -> None:
+        """Initialise des cumuls nuls."""
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+
+    def add(self, calls: int, total: float, longest: float, rows: int) -> None:
+        """Ajoute des exécutions aux cumuls.
+
+        Args:
+            calls: Nombre d'exécutions.
+            total: Durée cumulée (secondes).
+            longest: Durée de la plus longue (secondes).
+            rows: Lignes affectées ou renvoyées.
+        """
+        self.calls += calls
+        self.total += total
+        self.max = longest if longest > self.max else self.max
+        self.rows += rows
+
+
+class QueryStats:
+    """Statistiques du processus, par empreinte et par route.
+
+    Le nombre d'entrées est borné par ``MEDICAL_QUERY_STATS_MAX`` : au-delà,
+    les nouvelles empreintes ne sont plus suivies et sont comptées dans
+    ``dropped``.
+
+    Attributes:
+        since: Début de la collecte (horodatage Unix).
+        dropped: Exécutions non suivies, faute de place.
+    """
+
+    def __init__(self) -> None:
+        """Démarre une collecte vide."""
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, str | None], QueryStat] = {}
+        self.since = time.time()
+        self.dropped = 0
+
+    def record(
+        self, sql: str, view: str | None, duration: float, rows: int = 0
+    ) -> None:
+        """Compte une exécution.
+
+        Args:
+            sql: Requête SQL exécutée.
+            view: Route appelante, ``None`` hors requête HTTP.
+            duration: Durée d'exécution (secondes).
+            rows: Lignes affectées ou renvoyées (0 si inconnu).
+        """
+        key = (fingerprint(sql), view)
+        with self._lock:
+            stat = self._entries.get(key)
+            if stat is None:
+                if len(self._entries) >= settings.MEDICAL_QUERY_STATS_MAX:
+                    self.dropped += 1
+                    return
+                stat = self._entries[key] = QueryStat()
+            stat.add(1, duration, duration, rows)
+
+    def export(self) -> dict[str, Any]:
+        """Retourne une copie sérialisable (JSON) des statistiques.
+
+        Returns:
+            dict[str, Any]: ``since``, ``dropped`` et ``entries`` (liste de
+            ``[empreinte, route, calls, total, max, rows]``).
+        """
+        with self._lock:
+            return {
+                "since": self.since,
+                "dropped": self.dropped,
+                "entries": [
+                    [query, view, stat.calls, stat.total, stat.max, stat.rows]
+                    for (query, view), stat in self._entries.items()
+                ],
+            }
+
+    def clear(self) -> None:
+        """Oublie toutes les statistiques et repart de maintenant."""
+        with self._lock:
+            self._entries.clear()
+            self.since = time.time()
+            self.dropped = 0
+
+
+STATS = QueryStats()
+# Un worker créé par fork (gunicorn --preload) ne reprend pas les cumuls du
+# processus parent, qui les écrit déjà dans son propre fichier.
+os.register_at_fork(after_in_child=STATS.clear)
+
+_flusher_lock = threading.Lock()
+_flusher_pid: int | None = None
+
+
+def record_query_stats(
+    execute: Callable[..., Any],
+    sql: str,
+    params: Any,
+    many: bool,
+    context: dict[str, Any],
+) -> Any:
+    """Wrapper d'exécution SQL alimentant ``STATS``.
+
+    Args:
+        execute: Exécution suivante de la chaîne.
+        sql: Requête SQL.
+        params: Paramètres de la requête.
+        many: ``True`` pour ``executemany``.
+        context: Contexte d'exécution (connexion, curseur).
+
+    Returns:
+        Any: Résultat de ``execute``.
+    """
+    if not settings.MEDICAL_QUERY_STATS:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - started
+        rows = getattr(context["cursor"], "rowcount", -1)
+        STATS.record(sql, current_view(), duration, rows if rows > 0 else 0)
+        _start_flusher()
+
+
+def stats_dir() -> Path:
+    """Retourne le répertoire partagé des statistiques des processus."""
+    return Path(settings.MEDICAL_QUERY_STATS_DIR)
+
+
+def _reset_at(directory: Path) -> float:
+    """Retourne la date de la dernière remise à zéro (0 si aucune)."""
+    try:
+        return (directory / RESET_MARKER).stat().st_mtime
+    except FileNotFoundError:
+        return 0.0
+
+
+def save_stats() -> None:
+    """Écrit les statistiques du processus dans ``<pid>.json``.
+
+    Une remise à zéro demandée depuis un autre processus (``reset_stats``)
+    vide d'abord les statistiques collectées avant elle.
+    """
+    directory = stats_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    if _reset_at(directory) > STATS.since:
+        STATS.clear()
+    path = directory / f"{os.getpid()}.json"
+    part = path.with_suffix(".part")
+    part.write_text(json.dumps(STATS.export()), encoding="utf-8")
+    part.replace(path)
+
+
+def _flush_periodically(interval: float) -> None:
+    """Boucle du thread d'écriture des statistiques.
+
+    Args:
+        interval: Secondes entre deux écritures.
+    """
+    while True:
+        time.sleep(interval)
+        save_stats()
+
+
+def _start_flusher() -> None:
+    """Démarre l'écriture périodique dans ce processus, une seule fois."""
+    global _flusher_pid
+    if _flusher_pid == os.getpid() or settings.MEDICAL_QUERY_STATS_FLUSH <= 0:
+        return
+    with _flusher_lock:
+        if _flusher_pid == os.getpid():
+            return
+        _flusher_pid = os.getpid()
+        threading.Thread(
+            target=_flush_periodically,
+            args=(settings.MEDICAL_QUERY_STATS_FLUSH,),
+            name="query-stats-flush",
+            daemon=True,
+        ).start()
+        atexit.register(save_stats)
+
+
+def _alive(pid: int) -> bool:
+    """Indique si le processus ``pid`` existe encore, même sous un autre compte."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def collect_stats() -> dict[str, Any]:
+    """Rassemble les statistiques de tous les processus.
+
+    Les fichiers des autres processus sont relus ; celui du processus
+    courant est remplacé par ses valeurs en mémoire. Le fichier d'un
+    processus terminé est supprimé : ses cumuls ne survivent pas au
+    redémarrage des workers.
+
+    Returns:
+        dict[str, Any]: ``since``, ``dropped``, ``processes`` et ``entries``
+        (cumuls par empreinte et par route).
+    """
+    directory = stats_dir()
+    reset_at = _reset_at(directory)
+    exports = []
+    for path in directory.glob("*.json") if directory.is_dir() else ():
+        if path.stem == str(os.getpid()):
+            continue
+        if path.stem.isdigit() and not _alive(int(path.stem)):
+            path.unlink(missing_ok=True)
+            continue
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        if data["since"] >= reset_at:
+            exports.append(data)
+    if reset_at > STATS.since:
+        STATS.clear()
+    exports.append(STATS.export())
+    entries: dict[tuple[str, str | None], QueryStat] = {}
+    for data in exports:
+        for query, view, *values in data["entries"]:
+            entries.setdefault((query, view), QueryStat()).add(*values)
+    return {
+        "since": min(data["since"] for data in exports),
+        "dropped": sum(data["dropped"] for data in exports),
+        "processes": len(exports),
+        "entries": entries,
+    }
+
+
+def top_queries(
+    entries: dict[tuple[str, str | None], QueryStat],
+    limit: int = 20,
+    sort: str = "total_ms",
+    view: str | None = None,
+    by_view: bool = False,
+) -> list[dict[str, Any]]:
+    """Classe les empreintes.
+
+    Args:
+        entries: Cumuls par empreinte et par route (``collect_stats``).
+        limit: Nombre d'empreintes renvoyées (0 : toutes).
+        sort: Critère de tri, parmi ``SORT_KEYS`` (décroissant).
+        view: Ne garder que les requêtes de cette route.
+        by_view: Une ligne par empreinte et par route, au lieu d'une ligne
+            par empreinte toutes routes confondues.
+
+    Returns:
+        list[dict[str, Any]]: ``id``, ``query``, ``view`` (``None`` si
+        ``by_view`` est faux), ``calls``, ``total_ms``, ``mean_ms``,
+        ``max_ms``, ``rows`` et ``share`` (part du temps SQL total).
+
+    Raises:
+        ValueError: Si ``sort`` n'est pas un critère connu.
+    """
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Unknown sort key {sort!r}, expected one of {SORT_KEYS}.")
+    grouped: dict[tuple[str, str | None], QueryStat] = {}
+    for (query, query_view), stat in entries.items():
+        if view is not None and query_view != view:
+            continue
+        key = (query, query_view if by_view else None)
+        grouped.setdefault(key, QueryStat()).add(
+            stat.calls, stat.total, stat.max, stat.rows
+        )
+    total = sum(stat.total for stat in grouped.values()) or 1.0
+    rows = [
+        {
+            "id": fingerprint_id(query),
+            "query": query,
+            "view": query_view,
+            "calls": stat.calls,
+            "total_ms": round(stat.total * 1000, 3),
+            "mean_ms": round(stat.total * 1000 / stat.calls, 3),
+            "max_ms": round(stat.max * 1000, 3),
+            "rows": stat.rows,
+            "share": round(stat.total / total, 4),
+        }
+        for (query, query_view), stat in grouped.items()
+    ]
+    rows.sort(key=lambda row: cast(float, row[sort]), reverse=True)
+    return rows[:limit] if limit else rows
+
+
+def reset_stats() -> None:
+    """Remet à zéro les statistiques de tous les processus.
+
+    Les fichiers sont supprimés et un marqueur daté est posé : les autres
+    processus vident leurs valeurs en mémoire à leur prochaine écriture.
+    """
+    directory = stats_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    for path in directory.glob("*.json"):
+        path.unlink(missing_ok=True)
+    (directory / RESET_MARKER).touch()
+    STATS.clear()
+
+
+def _install(connection: BaseDatabaseWrapper, **kwargs: Any) -> None:
+    """Ajoute ``record_query_stats`` aux wrappers d'une connexion, une seule fois."""
+    if record_query_stats not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query_stats)
+
+
+def enable_query_stats() -> None:
+    """Installe ``record_query_stats`` sur les connexions, présentes et futures.
+
+    Appelé au démarrage (``MedicalConfig.ready``) lorsque
+    ``MEDICAL_QUERY_STATS`` est actif.
+    """
+    connection_created.connect(_install, dispatch_uid="medical.query_stats")
+    for connection in connections.all():
+        _install(connection)
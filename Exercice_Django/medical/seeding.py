@@ -0,0 +1,583 @@
+import random
+import string
+from contextlib import contextmanager
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from itertools import accumulate
+from multiprocessing import get_context
+from typing import Any
+
+from django.db import connection, connections, models, transaction
+from django.utils import timezone
+
+from medical.datasets import data_replaced
+from medical.models import Medication, Patient, Prescription
+from medical.summaries import rebuild_patient_summaries
+
+# Lignes générées puis insérées par transaction en mode massif.
+SEED_BATCH_SIZE = 10_000
+
+LAST_NAMES = [
+    "Martin",
+    "Bernard",
+    "Thomas",
+    "Petit",
+    "Robert",
+    "Richard",
+    "Durand",
+    "Dubois",
+    "Moreau",
+    "Laurent",
+    "Michel",
+    "Garcia",
+    "David",
+    "Bertrand",
+    "Roux",
+    "Vincent",
+    "Fournier",
+    "Morel",
+    "Lefebvre",
+    "Mercier",
+    "Dupont",
+    "Lambert",
+    "Bonnet",
+    "Francois",
+    "Martinez",
+    "Legrand",
+    "Garnier",
+    "Faure",
+    "Andre",
+    "Rousseau",
+    "Simon",
+    "Leroy",
+    "Roux",
+    "Girard",
+    "Colin",
+    "Lefevre",
+    "Boyer",
+    "Chevalier",
+    "Robin",
+    "Masson",
+    "Picard",
+    "Blanc",
+    "Gautier",
+    "Nicolas",
+    "Henry",
+    "Perrin",
+    "Morin",
+    "Mathieu",
+    "Clement",
+    "Gauthier",
+    "Dumont",
+    "Lopez",
+    "Fontaine",
+    "Schmitt",
+    "Rodriguez",
+    "Dufour",
+    "Blanchard",
+    "Meunier",
+    "Brunet",
+    "Roy",
+]
+
+FIRST_NAMES = [
+    "Jean",
+    "Jeanne",
+    "Marie",
+    "Luc",
+    "Lucie",
+    "Paul",
+    "Camille",
+    "Pierre",
+    "Sophie",
+    "Emma",
+    "Louis",
+    "Louise",
+    "Alice",
+    "Gabriel",
+    "Jules",
+    "Lucas",
+    "Hugo",
+    "Arthur",
+    "Adam",
+    "Raphael",
+    "Leo",
+    "Nathan",
+    "Tom",
+    "Zoe",
+    "Chloe",
+    "Ines",
+    "Lea",
+    "Lena",
+    "Eva",
+    "Nina",
+    "Ethan",
+    "Noah",
+    "Liam",
+    "Rose",
+    "Anna",
+    "Jade",
+    "Maeva",
+    "Sarah",
+    "Laura",
+    "Clara",
+    "Julie",
+    "Nicolas",
+    "Thomas",
+    "Antoine",
+    "Emilie",
+    "Mathilde",
+    "Charlotte",
+    "Manon",
+    "Julia",
+    "Elise",
+    "Victor",
+    "Alex",
+    "Samuel",
+    "Valentin",
+    "Axel",
+    "Simon",
+    "Romain",
+    "Vincent",
+    "Marc",
+    "David",
+]
+
+MEDICATION_LABELS = [
+    "Paracetamol",
+    "Ibuprofen",
+    "Amoxicillin",
+    "Aspirin",
+    "Omeprazole",
+    "Metformin",
+    "Loratadine",
+    "Cetirizine",
+    "Azithromycin",
+    "Atorvastatin",
+    "Simvastatin",
+    "Lisinopril",
+    "Amlodipine",
+    "Metoprolol",
+    "Sertraline",
+    "Fluoxetine",
+    "Escitalopram",
+    "Gabapentin",
+    "Pregabalin",
+    "Tramadol",
+    "Oxycodone",
+    "Hydrocodone",
+    "Morphine",
+    "Diazepam",
+    "Alprazolam",
+    "Clonazepam",
+    "Zolpidem",
+    "Trazodone",
+    "Cyclobenzaprine",
+    "Meloxicam",
+    "Prednisone",
+    "Methylprednisolone",
+    "Hydrocortisone",
+    "Fluticasone",
+    "Montelukast",
+    "Albuterol",
+    "Fluconazole",
+    "Terbinafine",
+    "Metronidazole",
+    "Ciprofloxacin",
+    "Doxycycline",
+    "Cephalexin",
+    "Nitrofurantoin",
+    "Pantoprazole",
+    "Ranitidine",
+    "Famotidine",
+    "Dicyclomine",
+    "Ondansetron",
+    "Promethazine",
+    "Meclizine",
+]
+
+DOSAGES = [15, 20, 25, 50, 100, 200, 250, 300, 400, 500, 800, 1000]
+UNITS = ["mg", "g", "µg"]
+COMMENTS = [
+    "À prendre pendant les repas",
+    "Traitement à suivre rigoureusement",
+    "En cas de douleur",
+    "Renouvellement prévu",
+    "Attention aux effets secondaires",
+    "Dosage à surveiller",
+    "",
+    "",
+    "",
+]
+
+PRESCRIPTION_MIN_DAYS = 1
+PRESCRIPTION_MAX_DAYS = 180
+MEDICATION_CODE_MIN = 1000
+MEDICATION_CODE_MAX = 9999
+
+
+PRESCRIPTION_STATUSES = [
+    Prescription.STATUS_VALIDE,
+    Prescription.STATUS_EN_ATTENTE,
+    Prescription.STATUS_SUPPR,
+]
+PRESCRIPTION_STATUS_WEIGHTS = [0.6, 0.3, 0.1]
+
+# Colonnes écrites par le chargement massif des prescriptions.
+PRESCRIPTION_COLUMNS = (
+    "patient",
+    "medication",
+    "start_date",
+    "end_date",
+    "status",
+    "comment",
+    "created_at",
+    "updated_at",
+)
+
+
+def random_date(
+    start_year: int = 1940, end_year: int = 2025, rng: random.Random | None = None
+) -> date:
+    """Génère une date aléatoire entre start_year et end_year.
+
+    Args:
+        start_year: Année de début (incluse). Par défaut 1940.
+        end_year: Année de fin (incluse). Par défaut 2025.
+        rng: Générateur à utiliser (module ``random`` par défaut).
+
+    Returns:
+        date: Une date aléatoire entre les deux années.
+    """
+    start_dt = date(start_year, 1, 1)
+    end_dt = date(end_year, 12, 31)
+    days = (end_dt - start_dt).days
+    return start_dt + timedelta(days=(rng or random).randint(0, days))
+
+
+def medication_codes(n: int, rng: random.Random) -> list[str]:
+    """Tire ``n`` codes de médicament distincts.
+
+    Les codes suivent le format ``MED####X`` tant que ses 234 000
+    combinaisons suffisent, puis un format numérique ``MED#######``.
+
+    Args:
+        n: Nombre de codes.
+        rng: Générateur aléatoire.
+
+    Returns:
+        list[str]: Codes uniques.
+    """
+    span = MEDICATION_CODE_MAX - MEDICATION_CODE_MIN + 1
+    capacity = span * len(string.ascii_uppercase)
+    if n > capacity:
+        return [f"MED{index:07d}" for index in range(n)]
+    return [
+        f"MED{MEDICATION_CODE_MIN + index % span}"
+        f"{string.ascii_uppercase[index // span]}"
+        for index in rng.sample(range(capacity), n)
+    ]
+
+
+def zipf_weights(n: int, exponent: float, rng: random.Random) -> list[float]:
+    """Poids cumulés d'une loi de Zipf, rangs attribués au hasard.
+
+    Le ``k``-ième élément le plus populaire a un poids ``1 / k ** exponent``.
+
+    Args:
+        n: Nombre d'éléments.
+        exponent: Exposant de la loi (0 : uniforme).
+        rng: Générateur aléatoire.
+
+    Returns:
+        list[float]: Poids cumulés, utilisables avec ``cum_weights``.
+    """
+    ranks = list(range(1, n + 1))
+    rng.shuffle(ranks)
+    return list(accumulate(1 / rank**exponent for rank in ranks))
+
+
+def activity_weights(n: int, sigma: float, rng: random.Random) -> list[float]:
+    """Poids cumulés log-normaux : nombre de prescriptions par patient.
+
+    Args:
+        n: Nombre de patients.
+        sigma: Dispersion (0 : tous les patients également actifs).
+        rng: Générateur aléatoire.
+
+    Returns:
+        list[float]: Poids cumulés, utilisables avec ``cum_weights``.
+    """
+    return list(accumulate(rng.lognormvariate(0, sigma) for _ in range(n)))
+
+
+def _insert(model: type[models.Model], objs: list[Any], batch_size: int) -> list[int]:
+    """Insère ``objs`` dans une transaction et retourne leurs identifiants."""
+    with transaction.atomic():
+        created = model._default_manager.bulk_create(objs, batch_size=batch_size)
+    return [obj.pk for obj in created]
+
+
+def bulk_patients(
+    n: int, rng: random.Random, batch_size: int = SEED_BATCH_SIZE
+) -> list[int]:
+    """Crée ``n`` patients par lots.
+
+    Args:
+        n: Nombre de patients.
+        rng: Générateur aléatoire.
+        batch_size: Patients par lot.
+
+    Returns:
+        list[int]: Identifiants créés.
+    """
+    ids: list[int] = []
+    for start in range(0, n, batch_size):
+        ids += _insert(
+            Patient,
+            [
+                Patient(
+                    last_name=rng.choice(LAST_NAMES),
+                    first_name=rng.choice(FIRST_NAMES),
+                    birth_date=random_date(rng=rng),
+                )
+                for _ in range(min(batch_size, n - start))
+            ],
+            batch_size,
+        )
+    return ids
+
+
+def bulk_medications(
+    n: int, rng: random.Random, batch_size: int = SEED_BATCH_SIZE
+) -> list[int]:
+    """Crée ``n`` médicaments aux codes uniques, par lots.
+
+    Args:
+        n: Nombre de médicaments.
+        rng: Générateur aléatoire.
+        batch_size: Médicaments par lot.
+
+    Returns:
+        list[int]: Identifiants créés.
+    """
+    codes = medication_codes(n, rng)
+    ids: list[int] = []
+    for start in range(0, n, batch_size):
+        ids += _insert(
+            Medication,
+            [
+                Medication(
+                    code=code,
+                    label=(
+                        f"{rng.choice(MEDICATION_LABELS)} "
+                        f"{rng.choice(DOSAGES)}{rng.choice(UNITS)}"
+                    ),
+                    status=rng.choices(
+                        [Medication.STATUS_ACTIF, Medication.STATUS_SUPPR],
+                        weights=[0.8, 0.2],
+                    )[0],
+                )
+                for code in codes[start : start + batch_size]
+            ],
+            batch_size,
+        )
+    return ids
+
+
+class PrescriptionPlan:
+    """Tirage reproductible des prescriptions, lot par lot.
+
+    Chaque lot a son propre générateur, dérivé de la graine et du numéro de
+    lot : le résultat ne dépend ni de l'ordre d'exécution des lots ni du
+    nombre de processus.
+
+    Attributes:
+        seed: Graine de la génération.
+        patient_ids: Patients disponibles.
+        patient_weights: Poids cumulés des patients (activité).
+        medication_ids: Médicaments disponibles.
+        medication_weights: Poids cumulés des médicaments (popularité).
+    """
+
+    def __init__(
+        self,
+        seed: int | None,
+        patient_ids: Sequence[int],
+        patient_weights: Sequence[float],
+        medication_ids: Sequence[int],
+        medication_weights: Sequence[float],
+    ) -> None:
+        """Initialise le plan.
+
+        Args:
+            seed: Graine de la génération (aléatoire si ``None``).
+            patient_ids: Patients disponibles.
+            patient_weights: Poids cumulés des patients.
+            medication_ids: Médicaments disponibles.
+            medication_weights: Poids cumulés des médicaments.
+        """
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self.patient_ids = patient_ids
+        self.patient_weights = patient_weights
+        self.medication_ids = medication_ids
+        self.medication_weights = medication_weights
+
+    def batch(self, index: int, size: int) -> list[tuple[Any, ...]]:
+        """Génère le lot ``index``.
+
+        Args:
+            index: Numéro du lot.
+            size: Nombre de prescriptions du lot.
+
+        Returns:
+            list[tuple]: Lignes dans l'ordre de ``PRESCRIPTION_COLUMNS``, valeurs
+            déjà adaptées à la base.
+        """
+        rng = random.Random(f"{self.seed}-{index}")
+        ops = connection.ops
+        patients = rng.choices(
+            self.patient_ids, cum_weights=self.patient_weights, k=size
+        )
+        medications = rng.choices(
+            self.medication_ids, cum_weights=self.medication_weights, k=size
+        )
+        statuses = rng.choices(
+            PRESCRIPTION_STATUSES, weights=PRESCRIPTION_STATUS_WEIGHTS, k=size
+        )
+        first_day = date(2020, 1, 1).toordinal()
+        last_day = date(2026, 12, 31).toordinal()
+        now = ops.adapt_datetimefield_value(timezone.now())
+        rows = []
+        for patient_id, medication_id, status in zip(patients, medications, statuses):
+            start = rng.randint(first_day, last_day)
+            end = start + rng.randint(PRESCRIPTION_MIN_DAYS, PRESCRIPTION_MAX_DAYS)
+            rows.append(
+                (
+                    patient_id,
+                    medication_id,
+                    ops.adapt_datefield_value(date.fromordinal(start)),
+                    ops.adapt_datefield_value(date.fromordinal(end)),
+                    status,
+                    rng.choice(COMMENTS),
+                    now,
+                    now,
+                )
+            )
+        return rows
+
+
+_plan: PrescriptionPlan | None = None
+
+
+def _start_worker(plan: PrescriptionPlan) -> None:
+    """Initialise un processus d'insertion (plan partagé, connexions neuves)."""
+    global _plan
+    _plan = plan
+    connections.close_all()
+
+
+def _insert_batch(index: int, size: int, plan: PrescriptionPlan | None = None) -> int:
+    """Génère et insère un lot de prescriptions en une transaction."""
+    plan = plan or _plan
+    if plan is None:
+        raise RuntimeError("Aucun plan : le processus n'a pas été initialisé.")
+    rows = plan.batch(index, size)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(_insert_sql(), rows)
+    return len(rows)
+
+
+def _insert_sql() -> str:
+    """Requête d'insertion d'une prescription (colonnes ``PRESCRIPTION_COLUMNS``)."""
+    quote = connection.ops.quote_name
+    names = {
+        field.name: field.column
+        for field in Prescription._meta.concrete_fields
+        if field.column is not None
+    }
+    columns = [names[name] for name in PRESCRIPTION_COLUMNS]
+    return (
+        f"INSERT INTO {quote(Prescription._meta.db_table)} "
+        f"({', '.join(quote(column) for column in columns)}) "
+        f"VALUES ({', '.join(['%s'] * len(columns))})"
+    )
+
+
+@contextmanager
+def deferred_indexes(model: type[models.Model]) -> Iterator[None]:
+    """Supprime les index secondaires de ``model`` le temps d'un chargement.
+
+    Maintenir des index pendant des millions d'insertions aléatoires coûte
+    bien plus que les reconstruire une fois à la fin. Les index sont recréés
+    même si le chargement échoue.
+
+    Args:
+        model: Modèle dont les ``Meta.indexes`` sont suspendus.
+    """
+    indexes = list(model._meta.indexes)
+    with connection.schema_editor() as editor:
+        for index in indexes:
+            editor.remove_index(model, index)
+    try:
+        yield
+    finally:
+        with connection.schema_editor() as editor:
+            for index in indexes:
+                editor.add_index(model, index)
+
+
+def bulk_prescriptions(
+    n: int,
+    plan: PrescriptionPlan,
+    batch_size: int = SEED_BATCH_SIZE,
+    workers: int = 1,
+) -> int:
+    """Crée ``n`` prescriptions par lots, éventuellement dans plusieurs processus.
+
+    Les lignes sont générées sans instancier de modèle et insérées par
+    ``executemany``, index secondaires suspendus : la préparation champ par
+    champ de ``bulk_create`` dominerait sinon le temps de chargement. Aucun
+    signal n'est émis ; les résumés, versions et journal sont reconstruits
+    une fois par ``finish_bulk_seed``.
+
+    Args:
+        n: Nombre de prescriptions.
+        plan: Tirage des lots.
+        batch_size: Prescriptions par lot (et par transaction).
+        workers: Processus d'insertion (``1`` : processus courant).
+
+    Returns:
+        int: Nombre de prescriptions créées.
+    """
+    batches = [
+        (index, min(batch_size, n - start))
+        for index, start in enumerate(range(0, n, batch_size))
+    ]
+    with deferred_indexes(Prescription):
+        if workers <= 1:
+            return sum(_insert_batch(*batch, plan=plan) for batch in batches)
+        # Les processus fils ne doivent pas hériter de la connexion du parent.
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=get_context("fork"),
+            initializer=_start_worker,
+            initargs=(plan,),
+        ) as pool:
+            return sum(pool.map(_insert_batch, *zip(*batches)))
+
+
+def finish_bulk_seed() -> int:
+    """Reconstruit les données dérivées après un chargement massif.
+
+    Recalcule les résumés des patients, incrémente les versions des tables
+    (ETags, caches, catalogue) et invalide les curseurs du journal.
+
+    Returns:
+        int: Nombre de résumés écrits.
+    """
+    written = rebuild_patient_summaries()
+    data_replaced()
+    return written
@@ -1,5 +1,19 @@
+from medical.serializers.changes import ChangesQuerySerializer
+from medical.serializers.export_job import ExportJobSerializer
+from medical.serializers.exports import ExportQuerySerializer
+from medical.serializers.fhir import FhirExportQuerySerializer
 from medical.serializers.medication import MedicationSerializer
 from medical.serializers.patient import PatientSerializer
+from medical.serializers.patient_summary import PatientPrescriptionSummarySerializer
 from medical.serializers.prescription import PrescriptionSerializer
 
-__all__ = ["PatientSerializer", "MedicationSerializer", "PrescriptionSerializer"]
+__all__ = [
+    "PatientSerializer",
+    "PatientPrescriptionSummarySerializer",
+    "MedicationSerializer",
+    "PrescriptionSerializer",
+    "ChangesQuerySerializer",
+    "ExportQuerySerializer",
+    "ExportJobSerializer",
+    "FhirExportQuerySerializer",
+]
@@ -0,0 +1,18 @@
+from rest_framework import serializers
+
+from medical.changelog import CHANGES_MAX_PAGE_SIZE, CHANGES_PAGE_SIZE
+
+
+class ChangesQuerySerializer(serializers.Serializer):
+    """Paramètres de ``GET /api/prescriptions/changes``.
+
+    Attributes:
+        since: Curseur renvoyé par la synchronisation précédente (absent la
+            première fois).
+        limit: Nombre maximal d'écritures lues dans le journal.
+    """
+
+    since = serializers.IntegerField(min_value=0, required=False)
+    limit = serializers.IntegerField(
+        min_value=1, max_value=CHANGES_MAX_PAGE_SIZE, default=CHANGES_PAGE_SIZE
+    )
@@ -0,0 +1,128 @@
+from typing import Any
+
+from django.urls import reverse
+from rest_framework import serializers
+
+from medical.exports.jobs import submit_export
+from medical.filters import PrescriptionFilter
+from medical.models import ExportJob, Prescription
+from medical.serializers.exports import (
+    EXPORT_CSV,
+    EXPORT_PARQUET,
+    validate_export_format,
+)
+
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    """Serializer des jobs d'export de prescriptions.
+
+    À la création, seuls ``file_format`` et ``filters`` (paramètres de
+    ``PrescriptionFilter``, comme pour ``GET /api/prescriptions``) sont lus ;
+    le job est alors soumis au pool d'export. ``download_url`` n'est renseigné
+    qu'une fois le fichier prêt.
+
+    Attributes:
+        file_format: ``csv`` (par défaut) ou ``parquet``.
+        filters: Filtres de l'extrait.
+        progress: Avancement entre 0 et 1, ``null`` tant qu'il est inconnu.
+        download_url: URL du fichier produit.
+    """
+
+    file_format = serializers.ChoiceField(
+        choices=[EXPORT_CSV, EXPORT_PARQUET], default=EXPORT_CSV
+    )
+    filters = serializers.DictField(
+        child=serializers.CharField(allow_blank=True), required=False, default=dict
+    )
+    progress = serializers.FloatField(read_only=True)
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ExportJob
+        fields = [
+            "id",
+            "file_format",
+            "filters",
+            "status",
+            "progress",
+            "total_rows",
+            "rows_written",
+            "size",
+            "error",
+            "created_at",
+            "started_at",
+            "finished_at",
+            "expires_at",
+            "download_url",
+        ]
+        read_only_fields = [
+            "id",
+            "status",
+            "total_rows",
+            "rows_written",
+            "size",
+            "error",
+            "created_at",
+            "started_at",
+            "finished_at",
+            "expires_at",
+        ]
+
+    def validate_file_format(self, value: Any) -> str:
+        """Refuse le format Parquet si ``pyarrow`` n'est pas installé.
+
+        Args:
+            value: Format demandé.
+
+        Returns:
+            str: Le format validé.
+        """
+        return validate_export_format(value)
+
+    def validate_filters(self, value: dict[str, str]) -> dict[str, str]:
+        """Valide les filtres avec ``PrescriptionFilter``.
+
+        Args:
+            value: Paramètres de filtrage.
+
+        Returns:
+            dict[str, str]: Les filtres validés.
+
+        Raises:
+            serializers.ValidationError: Si un filtre est inconnu ou invalide.
+        """
+        unknown = sorted(set(value) - set(PrescriptionFilter.base_filters))
+        if unknown:
+            raise serializers.ValidationError(
+                f"Filtres inconnus : {', '.join(unknown)}."
+            )
+        filterset = PrescriptionFilter(data=value, queryset=Prescription.objects.none())
+        if not filterset.is_valid():
+            raise serializers.ValidationError(filterset.errors)
+        return value
+
+    def get_download_url(self, obj: ExportJob) -> str | None:
+        """Retourne l'URL de téléchargement d'un job terminé.
+
+        Args:
+            obj: Job sérialisé.
+
+        Returns:
+            str | None: URL absolue si le contexte porte la requête.
+        """
+        if obj.status != ExportJob.STATUS_DONE:
+            return None
+        url = reverse("export-download", args=[obj.pk])
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request is not None else url
+
+    def create(self, validated_data: dict[str, Any]) -> ExportJob:
+        """Crée le job et le soumet au pool d'export.
+
+        Args:
+            validated_data: Format et filtres validés.
+
+        Returns:
+            ExportJob: Job en attente.
+        """
+        return submit_export(validated_data["file_format"], validated_data["filters"])
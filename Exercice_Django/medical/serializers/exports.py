@@ -0,0 +1,53 @@
+from typing import Any
+
+from rest_framework import serializers
+
+from medical.exports import parquet_available
+
+EXPORT_CSV = "csv"
+EXPORT_PARQUET = "parquet"
+
+
+def validate_export_format(value: str) -> str:
+    """Refuse le format Parquet si ``pyarrow`` n'est pas installé.
+
+    Args:
+        value: Format demandé.
+
+    Returns:
+        str: Le format validé.
+
+    Raises:
+        serializers.ValidationError: Si le format n'est pas disponible.
+    """
+    if value == EXPORT_PARQUET and not parquet_available():
+        raise serializers.ValidationError(
+            "L'export Parquet nécessite la dépendance optionnelle pyarrow."
+        )
+    return value
+
+
+class ExportQuerySerializer(serializers.Serializer):
+    """Paramètres de ``GET /api/prescriptions/export``.
+
+    Le paramètre ``format`` étant réservé par DRF au choix du renderer, le
+    format du fichier est choisi par ``file_format``.
+
+    Attributes:
+        file_format: ``csv`` (par défaut) ou ``parquet`` (nécessite ``pyarrow``).
+    """
+
+    file_format = serializers.ChoiceField(
+        choices=[EXPORT_CSV, EXPORT_PARQUET], default=EXPORT_CSV
+    )
+
+    def validate_file_format(self, value: Any) -> str:
+        """Refuse le format Parquet si ``pyarrow`` n'est pas installé.
+
+        Args:
+            value: Format demandé.
+
+        Returns:
+            str: Le format validé.
+        """
+        return validate_export_format(value)
@@ -0,0 +1,17 @@
+from rest_framework import serializers
+
+from medical.fhir import RESOURCE_TYPES
+
+
+class FhirExportQuerySerializer(serializers.Serializer):
+    """Paramètres de ``GET /api/fhir/$export``.
+
+    Attributes:
+        _type: Type de ressource exporté (un seul par réponse NDJSON).
+        _since: Ne retenir que les ressources modifiées depuis cette date.
+    """
+
+    _type = serializers.ChoiceField(
+        choices=sorted(RESOURCE_TYPES), default="MedicationRequest"
+    )
+    _since = serializers.DateTimeField(required=False)
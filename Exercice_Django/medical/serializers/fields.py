@@ -0,0 +1,76 @@
+from typing import Any
+
+from rest_framework import serializers
+
+from medical.cache import MedicationCatalog, get_catalog
+from medical.models import Medication
+from medical.serializers.medication import MedicationSerializer
+
+
+class CatalogMedicationRelatedField(serializers.PrimaryKeyRelatedField):
+    """Clé étrangère vers ``Medication`` résolue depuis le catalogue en mémoire.
+
+    Un identifiant absent du catalogue (médicament créé par un autre worker
+    depuis la dernière lecture de version) est vérifié en base comme d'habitude.
+
+    Seule la validation du serializer évite la requête : ``Prescription.save()``
+    exécute ``full_clean()``, qui vérifie toujours la clé en base, car le
+    catalogue peut être en retard sur la table (médicament supprimé entre la
+    lecture de version et l'écriture). Le gain porte donc sur les lectures et la
+    validation des requêtes, pas sur la requête d'existence à l'écriture.
+    """
+
+    def to_internal_value(self, data: Any) -> Medication:
+        """Retourne le médicament d'identifiant ``data``.
+
+        Args:
+            data: Identifiant reçu dans la requête.
+
+        Returns:
+            Medication: Le médicament correspondant.
+
+        Raises:
+            serializers.ValidationError: Si l'identifiant est invalide ou inconnu.
+        """
+        if not isinstance(data, bool):
+            medication = get_catalog().get(data)
+            if medication is not None:
+                return medication
+        stored: Medication = super().to_internal_value(data)
+        return stored
+
+
+class CatalogMedicationDetailsField(serializers.Field):
+    """Représentation imbriquée d'un médicament lue depuis le catalogue.
+
+    S'utilise avec ``source="medication_id"`` afin que la requête de liste n'ait
+    pas besoin de joindre la table des médicaments. Le catalogue est résolu une
+    fois par serializer : dans une transaction, la version de la table n'est pas
+    mémorisée et serait sinon relue pour chaque ligne.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        """Initialise le champ en lecture seule.
+
+        Args:
+            **kwargs: Arguments transmis à ``serializers.Field``.
+        """
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+        self.catalog: MedicationCatalog | None = None
+
+    def to_representation(self, value: int) -> dict[str, Any]:
+        """Sérialise le médicament d'identifiant ``value``.
+
+        Args:
+            value: Identifiant du médicament.
+
+        Returns:
+            dict[str, Any]: Données sérialisées par ``MedicationSerializer``.
+        """
+        if self.catalog is None:
+            self.catalog = get_catalog()
+        medication = self.catalog.get(value)
+        if medication is None:
+            medication = Medication.objects.get(pk=value)
+        return MedicationSerializer(medication).data
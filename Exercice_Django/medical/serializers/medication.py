@@ -1,9 +1,10 @@
 from rest_framework import serializers
 
 from medical.models import Medication
+from medical.serializers.mixins import TimedRepresentationMixin
 
 
-class MedicationSerializer(serializers.ModelSerializer):
+class MedicationSerializer(TimedRepresentationMixin, serializers.ModelSerializer):
     """Serializer pour les médicaments.
 
     Expose les champs ``id`` (lecture seule), ``code``, ``label`` et ``status``.
@@ -0,0 +1,33 @@
+from typing import TYPE_CHECKING, Any
+
+from rest_framework import serializers
+
+from medical.timing import current_timings
+
+if TYPE_CHECKING:
+    _Serializer = serializers.BaseSerializer
+else:
+    _Serializer = object
+
+
+class TimedRepresentationMixin(_Serializer):
+    """Compte le temps de sérialisation dans la phase ``serialize`` de la requête.
+
+    Sans mesure en cours (``Server-Timing`` désactivé), le coût se limite à
+    la lecture d'une variable de contexte par objet sérialisé.
+    """
+
+    def to_representation(self, instance: Any) -> Any:
+        """Sérialise ``instance`` en mesurant la durée.
+
+        Args:
+            instance: Objet à sérialiser.
+
+        Returns:
+            Any: Représentation produite par le serializer.
+        """
+        timings = current_timings()
+        if timings is None:
+            return super().to_representation(instance)
+        with timings.measure("serialize"):
+            return super().to_representation(instance)
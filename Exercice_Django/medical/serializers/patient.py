@@ -1,22 +1,47 @@
+from typing import Any
+
 from rest_framework import serializers
 
 from medical.models import Patient
+from medical.serializers.mixins import TimedRepresentationMixin
+from medical.serializers.patient_summary import PatientPrescriptionSummarySerializer
 
 
-class PatientSerializer(serializers.ModelSerializer):
+class PatientSerializer(TimedRepresentationMixin, serializers.ModelSerializer):
     """Serializer pour sérialiser et valider les données des patients.
 
     Expose les champs id, last_name, first_name, et birth_date.
     Le champ birth_date est optionnel lors de la création et la mise à jour.
+    Les champs de ``EXPANDABLE_FIELDS`` ne sont inclus que s'ils figurent dans
+    ``context["expand"]``.
 
     Attributes:
         id: Identifiant unique du patient (lecture seule).
         last_name: Nom de famille du patient.
         first_name: Prénom du patient.
         birth_date: Date de naissance optionnelle du patient.
+        prescription_summary: Résumé des prescriptions (extension optionnelle,
+            ``null`` si le patient n'a jamais eu de prescription).
     """
 
+    EXPANDABLE_FIELDS = ("prescription_summary",)
+
+    prescription_summary = PatientPrescriptionSummarySerializer(read_only=True)
+
     class Meta:
         model = Patient
-        fields = ["id", "last_name", "first_name", "birth_date"]
+        fields = ["id", "last_name", "first_name", "birth_date", "prescription_summary"]
         read_only_fields = ["id"]
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Retire les extensions non demandées dans le contexte.
+
+        Args:
+            *args: Arguments positionnels de ``ModelSerializer``.
+            **kwargs: Arguments nommés de ``ModelSerializer``.
+        """
+        super().__init__(*args, **kwargs)
+        expand = self.context.get("expand", ())
+        for name in self.EXPANDABLE_FIELDS:
+            if name not in expand:
+                self.fields.pop(name)
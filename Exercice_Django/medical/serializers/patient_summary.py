@@ -0,0 +1,26 @@
+from rest_framework import serializers
+
+from medical.models import PatientPrescriptionSummary
+
+
+class PatientPrescriptionSummarySerializer(serializers.ModelSerializer):
+    """Serializer en lecture seule du résumé des prescriptions d'un patient.
+
+    ``is_active`` indique si une prescription validée n'est pas encore terminée.
+    """
+
+    is_active = serializers.BooleanField(read_only=True)
+
+    class Meta:
+        model = PatientPrescriptionSummary
+        fields = [
+            "valid_count",
+            "pending_count",
+            "active_until",
+            "is_active",
+            "last_start_date",
+            "last_prescription",
+            "last_medication",
+            "updated_at",
+        ]
+        read_only_fields = fields
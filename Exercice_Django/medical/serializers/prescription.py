@@ -1,21 +1,30 @@
 from typing import Any
 
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
 
-from medical.models import Prescription
-from medical.serializers.medication import MedicationSerializer
+from medical.models import Medication, Prescription
+from medical.serializers.fields import (
+    CatalogMedicationDetailsField,
+    CatalogMedicationRelatedField,
+)
+from medical.serializers.mixins import TimedRepresentationMixin
 from medical.serializers.patient import PatientSerializer
 
 
-class PrescriptionSerializer(serializers.ModelSerializer):
+class PrescriptionSerializer(TimedRepresentationMixin, serializers.ModelSerializer):
     """Serializer pour les prescriptions médicamenteuses.
 
     Inclut ``patient_details`` et ``medication_details`` en lecture seule pour
     exposer les objets imbriqués sans modifier les clés étrangères d'écriture.
+    Le médicament (clé et détails) est résolu depuis le catalogue en mémoire,
+    sans jointure ni requête de validation ; son existence est revérifiée en
+    base à l'écriture par ``Prescription.full_clean()``.
     """
 
     patient_details = PatientSerializer(source="patient", read_only=True)
-    medication_details = MedicationSerializer(source="medication", read_only=True)
+    medication = CatalogMedicationRelatedField(queryset=Medication.objects.all())
+    medication_details = CatalogMedicationDetailsField(source="medication_id")
 
     class Meta:
         model = Prescription
@@ -59,3 +68,27 @@ class PrescriptionSerializer(serializers.ModelSerializer):
             )
 
         return data
+
+    def save(self, **kwargs: Any) -> Prescription:
+        """Enregistre la prescription en traduisant les erreurs de validation du modèle.
+
+        Le catalogue peut être en retard sur la table : un médicament supprimé
+        depuis sa dernière lecture est rejeté par ``full_clean()`` et donne une
+        réponse 400 plutôt qu'une erreur serveur.
+
+        Args:
+            **kwargs: Valeurs ajoutées aux données validées.
+
+        Returns:
+            Prescription: La prescription enregistrée.
+
+        Raises:
+            serializers.ValidationError: Si le modèle rejette les données.
+        """
+        try:
+            prescription: Prescription = super().save(**kwargs)
+        except DjangoValidationError as exc:
+            raise serializers.ValidationError(
+                serializers.as_serializer_error(exc)
+            ) from exc
+        return prescription
@@ -0,0 +1,126 @@
+import threading
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from typing import Any, NamedTuple
+
+from django.db import transaction
+from django.dispatch import Signal
+
+OPERATION_CREATE = "create"
+OPERATION_UPDATE = "update"
+OPERATION_DELETE = "delete"
+
+
+class PrescriptionChange(NamedTuple):
+    """Description d'une écriture sur une prescription.
+
+    Attributes:
+        id: Identifiant de la prescription.
+        patient_id: Patient de la prescription après l'écriture.
+        operation: ``create``, ``update`` ou ``delete``.
+        status: Statut après l'écriture (``None`` pour une suppression).
+        previous_patient_id: Patient avant l'écriture s'il a changé, sinon ``None``.
+    """
+
+    id: int
+    patient_id: int
+    operation: str
+    status: str | None
+    previous_patient_id: int | None = None
+
+
+# Émis après toute écriture sur ``Prescription``, unitaire (save/delete) ou en
+# masse (bulk_create, bulk_update, update, delete d'un QuerySet).
+# Argument: ``changes`` (list[PrescriptionChange]).
+prescriptions_changed = Signal()
+
+_state = threading.local()
+
+
+@contextmanager
+def mute_changes() -> Iterator[None]:
+    """Suspend l'émission de ``prescriptions_changed`` dans le thread courant.
+
+    Utilisé par les chargements massifs qui reconstruisent ensuite les données
+    dérivées en une fois, et par les opérations en masse qui regroupent les
+    signaux unitaires en un seul envoi.
+    """
+    _state.muted = getattr(_state, "muted", 0) + 1
+    try:
+        yield
+    finally:
+        _state.muted -= 1
+
+
+def changes_muted() -> bool:
+    """Indique si l'émission des changements est suspendue dans ce thread."""
+    return getattr(_state, "muted", 0) > 0
+
+
+def _held() -> list[PrescriptionChange] | None:
+    """Retourne le tampon des changements retenus, ``None`` s'il n'y en a pas.
+
+    Un tampon ouvert dans un bloc ``atomic`` qui n'est plus actif (suppression
+    interrompue par une erreur) est abandonné.
+    """
+    held = getattr(_state, "held", None)
+    if held is None:
+        return None
+    if held[0] not in transaction.get_connection().atomic_blocks:
+        _state.held = None
+        return None
+    changes: list[PrescriptionChange] = held[2]
+    return changes
+
+
+def hold_changes() -> None:
+    """Retient les changements émis jusqu'au ``release_changes`` correspondant.
+
+    Appelé en ``pre_delete`` d'un parent : les prescriptions supprimées en
+    cascade sont alors notifiées en un seul envoi au lieu d'un par ligne.
+    Les appels s'imbriquent ; hors transaction, rien n'est retenu.
+    """
+    atomic_blocks = transaction.get_connection().atomic_blocks
+    if not atomic_blocks:
+        return
+    if _held() is None:
+        _state.held = (atomic_blocks[-1], 1, [])
+    else:
+        block, depth, changes = _state.held
+        _state.held = (block, depth + 1, changes)
+
+
+def release_changes(sender: Any) -> None:
+    """Termine un ``hold_changes`` et émet les changements retenus au dernier.
+
+    Args:
+        sender: Modèle à l'origine des écritures (``Prescription``).
+    """
+    if _held() is None:
+        return
+    block, depth, changes = _state.held
+    if depth > 1:
+        _state.held = (block, depth - 1, changes)
+        return
+    _state.held = None
+    send_prescription_changes(sender, changes)
+
+
+def send_prescription_changes(
+    sender: Any, changes: Sequence[PrescriptionChange]
+) -> None:
+    """Émet ``prescriptions_changed`` sauf si la liste est vide ou l'émission suspendue.
+
+    Pendant un ``hold_changes``, les changements sont ajoutés au tampon.
+
+    Args:
+        sender: Modèle à l'origine des écritures (``Prescription``).
+        changes: Écritures à notifier.
+    """
+    if not changes or changes_muted():
+        return
+    held = _held()
+    if held is not None:
+        held.extend(changes)
+        return
+    prescriptions_changed.send(sender=sender, changes=list(changes))
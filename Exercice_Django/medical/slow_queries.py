@@ -0,0 +1,236 @@
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterator
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+
+from medical.timing import current_view
+
+# Requêtes dont le plan d'exécution peut être demandé.
+EXPLAINABLE = ("select", "with", "insert", "update", "delete")
+# Requêtes lentes en attente d'EXPLAIN ; au-delà, les suivantes sont ignorées.
+QUEUE_SIZE = 1000
+
+slow_query_logger = logging.getLogger("medical.slow_queries")
+
+_pending: queue.Queue[dict[str, Any]] = queue.Queue(QUEUE_SIZE)
+_worker_lock = threading.Lock()
+_worker: threading.Thread | None = None
+_explaining = threading.local()
+_handler: RotatingFileHandler | None = None
+
+
+def _json_safe(value: Any) -> Any:
+    """Convertit un paramètre SQL en valeur JSON (``str`` à défaut)."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _json_safe(item) for key, item in value.items()}
+    return str(value)
+
+
+def record_slow_query(
+    execute: Callable[..., Any],
+    sql: str,
+    params: Any,
+    many: bool,
+    context: dict[str, Any],
+) -> Any:
+    """Wrapper d'exécution SQL signalant les requêtes plus lentes que le seuil.
+
+    Le plan d'exécution n'est pas demandé ici : la requête lente est mise en
+    file et traitée par un thread dédié, hors du chemin de la requête HTTP.
+
+    Args:
+        execute: Exécution suivante de la chaîne.
+        sql: Requête SQL.
+        params: Paramètres (liste de jeux de paramètres si ``many``).
+        many: ``True`` pour ``executemany``.
+        context: Contexte d'exécution (connexion, curseur).
+
+    Returns:
+        Any: Résultat de ``execute``.
+    """
+    if getattr(_explaining, "active", False):
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - started
+        threshold = settings.MEDICAL_SLOW_QUERY_MS
+        if threshold > 0 and duration * 1000 >= threshold:
+            rows = list(params or []) if many else None
+            _enqueue(
+                {
+                    "at": datetime.now(timezone.utc).isoformat(),
+                    "duration_ms": round(duration * 1000, 2),
+                    "alias": context["connection"].alias,
+                    "view": current_view(),
+                    "sql": sql,
+                    "params": _json_safe(rows[0] if rows else params),
+                    "executions": len(rows) if rows is not None else 1,
+                }
+            )
+
+
+def _enqueue(record: dict[str, Any]) -> None:
+    """Met une requête lente en file, en démarrant le thread au besoin."""
+    global _worker
+    try:
+        _pending.put_nowait(record)
+    except queue.Full:
+        return
+    if _worker is None or not _worker.is_alive():
+        with _worker_lock:
+            if _worker is None or not _worker.is_alive():
+                _worker = threading.Thread(
+                    target=_process, name="slow-query-explain", daemon=True
+                )
+                _worker.start()
+
+
+def _process() -> None:
+    """Boucle du thread : ajoute le plan à chaque requête lente et l'écrit."""
+    _explaining.active = True
+    while True:
+        record = _pending.get()
+        try:
+            record.update(explain(record))
+            write_record(record)
+        except Exception:  # noqa: BLE001 - le journal ne doit jamais s'arrêter
+            slow_query_logger.exception("Slow query could not be logged")
+        finally:
+            _pending.task_done()
+            for connection in connections.all(initialized_only=True):
+                connection.close_if_unusable_or_obsolete()
+
+
+def explain(record: dict[str, Any]) -> dict[str, Any]:
+    """Demande le plan d'exécution d'une requête lente.
+
+    Utilise ``EXPLAIN QUERY PLAN`` sous SQLite et ``EXPLAIN`` ailleurs (sans
+    exécuter la requête), sur une connexion propre au thread appelant.
+
+    Args:
+        record: Requête lente (``alias``, ``sql``, ``params``).
+
+    Returns:
+        dict[str, Any]: ``plan`` (lignes du plan) ou ``plan_error``.
+    """
+    sql = record["sql"].lstrip()
+    if not sql.lower().startswith(EXPLAINABLE):
+        return {"plan": None}
+    connection = connections[record["alias"]]
+    params = record["params"]
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"{connection.ops.explain_query_prefix()} {sql}",
+                params if isinstance(params, (list, dict)) else None,
+            )
+            plan = [" ".join(str(value) for value in row) for row in cursor]
+    except Exception as error:  # noqa: BLE001 - requête non explicable
+        return {"plan": None, "plan_error": str(error)}
+    return {"plan": plan}
+
+
+def log_path() -> Path:
+    """Retourne le fichier du journal des requêtes lentes."""
+    return Path(settings.MEDICAL_SLOW_QUERY_LOG)
+
+
+def _log_handler() -> RotatingFileHandler:
+    """Retourne le gestionnaire du journal, rouvert si son chemin a changé."""
+    global _handler
+    path = log_path()
+    if _handler is None or _handler.baseFilename != os.path.abspath(path):
+        if _handler is not None:
+            _handler.close()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _handler = RotatingFileHandler(
+            path,
+            maxBytes=settings.MEDICAL_SLOW_QUERY_LOG_BYTES,
+            backupCount=settings.MEDICAL_SLOW_QUERY_LOG_BACKUPS,
+            encoding="utf-8",
+        )
+    return _handler
+
+
+def write_record(record: dict[str, Any]) -> None:
+    """Écrit une requête lente (une ligne JSON) dans le journal tournant.
+
+    Args:
+        record: Requête lente complétée de son plan.
+    """
+    _log_handler().handle(
+        slow_query_logger.makeRecord(
+            slow_query_logger.name,
+            logging.WARNING,
+            __file__,
+            0,
+            json.dumps(record, ensure_ascii=False),
+            (),
+            None,
+        )
+    )
+
+
+def read_records(include_rotated: bool = False) -> Iterator[dict[str, Any]]:
+    """Relit le journal, des requêtes les plus anciennes aux plus récentes.
+
+    Args:
+        include_rotated: Lire aussi les fichiers archivés (``.1``, ``.2``...).
+
+    Yields:
+        dict[str, Any]: Requêtes lentes.
+    """
+    path = log_path()
+    files = [path]
+    if include_rotated:
+        files = [
+            path.with_name(f"{path.name}.{index}")
+            for index in range(settings.MEDICAL_SLOW_QUERY_LOG_BACKUPS, 0, -1)
+        ] + files
+    for file in files:
+        if not file.is_file():
+            continue
+        with file.open(encoding="utf-8") as lines:
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def flush_slow_queries() -> None:
+    """Attend que les requêtes lentes en file soient écrites."""
+    _pending.join()
+
+
+def _install(connection: BaseDatabaseWrapper, **kwargs: Any) -> None:
+    """Ajoute ``record_slow_query`` aux wrappers d'une connexion, une seule fois."""
+    if record_slow_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_slow_query)
+
+
+def enable_slow_query_log() -> None:
+    """Installe ``record_slow_query`` sur les connexions, présentes et futures.
+
+    Appelé au démarrage (``MedicalConfig.ready``) : les commandes de gestion
+    sont instrumentées comme les requêtes HTTP.
+    """
+    connection_created.connect(_install, dispatch_uid="medical.slow_queries")
+    for connection in connections.all():
+        _install(connection)
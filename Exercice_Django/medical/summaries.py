@@ -0,0 +1,158 @@
+import threading
+from collections.abc import Iterable
+
+from django.db.models import Count, Max, OuterRef, Q, QuerySet, Subquery
+
+from medical.models import Patient, PatientPrescriptionSummary, Prescription
+
+SUMMARY_BATCH_SIZE = 500
+SUMMARY_FIELDS = [
+    "valid_count",
+    "pending_count",
+    "active_until",
+    "last_start_date",
+    "last_prescription_id",
+    "last_medication_id",
+]
+
+_state = threading.local()
+
+
+def _deleting() -> set[int]:
+    """Retourne l'ensemble des patients en cours de suppression dans ce thread."""
+    if not hasattr(_state, "deleting"):
+        _state.deleting = set()
+    deleting: set[int] = _state.deleting
+    return deleting
+
+
+def mark_patient_deleting(patient_id: int) -> None:
+    """Signale qu'un patient est en cours de suppression (``pre_delete``).
+
+    La suppression d'un patient supprime ses prescriptions en cascade ; recréer
+    son résumé pendant la cascade laisserait une ligne orpheline.
+
+    Args:
+        patient_id: Identifiant du patient supprimé.
+    """
+    _deleting().add(patient_id)
+
+
+def unmark_patient_deleting(patient_id: int) -> None:
+    """Signale la fin de la suppression d'un patient (``post_delete``).
+
+    Args:
+        patient_id: Identifiant du patient supprimé.
+    """
+    _deleting().discard(patient_id)
+
+
+def _summaries(patients: QuerySet[Patient]) -> list[PatientPrescriptionSummary]:
+    """Calcule en une requête les résumés des patients donnés.
+
+    Args:
+        patients: Patients à résumer.
+
+    Returns:
+        list[PatientPrescriptionSummary]: Résumés non sauvegardés.
+    """
+    latest = (
+        Prescription.objects.filter(patient=OuterRef("pk"))
+        .exclude(status=Prescription.STATUS_SUPPR)
+        .order_by("-start_date", "-id")
+    )
+    active = Q(
+        prescriptions__status__in=[
+            Prescription.STATUS_VALIDE,
+            Prescription.STATUS_EN_ATTENTE,
+        ]
+    )
+    rows = (
+        patients.order_by()
+        .annotate(
+            valid_count=Count(
+                "prescriptions",
+                filter=Q(prescriptions__status=Prescription.STATUS_VALIDE),
+            ),
+            pending_count=Count(
+                "prescriptions",
+                filter=Q(prescriptions__status=Prescription.STATUS_EN_ATTENTE),
+            ),
+            active_until=Max(
+                "prescriptions__end_date",
+                filter=Q(prescriptions__status=Prescription.STATUS_VALIDE),
+            ),
+            last_start_date=Max("prescriptions__start_date", filter=active),
+            last_prescription_id=Subquery(latest.values("id")[:1]),
+            last_medication_id=Subquery(latest.values("medication_id")[:1]),
+        )
+        .values_list("pk", *SUMMARY_FIELDS)
+    )
+    return [
+        PatientPrescriptionSummary(
+            patient_id=row[0], **dict(zip(SUMMARY_FIELDS, row[1:]))
+        )
+        for row in rows
+    ]
+
+
+def _save(summaries: list[PatientPrescriptionSummary]) -> int:
+    """Insère ou met à jour les résumés donnés.
+
+    Args:
+        summaries: Résumés calculés par ``_summaries``.
+
+    Returns:
+        int: Nombre de résumés écrits.
+    """
+    PatientPrescriptionSummary.objects.bulk_create(
+        summaries,
+        update_conflicts=True,
+        unique_fields=["patient"],
+        update_fields=[*SUMMARY_FIELDS, "updated_at"],
+    )
+    return len(summaries)
+
+
+def refresh_patient_summaries(patient_ids: Iterable[int]) -> int:
+    """Recalcule les résumés des patients dont une prescription a changé.
+
+    Args:
+        patient_ids: Identifiants des patients concernés.
+
+    Returns:
+        int: Nombre de résumés écrits.
+    """
+    ids = sorted(set(patient_ids) - _deleting())
+    written = 0
+    for start in range(0, len(ids), SUMMARY_BATCH_SIZE):
+        batch = ids[start : start + SUMMARY_BATCH_SIZE]
+        written += _save(_summaries(Patient.objects.filter(pk__in=batch)))
+    return written
+
+
+def rebuild_patient_summaries(batch_size: int = SUMMARY_BATCH_SIZE) -> int:
+    """Recalcule les résumés de tous les patients, par plages d'identifiants.
+
+    Les lignes existantes sont réécrites sur place : la table reste lisible
+    pendant toute la reconstruction.
+
+    Args:
+        batch_size: Nombre de patients traités par requête.
+
+    Returns:
+        int: Nombre de résumés écrits.
+    """
+    written = 0
+    last_id = 0
+    while True:
+        ids = list(
+            Patient.objects.filter(pk__gt=last_id)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not ids:
+            return written
+        patients = Patient.objects.filter(pk__gte=ids[0], pk__lte=ids[-1])
+        written += _save(_summaries(patients))
+        last_id = ids[-1]
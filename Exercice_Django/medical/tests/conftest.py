@@ -1,7 +1,57 @@
 import pytest
+from django.conf import settings
+from django.core.cache import cache
+from django.test import override_settings
 from rest_framework.test import APIClient
 
+from medical.cache import clear_catalog, clear_response_cache, forget_versions
+from medical.cache.catalog import CATALOG_CACHE_ALIAS
+
 
 @pytest.fixture
 def api_client() -> APIClient:
     return APIClient()
+
+
+@pytest.fixture(autouse=True)
+def reset_medical_caches():
+    """Isole chaque test des caches (versions, catalogue, caches Django)."""
+    forget_versions()
+    clear_catalog()
+    cache.clear()
+    clear_response_cache()
+    yield
+    forget_versions()
+    clear_catalog()
+    cache.clear()
+    clear_response_cache()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def catalog_cache_location(tmp_path_factory):
+    """Place le cache partagé du catalogue hors du répertoire ``var/``."""
+    with override_settings(
+        CACHES={
+            **settings.CACHES,
+            CATALOG_CACHE_ALIAS: {
+                **settings.CACHES[CATALOG_CACHE_ALIAS],
+                "LOCATION": str(tmp_path_factory.mktemp("catalog")),
+            },
+        }
+    ):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def query_log_paths(settings, tmp_path):
+    """Écrit requêtes lentes, statistiques SQL et profils hors du répertoire ``var/``."""
+    settings.MEDICAL_SLOW_QUERY_LOG = tmp_path / "slow_queries.jsonl"
+    settings.MEDICAL_QUERY_STATS_DIR = tmp_path / "query_stats"
+    settings.MEDICAL_PROFILE_DIR = tmp_path / "profiles"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def no_query_stats_flush():
+    """N'écrit pas les statistiques SQL des processus de test sur le disque."""
+    with override_settings(MEDICAL_QUERY_STATS_FLUSH=0):
+        yield
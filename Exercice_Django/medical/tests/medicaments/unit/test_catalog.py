@@ -0,0 +1,158 @@
+"""
+Tests unitaires pour le catalogue en mémoire des médicaments.
+"""
+
+from datetime import date
+
+import pytest
+from django.core.cache import caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from medical.cache import catalog as catalog_module
+from medical.cache import forget_versions, get_catalog, get_version
+from medical.cache.catalog import CATALOG_CACHE_ALIAS, load_rows
+from medical.models import Medication, Prescription, TableVersion
+from medical.serializers import PrescriptionSerializer
+from medical.tests.factories import MedicationFactory, PatientFactory
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestTableVersion:
+    """Tests des compteurs de version par table."""
+
+    def test_unknown_table_has_version_zero(self):
+        assert get_version("inconnue") == 0
+
+    def test_bump_creates_then_increments(self):
+        TableVersion.bump("patient")
+        first = TableVersion.objects.get(table="patient").version
+        TableVersion.bump("patient")
+
+        assert TableVersion.objects.get(table="patient").version > first
+
+    def test_medication_save_bumps_version(self, medication):
+        before = get_version("medication")
+        medication.label = "Nouveau libellé"
+        medication.save()
+
+        assert get_version("medication") > before
+
+    def test_medication_delete_bumps_version(self, medication):
+        before = get_version("medication")
+        medication.delete()
+
+        assert get_version("medication") > before
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestMedicationCatalog:
+    """Tests du catalogue des médicaments indexé par id et par code."""
+
+    def test_lookup_by_id_and_code(self, medication):
+        catalog = get_catalog()
+
+        assert catalog.get(medication.id).code == medication.code
+        assert catalog.get(str(medication.id)).code == medication.code
+        assert catalog.get_by_code(medication.code).id == medication.id
+
+    def test_lookups_return_distinct_instances(self, medication):
+        catalog = get_catalog()
+        first = catalog.get(medication.id)
+        first.label = "Modifié"
+
+        assert catalog.get(medication.id) is not first
+        assert catalog.get(medication.id).label == medication.label
+        assert catalog.get_by_code(medication.code).label == medication.label
+
+    def test_unknown_or_invalid_keys_return_none(self, medication):
+        catalog = get_catalog()
+
+        assert catalog.get(99999) is None
+        assert catalog.get("abc") is None
+        assert catalog.get(None) is None
+        assert catalog.get_by_code("INCONNU") is None
+
+    def test_catalog_is_reused_while_version_is_unchanged(self, medications_batch):
+        catalog = get_catalog()
+
+        assert get_catalog() is catalog
+        assert len(catalog) == 5
+
+    def test_other_worker_reuses_shared_snapshot(self, medications_batch):
+        version = get_catalog().version
+        # Un autre worker : ni instantané ni versions mémorisés dans le processus.
+        catalog_module._catalog = None
+        forget_versions()
+
+        with CaptureQueriesContext(connection) as ctx:
+            rows = load_rows(version)
+
+        assert len(rows) == 5
+        assert len(ctx.captured_queries) == 0
+        assert isinstance(caches[CATALOG_CACHE_ALIAS], FileBasedCache)
+
+    def test_catalog_is_rebuilt_after_write(self, medication):
+        get_catalog()
+        MedicationFactory(code="NEW001")
+
+        assert get_catalog().get_by_code("NEW001") is not None
+
+    def test_catalog_reflects_updates(self, medication):
+        get_catalog()
+        Medication.objects.filter(pk=medication.pk).first().delete()
+
+        assert get_catalog().get(medication.id) is None
+
+    def test_serializer_does_not_query_medications(self, medication):
+        patient = PatientFactory()
+        prescription = Prescription.objects.create(
+            patient=patient,
+            medication=medication,
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 1, 31),
+        )
+        instance = Prescription.objects.select_related("patient").get(
+            pk=prescription.pk
+        )
+        get_catalog()
+
+        with CaptureQueriesContext(connection) as ctx:
+            data = PrescriptionSerializer(instance).data
+
+        assert data["medication_details"]["code"] == medication.code
+        assert not any("medical_medication" in q["sql"] for q in ctx.captured_queries)
+
+    def test_validation_resolves_medication_from_catalog(self, medication):
+        patient = PatientFactory()
+        get_catalog()
+        payload = {
+            "patient": patient.id,
+            "medication": medication.id,
+            "start_date": "2024-01-01",
+            "end_date": "2024-01-31",
+        }
+
+        with CaptureQueriesContext(connection) as ctx:
+            serializer = PrescriptionSerializer(data=payload)
+            assert serializer.is_valid(), serializer.errors
+
+        assert serializer.validated_data["medication"].code == medication.code
+        assert not any("medical_medication" in q["sql"] for q in ctx.captured_queries)
+
+    def test_validation_rejects_unknown_medication(self):
+        patient = PatientFactory()
+        serializer = PrescriptionSerializer(
+            data={
+                "patient": patient.id,
+                "medication": 99999,
+                "start_date": "2024-01-01",
+                "end_date": "2024-01-31",
+            }
+        )
+
+        assert not serializer.is_valid()
+        assert "medication" in serializer.errors
@@ -0,0 +1,139 @@
+"""
+Tests de la synchronisation du catalogue des médicaments (import_medications).
+"""
+
+import io
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from medical.cache import get_catalog, get_version
+from medical.catalog_import import CatalogRow, read_catalog_csv, sync_catalog
+from medical.models import Medication
+
+
+def rows(*values) -> list[CatalogRow]:
+    return [CatalogRow(*value) for value in values]
+
+
+@pytest.mark.unit
+class TestReadCatalogCsv:
+    """Lecture et validation du fichier."""
+
+    def test_default_status_and_trimming(self):
+        stream = io.StringIO("code,label\n A1 , Doliprane \n")
+        assert list(read_catalog_csv(stream)) == rows(("A1", "Doliprane", "actif"))
+
+    def test_delimiter(self):
+        stream = io.StringIO("code;label;status\nA1;Doliprane;suppr\n")
+        assert list(read_catalog_csv(stream, ";"))[0].status == "suppr"
+
+    @pytest.mark.parametrize(
+        "content, message",
+        [
+            ("code\nA1\n", "Colonnes manquantes"),
+            ("code,label\nA1,\n", "obligatoires"),
+            ("code,label,status\nA1,X,perime\n", "statut inconnu"),
+            ("code,label\nA1,X\nA1,Y\n", "en double"),
+        ],
+    )
+    def test_invalid_files(self, content, message):
+        with pytest.raises(ValueError, match=message):
+            list(read_catalog_csv(io.StringIO(content)))
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestSyncCatalog:
+    """Comparaison avec la table et écritures minimales."""
+
+    def test_inserts_updates_and_keeps_unchanged(self, medications_batch):
+        first, second, *others = medications_batch
+        result = sync_catalog(
+            rows(
+                (first.code, first.label, first.status),
+                (second.code, "Nouveau libellé", second.status),
+                ("NEW1", "Nouveau", "actif"),
+            )
+        )
+        assert result == (1, 1, 0, 1)
+        second.refresh_from_db()
+        assert second.label == "Nouveau libellé"
+        assert Medication.objects.filter(code="NEW1").exists()
+
+    def test_reimport_without_change_writes_nothing(self, medications_batch):
+        catalog = rows(*((m.code, m.label, m.status) for m in medications_batch))
+        version = get_version("medication")
+        with CaptureQueriesContext(connection) as queries:
+            result = sync_catalog(catalog)
+        assert not result.changed
+        assert result.unchanged == len(medications_batch)
+        assert not [
+            q
+            for q in queries
+            if not q["sql"].startswith(("SELECT", "SAVEPOINT", "RELEASE"))
+        ]
+        assert get_version("medication") == version
+
+    def test_retire_missing(self, medications_batch):
+        kept = medications_batch[0]
+        result = sync_catalog(
+            rows((kept.code, kept.label, kept.status)), retire_missing=True
+        )
+        assert result.retired == len(medications_batch) - 1
+        assert set(
+            Medication.objects.filter(status=Medication.STATUS_SUPPR).values_list(
+                "code", flat=True
+            )
+        ) == {m.code for m in medications_batch[1:]}
+
+    def test_dry_run(self, medications_batch):
+        result = sync_catalog(rows(("NEW1", "Nouveau", "actif")), dry_run=True)
+        assert result.created == 1
+        assert not Medication.objects.filter(code="NEW1").exists()
+
+    def test_changes_refresh_in_memory_catalog(self, medication):
+        assert get_catalog().get_by_code("NEW1") is None
+        sync_catalog(rows(("NEW1", "Nouveau", "actif")))
+        assert get_catalog().get_by_code("NEW1") is not None
+
+    def test_batches(self):
+        catalog = rows(*((f"C{n}", f"Médicament {n}", "actif") for n in range(7)))
+        with CaptureQueriesContext(connection) as queries:
+            sync_catalog(catalog, batch_size=3)
+        inserts = [
+            q
+            for q in queries
+            if q["sql"].startswith('INSERT INTO "medical_medication"')
+        ]
+        assert len(inserts) == 3
+        assert Medication.objects.count() == 7
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestImportMedicationsCommand:
+    """Commande import_medications."""
+
+    def test_import(self, tmp_path):
+        path = tmp_path / "catalogue.csv"
+        path.write_text("\ufeffcode,label,status\nA1,Doliprane,actif\n", "utf-8")
+        out = StringIO()
+        call_command("import_medications", str(path), stdout=out)
+        assert "1 created, 0 updated, 0 retired, 0 unchanged" in out.getvalue()
+        call_command("import_medications", str(path), stdout=out)
+        assert "0 created, 0 updated, 0 retired, 1 unchanged" in out.getvalue()
+
+    def test_invalid_file_rolls_back(self, tmp_path):
+        path = tmp_path / "catalogue.csv"
+        path.write_text("code,label\nA1,Doliprane\nA1,Doublon\n")
+        with pytest.raises(CommandError, match="en double"):
+            call_command("import_medications", str(path), "--batch-size", "1")
+        assert not Medication.objects.exists()
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(CommandError):
+            call_command("import_medications", str(tmp_path / "absent.csv"))
@@ -0,0 +1,53 @@
+"""
+Garde-fous contre les requêtes par ligne (N+1) sur les actions des médicaments.
+"""
+
+import pytest
+from django.urls import reverse
+
+from medical.models import Medication
+from medical.tests.factories import MedicationFactory
+from medical.tests.queries import assert_constant_queries
+
+LIST = reverse("medication-list")
+
+
+def with_rows(size: int) -> list[int]:
+    """Complète la table jusqu'à ``size`` médicaments et retourne leurs
+    identifiants."""
+    missing = size - Medication.objects.count()
+    MedicationFactory.create_batch(max(missing, 0))
+    return list(Medication.objects.values_list("id", flat=True))
+
+
+@pytest.fixture(autouse=True)
+def without_response_cache(settings):
+    """Le cache des réponses masquerait les requêtes du second appel."""
+    settings.MEDICAL_RESPONSE_CACHE_ENABLED = False
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestMedicationQueryCounts:
+    """Nombre de requêtes indépendant du nombre de lignes et de la page."""
+
+    def test_list_with_growing_rows(self, api_client):
+        def prepare(size):
+            with_rows(size)
+            return lambda: api_client.get(LIST, {"page_size": 100})
+
+        assert_constant_queries(prepare)
+
+    def test_list_with_growing_page_size(self, api_client):
+        with_rows(12)
+        assert_constant_queries(
+            lambda size: lambda: api_client.get(LIST, {"page_size": size}),
+            sizes=(2, 10),
+        )
+
+    def test_retrieve(self, api_client):
+        def prepare(size):
+            pk = with_rows(size)[0]
+            return lambda: api_client.get(reverse("medication-detail", args=[pk]))
+
+        assert_constant_queries(prepare)
@@ -0,0 +1,56 @@
+"""
+Garde-fous contre les requêtes par ligne (N+1) sur les actions des patients.
+"""
+
+import pytest
+from django.urls import reverse
+
+from medical.models import Patient
+from medical.tests.factories import PrescriptionFactory
+from medical.tests.queries import assert_constant_queries
+
+LIST = reverse("patient-list")
+EXPAND = {"expand": "prescription_summary"}
+
+
+def with_rows(size: int) -> list[int]:
+    """Complète la table jusqu'à ``size`` patients ayant chacun une
+    prescription (donc un résumé) et retourne leurs identifiants."""
+    missing = size - Patient.objects.count()
+    PrescriptionFactory.create_batch(max(missing, 0))
+    return list(Patient.objects.values_list("id", flat=True))
+
+
+@pytest.fixture(autouse=True)
+def without_response_cache(settings):
+    """Le cache des réponses masquerait les requêtes du second appel."""
+    settings.MEDICAL_RESPONSE_CACHE_ENABLED = False
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestPatientQueryCounts:
+    """Nombre de requêtes indépendant du nombre de lignes et de la page."""
+
+    @pytest.mark.parametrize("params", [{}, EXPAND])
+    def test_list_with_growing_rows(self, api_client, params):
+        def prepare(size):
+            with_rows(size)
+            return lambda: api_client.get(LIST, {"page_size": 100, **params})
+
+        assert_constant_queries(prepare)
+
+    def test_list_with_growing_page_size(self, api_client):
+        with_rows(12)
+        assert_constant_queries(
+            lambda size: lambda: api_client.get(LIST, {"page_size": size, **EXPAND}),
+            sizes=(2, 10),
+        )
+
+    @pytest.mark.parametrize("params", [{}, EXPAND])
+    def test_retrieve(self, api_client, params):
+        def prepare(size):
+            pk = with_rows(size)[0]
+            return lambda: api_client.get(reverse("patient-detail", args=[pk]), params)
+
+        assert_constant_queries(prepare)
@@ -0,0 +1,219 @@
+"""
+Tests unitaires pour le résumé matérialisé des prescriptions par patient.
+"""
+
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.db import DatabaseError, connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from medical.models import PatientPrescriptionSummary, Prescription
+from medical.signals import mute_changes
+from medical.tests.factories import (
+    MedicationFactory,
+    PatientFactory,
+    PrescriptionFactory,
+)
+
+
+def summary_of(patient):
+    return PatientPrescriptionSummary.objects.get(patient=patient)
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestSummaryMaintenance:
+    """Tests de la mise à jour incrémentale des résumés."""
+
+    def test_create_builds_summary(self, patient):
+        prescription = PrescriptionFactory(patient=patient)
+        PrescriptionFactory(patient=patient, status=Prescription.STATUS_EN_ATTENTE)
+
+        summary = summary_of(patient)
+        assert summary.valid_count == 1
+        assert summary.pending_count == 1
+        assert summary.active_until == prescription.end_date
+        assert summary.is_active
+
+    def test_last_prescription_ignores_suppr(self, patient):
+        older = PrescriptionFactory(
+            patient=patient,
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 2, 1),
+        )
+        PrescriptionFactory(
+            patient=patient,
+            start_date=date(2024, 6, 1),
+            end_date=date(2024, 7, 1),
+            status=Prescription.STATUS_SUPPR,
+        )
+
+        summary = summary_of(patient)
+        assert summary.last_prescription_id == older.id
+        assert summary.last_medication_id == older.medication_id
+        assert summary.last_start_date == date(2024, 1, 1)
+
+    def test_status_update_is_reflected(self, patient):
+        prescription = PrescriptionFactory(patient=patient)
+        prescription.status = Prescription.STATUS_EN_ATTENTE
+        prescription.save()
+
+        summary = summary_of(patient)
+        assert summary.valid_count == 0
+        assert summary.pending_count == 1
+
+    def test_moving_prescription_refreshes_both_patients(self, patient):
+        other = PatientFactory()
+        prescription = PrescriptionFactory(patient=patient)
+        loaded = Prescription.objects.get(pk=prescription.pk)
+        loaded.patient = other
+        loaded.save()
+
+        assert summary_of(patient).valid_count == 0
+        assert summary_of(other).valid_count == 1
+
+    def test_delete_is_reflected(self, patient):
+        prescription = PrescriptionFactory(patient=patient)
+        prescription.delete()
+
+        summary = summary_of(patient)
+        assert summary.valid_count == 0
+        assert summary.last_prescription_id is None
+
+    def test_queryset_update_is_reflected(self, patient):
+        PrescriptionFactory.create_batch(3, patient=patient)
+        Prescription.objects.filter(patient=patient).update(
+            status=Prescription.STATUS_EN_ATTENTE
+        )
+
+        summary = summary_of(patient)
+        assert summary.valid_count == 0
+        assert summary.pending_count == 3
+
+    def test_queryset_delete_is_reflected(self, patient):
+        PrescriptionFactory.create_batch(3, patient=patient)
+        Prescription.objects.filter(patient=patient).delete()
+
+        assert summary_of(patient).valid_count == 0
+
+    def test_bulk_create_and_bulk_update_are_reflected(self, patient):
+        medication = MedicationFactory()
+        today = date.today()
+        created = Prescription.objects.bulk_create(
+            [
+                Prescription(
+                    patient=patient,
+                    medication=medication,
+                    start_date=today,
+                    end_date=today + timedelta(days=5),
+                    status=Prescription.STATUS_EN_ATTENTE,
+                )
+                for _ in range(2)
+            ]
+        )
+        assert summary_of(patient).pending_count == 2
+
+        for prescription in created:
+            prescription.status = Prescription.STATUS_VALIDE
+        Prescription.objects.bulk_update(created, ["status"])
+
+        summary = summary_of(patient)
+        assert summary.valid_count == 2
+        assert summary.pending_count == 0
+
+    def test_deleting_patient_removes_summary(self, patient):
+        PrescriptionFactory(patient=patient)
+        patient.delete()
+
+        assert not PatientPrescriptionSummary.objects.exists()
+
+    def test_deleting_medication_refreshes_patients(self, patient):
+        medication = MedicationFactory()
+        PrescriptionFactory(patient=patient, medication=medication)
+        medication.delete()
+
+        assert summary_of(patient).valid_count == 0
+
+    def test_cascade_is_notified_once(self):
+        counts = []
+        for size in (2, 8):
+            medication = MedicationFactory()
+            patients = PatientFactory.create_batch(size)
+            for patient in patients:
+                PrescriptionFactory(patient=patient, medication=medication)
+            with CaptureQueriesContext(connection) as context:
+                medication.delete()
+            counts.append(len(context))
+            assert all(summary_of(patient).valid_count == 0 for patient in patients)
+        assert counts[0] == counts[1]
+
+    def test_failed_cascade_does_not_hold_later_changes(self, patient):
+        medication = MedicationFactory()
+        PrescriptionFactory(patient=patient, medication=medication)
+        with mock.patch(
+            "django.db.models.sql.DeleteQuery.delete_batch",
+            side_effect=DatabaseError,
+        ):
+            with pytest.raises(DatabaseError), transaction.atomic():
+                medication.delete()
+        PrescriptionFactory(patient=patient)
+
+        assert summary_of(patient).valid_count == 2
+
+    def test_muted_changes_are_not_applied(self, patient):
+        with mute_changes():
+            PrescriptionFactory(patient=patient)
+
+        assert not PatientPrescriptionSummary.objects.exists()
+
+    def test_rebuild_command_recomputes_all(self, patients_batch):
+        with mute_changes():
+            for patient in patients_batch:
+                PrescriptionFactory(patient=patient)
+        out = StringIO()
+
+        call_command("rebuild_prescription_summaries", "--batch-size", "2", stdout=out)
+
+        assert "Rebuilt 5 patient summaries" in out.getvalue()
+        assert PatientPrescriptionSummary.objects.filter(valid_count=1).count() == 5
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestSummaryExpansion:
+    """Tests de l'extension ``prescription_summary`` de l'API patients."""
+
+    def test_summary_not_included_by_default(self, api_client, patient):
+        data = api_client.get(reverse("patient-detail", args=[patient.id])).json()
+
+        assert "prescription_summary" not in data
+
+    def test_summary_included_when_expanded(self, api_client, patient):
+        PrescriptionFactory(patient=patient)
+
+        data = api_client.get(
+            reverse("patient-detail", args=[patient.id]),
+            {"expand": "prescription_summary"},
+        ).json()
+
+        assert data["prescription_summary"]["valid_count"] == 1
+        assert data["prescription_summary"]["is_active"] is True
+
+    def test_summary_is_null_without_prescriptions(self, api_client, patient):
+        data = api_client.get(
+            reverse("patient-list"), {"expand": "prescription_summary"}
+        ).json()
+
+        assert data["results"][0]["prescription_summary"] is None
+
+    def test_unknown_expansion_is_ignored(self, api_client, patient):
+        data = api_client.get(
+            reverse("patient-detail", args=[patient.id]), {"expand": "inconnu"}
+        ).json()
+
+        assert set(data) == {"id", "last_name", "first_name", "birth_date"}
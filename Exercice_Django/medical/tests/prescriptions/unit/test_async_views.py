@@ -0,0 +1,96 @@
+"""
+Tests des vues de lecture asynchrones (/api/async/...).
+"""
+
+import pytest
+from django.urls import reverse
+
+from medical.models import Prescription
+from medical.tests.factories import MedicationFactory, PatientFactory
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestAsyncReadViews:
+    """Les vues asynchrones répondent comme les ViewSets synchrones."""
+
+    @pytest.mark.parametrize(
+        "basename", ["patient", "medication", "prescription"], ids=str
+    )
+    def test_list_matches_sync_view(self, api_client, prescriptions_batch, basename):
+        sync = api_client.get(reverse(f"{basename}-list")).json()
+        data = api_client.get(reverse(f"async-{basename}-list")).json()
+        assert data["count"] == sync["count"]
+        assert data["results"] == sync["results"]
+
+    @pytest.mark.parametrize(
+        "basename", ["patient", "medication", "prescription"], ids=str
+    )
+    def test_retrieve_matches_sync_view(self, api_client, prescription, basename):
+        obj = (
+            prescription
+            if basename == "prescription"
+            else getattr(prescription, basename)
+        )
+        pk = obj.pk
+        sync = api_client.get(reverse(f"{basename}-detail", args=[pk]))
+        response = api_client.get(reverse(f"async-{basename}-detail", args=[pk]))
+        assert response.status_code == 200
+        assert response.json() == sync.json()
+
+    def test_retrieve_unknown_id_returns_404(self, api_client):
+        response = api_client.get(reverse("async-prescription-detail", args=[999999]))
+        assert response.status_code == 404
+        assert "detail" in response.json()
+
+    def test_list_is_paginated_with_links(self, api_client, prescriptions_batch):
+        data = api_client.get(
+            reverse("async-prescription-list"), {"page_size": 4, "page": 2}
+        ).json()
+        assert data["count"] == 10
+        assert len(data["results"]) == 4
+        assert "page=3" in data["next"]
+        assert "page_size=4" in data["previous"]
+
+    def test_page_size_is_capped(self, api_client, prescriptions_batch):
+        sync = api_client.get(reverse("prescription-list"), {"page_size": 1000})
+        data = api_client.get(reverse("async-prescription-list"), {"page_size": 1000})
+        assert len(data.json()["results"]) == len(sync.json()["results"])
+
+    def test_invalid_page_returns_404(self, api_client, prescriptions_batch):
+        response = api_client.get(reverse("async-prescription-list"), {"page": 99})
+        assert response.status_code == 404
+
+    def test_filters_are_applied(self, api_client, prescriptions_batch):
+        target = prescriptions_batch[0]
+        Prescription.objects.filter(pk=target.pk).update(
+            status=Prescription.STATUS_VALIDE
+        )
+        Prescription.objects.exclude(pk=target.pk).update(
+            status=Prescription.STATUS_SUPPR
+        )
+        data = api_client.get(
+            reverse("async-prescription-list"),
+            {"status": Prescription.STATUS_VALIDE, "patient": target.patient_id},
+        ).json()
+        assert [row["id"] for row in data["results"]] == [target.pk]
+
+    def test_invalid_filter_returns_400(self, api_client):
+        response = api_client.get(
+            reverse("async-prescription-list"), {"start_date_gte": "pas-une-date"}
+        )
+        assert response.status_code == 400
+        assert "start_date_gte" in response.json()
+
+    def test_patient_expand_includes_summary(self, api_client):
+        patient = PatientFactory()
+        MedicationFactory()
+        data = api_client.get(
+            reverse("async-patient-list"), {"expand": "prescription_summary"}
+        ).json()
+        assert data["results"][0]["id"] == patient.pk
+        assert "prescription_summary" in data["results"][0]
+
+    def test_write_methods_are_not_allowed(self, api_client):
+        response = api_client.post(reverse("async-medication-list"), {})
+        assert response.status_code == 405
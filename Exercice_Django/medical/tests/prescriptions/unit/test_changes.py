@@ -0,0 +1,150 @@
+"""
+Tests de la synchronisation incrémentale (/api/prescriptions/changes).
+"""
+
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.db import DatabaseError, transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from medical.changelog import changes_since, prune_changes
+from medical.models import Prescription, PrescriptionChangeLog
+
+
+def sync(api_client, **params):
+    response = api_client.get(reverse("prescription-changes"), params)
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestChangeLog:
+    """Alimentation et lecture du journal."""
+
+    def test_every_write_path_is_logged(self, prescription):
+        pk = prescription.pk
+        prescription.status = Prescription.STATUS_SUPPR
+        prescription.save()
+        Prescription.objects.filter(pk=prescription.pk).update(comment="vu")
+        prescription.delete()
+        operations = list(
+            PrescriptionChangeLog.objects.filter(prescription_id=pk).values_list(
+                "operation", flat=True
+            )
+        )
+        assert operations == ["create", "update", "update", "delete"]
+
+    def test_rolled_back_writes_are_not_logged(self, prescription):
+        before = PrescriptionChangeLog.objects.count()
+        with pytest.raises(RuntimeError), transaction.atomic():
+            prescription.save()
+            raise RuntimeError
+        assert PrescriptionChangeLog.objects.count() == before
+
+    def test_write_is_undone_when_logging_fails(self, prescription):
+        pk = prescription.pk
+        writes = [
+            lambda: Prescription.objects.get(pk=pk).save(update_fields=["comment"]),
+            lambda: Prescription.objects.filter(pk=pk).update(comment="vu"),
+            lambda: Prescription.objects.bulk_update(
+                [Prescription(pk=pk, comment="vu")], ["comment"]
+            ),
+            lambda: Prescription.objects.filter(pk=pk).delete(),
+        ]
+        with mock.patch("medical.handlers.record_changes", side_effect=DatabaseError):
+            for write in writes:
+                with pytest.raises(DatabaseError):
+                    write()
+        prescription.refresh_from_db()
+        assert prescription.comment != "vu"
+
+    def test_window_keeps_latest_write_per_prescription(self, prescriptions_batch):
+        first, second = prescriptions_batch[:2]
+        cursor = changes_since(0, limit=1000).cursor
+        first.save()
+        second.save()
+        first.save()
+        window = changes_since(cursor)
+        assert [entry.prescription_id for entry in window.entries] == [
+            second.pk,
+            first.pk,
+        ]
+        assert window.cursor == PrescriptionChangeLog.objects.latest("seq").seq
+
+    def test_prune_keeps_last_entry(self, prescriptions_batch):
+        deleted = prune_changes(timezone.now() + timedelta(days=1))
+        assert deleted == len(prescriptions_batch) - 1
+        assert PrescriptionChangeLog.objects.count() == 1
+
+    def test_prune_command(self, prescriptions_batch):
+        PrescriptionChangeLog.objects.update(
+            created_at=timezone.now() - timedelta(days=60)
+        )
+        out = StringIO()
+        call_command("prune_prescription_changes", "--days", "30", stdout=out)
+        assert f"Deleted {len(prescriptions_batch) - 1}" in out.getvalue()
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestChangesEndpoint:
+    """Endpoint /api/prescriptions/changes."""
+
+    def test_first_sync_returns_cursor_and_reset(self, api_client, prescriptions_batch):
+        data = sync(api_client)
+        assert data["reset"] is True
+        assert data["results"] == []
+        assert data["cursor"] == PrescriptionChangeLog.objects.latest("seq").seq
+
+    def test_no_change_since_cursor(self, api_client, prescriptions_batch):
+        cursor = sync(api_client)["cursor"]
+        data = sync(api_client, since=cursor)
+        assert data == {
+            "cursor": cursor,
+            "reset": False,
+            "has_more": False,
+            "results": [],
+        }
+
+    def test_returns_updates_and_tombstones(self, api_client, prescriptions_batch):
+        updated, deleted = prescriptions_batch[:2]
+        cursor = sync(api_client)["cursor"]
+        updated.status = Prescription.STATUS_SUPPR
+        updated.save()
+        deleted_id = deleted.pk
+        deleted.delete()
+        results = sync(api_client, since=cursor)["results"]
+        assert [(row["id"], row["operation"]) for row in results] == [
+            (updated.pk, "update"),
+            (deleted_id, "delete"),
+        ]
+        assert results[0]["data"]["status"] == Prescription.STATUS_SUPPR
+        assert results[1]["data"] is None
+
+    def test_limit_and_has_more(self, api_client, prescriptions_batch):
+        data = sync(api_client, since=0, limit=4)
+        assert data["has_more"] is True
+        assert len(data["results"]) == 4
+        rest = sync(api_client, since=data["cursor"], limit=100)
+        assert rest["has_more"] is False
+        seen = {row["id"] for row in data["results"] + rest["results"]}
+        assert seen == {prescription.pk for prescription in prescriptions_batch}
+
+    def test_pruned_cursor_requires_reset(self, api_client, prescriptions_batch):
+        prune_changes(timezone.now() + timedelta(days=1))
+        data = sync(api_client, since=0)
+        assert data["reset"] is True
+
+    def test_future_cursor_requires_reset(self, api_client, prescriptions_batch):
+        assert sync(api_client, since=10**12)["reset"] is True
+
+    def test_invalid_cursor_returns_400(self, api_client):
+        response = api_client.get(reverse("prescription-changes"), {"since": "abc"})
+        assert response.status_code == 400
+        assert "since" in response.json()
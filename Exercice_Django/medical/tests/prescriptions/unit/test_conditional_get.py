@@ -0,0 +1,146 @@
+"""
+Tests des requêtes conditionnelles (ETag / Last-Modified / 304) de l'API.
+"""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from medical.models import Prescription
+from medical.tests.factories import PrescriptionFactory
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestConditionalGet:
+    """Tests des validateurs HTTP sur les endpoints de lecture."""
+
+    def test_list_emits_validators(self, api_client, prescriptions_batch):
+        response = api_client.get(reverse("prescription-list"))
+
+        assert response.status_code == 200
+        assert response["ETag"].startswith('"')
+        assert "Last-Modified" in response
+        assert "no-cache" in response["Cache-Control"]
+
+    def test_list_returns_304_when_unchanged(self, api_client, prescriptions_batch):
+        url = reverse("prescription-list")
+        etag = api_client.get(url, {"status": "valide"})["ETag"]
+
+        response = api_client.get(url, {"status": "valide"}, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+        assert not response.content
+
+    def test_etag_depends_on_query_string(self, api_client, prescriptions_batch):
+        url = reverse("prescription-list")
+        first = api_client.get(url, {"page_size": 5})["ETag"]
+        second = api_client.get(url, {"page_size": 6})["ETag"]
+
+        assert first != second
+
+    def test_update_in_scope_changes_etag(self, api_client, prescriptions_batch):
+        url = reverse("prescription-list")
+        etag = api_client.get(url)["ETag"]
+        api_client.patch(
+            reverse("prescription-detail", args=[prescriptions_batch[0].id]),
+            {"comment": "Modifié"},
+            format="json",
+        )
+
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_delete_in_scope_changes_etag(self, api_client, prescriptions_batch):
+        url = reverse("prescription-list")
+        etag = api_client.get(url)["ETag"]
+        prescriptions_batch[0].delete()
+
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_validators_do_not_read_rows(
+        self, api_client, settings, prescriptions_batch
+    ):
+        settings.MEDICAL_RESPONSE_CACHE_ENABLED = False
+        url = reverse("prescription-list")
+        with CaptureQueriesContext(connection) as context:
+            etag = api_client.get(url)["ETag"]
+        assert not any("MAX(" in query["sql"] for query in context.captured_queries)
+
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        assert not any(
+            "medical_prescription" in query["sql"] for query in context.captured_queries
+        )
+
+    def test_write_out_of_scope_changes_etag(self, api_client, prescriptions_batch):
+        url = reverse("prescription-list")
+        params = {"patient": prescriptions_batch[0].patient_id}
+        etag = api_client.get(url, params)["ETag"]
+        outside = Prescription.objects.exclude(
+            patient_id=prescriptions_batch[0].patient_id
+        ).first()
+        outside.comment = "Modifié"
+        outside.save()
+
+        assert api_client.get(url, params, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_related_patient_change_changes_etag(self, api_client, prescription):
+        url = reverse("prescription-detail", args=[prescription.id])
+        etag = api_client.get(url)["ETag"]
+        prescription.patient.last_name = "Nouveau"
+        prescription.patient.save()
+
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_detail_returns_304_when_unchanged(self, api_client, prescription):
+        url = reverse("prescription-detail", args=[prescription.id])
+        etag = api_client.get(url)["ETag"]
+
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    def test_if_modified_since_returns_304(self, api_client, prescription):
+        url = reverse("prescription-detail", args=[prescription.id])
+        last_modified = api_client.get(url)["Last-Modified"]
+
+        response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        assert response.status_code == 304
+
+    def test_unknown_or_invalid_detail_returns_404(self, api_client):
+        assert (
+            api_client.get(reverse("prescription-detail", args=[99999])).status_code
+            == 404
+        )
+        assert api_client.get("/api/prescriptions/abc").status_code == 404
+
+    def test_writes_have_no_validators(self, api_client, prescription):
+        response = api_client.patch(
+            reverse("prescription-detail", args=[prescription.id]),
+            {"comment": "Modifié"},
+            format="json",
+        )
+
+        assert "ETag" not in response
+
+    def test_medication_list_returns_304(self, api_client):
+        PrescriptionFactory()
+        url = reverse("medication-list")
+        etag = api_client.get(url)["ETag"]
+
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    def test_patient_summary_expansion_depends_on_prescriptions(
+        self, api_client, prescription
+    ):
+        url = reverse("patient-detail", args=[prescription.patient_id])
+        params = {"expand": "prescription_summary"}
+        etag = api_client.get(url, params)["ETag"]
+        plain_etag = api_client.get(url)["ETag"]
+        PrescriptionFactory(patient=prescription.patient)
+
+        assert api_client.get(url, params, HTTP_IF_NONE_MATCH=etag).status_code == 200
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=plain_etag).status_code == 304
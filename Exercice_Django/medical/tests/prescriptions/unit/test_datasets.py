@@ -0,0 +1,138 @@
+"""
+Tests de la purge rapide des tables métier et des instantanés SQLite.
+"""
+
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connections, transaction
+from django.db.transaction import TransactionManagementError
+
+from medical.cache import get_catalog, get_version
+from medical.cache.responses import get_cached_response, set_cached_response
+from medical.changelog import changes_since
+from medical.datasets import (
+    flush_medical_data,
+    restore_database,
+    snapshot_database,
+    snapshot_path,
+)
+from medical.models import (
+    Medication,
+    Patient,
+    PatientPrescriptionSummary,
+    Prescription,
+)
+from medical.tests.factories import PatientFactory, PrescriptionFactory
+
+
+def run(*args: str) -> str:
+    out = StringIO()
+    call_command(*args, stdout=out)
+    return out.getvalue()
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestFlushMedicalData:
+    """Purge ensembliste des tables métier."""
+
+    def test_tables_are_emptied(self, prescriptions_batch):
+        flush_medical_data()
+        for model in (PatientPrescriptionSummary, Prescription, Patient, Medication):
+            assert not model.objects.exists()
+
+    def test_sequences_are_reset(self, prescriptions_batch):
+        flush_medical_data()
+        assert PatientFactory().pk == 1
+
+    def test_sequences_can_be_kept(self, prescriptions_batch):
+        last = max(prescription.patient_id for prescription in prescriptions_batch)
+        flush_medical_data(reset_sequences=False)
+        assert PatientFactory().pk > last
+
+    def test_derived_data_is_invalidated(self, prescriptions_batch):
+        version = get_version("prescription")
+        cursor = changes_since(None).cursor
+        assert get_catalog().get(prescriptions_batch[0].medication_id)
+        flush_medical_data()
+        assert get_version("prescription") > version
+        assert changes_since(cursor).reset
+        assert get_catalog().get(prescriptions_batch[0].medication_id) is None
+
+    def test_command(self, prescriptions_batch):
+        assert "Medical tables emptied." in run("reset_medical_data")
+        assert not Prescription.objects.exists()
+
+    @pytest.mark.parametrize("name", ["", "../x", "a/b"])
+    def test_invalid_snapshot_name(self, name):
+        with pytest.raises(ValueError):
+            snapshot_path(name)
+
+    def test_restore_refuses_open_transaction(self, tmp_path):
+        path = tmp_path / "base.sqlite3"
+        snapshot_database(path)
+        with pytest.raises(TransactionManagementError), transaction.atomic():
+            restore_database(path)
+
+
+@pytest.mark.unit
+@pytest.mark.django_db(transaction=True)
+class TestSnapshots:
+    """Sauvegarde et restauration par l'API de sauvegarde SQLite."""
+
+    def test_round_trip(self, tmp_path):
+        kept = PrescriptionFactory().pk
+        path = tmp_path / "base.sqlite3"
+        assert snapshot_database(path) == path.stat().st_size
+        PrescriptionFactory.create_batch(3)
+        Prescription.objects.filter(pk=kept).delete()
+        restore_database(path)
+        assert list(Prescription.objects.values_list("id", flat=True)) == [kept]
+
+    def test_restore_invalidates_versions_and_cursors(self, tmp_path):
+        PrescriptionFactory()
+        path = tmp_path / "base.sqlite3"
+        snapshot_database(path)
+        PrescriptionFactory.create_batch(3)
+        version = get_version("prescription")
+        cursor = changes_since(None).cursor
+        restore_database(path)
+        assert get_version("prescription") > version
+        window = changes_since(cursor)
+        assert window.reset
+        assert window.cursor > cursor
+
+    def test_restore_resets_connections_and_caches(self, tmp_path):
+        path = tmp_path / "base.sqlite3"
+        snapshot_database(path)
+        set_cached_response("liste", "application/json", b"[]", {})
+        with mock.patch.object(
+            connections, "close_all", wraps=connections.close_all
+        ) as close_all:
+            restore_database(path)
+        assert close_all.call_count == 2
+        assert get_cached_response("liste") is None
+
+    def test_restore_missing_file(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            restore_database(tmp_path / "absent.sqlite3")
+
+    def test_command(self, tmp_path, settings):
+        settings.MEDICAL_SNAPSHOT_DIR = tmp_path
+        PrescriptionFactory()
+        assert "Saved" in run("snapshot_db", "save", "bench")
+        assert run("snapshot_db", "list").startswith("bench\t")
+        Prescription.objects.all().delete()
+        assert "Restored" in run("snapshot_db", "restore", "bench")
+        assert Prescription.objects.count() == 1
+
+    @pytest.mark.parametrize(
+        "args", [("save",), ("restore", "absent"), ("save", "a/b")]
+    )
+    def test_command_errors(self, tmp_path, settings, args):
+        settings.MEDICAL_SNAPSHOT_DIR = tmp_path
+        with pytest.raises(CommandError):
+            run("snapshot_db", *args)
@@ -0,0 +1,212 @@
+"""
+Tests du flux Server-Sent Events des changements de prescriptions.
+"""
+
+import asyncio
+import json
+import threading
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+
+from medical.events import ChangeBroadcaster, broadcaster
+from medical.signals import OPERATION_DELETE, OPERATION_UPDATE, PrescriptionChange
+from medical.tests.factories import PrescriptionFactory
+
+
+def change(pk: int, patient_id: int = 1) -> PrescriptionChange:
+    return PrescriptionChange(pk, patient_id, OPERATION_UPDATE, "valide")
+
+
+@pytest.mark.unit
+class TestChangeBroadcaster:
+    """Numérotation, remise et reprise des événements."""
+
+    def test_publish_numbers_events(self):
+        events = ChangeBroadcaster().publish([change(1), change(2)])
+        assert [event.seq for event in events] == [1, 2]
+
+    def test_subscriber_receives_events_published_from_other_thread(self):
+        hub = ChangeBroadcaster()
+
+        async def scenario():
+            subscription, replay = hub.subscribe()
+            thread = threading.Thread(target=hub.publish, args=([change(7)],))
+            thread.start()
+            event = await subscription.get(timeout=2)
+            thread.join()
+            hub.unsubscribe(subscription)
+            return replay, event
+
+        replay, event = asyncio.run(scenario())
+        assert replay == []
+        assert event.change.id == 7
+        assert hub.subscriber_count == 0
+
+    def test_get_returns_none_on_timeout(self):
+        hub = ChangeBroadcaster()
+
+        async def scenario():
+            subscription, _ = hub.subscribe()
+            return await subscription.get(timeout=0.01)
+
+        assert asyncio.run(scenario()) is None
+
+    def test_replay_after_last_event_id(self):
+        hub = ChangeBroadcaster()
+        first, second, third = hub.publish([change(1), change(2), change(3)])
+
+        async def scenario():
+            return hub.subscribe(hub.event_id(first))[1]
+
+        assert asyncio.run(scenario()) == [second, third]
+
+    @pytest.mark.parametrize("last_event_id", ["autre-1", "garbage", None])
+    def test_unknown_last_event_id_requires_reset(self, last_event_id):
+        hub = ChangeBroadcaster()
+        hub.publish([change(1)])
+        if last_event_id is None:
+            last_event_id = f"{hub.epoch}-99"
+
+        async def scenario():
+            return hub.subscribe(last_event_id)[1]
+
+        assert asyncio.run(scenario()) is None
+
+    def test_expired_history_requires_reset(self):
+        hub = ChangeBroadcaster(history=2)
+        first, *_ = hub.publish([change(1), change(2), change(3), change(4)])
+
+        async def scenario():
+            return hub.subscribe(hub.event_id(first))[1]
+
+        assert asyncio.run(scenario()) is None
+
+    def test_overflow_drops_pending_events(self):
+        hub = ChangeBroadcaster(queue_size=2)
+
+        async def scenario():
+            subscription, _ = hub.subscribe()
+            hub.publish([change(1), change(2), change(3)])
+            await asyncio.sleep(0)
+            return subscription
+
+        subscription = asyncio.run(scenario())
+        assert subscription.overflowed
+        assert subscription.queue.empty()
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestBroadcastOnWrite:
+    """Les écritures validées alimentent le diffuseur."""
+
+    def test_committed_save_is_published(self, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            prescription = PrescriptionFactory()
+        event = broadcaster._history[-1]
+        assert event.change.id == prescription.pk
+        assert event.payload()["status"] == prescription.status
+
+    def test_publication_waits_for_commit(self, django_capture_on_commit_callbacks):
+        before = len(broadcaster._history)
+        with django_capture_on_commit_callbacks() as callbacks:
+            PrescriptionFactory()
+        assert len(broadcaster._history) == before
+        assert callbacks
+
+    def test_delete_is_published(
+        self, prescription, django_capture_on_commit_callbacks
+    ):
+        pk = prescription.pk
+        with django_capture_on_commit_callbacks(execute=True):
+            prescription.delete()
+        assert broadcaster._history[-1].payload() == {
+            "id": pk,
+            "operation": OPERATION_DELETE,
+            "status": None,
+            "patient": prescription.patient_id,
+            "previous_patient": None,
+        }
+
+
+async def read_stream(url: str, publish=(), chunks: int = 2, **headers) -> list[str]:
+    """Ouvre le flux, publie ``publish`` depuis un thread et lit ``chunks`` messages."""
+    response = await AsyncClient().get(url, headers=headers)
+    assert response["Content-Type"] == "text/event-stream"
+    stream = response.streaming_content
+    messages = [(await anext(stream)).decode()]
+    if publish:
+        thread = threading.Thread(target=broadcaster.publish, args=(list(publish),))
+        thread.start()
+        thread.join()
+    try:
+        while len(messages) < chunks:
+            messages.append((await asyncio.wait_for(anext(stream), 2)).decode())
+    finally:
+        await stream.aclose()
+    return messages
+
+
+def data(message: str) -> dict:
+    return json.loads(message.split("data: ", 1)[1])
+
+
+@pytest.mark.unit
+class TestPrescriptionEventsView:
+    """Endpoint /api/prescriptions/events."""
+
+    def test_stream_starts_with_retry(self):
+        messages = async_to_sync(read_stream)(reverse("prescription-events"), chunks=1)
+        assert messages[0].startswith("retry: ")
+
+    def test_stream_pushes_published_changes(self):
+        messages = async_to_sync(read_stream)(
+            reverse("prescription-events"), publish=[change(42, patient_id=3)]
+        )
+        assert "event: prescription" in messages[1]
+        assert f"id: {broadcaster.epoch}-" in messages[1]
+        assert data(messages[1])["id"] == 42
+
+    def test_patient_filter(self):
+        messages = async_to_sync(read_stream)(
+            reverse("prescription-events") + "?patient=5",
+            publish=[change(1, patient_id=4), change(2, patient_id=5)],
+        )
+        assert data(messages[1])["id"] == 2
+
+    def test_reconnection_replays_missed_events(self):
+        (first,) = broadcaster.publish([change(10)])
+        broadcaster.publish([change(11)])
+        messages = async_to_sync(read_stream)(
+            reverse("prescription-events"),
+            last_event_id=broadcaster.event_id(first),
+        )
+        assert data(messages[1])["id"] == 11
+
+    def test_unknown_last_event_id_sends_reset(self):
+        messages = async_to_sync(read_stream)(
+            reverse("prescription-events"), last_event_id="inconnu-1"
+        )
+        assert messages[1].startswith("event: reset")
+
+    def test_heartbeat(self, settings):
+        settings.MEDICAL_EVENTS_HEARTBEAT = 0.01
+        messages = async_to_sync(read_stream)(reverse("prescription-events"))
+        assert messages[1] == ": keepalive\n\n"
+
+    def test_overflow_sends_reset(self, settings):
+        settings.MEDICAL_EVENTS_HEARTBEAT = 0.05
+        size = broadcaster.queue_size
+        broadcaster.queue_size = 1
+        try:
+            messages = async_to_sync(read_stream)(
+                reverse("prescription-events"),
+                publish=[change(1), change(2)],
+                chunks=3,
+            )
+        finally:
+            broadcaster.queue_size = size
+        assert messages[1].startswith("event: reset")
@@ -0,0 +1,129 @@
+"""
+Tests de l'export CSV / Parquet des prescriptions (/api/prescriptions/export).
+"""
+
+import csv
+import gzip
+import io
+from unittest import mock
+
+import pytest
+from django.urls import reverse
+
+from medical.exports import (
+    PRESCRIPTION_COLUMNS,
+    export_rows,
+    gzip_stream,
+    iter_csv,
+    writers,
+)
+from medical.models import Prescription
+
+
+def download(api_client, **params):
+    response = api_client.get(reverse("prescription-export"), params)
+    assert response.status_code == 200
+    return response, b"".join(response.streaming_content)
+
+
+def read_csv(body: bytes) -> list[dict[str, str]]:
+    return list(csv.DictReader(io.StringIO(body.decode())))
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestExportEndpoint:
+    """Extraits complets des prescriptions filtrées."""
+
+    def test_csv_contains_every_row_with_flattened_columns(
+        self, api_client, prescriptions_batch
+    ):
+        response, body = download(api_client)
+        assert response["Content-Type"] == "text/csv; charset=utf-8"
+        assert "attachment;" in response["Content-Disposition"]
+        rows = read_csv(body)
+        assert [int(row["id"]) for row in rows] == sorted(
+            prescription.pk for prescription in prescriptions_batch
+        )
+        first = prescriptions_batch[0]
+        row = next(row for row in rows if row["id"] == str(first.pk))
+        assert row["patient_last_name"] == first.patient.last_name
+        assert row["medication_code"] == first.medication.code
+        assert row["start_date"] == first.start_date.isoformat()
+        assert "T" in row["updated_at"]
+
+    def test_filters_are_applied(self, api_client, prescriptions_batch):
+        patient_id = prescriptions_batch[0].patient_id
+        _, body = download(api_client, patient=patient_id)
+        rows = read_csv(body)
+        assert rows
+        assert {row["patient_id"] for row in rows} == {str(patient_id)}
+
+    def test_invalid_filter_returns_400(self, api_client):
+        response = api_client.get(
+            reverse("prescription-export"), {"start_date_gte": "hier"}
+        )
+        assert response.status_code == 400
+
+    def test_gzip_when_accepted(self, api_client, prescriptions_batch):
+        response = api_client.get(
+            reverse("prescription-export"), HTTP_ACCEPT_ENCODING="gzip"
+        )
+        assert response["Content-Encoding"] == "gzip"
+        body = gzip.decompress(b"".join(response.streaming_content))
+        assert len(read_csv(body)) == len(prescriptions_batch)
+
+    def test_accept_header_does_not_trigger_406(self, api_client, prescriptions_batch):
+        response = api_client.get(
+            reverse("prescription-export"), HTTP_ACCEPT="text/csv"
+        )
+        assert response.status_code == 200
+
+    def test_unknown_file_format_returns_400(self, api_client):
+        response = api_client.get(
+            reverse("prescription-export"), {"file_format": "xlsx"}
+        )
+        assert response.status_code == 400
+        assert "file_format" in response.json()
+
+    def test_parquet_without_pyarrow_returns_400(self, api_client):
+        with mock.patch(
+            "medical.serializers.exports.parquet_available", return_value=False
+        ):
+            response = api_client.get(
+                reverse("prescription-export"), {"file_format": "parquet"}
+            )
+        assert response.status_code == 400
+
+    def test_parquet(self, api_client, prescriptions_batch, monkeypatch):
+        pq = pytest.importorskip("pyarrow.parquet")
+        monkeypatch.setattr(writers, "PARQUET_ROW_GROUP_SIZE", 4)
+        response, body = download(api_client, file_format="parquet")
+        table = pq.read_table(io.BytesIO(body))
+        assert table.num_rows == len(prescriptions_batch)
+        assert table.column_names == [column.name for column in PRESCRIPTION_COLUMNS]
+        assert pq.ParquetFile(io.BytesIO(body)).num_row_groups == 3
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestExportWriters:
+    """Encodeurs en flux."""
+
+    def test_csv_is_flushed_in_blocks(self, prescriptions_batch, monkeypatch):
+        monkeypatch.setattr(writers, "CSV_FLUSH_ROWS", 3)
+        rows = export_rows(Prescription.objects.all(), chunk_size=2)
+        blocks = list(iter_csv(rows, PRESCRIPTION_COLUMNS))
+        assert len(blocks) == 4
+        assert len(read_csv(b"".join(blocks))) == len(prescriptions_batch)
+
+    def test_empty_export_has_header_only(self):
+        body = b"".join(
+            iter_csv(export_rows(Prescription.objects.all()), PRESCRIPTION_COLUMNS)
+        )
+        assert body.decode().strip() == ",".join(c.name for c in PRESCRIPTION_COLUMNS)
+
+    def test_gzip_stream_round_trip(self):
+        assert gzip.decompress(b"".join(gzip_stream([b"a" * 1000, b"b"]))) == (
+            b"a" * 1000 + b"b"
+        )
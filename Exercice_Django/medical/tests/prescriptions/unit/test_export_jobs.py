@@ -0,0 +1,280 @@
+"""
+Tests des exports en arrière-plan (/api/exports) et de leur téléchargement.
+"""
+
+import csv
+import gzip
+import io
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from medical.exports import (
+    RangeNotSatisfiable,
+    fail_stale_exports,
+    parse_range,
+    run_export,
+)
+from medical.exports import jobs
+from medical.models import ExportJob
+
+
+@pytest.fixture(autouse=True)
+def export_settings(settings, tmp_path):
+    """Exécute les jobs sans pool, dans un répertoire temporaire."""
+    settings.MEDICAL_EXPORT_DIR = tmp_path
+    settings.MEDICAL_EXPORT_WORKERS = 0
+    return settings
+
+
+@pytest.fixture
+def submit(api_client, django_capture_on_commit_callbacks):
+    """Soumet un export et l'exécute à la validation de la transaction."""
+
+    def submit(**payload):
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.post(reverse("export-list"), payload, format="json")
+        assert response.status_code == 202, response.content
+        return api_client.get(response["Location"]).json()
+
+    return submit
+
+
+def read_csv(content: bytes) -> list[dict[str, str]]:
+    return list(csv.DictReader(io.StringIO(gzip.decompress(content).decode())))
+
+
+@pytest.mark.unit
+class TestParseRange:
+    """Interprétation de l'en-tête Range."""
+
+    @pytest.mark.parametrize(
+        "header, expected",
+        [
+            ("bytes=0-9", (0, 9)),
+            ("bytes=10-", (10, 99)),
+            ("bytes=90-500", (90, 99)),
+            ("bytes=-10", (90, 99)),
+            ("bytes=-500", (0, 99)),
+            (None, None),
+            ("bytes=5-2", None),
+            ("bytes=0-1,5-6", None),
+            ("items=0-1", None),
+            ("bytes=-", None),
+        ],
+    )
+    def test_parse(self, header, expected):
+        assert parse_range(header, 100) == expected
+
+    @pytest.mark.parametrize("header", ["bytes=100-", "bytes=-0"])
+    def test_unsatisfiable(self, header):
+        with pytest.raises(RangeNotSatisfiable):
+            parse_range(header, 100)
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestExportJobs:
+    """Soumission, exécution et suivi des jobs."""
+
+    def test_csv_job_writes_filtered_rows(
+        self, api_client, submit, prescriptions_batch
+    ):
+        patient_id = prescriptions_batch[0].patient_id
+        job = submit(filters={"patient": patient_id})
+        assert job["status"] == ExportJob.STATUS_DONE
+        assert job["progress"] == 1.0
+        expected = [p.pk for p in prescriptions_batch if p.patient_id == patient_id]
+        assert job["total_rows"] == job["rows_written"] == len(expected)
+        content = b"".join(api_client.get(job["download_url"]).streaming_content)
+        assert len(content) == job["size"]
+        rows = read_csv(content)
+        assert sorted(int(row["id"]) for row in rows) == sorted(expected)
+
+    def test_parquet_job(self, submit, prescriptions_batch):
+        pq = pytest.importorskip("pyarrow.parquet")
+        job = submit(file_format="parquet")
+        path = ExportJob.objects.get(pk=job["id"]).path
+        assert pq.read_table(path).num_rows == len(prescriptions_batch)
+
+    def test_progress_is_reported(self, monkeypatch):
+        monkeypatch.setattr(jobs, "PROGRESS_ROWS", 4)
+        job = ExportJob.objects.create(file_format="csv", total_rows=10)
+        rows = iter(jobs._Progress(job.pk, iter([(n,) for n in range(10)])))
+        for _ in range(5):
+            next(rows)
+        job.refresh_from_db()
+        assert job.rows_written == 4
+        assert job.progressed_at > job.created_at
+        assert job.progress == 0.4
+
+    def test_invalid_filters_are_rejected(self, api_client):
+        url = reverse("export-list")
+        for filters in ({"status": "inconnu"}, {"nom": "x"}):
+            response = api_client.post(url, {"filters": filters}, format="json")
+            assert response.status_code == 400
+            assert "filters" in response.json()
+        assert not ExportJob.objects.exists()
+
+    def test_failed_job_records_error(self, monkeypatch, prescriptions_batch):
+        job = ExportJob.objects.create(file_format="csv")
+
+        def boom(*args, **kwargs):
+            raise RuntimeError("disque plein")
+
+        monkeypatch.setattr(jobs, "iter_csv", boom)
+        run_export(job.pk)
+        job.refresh_from_db()
+        assert job.status == ExportJob.STATUS_FAILED
+        assert job.error == "disque plein"
+        assert job.expires_at is not None
+
+    def test_job_runs_once(self, prescriptions_batch):
+        job = ExportJob.objects.create(file_format="csv")
+        run_export(job.pk)
+        job.refresh_from_db()
+        finished_at = job.finished_at
+        run_export(job.pk)
+        job.refresh_from_db()
+        assert job.finished_at == finished_at
+
+    def test_destroy_removes_file(self, api_client, submit, prescriptions_batch):
+        job = submit()
+        path = ExportJob.objects.get(pk=job["id"]).path
+        assert path.is_file()
+        response = api_client.delete(reverse("export-detail", args=[job["id"]]))
+        assert response.status_code == 204
+        assert not path.exists()
+
+    def test_expired_exports_are_purged(self, submit, prescriptions_batch):
+        job = submit()
+        path = ExportJob.objects.get(pk=job["id"]).path
+        ExportJob.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        out = StringIO()
+        call_command("purge_exports", stdout=out)
+        assert "Deleted 1 expired exports" in out.getvalue()
+        assert not path.exists()
+        assert not ExportJob.objects.exists()
+
+    def test_abandoned_jobs_fail_then_expire(self, export_settings):
+        stale = ExportJob.objects.create(
+            file_format="csv", status=ExportJob.STATUS_RUNNING
+        )
+        recent = ExportJob.objects.create(file_format="csv")
+        ExportJob.objects.filter(pk=stale.pk).update(
+            progressed_at=timezone.now() - timedelta(hours=2)
+        )
+        part = export_settings.MEDICAL_EXPORT_DIR / f"{stale.pk.hex}.csv.gz.part"
+        part.write_bytes(b"partiel")
+        call_command("purge_exports", stdout=StringIO())
+        stale.refresh_from_db()
+        assert stale.status == ExportJob.STATUS_FAILED
+        assert stale.error == jobs.STALE_ERROR
+        assert stale.expires_at is not None
+        assert not part.exists()
+        recent.refresh_from_db()
+        assert recent.status == ExportJob.STATUS_PENDING
+
+    def test_old_job_still_progressing_survives_submit(
+        self, api_client, monkeypatch, prescriptions_batch
+    ):
+        job = ExportJob.objects.create(file_format="csv")
+        ExportJob.objects.filter(pk=job.pk).update(
+            created_at=timezone.now() - timedelta(hours=2)
+        )
+        iter_csv = jobs.iter_csv
+
+        def submitted_meanwhile(*args, **kwargs):
+            response = api_client.post(reverse("export-list"), {}, format="json")
+            assert response.status_code == 202
+            return iter_csv(*args, **kwargs)
+
+        monkeypatch.setattr(jobs, "iter_csv", submitted_meanwhile)
+        run_export(job.pk)
+        job.refresh_from_db()
+        assert job.status == ExportJob.STATUS_DONE
+        assert job.path.is_file()
+
+    def test_job_failed_as_stale_is_not_completed(
+        self, export_settings, monkeypatch, prescriptions_batch
+    ):
+        export_settings.MEDICAL_EXPORT_TIMEOUT = -1
+        job = ExportJob.objects.create(file_format="csv")
+        iter_csv = jobs.iter_csv
+
+        def interrupted(*args, **kwargs):
+            fail_stale_exports()
+            return iter_csv(*args, **kwargs)
+
+        monkeypatch.setattr(jobs, "iter_csv", interrupted)
+        run_export(job.pk)
+        job.refresh_from_db()
+        assert job.status == ExportJob.STATUS_FAILED
+        assert job.error == jobs.STALE_ERROR
+        assert not any(export_settings.MEDICAL_EXPORT_DIR.iterdir())
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestExportDownload:
+    """Téléchargement complet, par plages et cas d'erreur."""
+
+    def test_full_download_advertises_ranges(
+        self, api_client, submit, prescriptions_batch
+    ):
+        job = submit()
+        response = api_client.get(job["download_url"])
+        assert response.status_code == 200
+        assert response["Accept-Ranges"] == "bytes"
+        assert response["Content-Type"] == "application/gzip"
+        assert ".csv.gz" in response["Content-Disposition"]
+        assert response["ETag"]
+
+    def test_resume_with_range(self, api_client, submit, prescriptions_batch):
+        job = submit()
+        url = job["download_url"]
+        full = b"".join(api_client.get(url).streaming_content)
+        head = b"".join(api_client.get(url, HTTP_RANGE="bytes=0-99").streaming_content)
+        response = api_client.get(url, HTTP_RANGE="bytes=100-")
+        assert response.status_code == 206
+        assert response["Content-Range"] == f"bytes 100-{len(full) - 1}/{len(full)}"
+        assert int(response["Content-Length"]) == len(full) - 100
+        assert head + b"".join(response.streaming_content) == full
+
+    def test_if_range_mismatch_sends_full_file(
+        self, api_client, submit, prescriptions_batch
+    ):
+        job = submit()
+        response = api_client.get(
+            job["download_url"], HTTP_RANGE="bytes=10-", HTTP_IF_RANGE='"ancien"'
+        )
+        assert response.status_code == 200
+
+    def test_if_range_match_sends_range(self, api_client, submit, prescriptions_batch):
+        job = submit()
+        etag = api_client.get(job["download_url"])["ETag"]
+        response = api_client.get(
+            job["download_url"], HTTP_RANGE="bytes=10-", HTTP_IF_RANGE=etag
+        )
+        assert response.status_code == 206
+
+    def test_unsatisfiable_range(self, api_client, submit, prescriptions_batch):
+        job = submit()
+        response = api_client.get(job["download_url"], HTTP_RANGE="bytes=999999-")
+        assert response.status_code == 416
+        assert response["Content-Range"] == f"bytes */{job['size']}"
+
+    def test_pending_job_returns_409(self, api_client):
+        job = ExportJob.objects.create(file_format="csv")
+        response = api_client.get(reverse("export-download", args=[job.pk]))
+        assert response.status_code == 409
+
+    def test_missing_file_returns_410(self, api_client, submit, prescriptions_batch):
+        job = submit()
+        ExportJob.objects.get(pk=job["id"]).path.unlink()
+        response = api_client.get(job["download_url"])
+        assert response.status_code == 410
@@ -0,0 +1,151 @@
+"""
+Tests de l'export NDJSON des ressources FHIR (endpoint et commande export_fhir).
+"""
+
+import gzip
+import json
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from medical.fhir import RESOURCE_TYPES, export_bulk, id_ranges, iter_ndjson
+from medical.fhir import bulk
+from medical.models import Prescription
+
+
+def ndjson(content: bytes) -> list[dict]:
+    return [json.loads(line) for line in content.decode().splitlines()]
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestFhirResources:
+    """Correspondance des modèles avec les ressources FHIR."""
+
+    def test_medication_request(self, prescription):
+        resource = next(bulk.iter_resources(RESOURCE_TYPES["MedicationRequest"]))
+        assert resource["resourceType"] == "MedicationRequest"
+        assert resource["id"] == str(prescription.pk)
+        assert resource["subject"] == {
+            "reference": f"Patient/{prescription.patient_id}"
+        }
+        assert resource["medicationReference"] == {
+            "reference": f"Medication/{prescription.medication_id}"
+        }
+        period = resource["dosageInstruction"][0]["timing"]["repeat"]["boundsPeriod"]
+        assert period == {
+            "start": prescription.start_date.isoformat(),
+            "end": prescription.end_date.isoformat(),
+        }
+        assert resource["intent"] == "order"
+
+    def test_statuses(self, prescription):
+        prescription.status = Prescription.STATUS_SUPPR
+        prescription.save()
+        resource = next(bulk.iter_resources(RESOURCE_TYPES["MedicationRequest"]))
+        assert resource["status"] == "cancelled"
+
+    def test_patient_and_medication(self, patient, medication):
+        (patient_resource,) = bulk.iter_resources(RESOURCE_TYPES["Patient"])
+        assert patient_resource["name"] == [
+            {"family": patient.last_name, "given": [patient.first_name]}
+        ]
+        (medication_resource,) = bulk.iter_resources(RESOURCE_TYPES["Medication"])
+        assert medication_resource["code"]["coding"][0]["code"] == medication.code
+        assert medication_resource["status"] == "active"
+
+
+@pytest.mark.unit
+class TestNdjsonEncoder:
+    """Encodage NDJSON par blocs."""
+
+    def test_blocks_are_bounded(self, monkeypatch):
+        monkeypatch.setattr(bulk, "NDJSON_BATCH_SIZE", 3)
+        blocks = list(iter_ndjson({"id": str(n)} for n in range(7)))
+        assert len(blocks) == 3
+        assert [row["id"] for row in ndjson(b"".join(blocks))] == [
+            str(n) for n in range(7)
+        ]
+
+    def test_empty(self):
+        assert list(iter_ndjson([])) == []
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestBulkExport:
+    """Découpage par plages et écriture des fichiers."""
+
+    def test_id_ranges_cover_table(self, prescriptions_batch):
+        ids = sorted(p.pk for p in prescriptions_batch)
+        ranges = id_ranges(RESOURCE_TYPES["MedicationRequest"], chunk_size=3)
+        assert ranges[0][0] == ids[0]
+        assert ranges[-1][1] == ids[-1] + 1
+        assert all(stop - start <= 3 for start, stop in ranges)
+
+    def test_export_writes_one_file_per_range(self, tmp_path, prescriptions_batch):
+        manifest = export_bulk(tmp_path, chunk_size=4, workers=1)
+        requests = [e for e in manifest["output"] if e["type"] == "MedicationRequest"]
+        assert len(requests) == 3
+        ids = [
+            resource["id"]
+            for entry in requests
+            for resource in ndjson((tmp_path / entry["url"]).read_bytes())
+        ]
+        assert sorted(ids) == sorted(str(p.pk) for p in prescriptions_batch)
+        assert sum(entry["count"] for entry in requests) == len(prescriptions_batch)
+
+    def test_since_filters_resources(self, tmp_path, prescriptions_batch):
+        manifest = export_bulk(
+            tmp_path,
+            types=["MedicationRequest"],
+            since=timezone.now() + timedelta(days=1),
+        )
+        assert manifest["output"] == []
+
+    def test_command_writes_manifest(self, tmp_path, prescriptions_batch):
+        out = StringIO()
+        call_command(
+            "export_fhir",
+            "--output",
+            str(tmp_path),
+            "--type",
+            "Patient",
+            "--workers",
+            "1",
+            stdout=out,
+        )
+        manifest = json.loads((tmp_path / "manifest.json").read_text())
+        assert {entry["type"] for entry in manifest["output"]} == {"Patient"}
+        assert "Exported 5 resources" in out.getvalue()
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestFhirExportView:
+    """Endpoint /api/fhir/$export."""
+
+    def test_streams_medication_requests(self, api_client, prescriptions_batch):
+        response = api_client.get(reverse("fhir-export"))
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/fhir+ndjson"
+        resources = ndjson(b"".join(response.streaming_content))
+        assert len(resources) == len(prescriptions_batch)
+
+    def test_type_and_gzip(self, api_client, prescriptions_batch):
+        response = api_client.get(
+            reverse("fhir-export"),
+            {"_type": "Patient"},
+            HTTP_ACCEPT_ENCODING="gzip",
+        )
+        assert response["Content-Encoding"] == "gzip"
+        content = gzip.decompress(b"".join(response.streaming_content))
+        assert {r["resourceType"] for r in ndjson(content)} == {"Patient"}
+
+    def test_unknown_type_returns_400(self, api_client):
+        response = api_client.get(reverse("fhir-export"), {"_type": "Observation"})
+        assert response.status_code == 400
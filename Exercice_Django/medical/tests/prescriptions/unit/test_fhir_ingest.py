@@ -0,0 +1,254 @@
+"""
+Tests de l'ingestion de MedicationRequest FHIR (commande ingest_fhir).
+"""
+
+import gzip
+import io
+import json
+from io import StringIO
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.core.management import CommandError, call_command
+
+from medical.fhir import (
+    MEDICATION_CODE_SYSTEM,
+    ingest_medication_requests,
+    iter_bundle_resources,
+    iter_ndjson_resources,
+)
+from medical.models import (
+    PatientPrescriptionSummary,
+    Prescription,
+    PrescriptionChangeLog,
+)
+from medical.signals import OPERATION_CREATE, OPERATION_UPDATE
+
+
+def request(pk="r1", patient=None, medication=None, **overrides) -> dict:
+    resource = {
+        "resourceType": "MedicationRequest",
+        "id": pk,
+        "status": "active",
+        "intent": "order",
+        "subject": {"reference": f"Patient/{patient.pk}"},
+        "medicationReference": {"reference": f"Medication/{medication.pk}"},
+        "dosageInstruction": [
+            {
+                "timing": {
+                    "repeat": {
+                        "boundsPeriod": {"start": "2026-01-01", "end": "2026-02-01"}
+                    }
+                }
+            }
+        ],
+        "note": [{"text": "matin"}],
+    }
+    resource.update(overrides)
+    return resource
+
+
+@pytest.mark.unit
+class TestBundleReader:
+    """Lecture incrémentale des Bundles."""
+
+    def test_entries_across_small_blocks(self):
+        bundle = {
+            "resourceType": "Bundle",
+            "meta": {"entry": "leurre"},
+            "entry": [{"resource": {"id": str(n), "value": 12345}} for n in range(20)],
+            "total": 20,
+        }
+        stream = io.StringIO(json.dumps(bundle, indent=1))
+        resources = list(iter_bundle_resources(stream, block_size=7))
+        assert [r["id"] for r in resources] == [str(n) for n in range(20)]
+        assert all(r["value"] == 12345 for r in resources)
+
+    @pytest.mark.parametrize("document", ["{}", '{"entry": []}', '{"type": "batch"}'])
+    def test_empty_bundles(self, document):
+        assert list(iter_bundle_resources(io.StringIO(document))) == []
+
+    def test_truncated_bundle_raises(self):
+        stream = io.StringIO('{"entry": [{"resource": {"id": "1"}}, {"reso')
+        with pytest.raises(ValueError):
+            list(iter_bundle_resources(stream))
+
+    def test_ndjson_keeps_invalid_lines(self):
+        resources = list(iter_ndjson_resources(io.StringIO('{"id": 1}\n\nnope\n')))
+        assert resources[0] == {"id": 1}
+        assert isinstance(resources[1], ValueError)
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestIngestMedicationRequests:
+    """Conversion et écriture par lots."""
+
+    def test_creates_then_updates_by_external_id(self, patient, medication):
+        report = ingest_medication_requests(
+            [request(patient=patient, medication=medication)]
+        )
+        assert report.upserted == 1
+        prescription = Prescription.objects.get(external_id="r1")
+        assert prescription.status == Prescription.STATUS_VALIDE
+        assert prescription.comment == "matin"
+        ingest_medication_requests(
+            [request(patient=patient, medication=medication, status="cancelled")]
+        )
+        prescription.refresh_from_db()
+        assert prescription.status == Prescription.STATUS_SUPPR
+        assert Prescription.objects.count() == 1
+
+    def test_changes_distinguish_inserted_from_updated_rows(self, patient, medication):
+        ingest_medication_requests([request("r1", patient, medication)])
+        ingest_medication_requests(
+            [request("r1", patient, medication), request("r2", patient, medication)]
+        )
+        ids = dict(Prescription.objects.values_list("external_id", "id"))
+
+        operations = list(
+            PrescriptionChangeLog.objects.values_list("prescription_id", "operation")
+        )
+
+        assert operations == [
+            (ids["r1"], OPERATION_CREATE),
+            (ids["r1"], OPERATION_UPDATE),
+            (ids["r2"], OPERATION_CREATE),
+        ]
+
+    def test_reingest_under_another_patient_refreshes_both(
+        self, patients_batch, medication
+    ):
+        first, second = patients_batch[:2]
+        ingest_medication_requests([request(patient=first, medication=medication)])
+        assert PatientPrescriptionSummary.objects.get(patient=first).valid_count == 1
+        ingest_medication_requests([request(patient=second, medication=medication)])
+        assert Prescription.objects.get(external_id="r1").patient_id == second.pk
+        assert PatientPrescriptionSummary.objects.get(patient=first).valid_count == 0
+        assert PatientPrescriptionSummary.objects.get(patient=second).valid_count == 1
+
+    def test_medication_by_code(self, patient, medication):
+        resource = request(patient=patient, medication=medication)
+        del resource["medicationReference"]
+        resource["medicationCodeableConcept"] = {
+            "coding": [{"system": MEDICATION_CODE_SYSTEM, "code": medication.code}]
+        }
+        ingest_medication_requests([resource])
+        assert Prescription.objects.get().medication_id == medication.pk
+
+    def test_rejections_do_not_stop_import(self, patient, medication):
+        rejected = []
+        bad_period = request("r3", patient, medication)
+        bad_period["dosageInstruction"][0]["timing"]["repeat"]["boundsPeriod"] = {
+            "start": "2026-03-01",
+            "end": "2026-01-01",
+        }
+        resources = [
+            request("r1", patient, medication),
+            request("r2", patient, medication, subject={"reference": "Patient/0"}),
+            bad_period,
+            request("r4", patient, medication, status="unknown"),
+            {"resourceType": "Patient", "id": "p1"},
+            ValueError("ligne illisible"),
+            request("r5", patient, medication),
+        ]
+        report = ingest_medication_requests(
+            resources, chunk_size=3, on_reject=rejected.append
+        )
+        assert (report.read, report.upserted, report.rejected, report.skipped) == (
+            7,
+            2,
+            4,
+            1,
+        )
+        assert sorted(r.position for r in rejected) == [2, 3, 4, 6]
+        assert set(Prescription.objects.values_list("external_id", flat=True)) == {
+            "r1",
+            "r5",
+        }
+
+    def test_duplicate_in_chunk_keeps_last(self, patient, medication):
+        ingest_medication_requests(
+            [
+                request(patient=patient, medication=medication, status="draft"),
+                request(patient=patient, medication=medication, status="active"),
+            ]
+        )
+        assert Prescription.objects.get().status == Prescription.STATUS_VALIDE
+
+    def test_reingest_without_id_is_idempotent(self, patient, medication):
+        resource = request(patient=patient, medication=medication)
+        del resource["id"]
+        resource["identifier"] = [{"system": "urn:hopital", "value": "ord-42"}]
+        for status in ("draft", "active"):
+            report = ingest_medication_requests([{**resource, "status": status}])
+            assert report.upserted == 1
+        prescription = Prescription.objects.get()
+        assert prescription.external_id.startswith("identifier:")
+        assert prescription.status == Prescription.STATUS_VALIDE
+
+    def test_resource_without_id_or_identifier_is_rejected(self, patient, medication):
+        rejected = []
+        resource = request(patient=patient, medication=medication)
+        del resource["id"]
+        report = ingest_medication_requests([resource], on_reject=rejected.append)
+        assert report.rejected == 1
+        assert rejected[0].reason == "Ressource sans id ni identifier."
+        assert not Prescription.objects.exists()
+
+    def test_one_insert_per_chunk(self, patients_batch, medication):
+        resources = [
+            request(f"r{n}", patient, medication)
+            for n, patient in enumerate(patients_batch)
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            report = ingest_medication_requests(resources, chunk_size=2)
+        assert report.upserted == len(patients_batch)
+        inserts = [
+            q
+            for q in queries
+            if q["sql"].startswith('INSERT INTO "medical_prescription"')
+        ]
+        assert len(inserts) == 3
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestIngestCommand:
+    """Commande ingest_fhir."""
+
+    def test_ndjson_gz_with_rejects(self, tmp_path, patient, medication):
+        source = tmp_path / "requests.ndjson.gz"
+        with gzip.open(source, "wt") as file:
+            file.write(json.dumps(request("a", patient, medication)) + "\n")
+            file.write(json.dumps(request("b", patient, medication, status="?")) + "\n")
+        rejects = tmp_path / "rejects.ndjson"
+        out = StringIO()
+        call_command("ingest_fhir", str(source), "--rejects", str(rejects), stdout=out)
+        assert "1 upserted, 1 rejected" in out.getvalue()
+        assert json.loads(rejects.read_text())["resource_id"] == "b"
+
+    def test_bundle(self, tmp_path, patient, medication):
+        source = tmp_path / "bundle.json"
+        source.write_text(
+            json.dumps(
+                {
+                    "resourceType": "Bundle",
+                    "type": "collection",
+                    "entry": [{"resource": request("a", patient, medication)}],
+                }
+            )
+        )
+        call_command("ingest_fhir", str(source), stdout=StringIO())
+        assert Prescription.objects.filter(external_id="a").exists()
+
+    def test_invalid_bundle(self, tmp_path):
+        source = tmp_path / "bundle.json"
+        source.write_text("[1, 2]")
+        with pytest.raises(CommandError):
+            call_command("ingest_fhir", str(source), stdout=StringIO())
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(CommandError):
+            call_command("ingest_fhir", str(tmp_path / "absent.json"))
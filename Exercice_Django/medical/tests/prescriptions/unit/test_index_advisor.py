@@ -0,0 +1,205 @@
+"""
+Tests du conseiller d'index (advise_indexes).
+"""
+
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+
+from medical.filters import PrescriptionFilter
+from medical.index_advisor import (
+    Candidate,
+    WorkloadQuery,
+    advise,
+    candidate_indexes,
+    existing_indexes,
+    filter_combinations,
+    filter_workload,
+    plan_issues,
+    recorded_workload,
+    scratch_database,
+)
+from medical.slow_queries import write_record
+
+LIST_SQL = (
+    'SELECT "medical_prescription"."id" FROM "medical_prescription" '
+    'INNER JOIN "medical_patient" ON ("medical_prescription"."patient_id" = '
+    '"medical_patient"."id") WHERE ("medical_prescription"."status" = %s AND '
+    '"medical_prescription"."end_date" >= %s AND '
+    '"medical_prescription"."start_date" < %s) '
+    'ORDER BY "medical_prescription"."start_date" DESC, '
+    '"medical_prescription"."id" ASC LIMIT 20'
+)
+END_DATE_SQL = (
+    'SELECT "medical_prescription"."id" FROM "medical_prescription" '
+    'WHERE "medical_prescription"."end_date" >= %s'
+)
+
+
+@pytest.mark.unit
+class TestCandidates:
+    """Lecture des plans et des requêtes."""
+
+    def test_plan_issues(self):
+        plan = [
+            "SCAN medical_prescription",
+            "SEARCH medical_patient USING INTEGER PRIMARY KEY (rowid=?)",
+            "USE TEMP B-TREE FOR ORDER BY",
+        ]
+        assert plan_issues(plan) == [plan[0], plan[2]]
+
+    def test_candidates_for_scanned_table(self):
+        plan = ["SCAN medical_prescription", "USE TEMP B-TREE FOR ORDER BY"]
+        assert candidate_indexes(LIST_SQL, plan) == [
+            Candidate("medical_prescription", ("status", "end_date")),
+            Candidate("medical_prescription", ("status", "-start_date")),
+            Candidate("medical_prescription", ("status",)),
+            Candidate("medical_prescription", ("end_date",)),
+            Candidate("medical_prescription", ("start_date",)),
+        ]
+
+    def test_search_without_sort_has_no_candidate(self):
+        plan = ["SEARCH medical_prescription USING INDEX x (status=?)"]
+        assert candidate_indexes(LIST_SQL, plan) == []
+
+    def test_ddl_and_meta_index(self):
+        candidate = Candidate("medical_prescription", ("patient_id", "-start_date"))
+        assert candidate.ddl() == (
+            'CREATE INDEX "advisor_medical_prescription_patient_id_start_date" '
+            'ON "medical_prescription" ("patient_id", "start_date" DESC)'
+        )
+        assert candidate.meta_index() == (
+            'Prescription: models.Index(fields=["patient", "-start_date"])'
+        )
+        assert Candidate("other", ("x",)).meta_index() == (
+            'other: models.Index(fields=["x"])'
+        )
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestWorkload:
+    """Requêtes rejouées."""
+
+    def test_filter_combinations(self, prescriptions_batch):
+        combinations = filter_combinations(PrescriptionFilter)
+        assert combinations[0] == {}
+        singles = [params for params in combinations if len(params) == 1]
+        assert {name for params in singles for name in params} == set(
+            PrescriptionFilter.base_filters
+        )
+        pairs = [set(params) for params in combinations if len(params) == 2]
+        assert {"status", "start_date_gte"} in pairs
+        assert {"start_date", "start_date_gte"} not in pairs
+
+    def test_empty_table_has_no_sample(self):
+        assert filter_combinations(PrescriptionFilter) == [{}]
+
+    def test_filter_workload_captures_list_queries(self, prescriptions_batch):
+        workload = filter_workload()
+        # Le premier passage dans les middlewares peut installer leurs wrappers.
+        assert all(
+            wrapper.__name__ != "collect" for wrapper in connection.execute_wrappers
+        )
+        routes = {query.label.split("?")[0] for query in workload}
+        assert routes == {"prescription-list", "patient-list", "medication-list"}
+        assert all(query.sql.lstrip().startswith("SELECT") for query in workload)
+        assert any(
+            query.label == "prescription-list?status=valide"
+            and "valide" in query.params
+            for query in workload
+        )
+
+    def test_recorded_workload_keeps_slowest_parameters(self):
+        sql = END_DATE_SQL
+        for duration, value in ((5.0, "2026-01-01"), (9.0, "2026-06-01")):
+            write_record(
+                {
+                    "duration_ms": duration,
+                    "view": "prescription-list",
+                    "sql": sql,
+                    "params": [value],
+                    "executions": 1,
+                }
+            )
+        write_record(
+            {
+                "duration_ms": 50.0,
+                "view": None,
+                "sql": 'UPDATE "medical_prescription" SET "status" = %s',
+                "params": ["suppr"],
+                "executions": 1,
+            }
+        )
+        assert recorded_workload() == [
+            WorkloadQuery("prescription-list", sql, ("2026-06-01",), 2.0)
+        ]
+
+
+@pytest.mark.unit
+@pytest.mark.django_db(transaction=True)
+class TestAdvise:
+    """Évaluation sur une copie de la base."""
+
+    def test_best_candidate_is_kept_on_the_copy_only(
+        self, prescriptions_batch, tmp_path
+    ):
+        workload = [WorkloadQuery("end_date", END_DATE_SQL, ("2026-01-01",), 1.0)]
+        with scratch_database(tmp_path / "scratch.sqlite3") as scratch:
+            baseline, advice = advise(
+                workload, scratch, repeat=1, min_benefit=float("-inf")
+            )
+            assert (
+                existing_indexes(scratch, "medical_prescription").count(("end_date",))
+                == 1
+            )
+        assert plan_issues(baseline[workload[0]].plan)
+        assert [item.candidate for item in advice] == [
+            Candidate("medical_prescription", ("end_date",))
+        ]
+        assert advice[0].build_seconds > 0
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA index_list(medical_prescription)")
+            assert not any("advisor" in row[1] for row in cursor.fetchall())
+
+    def test_existing_index_is_not_proposed(self, prescriptions_batch):
+        sql = (
+            'SELECT "medical_prescription"."id" FROM "medical_prescription" '
+            'WHERE "medical_prescription"."status" = %s '
+            'ORDER BY "medical_prescription"."start_date" ASC'
+        )
+        workload = [WorkloadQuery("status", sql, ("valide",), 1.0)]
+        with scratch_database() as scratch:
+            _, advice = advise(workload, scratch, repeat=1, min_benefit=float("-inf"))
+        assert advice == []
+
+    def test_command(self, prescriptions_batch):
+        out = StringIO()
+        call_command(
+            "advise_indexes",
+            "--repeat",
+            "1",
+            "--min-benefit",
+            "-1000",
+            "--limit",
+            "1",
+            "--json",
+            stdout=out,
+        )
+        data = json.loads(out.getvalue())
+        assert data["queries"] > 0
+        assert len(data["advice"]) == 1
+        assert data["advice"][0]["index"].startswith(
+            ("Prescription:", "Patient:", "Medication:")
+        )
+        out = StringIO()
+        call_command("advise_indexes", "--repeat", "1", stdout=out)
+        assert "Replayed" in out.getvalue()
+
+    def test_command_without_workload(self):
+        with pytest.raises(CommandError):
+            call_command("advise_indexes", "--source", "slow-log")
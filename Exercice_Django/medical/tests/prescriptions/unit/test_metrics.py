@@ -0,0 +1,198 @@
+"""
+Tests des métriques Prometheus (MetricsMiddleware, /metrics).
+"""
+
+import importlib.util
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import pytest
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.urls import reverse
+from prometheus_client import REGISTRY
+
+from medical.cache import get_catalog
+from medical.metrics import render_metrics
+
+
+def sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def requests_count(route: str, status: str = "2xx") -> float:
+    return sample(
+        "medical_http_request_duration_seconds_count",
+        route=route,
+        method="GET",
+        status=status,
+    )
+
+
+@pytest.fixture
+def metrics_enabled(settings):
+    settings.MEDICAL_METRICS_ENABLED = True
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+@pytest.mark.usefixtures("metrics_enabled")
+class TestMetricsMiddleware:
+    """Mesures par route, SQL et caches."""
+
+    def test_request_is_counted_per_route(self, api_client, prescriptions_batch):
+        before = requests_count("prescription-list")
+        size = sample(
+            "medical_http_response_size_bytes_sum",
+            route="prescription-list",
+            method="GET",
+        )
+        response = api_client.get(reverse("prescription-list"), {"status": "valide"})
+        assert requests_count("prescription-list") == before + 1
+        assert sample(
+            "medical_http_response_size_bytes_sum",
+            route="prescription-list",
+            method="GET",
+        ) == size + len(response.content)
+
+    def test_detail_routes_share_one_label(self, api_client, prescriptions_batch):
+        before = requests_count("prescription-detail")
+        for prescription in prescriptions_batch[:3]:
+            api_client.get(reverse("prescription-detail", args=[prescription.pk]))
+        assert requests_count("prescription-detail") == before + 3
+
+    def test_unmatched_route(self, api_client):
+        before = requests_count("unmatched", status="4xx")
+        assert api_client.get("/nulle-part").status_code == 404
+        assert requests_count("unmatched", status="4xx") == before + 1
+
+    def test_db_queries_are_observed(self, api_client, prescription):
+        before = sample("medical_db_queries_per_request_sum", route="patient-list")
+        api_client.get(reverse("patient-list"))
+        assert (
+            sample("medical_db_queries_per_request_sum", route="patient-list") > before
+        )
+
+    def test_in_flight_returns_to_zero(self, api_client, prescription):
+        api_client.get(reverse("prescription-list"))
+        assert sample("medical_http_requests_in_flight") == 0
+
+    def test_response_cache_results(self, api_client, prescriptions_batch):
+        hits = sample("medical_cache_requests_total", cache="response", result="hit")
+        misses = sample("medical_cache_requests_total", cache="response", result="miss")
+        api_client.get(reverse("medication-list"))
+        api_client.get(reverse("medication-list"))
+        assert (
+            sample("medical_cache_requests_total", cache="response", result="miss")
+            == misses + 1
+        )
+        assert (
+            sample("medical_cache_requests_total", cache="response", result="hit")
+            == hits + 1
+        )
+
+    def test_catalog_results(self, medication):
+        misses = sample("medical_cache_requests_total", cache="catalog", result="miss")
+        hits = sample("medical_cache_requests_total", cache="catalog", result="hit")
+        get_catalog()
+        get_catalog()
+        assert (
+            sample("medical_cache_requests_total", cache="catalog", result="miss")
+            == misses + 1
+        )
+        assert (
+            sample("medical_cache_requests_total", cache="catalog", result="hit")
+            == hits + 1
+        )
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+@pytest.mark.usefixtures("metrics_enabled")
+class TestMetricsView:
+    """Endpoint /metrics."""
+
+    def test_exposition(self, api_client, settings, prescription):
+        settings.MEDICAL_METRICS_TOKEN = "secret"
+        api_client.get(reverse("prescription-list"))
+        response = api_client.get(
+            reverse("metrics"), HTTP_AUTHORIZATION="Bearer secret"
+        )
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("text/plain")
+        body = response.content.decode()
+        assert 'route="prescription-list"' in body
+        assert "medical_http_requests_in_flight" in body
+
+    def test_hidden_without_debug_staff_or_token(self, api_client, settings):
+        url = reverse("metrics")
+        assert api_client.get(url).status_code == 404
+        assert api_client.get(url, HTTP_AUTHORIZATION="Bearer ").status_code == 404
+        settings.MEDICAL_METRICS_TOKEN = "secret"
+        assert api_client.get(url, HTTP_AUTHORIZATION="Bearer other").status_code == (
+            404
+        )
+
+    def test_debug_or_staff(self, api_client, settings):
+        url = reverse("metrics")
+        settings.DEBUG = True
+        assert api_client.get(url).status_code == 200
+        settings.DEBUG = False
+        api_client.force_login(User.objects.create_user("admin", is_staff=True))
+        assert api_client.get(url).status_code == 200
+
+    def test_disabled(self, api_client, settings):
+        settings.DEBUG = True
+        settings.MEDICAL_METRICS_ENABLED = False
+        assert api_client.get(reverse("metrics")).status_code == 404
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_middleware_disabled_by_default(api_client, prescription):
+    before = requests_count("prescription-list")
+    api_client.get(reverse("prescription-list"))
+    assert requests_count("prescription-list") == before
+
+
+WORKER = (
+    "from medical.metrics import CACHE_REQUESTS; "
+    "CACHE_REQUESTS.labels('catalog', 'hit').inc(2)"
+)
+
+WORKER_IN_FLIGHT = (
+    "from medical.metrics import REQUESTS_IN_FLIGHT; REQUESTS_IN_FLIGHT.inc()"
+)
+
+
+@pytest.mark.unit
+def test_values_are_aggregated_across_processes(tmp_path):
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    for _ in range(2):
+        subprocess.run(
+            [sys.executable, "-c", WORKER], check=True, env=env, cwd=settings.BASE_DIR
+        )
+    body = render_metrics(str(tmp_path)).decode()
+    assert 'medical_cache_requests_total{cache="catalog",result="hit"} 4.0' in body
+
+
+@pytest.mark.unit
+def test_gunicorn_child_exit_marks_worker_dead(tmp_path, monkeypatch):
+    spec = importlib.util.spec_from_file_location(
+        "gunicorn_conf", settings.BASE_DIR / "gunicorn.conf.py"
+    )
+    config = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(config)
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    worker = subprocess.Popen(
+        [sys.executable, "-c", WORKER_IN_FLIGHT], env=env, cwd=settings.BASE_DIR
+    )
+    worker.wait()
+    assert list(tmp_path.glob(f"gauge_livesum_{worker.pid}.db"))
+
+    config.child_exit(None, SimpleNamespace(pid=worker.pid))
+
+    assert not list(tmp_path.glob(f"gauge_livesum_{worker.pid}.db"))
@@ -0,0 +1,145 @@
+"""
+Tests du profilage à la demande (ProfilingMiddleware, /debug/profiles).
+"""
+
+import pstats
+import tracemalloc
+
+import pytest
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from medical.profiling import list_profiles, load_profile, profile_dir, run_profiled
+
+
+@pytest.fixture
+def profiling(settings):
+    """Active le profilage, sans cache de réponses."""
+    settings.MEDICAL_PROFILING = True
+    settings.MEDICAL_RESPONSE_CACHE_ENABLED = False
+
+
+def allocate() -> list[bytes]:
+    return [bytes(1024) for _ in range(200)]
+
+
+@pytest.mark.unit
+class TestRunProfiled:
+    """Profil d'un appel."""
+
+    def test_report(self):
+        result, _, report = run_profiled(allocate)
+        assert len(result) == 200
+        assert report["duration_ms"] > 0
+        assert report["peak_kb"] >= 200
+        assert report["functions"][0]["cumulative_ms"] >= (
+            report["functions"][-1]["cumulative_ms"]
+        )
+        assert any(
+            function["function"].endswith("(allocate)")
+            for function in report["functions"]
+        )
+        allocation = report["allocations"][0]
+        assert "test_profiling.py" in allocation["location"]
+        assert allocation["size_kb"] >= 200 and allocation["count"] >= 200
+
+    def test_tracemalloc_state_is_restored(self):
+        run_profiled(list)
+        assert not tracemalloc.is_tracing()
+        tracemalloc.start()
+        try:
+            run_profiled(list)
+            assert tracemalloc.is_tracing()
+        finally:
+            tracemalloc.stop()
+
+    def test_exception_is_propagated(self):
+        with pytest.raises(ZeroDivisionError):
+            run_profiled(lambda: 1 / 0)
+        assert not tracemalloc.is_tracing()
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestProfilingMiddleware:
+    """Déclenchement et enregistrement des profils."""
+
+    url = "/api/prescriptions"
+
+    def test_header_in_debug(
+        self, api_client, settings, prescriptions_batch, profiling
+    ):
+        settings.DEBUG = True
+        response = api_client.get(self.url, HTTP_X_PROFILE="1")
+        assert response.status_code == 200
+        assert len(response.json()["results"]) == 10
+        report = load_profile(response["X-Profile-Id"])
+        assert report["view"] == "prescription-list"
+        assert (report["method"], report["path"], report["status"]) == (
+            "GET",
+            self.url,
+            200,
+        )
+        assert any("medical/views" in row["function"] for row in report["functions"])
+        assert report["functions"][0]["callees"]
+        stats = pstats.Stats(str(profile_dir() / f"{report['id']}.prof"))
+        assert stats.total_calls > 0
+
+    def test_parameter_for_staff(self, api_client, profiling, patient):
+        api_client.force_login(User.objects.create_user("admin", is_staff=True))
+        response = api_client.get(reverse("patient-list"), {"profile": "1"})
+        assert response.status_code == 200
+        assert load_profile(response["X-Profile-Id"])["path"].endswith("?profile=1")
+
+    def test_ignored_without_debug_or_staff(self, api_client, profiling, patient):
+        response = api_client.get(self.url, HTTP_X_PROFILE="1")
+        assert response.status_code == 200
+        assert not response.has_header("X-Profile-Id")
+
+    def test_not_requested(self, api_client, settings, profiling):
+        settings.DEBUG = True
+        assert not api_client.get(self.url).has_header("X-Profile-Id")
+
+    def test_disabled(self, api_client, settings):
+        settings.DEBUG = True
+        response = api_client.get(self.url, HTTP_X_PROFILE="1")
+        assert not response.has_header("X-Profile-Id")
+
+    def test_only_recent_profiles_are_kept(self, api_client, settings, profiling):
+        settings.DEBUG = True
+        settings.MEDICAL_PROFILE_KEEP = 2
+        ids = [
+            api_client.get(self.url, HTTP_X_PROFILE="1")["X-Profile-Id"]
+            for _ in range(3)
+        ]
+        assert {path.stem for path in profile_dir().glob("*.json")} <= set(ids)
+        assert len(list(profile_dir().glob("*.prof"))) == 2
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestProfileView:
+    """Endpoint /debug/profiles."""
+
+    def test_list_and_detail(self, api_client, settings, profiling):
+        settings.DEBUG = True
+        profile_id = api_client.get("/api/patients", HTTP_X_PROFILE="1")["X-Profile-Id"]
+        profiles = api_client.get(reverse("profile-list")).json()["profiles"]
+        assert [(row["id"], row["path"]) for row in profiles] == [
+            (profile_id, "/api/patients")
+        ]
+        assert profiles == list_profiles()
+        detail = api_client.get(reverse("profile-detail", args=[profile_id])).json()
+        assert set(detail) >= {"functions", "allocations", "peak_kb"}
+
+    def test_unknown_profile(self, api_client, settings, profiling):
+        settings.DEBUG = True
+        url = reverse("profile-detail", args=["missing-id"])
+        assert api_client.get(url).status_code == 404
+
+    def test_hidden_without_debug_or_staff(self, api_client, profiling):
+        assert api_client.get(reverse("profile-list")).status_code == 404
+
+    def test_hidden_when_disabled(self, api_client, settings):
+        settings.DEBUG = True
+        assert api_client.get(reverse("profile-list")).status_code == 404
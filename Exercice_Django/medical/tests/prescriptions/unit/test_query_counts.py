@@ -0,0 +1,150 @@
+"""
+Garde-fous contre les requêtes par ligne (N+1) sur les actions des prescriptions.
+"""
+
+from datetime import date
+
+import pytest
+from django.urls import reverse
+
+from medical.models import Prescription
+from medical.tests.factories import (
+    MedicationFactory,
+    PatientFactory,
+    PrescriptionFactory,
+)
+from medical.tests.queries import assert_constant_queries, count_queries
+
+LIST = reverse("prescription-list")
+
+
+def detail(pk: int) -> str:
+    return reverse("prescription-detail", args=[pk])
+
+
+def with_rows(size: int) -> list[int]:
+    """Complète la table jusqu'à ``size`` prescriptions (patients et
+    médicaments distincts) et retourne leurs identifiants."""
+    missing = size - Prescription.objects.count()
+    PrescriptionFactory.create_batch(max(missing, 0))
+    return list(Prescription.objects.values_list("id", flat=True))
+
+
+def payload() -> dict:
+    return {
+        "patient": PatientFactory().pk,
+        "medication": MedicationFactory().pk,
+        "start_date": date(2026, 1, 1),
+        "end_date": date(2026, 2, 1),
+        "status": Prescription.STATUS_VALIDE,
+        "comment": "Contrôle",
+    }
+
+
+@pytest.fixture(autouse=True)
+def without_response_cache(settings):
+    """Le cache des réponses masquerait les requêtes du second appel."""
+    settings.MEDICAL_RESPONSE_CACHE_ENABLED = False
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestPrescriptionQueryCounts:
+    """Nombre de requêtes indépendant du nombre de lignes et de la page."""
+
+    def test_error_responses_are_not_measured(self, api_client):
+        with pytest.raises(AssertionError, match="404"):
+            count_queries(lambda: api_client.get(detail(0)))
+
+    def test_list_with_growing_rows(self, api_client):
+        def prepare(size):
+            with_rows(size)
+            return lambda: api_client.get(LIST, {"page_size": 100})
+
+        assert_constant_queries(prepare)
+
+    def test_list_with_growing_page_size(self, api_client):
+        with_rows(12)
+        assert_constant_queries(
+            lambda size: lambda: api_client.get(LIST, {"page_size": size}),
+            sizes=(2, 10),
+        )
+
+    def test_filtered_list(self, api_client):
+        def prepare(size):
+            with_rows(size)
+            return lambda: api_client.get(
+                LIST, {"status": "valide", "start_date_gte": "2000-01-01"}
+            )
+
+        assert_constant_queries(prepare)
+
+    def test_streamed_list(self, api_client, settings):
+        settings.MEDICAL_STREAM_CHUNK_SIZE = 10
+
+        def prepare(size):
+            with_rows(size)
+            return lambda: api_client.get(LIST, {"stream": 1, "page_size": 100})
+
+        # Une requête par morceau de lignes : les deux tailles tiennent dans un seul.
+        assert_constant_queries(prepare)
+
+    def test_retrieve(self, api_client):
+        def prepare(size):
+            pk = with_rows(size)[0]
+            return lambda: api_client.get(detail(pk))
+
+        assert_constant_queries(prepare)
+
+    def test_create(self, api_client):
+        def prepare(size):
+            with_rows(size)
+            data = payload()
+            return lambda: api_client.post(LIST, data, format="json")
+
+        assert_constant_queries(prepare)
+
+    def test_update(self, api_client):
+        def prepare(size):
+            pk = with_rows(size)[0]
+            data = payload()
+            return lambda: api_client.put(detail(pk), data, format="json")
+
+        assert_constant_queries(prepare)
+
+    def test_partial_update(self, api_client):
+        def prepare(size):
+            pk = with_rows(size)[0]
+            return lambda: api_client.patch(
+                detail(pk), {"comment": "Revu"}, format="json"
+            )
+
+        assert_constant_queries(prepare)
+
+    def test_destroy(self, api_client):
+        def prepare(size):
+            ids = iter(with_rows(size + 2))
+            return lambda: api_client.delete(detail(next(ids)))
+
+        assert_constant_queries(prepare)
+
+    def test_changes(self, api_client):
+        def prepare(size):
+            with_rows(size)
+            cursor = api_client.get(reverse("prescription-changes")).json()["cursor"]
+            for prescription in Prescription.objects.all():
+                prescription.save()
+            return lambda: api_client.get(
+                reverse("prescription-changes"), {"since": cursor}
+            )
+
+        assert_constant_queries(prepare)
+
+    def test_export(self, api_client):
+        def prepare(size):
+            with_rows(size)
+            return lambda: api_client.get(
+                reverse("prescription-export"), {"file_format": "csv"}
+            )
+
+        assert_constant_queries(prepare)
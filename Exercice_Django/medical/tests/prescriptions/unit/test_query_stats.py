@@ -0,0 +1,262 @@
+"""
+Tests des statistiques par empreinte de requête SQL (commande, /debug/query-stats).
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from io import StringIO
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import reverse
+
+from medical.models import Prescription
+from medical.query_stats import (
+    STATS,
+    collect_stats,
+    enable_query_stats,
+    fingerprint,
+    reset_stats,
+    save_stats,
+    stats_dir,
+    top_queries,
+)
+
+
+@pytest.fixture
+def stats(settings):
+    """Active les statistiques et part de valeurs vides, sans cache de réponses."""
+    settings.MEDICAL_QUERY_STATS = True
+    settings.MEDICAL_RESPONSE_CACHE_ENABLED = False
+    enable_query_stats()
+    reset_stats()
+    yield
+    reset_stats()
+
+
+def entries_for(view: str | None = None) -> dict:
+    return {
+        query: stat
+        for (query, query_view), stat in collect_stats()["entries"].items()
+        if view is None or query_view == view
+    }
+
+
+def write_process(pid: int, entries: list, since: float | None = None) -> None:
+    stats_dir().mkdir(parents=True, exist_ok=True)
+    (stats_dir() / f"{pid}.json").write_text(
+        json.dumps({"since": since or time.time(), "dropped": 2, "entries": entries})
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "sql, expected",
+    [
+        (
+            'SELECT "a"."id" FROM "a" WHERE "a"."status" = %s LIMIT 21 OFFSET 40',
+            'SELECT "a"."id" FROM "a" WHERE "a"."status" = ? LIMIT ? OFFSET ?',
+        ),
+        (
+            'SELECT 1 FROM "a" WHERE "id" IN (%s, %s, %s)',
+            'SELECT ? FROM "a" WHERE "id" IN (...)',
+        ),
+        (
+            'INSERT INTO "a" ("x", "y") VALUES (%s, %s), (%s, %s) RETURNING "a"."id"',
+            'INSERT INTO "a" ("x", "y") VALUES (...) RETURNING "a"."id"',
+        ),
+        (
+            "SELECT * FROM t WHERE name = 'O''Brien' AND n > -3.5",
+            "SELECT * FROM t WHERE name = ? AND n > ?",
+        ),
+        ('RELEASE SAVEPOINT "s1396_x4"', "RELEASE SAVEPOINT ?"),
+        ('SELECT "idx_2024"\n  FROM   "t2"', 'SELECT "idx_2024" FROM "t2"'),
+    ],
+)
+def test_fingerprint(sql, expected):
+    assert fingerprint(sql) == expected
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestCollection:
+    """Cumuls alimentés par le wrapper d'exécution."""
+
+    def test_request_queries_are_grouped_by_view(
+        self, api_client, prescriptions_batch, stats
+    ):
+        url = reverse("prescription-list")
+        for page in (2, 3):
+            assert (
+                api_client.get(url, {"page_size": 3, "page": page}).status_code == 200
+            )
+        entries = entries_for("prescription-list")
+        select = next(
+            stat
+            for query, stat in entries.items()
+            if query.startswith('SELECT "medical_prescription"."id"')
+        )
+        assert select.calls == 2
+        assert select.total > 0 and select.max <= select.total
+        assert not any("%s" in query for query in entries)
+
+    def test_write_rows_are_counted(self, prescriptions_batch, stats):
+        assert Prescription.objects.update(comment="relu") == 10
+        update = next(
+            stat
+            for query, stat in entries_for(None).items()
+            if query.startswith('UPDATE "medical_prescription"')
+        )
+        assert (update.calls, update.rows) == (1, 10)
+
+    def test_disabled(self, settings, patient, stats):
+        settings.MEDICAL_QUERY_STATS = False
+        list(Prescription.objects.all())
+        assert collect_stats()["entries"] == {}
+
+    def test_bounded_number_of_fingerprints(self, settings, stats):
+        settings.MEDICAL_QUERY_STATS_MAX = 1
+        STATS.record("SELECT 1", None, 0.001)
+        STATS.record("SELECT 2", None, 0.001)
+        STATS.record("SELECT 1 FROM t", None, 0.001)
+        data = collect_stats()
+        assert data["dropped"] == 1
+        assert [stat.calls for stat in data["entries"].values()] == [2]
+
+
+@pytest.mark.unit
+class TestProcesses:
+    """Agrégation des fichiers des processus et remise à zéro."""
+
+    def test_other_processes_are_merged(self, stats):
+        STATS.record("SELECT 1", "patient-list", 0.002)
+        write_process(os.getppid(), [["SELECT ?", "patient-list", 3, 0.006, 0.004, 0]])
+        data = collect_stats()
+        assert data["processes"] == 2
+        assert data["dropped"] == 2
+        stat = data["entries"][("SELECT ?", "patient-list")]
+        assert (stat.calls, stat.max) == (4, 0.004)
+        assert stat.total == pytest.approx(0.008)
+
+    def test_own_file_is_replaced_by_live_values(self, stats):
+        STATS.record("SELECT 1", None, 0.002)
+        save_stats()
+        STATS.record("SELECT 1", None, 0.002)
+        assert collect_stats()["entries"][("SELECT ?", None)].calls == 2
+
+    def test_files_of_exited_processes_are_removed(self, stats):
+        exited = subprocess.run(
+            [sys.executable, "-c", "import os; print(os.getpid())"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        pid = int(exited.stdout)
+        write_process(pid, [["SELECT ?", None, 1, 0.1, 0.1, 0]])
+        assert collect_stats()["processes"] == 1
+        assert not (stats_dir() / f"{pid}.json").exists()
+
+    def test_reset_ignores_stale_files(self, stats):
+        write_process(os.getppid(), [["SELECT ?", None, 1, 0.1, 0.1, 0]], since=1.0)
+        assert collect_stats()["entries"] == {}
+
+    def test_reset_from_another_process_clears_live_values(self, stats):
+        STATS.record("SELECT 1", None, 0.002)
+        STATS.since -= 60
+        (stats_dir() / "reset").touch()
+        save_stats()
+        saved = json.loads((stats_dir() / f"{os.getpid()}.json").read_text())
+        assert saved["entries"] == []
+
+
+@pytest.mark.unit
+class TestTopQueries:
+    """Classement des empreintes."""
+
+    @pytest.fixture
+    def recorded(self, stats):
+        STATS.record("SELECT 1", "patient-list", 0.010)
+        STATS.record("SELECT 2", "patient-detail", 0.030)
+        for _ in range(5):
+            STATS.record("UPDATE t SET x = 1", "patient-detail", 0.002, rows=1)
+        return collect_stats()["entries"]
+
+    def test_sorted_by_total_time(self, recorded):
+        rows = top_queries(recorded)
+        assert [row["query"] for row in rows] == ["SELECT ?", "UPDATE t SET x = ?"]
+        assert rows[0]["calls"] == 2 and rows[0]["view"] is None
+        assert rows[0]["total_ms"] == pytest.approx(40)
+        assert rows[1]["rows"] == 5
+        assert sum(row["share"] for row in rows) == pytest.approx(1)
+
+    def test_by_view_filter_sort_and_limit(self, recorded):
+        rows = top_queries(recorded, sort="calls", limit=1, by_view=True)
+        assert [(row["query"], row["view"]) for row in rows] == [
+            ("UPDATE t SET x = ?", "patient-detail")
+        ]
+        rows = top_queries(recorded, view="patient-list")
+        assert [(row["query"], row["mean_ms"]) for row in rows] == [("SELECT ?", 10)]
+
+    def test_unknown_sort(self, recorded):
+        with pytest.raises(ValueError):
+            top_queries(recorded, sort="name")
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestQueryStatsView:
+    """Endpoint de débogage /debug/query-stats."""
+
+    url = "/debug/query-stats"
+
+    def test_hidden_without_debug_or_staff(self, api_client, stats):
+        assert api_client.get(self.url).status_code == 404
+
+    def test_visible_in_debug(self, api_client, settings, patient, stats):
+        settings.DEBUG = True
+        api_client.get(reverse("patient-list"))
+        data = api_client.get(self.url, {"by_view": 1, "sort": "calls"}).json()
+        assert data["processes"] == 1
+        assert any(row["view"] == "patient-list" for row in data["queries"])
+
+    def test_visible_to_staff(self, api_client, stats):
+        user = User.objects.create_user("admin", is_staff=True)
+        api_client.force_login(user)
+        assert api_client.get(self.url, {"limit": 0}).status_code == 200
+
+    @pytest.mark.parametrize("params", [{"sort": "name"}, {"limit": "-1"}])
+    def test_invalid_parameters(self, api_client, settings, params, stats):
+        settings.DEBUG = True
+        assert api_client.get(self.url, params).status_code == 400
+
+    def test_disabled(self, api_client, settings, stats):
+        settings.DEBUG = True
+        settings.MEDICAL_QUERY_STATS = False
+        assert api_client.get(self.url).status_code == 404
+
+
+@pytest.mark.unit
+class TestQueryStatsCommand:
+    """Commande ``query_stats``."""
+
+    def run(self, *args) -> str:
+        out = StringIO()
+        call_command("query_stats", *args, stdout=out)
+        return out.getvalue()
+
+    def test_table_and_json(self, stats):
+        STATS.record("SELECT 1", "patient-list", 0.010)
+        output = self.run("--by-view")
+        assert "calls 1" in output and "patient-list" in output
+        assert "  SELECT ?" in output
+        data = json.loads(self.run("--json", "--sort", "max_ms"))
+        assert [row["query"] for row in data["queries"]] == ["SELECT ?"]
+
+    def test_reset(self, stats):
+        STATS.record("SELECT 1", None, 0.010)
+        assert "reset" in self.run("--reset")
+        assert collect_stats()["entries"] == {}
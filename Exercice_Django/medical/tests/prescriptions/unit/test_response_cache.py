@@ -0,0 +1,162 @@
+"""
+Tests du cache serveur des réponses de liste.
+"""
+
+import gzip
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+
+from medical.tests.factories import MedicationFactory, PrescriptionFactory
+from medical.views.mixins import accepts_gzip, gzip_etag
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestResponseCache:
+    """Tests du cache des listes (clé, compression, invalidation)."""
+
+    def test_second_identical_request_is_a_hit(self, api_client, prescriptions_batch):
+        url = reverse("prescription-list")
+        first = api_client.get(url, {"status": "valide"})
+        second = api_client.get(url, {"status": "valide"})
+
+        assert first["X-Cache"] == "MISS"
+        assert second["X-Cache"] == "HIT"
+        assert second.json() == first.json()
+
+    def test_hit_runs_no_query(self, api_client, prescriptions_batch, settings):
+        settings.MEDICAL_VERSION_TTL = 60
+        url = reverse("prescription-list")
+        api_client.get(url)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get(url)
+
+        assert response["X-Cache"] == "HIT"
+        assert len(ctx.captured_queries) <= 1
+
+    def test_query_string_is_normalized(self, api_client, prescriptions_batch):
+        url = reverse("prescription-list")
+        api_client.get(f"{url}?status=valide&page_size=5")
+
+        assert api_client.get(f"{url}?page_size=5&status=valide")["X-Cache"] == "HIT"
+
+    def test_different_pages_are_cached_separately(
+        self, api_client, prescriptions_batch
+    ):
+        url = reverse("prescription-list")
+        api_client.get(url, {"page_size": 5, "page": 1})
+        response = api_client.get(url, {"page_size": 5, "page": 2})
+
+        assert response["X-Cache"] == "MISS"
+
+    def test_gzip_body_served_when_accepted(self, api_client, prescriptions_batch):
+        url = reverse("prescription-list")
+        plain = api_client.get(url).json()
+
+        response = api_client.get(url, HTTP_ACCEPT_ENCODING="gzip, deflate")
+
+        assert response["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response["Vary"]
+        assert gzip.decompress(response.content) == JSONRenderer().render(plain)
+
+    def test_gzip_refused_with_zero_quality(self, api_client, prescriptions_batch):
+        url = reverse("prescription-list")
+        api_client.get(url)
+
+        response = api_client.get(url, HTTP_ACCEPT_ENCODING="gzip;q=0, identity")
+
+        assert not response.has_header("Content-Encoding")
+        assert response.json()["results"]
+
+    def test_gzip_representation_has_its_own_etag(
+        self, api_client, prescriptions_batch
+    ):
+        url = reverse("prescription-list")
+        plain = api_client.get(url)["ETag"]
+
+        compressed = api_client.get(url, HTTP_ACCEPT_ENCODING="gzip")["ETag"]
+
+        assert compressed == plain[:-1] + '-gzip"'
+        assert (
+            api_client.get(
+                url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=compressed
+            ).status_code
+            == 304
+        )
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=compressed).status_code == 200
+
+    def test_hit_answers_conditional_requests(self, api_client, prescriptions_batch):
+        url = reverse("prescription-list")
+        etag = api_client.get(url)["ETag"]
+
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        assert response["X-Cache"] == "HIT"
+
+    def test_prescription_write_invalidates(self, api_client, prescriptions_batch):
+        url = reverse("prescription-list")
+        api_client.get(url)
+        PrescriptionFactory()
+
+        response = api_client.get(url)
+        assert response["X-Cache"] == "MISS"
+        assert response.json()["count"] == 11
+
+    def test_medication_write_invalidates_prescriptions_only(
+        self, api_client, prescriptions_batch
+    ):
+        prescriptions_url = reverse("prescription-list")
+        patients_url = reverse("patient-list")
+        api_client.get(prescriptions_url)
+        api_client.get(patients_url)
+        MedicationFactory()
+
+        assert api_client.get(prescriptions_url)["X-Cache"] == "MISS"
+        assert api_client.get(patients_url)["X-Cache"] == "HIT"
+
+    def test_browsable_api_is_not_cached(self, api_client, prescriptions_batch):
+        url = reverse("prescription-list")
+        api_client.get(url, HTTP_ACCEPT="text/html")
+
+        assert "X-Cache" not in api_client.get(url, HTTP_ACCEPT="text/html")
+
+    def test_cache_can_be_disabled(self, api_client, prescriptions_batch, settings):
+        settings.MEDICAL_RESPONSE_CACHE_ENABLED = False
+        url = reverse("prescription-list")
+        api_client.get(url)
+
+        assert "X-Cache" not in api_client.get(url)
+
+
+@pytest.mark.unit
+class TestContentNegotiation:
+    """Tests de la négociation du codage gzip."""
+
+    @pytest.mark.parametrize(
+        ("header", "expected"),
+        [
+            ("", False),
+            ("gzip", True),
+            ("deflate, gzip;q=0.5", True),
+            ("gzip;q=0", False),
+            ("GZIP ; Q=0.0, br", False),
+            ("x-gzip", True),
+            ("*", True),
+            ("*;q=0", False),
+            ("gzip;q=0, *", False),
+            ("br, identity", False),
+            ("gzip;q=abc", False),
+        ],
+    )
+    def test_accepts_gzip(self, header, expected):
+        assert accepts_gzip(header) is expected
+
+    def test_gzip_etag_keeps_weak_prefix(self):
+        assert gzip_etag('"abc"') == '"abc-gzip"'
+        assert gzip_etag('W/"abc"') == 'W/"abc-gzip"'
@@ -0,0 +1,139 @@
+"""
+Tests de la commande seed_demo (mode unitaire et mode massif).
+"""
+
+import random
+from collections import Counter
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from medical.cache import get_version
+from medical.changelog import changes_since
+from medical.models import (
+    Medication,
+    Patient,
+    PatientPrescriptionSummary,
+    Prescription,
+)
+from medical.seeding import medication_codes, zipf_weights
+
+BULK = ["--bulk", "--batch-size", "70"]
+
+
+def seed(*args: str) -> str:
+    out = StringIO()
+    call_command("seed_demo", *args, stdout=out)
+    return out.getvalue()
+
+
+def snapshot() -> list[tuple]:
+    return list(
+        Prescription.objects.order_by("id").values_list(
+            "patient__last_name",
+            "medication__code",
+            "start_date",
+            "end_date",
+            "status",
+            "comment",
+        )
+    )
+
+
+@pytest.mark.unit
+class TestGenerators:
+    """Codes uniques et distributions."""
+
+    def test_medication_codes_are_unique(self):
+        codes = medication_codes(20_000, random.Random(1))
+        assert len(set(codes)) == 20_000
+        assert all(len(code) == 8 and code.startswith("MED") for code in codes)
+
+    def test_zipf_weights_are_skewed(self):
+        rng = random.Random(1)
+        weights = zipf_weights(100, 1.2, rng)
+        picks = Counter(rng.choices(range(100), cum_weights=weights, k=10_000))
+        assert picks.most_common(1)[0][1] > 10_000 / 100 * 10
+
+    def test_zero_exponent_is_uniform(self):
+        assert zipf_weights(4, 0, random.Random(1)) == [1.0, 2.0, 3.0, 4.0]
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestSeedDemo:
+    """Mode unitaire."""
+
+    def test_seed_is_reproducible(self):
+        seed("--seed", "3", "--patients", "5", "--prescriptions", "10")
+        first = snapshot()
+        seed("--seed", "3", "--patients", "5", "--prescriptions", "10")
+        assert snapshot() == first
+
+    def test_fast_reset_restarts_ids(self):
+        seed("--patients", "3", "--prescriptions", "4")
+        seed("--fast-reset", "--patients", "3", "--prescriptions", "4")
+        assert sorted(Patient.objects.values_list("id", flat=True)) == [1, 2, 3]
+        assert Prescription.objects.count() == 4
+
+
+@pytest.mark.unit
+@pytest.mark.django_db(transaction=True)
+class TestBulkSeedDemo:
+    """Mode massif (index suspendus : hors transaction de test)."""
+
+    def test_bulk_counts_and_derived_data(self):
+        version = get_version("prescription")
+        cursor = changes_since(0).cursor
+        out = seed(
+            *BULK,
+            "--seed",
+            "7",
+            "--patients",
+            "40",
+            "--medications",
+            "12",
+            "--prescriptions",
+            "500",
+        )
+        assert "Created 40 patients, 12 medications, and 500 prescriptions." in out
+        assert Patient.objects.count() == 40
+        assert Prescription.objects.count() == 500
+        assert PatientPrescriptionSummary.objects.count() == 40
+        assert get_version("prescription") > version
+        assert changes_since(cursor).reset
+
+    def test_bulk_is_reproducible_and_replaces_data(self):
+        args = (*BULK, "--seed", "11", "--patients", "20", "--prescriptions", "300")
+        seed(*args)
+        first = snapshot()
+        seed(*args)
+        assert snapshot() == first
+        assert Prescription.objects.count() == 300
+
+    def test_indexes_are_restored(self):
+        seed(*BULK, "--patients", "5", "--prescriptions", "50")
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, Prescription._meta.db_table
+            )
+        names = {index.name for index in Prescription._meta.indexes}
+        assert names <= set(constraints)
+
+    def test_medication_popularity_follows_zipf(self):
+        seed(
+            *BULK,
+            "--seed",
+            "5",
+            "--medications",
+            "50",
+            "--prescriptions",
+            "2000",
+            "--zipf",
+            "1.5",
+        )
+        counts = Counter(Prescription.objects.values_list("medication", flat=True))
+        assert counts.most_common(1)[0][1] > 2000 / 50 * 5
+        assert Medication.objects.values("code").distinct().count() == 50
@@ -0,0 +1,109 @@
+"""
+Tests de l'en-tête Server-Timing (ServerTimingMiddleware).
+"""
+
+import logging
+import re
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from medical.timing import RequestTimings, collect_timings, current_timings
+
+METRIC = re.compile(r'(\w+);dur=([\d.]+)(?:;desc="(\d+) queries")?')
+
+
+def metrics(response) -> dict[str, tuple[float, str | None]]:
+    return {
+        name: (float(duration), queries)
+        for name, duration, queries in METRIC.findall(response["Server-Timing"])
+    }
+
+
+@pytest.fixture
+def server_timing(settings):
+    settings.MEDICAL_SERVER_TIMING = True
+    settings.MEDICAL_RESPONSE_CACHE_ENABLED = False
+
+
+@pytest.mark.unit
+class TestRequestTimings:
+    """Cumul des phases."""
+
+    def test_nested_measures_are_counted_once(self):
+        timings = RequestTimings()
+        with timings.measure("serialize"):
+            with timings.measure("serialize"):
+                pass
+            assert list(timings._active) == ["serialize"]
+        assert not timings._active
+        assert timings.durations["serialize"] > 0
+
+    def test_stop_without_start_is_ignored(self):
+        timings = RequestTimings()
+        timings.stop("render")
+        assert timings.durations["render"] == 0
+
+    def test_header_and_dict(self):
+        timings = RequestTimings()
+        timings.queries = 3
+        assert timings.header().startswith('db;dur=0.0;desc="3 queries", serialize')
+        assert set(timings.as_dict()) == {
+            "total_ms",
+            "db_ms",
+            "serialize_ms",
+            "render_ms",
+            "queries",
+        }
+
+    def test_collect_timings_scopes_context(self):
+        assert current_timings() is None
+        with collect_timings() as timings:
+            assert current_timings() is timings
+        assert current_timings() is None
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestServerTimingMiddleware:
+    """En-tête et journal des durées par requête."""
+
+    def test_disabled_by_default(self, api_client, prescriptions_batch):
+        response = api_client.get(reverse("prescription-list"))
+        assert "Server-Timing" not in response
+
+    def test_list_breakdown(self, api_client, prescriptions_batch, server_timing):
+        api_client.get(reverse("prescription-list"))
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(reverse("prescription-list"))
+        data = metrics(response)
+        assert set(data) == {"db", "serialize", "render", "total"}
+        assert data["db"][1] == str(len(queries))
+        assert data["serialize"][0] > 0
+        assert data["render"][0] > 0
+        assert data["total"][0] >= data["serialize"][0]
+
+    def test_write_is_measured(self, api_client, prescription, server_timing):
+        response = api_client.patch(
+            reverse("prescription-detail", args=[prescription.pk]),
+            {"comment": "Revu"},
+            format="json",
+        )
+        assert int(metrics(response)["db"][1]) > 0
+
+    def test_structured_log_line(self, api_client, prescription, server_timing, caplog):
+        url = reverse("prescription-detail", args=[prescription.pk])
+        with caplog.at_level(logging.INFO, logger="medical.timing"):
+            api_client.get(url)
+        (record,) = caplog.records
+        assert record.getMessage().startswith(f"method=GET path={url} status=200 ")
+        assert record.timings["queries"] > 0
+
+    def test_async_view(self, prescriptions_batch, server_timing):
+        response = async_to_sync(AsyncClient().get)(reverse("async-prescription-list"))
+        assert response.status_code == 200
+        assert int(metrics(response)["db"][1]) > 0
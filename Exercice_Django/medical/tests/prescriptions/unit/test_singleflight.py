@@ -0,0 +1,224 @@
+"""
+Tests du regroupement des requêtes identiques concurrentes (single-flight).
+"""
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from django.urls import reverse
+
+from medical.cache.responses import RESPONSE_CACHE_ALIAS
+from medical.cache.singleflight import (
+    ORIGIN_LEADER,
+    ORIGIN_PEER,
+    SingleFlight,
+    SingleFlightTimeout,
+    _peer_lock,
+    run_once,
+)
+from medical.checks import check_singleflight_cache
+
+
+@pytest.mark.unit
+class TestSingleFlight:
+    """Tests du regroupement dans un même worker."""
+
+    def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        results = []
+
+        def compute():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return "page"
+
+        def leader():
+            results.append(flight.do("key", compute))
+
+        def follower():
+            results.append(flight.do("key", compute))
+
+        threads = [threading.Thread(target=leader)]
+        threads[0].start()
+        started.wait(5)
+        threads += [threading.Thread(target=follower) for _ in range(3)]
+        for thread in threads[1:]:
+            thread.start()
+        time.sleep(0.2)  # laisse les suiveurs rejoindre l'exécution en cours
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert len(calls) == 1
+        assert sorted(results) == [("page", False)] + [("page", True)] * 3
+
+    def test_errors_are_propagated_and_not_kept(self):
+        flight = SingleFlight()
+
+        with pytest.raises(ValueError):
+            flight.do("key", lambda: (_ for _ in ()).throw(ValueError("boom")))
+
+        assert flight.do("key", lambda: 42) == (42, False)
+
+    def test_follower_stops_waiting_after_timeout(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(5)
+            return "page"
+
+        leader = threading.Thread(target=flight.do, args=("key", slow))
+        leader.start()
+        started.wait(5)
+        try:
+            with pytest.raises(SingleFlightTimeout):
+                flight.do("key", lambda: "follower", timeout=0.05)
+        finally:
+            release.set()
+            leader.join(5)
+
+    def test_run_once_computes_locally_when_leader_hangs(self, settings):
+        settings.MEDICAL_SINGLEFLIGHT_TIMEOUT = 0.05
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(5)
+            return "leader"
+
+        leader = threading.Thread(target=run_once, args=("key", slow, lambda: None))
+        leader.start()
+        started.wait(5)
+        try:
+            result = run_once("key", lambda: "follower", lambda: None)
+        finally:
+            release.set()
+            leader.join(5)
+        assert result == ("follower", ORIGIN_LEADER)
+
+
+@pytest.fixture
+def shared_cache(settings, tmp_path):
+    """Cache des réponses sur fichiers, visible de tous les workers."""
+    settings.CACHES = {
+        **settings.CACHES,
+        RESPONSE_CACHE_ALIAS: {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": str(tmp_path / "responses"),
+        },
+    }
+
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("shared_cache")
+class TestPeerCoalescing:
+    """Tests du regroupement entre workers par verrou fichier."""
+
+    def test_waits_for_result_published_by_peer(self, settings, tmp_path):
+        settings.VAR_DIR = tmp_path
+        settings.MEDICAL_SINGLEFLIGHT_SHARED = True
+        settings.MEDICAL_SINGLEFLIGHT_TIMEOUT = 1
+
+        with _peer_lock("key", 10) as acquired:
+            assert acquired
+            result, origin = run_once(
+                "key", lambda: "local", lambda: "published by peer"
+            )
+
+        assert (result, origin) == ("published by peer", ORIGIN_PEER)
+
+    def test_computes_when_peer_does_not_publish(self, settings, tmp_path):
+        settings.VAR_DIR = tmp_path
+        settings.MEDICAL_SINGLEFLIGHT_SHARED = True
+        settings.MEDICAL_SINGLEFLIGHT_TIMEOUT = 0.1
+
+        with _peer_lock("key", 10):
+            result, origin = run_once("key", lambda: "local", lambda: None)
+
+        assert (result, origin) == ("local", ORIGIN_LEADER)
+
+    def test_lock_is_released_after_compute(self, settings, tmp_path):
+        settings.VAR_DIR = tmp_path
+        settings.MEDICAL_SINGLEFLIGHT_SHARED = True
+
+        assert run_once("key", lambda: "local", lambda: None) == (
+            "local",
+            ORIGIN_LEADER,
+        )
+        assert not list(Path(tmp_path, "locks").iterdir())
+
+    def test_check_accepts_shared_cache(self, settings):
+        settings.MEDICAL_SINGLEFLIGHT_SHARED = True
+        assert check_singleflight_cache() == []
+
+    def test_stale_lock_is_replaced(self, settings, tmp_path):
+        settings.VAR_DIR = tmp_path
+        with _peer_lock("key", 10):
+            with _peer_lock("key", -1) as acquired:
+                assert acquired
+
+
+@pytest.mark.unit
+class TestProcessLocalCache:
+    """Regroupement demandé entre workers avec un cache ``locmem``."""
+
+    def test_peer_lock_is_not_used(self, settings, tmp_path):
+        settings.VAR_DIR = tmp_path
+        settings.MEDICAL_SINGLEFLIGHT_SHARED = True
+        settings.MEDICAL_SINGLEFLIGHT_TIMEOUT = 5
+
+        with _peer_lock("key", 10):
+            started = time.monotonic()
+            result = run_once("key", lambda: "local", lambda: None)
+
+        assert result == ("local", ORIGIN_LEADER)
+        assert time.monotonic() - started < 1
+
+    def test_check_warns(self, settings):
+        settings.MEDICAL_SINGLEFLIGHT_SHARED = True
+        assert [message.id for message in check_singleflight_cache()] == [
+            "medical.W001"
+        ]
+        settings.MEDICAL_SINGLEFLIGHT_SHARED = False
+        assert check_singleflight_cache() == []
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestListCoalescing:
+    """Tests de l'intégration dans le cache des listes."""
+
+    def test_list_miss_is_computed_through_run_once(
+        self, api_client, prescriptions_batch, settings, tmp_path
+    ):
+        settings.VAR_DIR = tmp_path
+        settings.MEDICAL_SINGLEFLIGHT_SHARED = True
+        url = reverse("prescription-list")
+
+        first = api_client.get(url, {"status": "valide"})
+        second = api_client.get(url, {"status": "valide"})
+
+        assert first["X-Cache"] == "MISS"
+        assert second["X-Cache"] == "HIT"
+        assert first.json() == second.json()
+
+    def test_conditional_leader_still_publishes_full_body(
+        self, api_client, prescriptions_batch
+    ):
+        url = reverse("prescription-list")
+        etag = api_client.get(url, {"page": 1})["ETag"]
+        api_client.get(url, {"page": 1, "x": 1})
+
+        response = api_client.get(url, {"page": 1}, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
@@ -0,0 +1,174 @@
+"""
+Tests du journal des requêtes SQL lentes (plans EXPLAIN, rotation, commande).
+"""
+
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+
+from medical.models import Prescription
+from medical.slow_queries import (
+    enable_slow_query_log,
+    explain,
+    flush_slow_queries,
+    read_records,
+    write_record,
+)
+
+
+@pytest.fixture
+def slow_log(settings):
+    """Journalise toutes les requêtes (fichier temporaire de ``conftest``).
+
+    Le journal étant désactivé par défaut, il n'est pas installé au démarrage.
+    """
+    settings.MEDICAL_SLOW_QUERY_MS = 0.000001
+    settings.MEDICAL_RESPONSE_CACHE_ENABLED = False
+    enable_slow_query_log()
+    yield settings.MEDICAL_SLOW_QUERY_LOG
+    flush_slow_queries()
+
+
+def logged() -> list[dict]:
+    flush_slow_queries()
+    return list(read_records())
+
+
+def record(**values) -> dict:
+    return {
+        "at": "2026-01-01T00:00:00+00:00",
+        "duration_ms": 250.0,
+        "alias": "default",
+        "view": "prescription-list",
+        "sql": "SELECT 1",
+        "params": [],
+        "executions": 1,
+        **values,
+    }
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestSlowQueryLog:
+    """Capture des requêtes au-delà du seuil."""
+
+    def test_request_queries_are_logged_with_view_and_plan(
+        self, api_client, prescriptions_batch, slow_log
+    ):
+        patient_id = prescriptions_batch[0].patient_id
+        response = api_client.get(reverse("prescription-list"), {"patient": patient_id})
+        assert response.status_code == 200
+        entries = logged()
+        assert {entry["view"] for entry in entries} == {"prescription-list"}
+        selects = [
+            entry for entry in entries if 'FROM "medical_prescription"' in entry["sql"]
+        ]
+        assert selects
+        entry = selects[0]
+        assert patient_id in entry["params"]
+        assert entry["duration_ms"] >= 0
+        assert entry["plan"] and "medical_prescription" in " ".join(entry["plan"])
+
+    def test_queries_outside_requests_have_no_view(self, patient, slow_log):
+        list(Prescription.objects.filter(patient=patient))
+        entries = logged()
+        assert entries
+        assert {entry["view"] for entry in entries} == {None}
+
+    def test_fast_queries_are_not_logged(self, settings, patient, slow_log):
+        settings.MEDICAL_SLOW_QUERY_MS = 60_000
+        list(Prescription.objects.all())
+        assert logged() == []
+        assert not slow_log.exists()
+
+    def test_disabled_log_records_nothing(self, settings, patient, slow_log):
+        settings.MEDICAL_SLOW_QUERY_MS = 0
+        list(Prescription.objects.all())
+        assert logged() == []
+
+    def test_executemany_keeps_first_parameters(self, patient, slow_log):
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                'UPDATE "medical_patient" SET "last_name" = %s WHERE "id" = %s',
+                [("Durand", patient.pk), ("Martin", patient.pk)],
+            )
+        (update,) = logged()
+        assert update["params"] == ["Durand", patient.pk]
+        assert update["executions"] == 2
+        assert update["plan"]
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestExplain:
+    """Plans d'exécution."""
+
+    def test_statement_without_plan(self):
+        assert explain(record(sql="SAVEPOINT s1")) == {"plan": None}
+
+    def test_error_is_recorded(self):
+        result = explain(record(sql="SELECT * FROM missing_table"))
+        assert result["plan"] is None
+        assert "missing_table" in result["plan_error"]
+
+
+@pytest.mark.unit
+class TestLogFile:
+    """Rotation et relecture."""
+
+    def test_rotation_keeps_backups(self, settings, tmp_path):
+        settings.MEDICAL_SLOW_QUERY_LOG = tmp_path / "slow.jsonl"
+        settings.MEDICAL_SLOW_QUERY_LOG_BYTES = 1000
+        settings.MEDICAL_SLOW_QUERY_LOG_BACKUPS = 2
+        for index in range(30):
+            write_record(record(duration_ms=float(index)))
+        assert (tmp_path / "slow.jsonl.1").exists()
+        assert not (tmp_path / "slow.jsonl.3").exists()
+        current = [entry["duration_ms"] for entry in read_records()]
+        everything = [
+            entry["duration_ms"] for entry in read_records(include_rotated=True)
+        ]
+        assert everything[-len(current) :] == current
+        assert len(everything) > len(current)
+        assert everything == sorted(everything)
+
+
+@pytest.mark.unit
+class TestSlowQueriesCommand:
+    """Commande ``slow_queries``."""
+
+    @pytest.fixture
+    def entries(self):
+        write_record(record(duration_ms=300.0, plan=["SCAN medical_prescription"]))
+        write_record(record(duration_ms=900.0, view="patient-list", plan=None))
+        write_record(
+            record(duration_ms=500.0, plan=None, plan_error="no such table: x")
+        )
+
+    def run(self, *args) -> str:
+        out = StringIO()
+        call_command("slow_queries", *args, stdout=out)
+        return out.getvalue()
+
+    def test_most_recent_first(self, entries):
+        output = self.run()
+        assert output.index("500.0 ms") < output.index("900.0 ms")
+        assert output.index("900.0 ms") < output.index("300.0 ms")
+        assert "plan: SCAN medical_prescription" in output
+        assert "plan error: no such table: x" in output
+
+    def test_sort_filter_and_limit(self, entries):
+        output = self.run("--sort", "duration", "--limit", "1", "--json")
+        assert [json.loads(line)["duration_ms"] for line in output.splitlines()] == [
+            900.0
+        ]
+        output = self.run("--view", "prescription-list", "--min-ms", "400")
+        assert "500.0 ms" in output and "300.0 ms" not in output
+
+    def test_empty_log(self, settings, tmp_path):
+        settings.MEDICAL_SLOW_QUERY_LOG = tmp_path / "missing.jsonl"
+        assert "No slow queries" in self.run()
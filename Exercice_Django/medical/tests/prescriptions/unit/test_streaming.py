@@ -0,0 +1,121 @@
+"""
+Tests de la liste des prescriptions rendue en flux (?stream=1).
+"""
+
+import json
+import tracemalloc
+from datetime import date, timedelta
+
+import pytest
+from django.urls import reverse
+
+from medical.models import Prescription
+
+
+@pytest.fixture
+def make_prescriptions(patients_batch, medications_batch):
+    """Insère ``n`` prescriptions en masse."""
+
+    def make(n: int) -> None:
+        Prescription.objects.bulk_create(
+            Prescription(
+                patient=patients_batch[i % len(patients_batch)],
+                medication=medications_batch[i % len(medications_batch)],
+                start_date=date(2026, 1, 1) + timedelta(days=i % 300),
+                end_date=date(2026, 12, 31),
+                status=Prescription.STATUS_VALIDE,
+                comment="x" * 200,
+            )
+            for i in range(n)
+        )
+
+    return make
+
+
+def stream(api_client, **params):
+    response = api_client.get(reverse("prescription-list"), {"stream": 1, **params})
+    assert response.status_code == 200
+    assert response.streaming
+    return json.loads(b"".join(response.streaming_content))
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestStreamingList:
+    """Même enveloppe que la pagination standard, mémoire bornée."""
+
+    def test_same_document_as_paginated_list(self, api_client, prescriptions_batch):
+        params = {"page_size": 4, "page": 2}
+        expected = api_client.get(reverse("prescription-list"), params).json()
+        data = stream(api_client, **params)
+        # Les liens conservent ``stream=1`` : seule différence avec la liste paginée.
+        for link in ("next", "previous"):
+            assert data.pop(link).replace("&stream=1", "") == expected.pop(link)
+        assert data == expected
+
+    def test_page_size_above_standard_maximum(self, api_client, make_prescriptions):
+        make_prescriptions(150)
+        data = stream(api_client, page_size=150)
+        assert data["count"] == 150
+        assert len(data["results"]) == 150
+        assert data["next"] is None
+
+    def test_chunks_do_not_change_result(
+        self, api_client, make_prescriptions, settings
+    ):
+        make_prescriptions(25)
+        settings.MEDICAL_STREAM_CHUNK_SIZE = 7
+        ids = [row["id"] for row in stream(api_client, page_size=25)["results"]]
+        assert ids == list(
+            Prescription.objects.order_by("-start_date", "id").values_list(
+                "id", flat=True
+            )
+        )
+
+    def test_empty_result(self, api_client):
+        assert stream(api_client) == {
+            "count": 0,
+            "next": None,
+            "previous": None,
+            "results": [],
+        }
+
+    def test_filters_are_applied(self, api_client, prescriptions_batch):
+        patient_id = prescriptions_batch[0].patient_id
+        data = stream(api_client, patient=patient_id)
+        assert {row["patient"] for row in data["results"]} == {patient_id}
+
+    def test_invalid_page_returns_404(self, api_client, prescriptions_batch):
+        response = api_client.get(
+            reverse("prescription-list"), {"stream": 1, "page": 50}
+        )
+        assert response.status_code == 404
+
+    def test_conditional_request_returns_304(self, api_client, prescriptions_batch):
+        url = reverse("prescription-list")
+        etag = api_client.get(url, {"stream": 1})["ETag"]
+        response = api_client.get(url, {"stream": 1}, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+
+    def test_peak_memory_does_not_grow_with_page_size(
+        self, api_client, make_prescriptions, settings
+    ):
+        settings.MEDICAL_STREAM_CHUNK_SIZE = 50
+        make_prescriptions(1000)
+
+        def peak(page_size: int) -> int:
+            tracemalloc.start()
+            try:
+                response = api_client.get(
+                    reverse("prescription-list"),
+                    {"stream": 1, "page_size": page_size},
+                )
+                size = sum(len(part) for part in response.streaming_content)
+                assert size > page_size * 200
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        peak(100)  # Chauffe : catalogue, caches de requêtes compilées...
+        small, large = peak(100), peak(1000)
+        assert large < small * 1.5
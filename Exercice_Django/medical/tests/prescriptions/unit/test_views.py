@@ -7,7 +7,8 @@ from datetime import date
 import pytest
 from django.urls import reverse
 
-from medical.models import Prescription
+from medical.cache import get_catalog
+from medical.models import Medication, Prescription
 from medical.tests.factories import (
     MedicationFactory,
     PatientFactory,
@@ -126,6 +127,25 @@ class TestPrescriptionViews:
         response = api_client.post(reverse("prescription-list"), payload, format="json")
         assert response.status_code == 400
 
+    def test_create_with_medication_deleted_since_catalog_load_returns_400(
+        self, api_client, patient, medication
+    ):
+        get_catalog()
+        # Suppression sans signal : la version de la table, donc le catalogue,
+        # ne change pas.
+        Medication.objects.filter(pk=medication.pk)._raw_delete("default")
+        payload = {
+            "patient": patient.id,
+            "medication": medication.id,
+            "start_date": "2024-01-01",
+            "end_date": "2024-01-31",
+            "status": "valide",
+        }
+        response = api_client.post(reverse("prescription-list"), payload, format="json")
+        assert response.status_code == 400
+        assert "medication" in response.json()
+        assert not Prescription.objects.exists()
+
     def test_create_missing_fields_returns_400(self, api_client):
         response = api_client.post(reverse("prescription-list"), {}, format="json")
         assert response.status_code == 400
@@ -0,0 +1,63 @@
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from django.db import connection
+from django.http import StreamingHttpResponse
+from django.test.utils import CaptureQueriesContext
+
+
+def _consume(response: Any) -> None:
+    """Lit une réponse en flux et vérifie que son statut est un succès (2xx)."""
+    if isinstance(response, StreamingHttpResponse):
+        b"".join(response.streaming_content)  # type: ignore[arg-type]
+    status = response.status_code
+    assert 200 <= status < 300, f"Unexpected status {status}"
+
+
+def count_queries(call: Callable[[], Any]) -> list[str]:
+    """Exécute ``call`` deux fois et retourne le SQL du second appel.
+
+    Le premier appel remplit les caches du processus (versions des tables,
+    catalogue des médicaments) : seul le régime établi est compté. Chaque
+    réponse doit être un succès : une erreur (400, 404...) court-circuite
+    la vue et fausserait la mesure. Les réponses en flux sont lues
+    entièrement pendant la mesure.
+
+    Args:
+        call: Requête à mesurer, par exemple ``lambda: client.get(url)``.
+
+    Returns:
+        list[str]: Requêtes SQL émises par le second appel.
+
+    Raises:
+        AssertionError: Si une réponse n'a pas un statut 2xx.
+    """
+    _consume(call())
+    with CaptureQueriesContext(connection) as context:
+        _consume(call())
+    return [query["sql"] for query in context.captured_queries]
+
+
+def assert_constant_queries(
+    prepare: Callable[[int], Callable[[], Any]], sizes: Sequence[int] = (2, 8)
+) -> None:
+    """Vérifie qu'une requête émet autant de requêtes SQL quelle que soit la taille.
+
+    Détecte les requêtes par ligne (N+1) : ``prepare(size)`` met en place
+    ``size`` lignes, ou une page de ``size`` éléments, et retourne la requête
+    à mesurer. Les écritures de ``prepare`` ne sont pas comptées.
+
+    Args:
+        prepare: Prépare une taille et retourne la requête à mesurer.
+        sizes: Tailles comparées.
+
+    Raises:
+        AssertionError: Si le nombre de requêtes varie, avec le SQL émis.
+    """
+    captured = {size: count_queries(prepare(size)) for size in sizes}
+    counts = {size: len(queries) for size, queries in captured.items()}
+    if len(set(counts.values())) > 1:
+        largest = max(captured.values(), key=len)
+        raise AssertionError(
+            f"Query count depends on size: {counts}\n" + "\n".join(largest)
+        )
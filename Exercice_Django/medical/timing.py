@@ -0,0 +1,213 @@
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+
+# Phases mesurées, dans l'ordre de l'en-tête ``Server-Timing``.
+PHASES = ("db", "serialize", "render")
+
+_current: ContextVar["RequestTimings | None"] = ContextVar(
+    "medical_request_timings", default=None
+)
+_current_view: ContextVar[str | None] = ContextVar("medical_query_view", default=None)
+
+
+class RequestTimings:
+    """Durées cumulées des phases d'une requête HTTP.
+
+    Les phases peuvent se recouvrir : une requête SQL déclenchée pendant la
+    sérialisation (relation non jointe) compte à la fois dans ``db`` et dans
+    ``serialize``.
+
+    Attributes:
+        started: Début de la requête (``time.perf_counter``).
+        durations: Secondes cumulées par phase.
+        queries: Nombre de requêtes SQL exécutées.
+    """
+
+    __slots__ = ("started", "durations", "queries", "_active")
+
+    def __init__(self) -> None:
+        """Démarre la mesure d'une requête."""
+        self.started = time.perf_counter()
+        self.durations = dict.fromkeys(PHASES, 0.0)
+        self.queries = 0
+        self._active: dict[str, float] = {}
+
+    def start(self, phase: str) -> None:
+        """Ouvre une mesure de ``phase``.
+
+        Une mesure ouverte alors que la même phase l'est déjà (serializer
+        imbriqué) est ignorée, pour ne pas compter deux fois.
+
+        Args:
+            phase: Nom de la phase.
+        """
+        self._active.setdefault(phase, time.perf_counter())
+
+    def stop(self, phase: str) -> None:
+        """Ferme la mesure ouverte de ``phase`` et cumule sa durée.
+
+        Args:
+            phase: Nom de la phase.
+        """
+        started = self._active.pop(phase, None)
+        if started is not None:
+            self.durations[phase] += time.perf_counter() - started
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        """Ajoute la durée du bloc à ``phase`` (sauf bloc imbriqué).
+
+        Args:
+            phase: Nom de la phase.
+        """
+        if phase in self._active:
+            yield
+            return
+        self.start(phase)
+        try:
+            yield
+        finally:
+            self.stop(phase)
+
+    def elapsed(self) -> float:
+        """Retourne la durée écoulée depuis le début de la requête (secondes)."""
+        return time.perf_counter() - self.started
+
+    def header(self) -> str:
+        """Formate les mesures pour l'en-tête ``Server-Timing``.
+
+        Returns:
+            str: Par exemple ``db;dur=3.1;desc="4 queries", ..., total;dur=9.8``.
+        """
+        metrics = [
+            f'db;dur={self.durations["db"] * 1000:.1f};desc="{self.queries} queries"'
+        ]
+        metrics.extend(
+            f"{phase};dur={self.durations[phase] * 1000:.1f}" for phase in PHASES[1:]
+        )
+        metrics.append(f"total;dur={self.elapsed() * 1000:.1f}")
+        return ", ".join(metrics)
+
+    def as_dict(self) -> dict[str, float | int]:
+        """Retourne les mesures en millisecondes, pour la journalisation.
+
+        Returns:
+            dict[str, float | int]: ``total_ms``, ``<phase>_ms`` et ``queries``.
+        """
+        data: dict[str, float | int] = {"total_ms": round(self.elapsed() * 1000, 1)}
+        for phase in PHASES:
+            data[f"{phase}_ms"] = round(self.durations[phase] * 1000, 1)
+        data["queries"] = self.queries
+        return data
+
+
+def current_timings() -> RequestTimings | None:
+    """Retourne les mesures de la requête en cours, ``None`` hors mesure."""
+    return _current.get()
+
+
+def current_view() -> str | None:
+    """Retourne la route à laquelle attribuer les requêtes SQL en cours.
+
+    Returns:
+        str | None: Nom de la route (``prescription-list``), ``None`` hors
+        requête HTTP (commandes, threads d'arrière-plan).
+    """
+    return _current_view.get()
+
+
+def set_current_view(view: str | None) -> Any:
+    """Attribue les requêtes SQL suivantes (contexte courant) à une route.
+
+    Args:
+        view: Nom de la route appelée, ``None`` hors requête HTTP.
+
+    Returns:
+        Any: Jeton à passer à ``reset_current_view``.
+    """
+    return _current_view.set(view)
+
+
+def reset_current_view(token: Any) -> None:
+    """Restaure la route associée avant ``set_current_view``.
+
+    Args:
+        token: Jeton retourné par ``set_current_view``.
+    """
+    _current_view.reset(token)
+
+
+@contextmanager
+def collect_timings() -> Iterator[RequestTimings]:
+    """Mesure les phases exécutées dans le bloc (et ses threads ``sync_to_async``).
+
+    Une mesure déjà en cours (middleware englobant) est réutilisée.
+
+    Yields:
+        RequestTimings: Mesures en cours.
+    """
+    timings = _current.get()
+    if timings is not None:
+        yield timings
+        return
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+def record_query(
+    execute: Callable[..., Any],
+    sql: str,
+    params: Any,
+    many: bool,
+    context: dict[str, Any],
+) -> Any:
+    """Wrapper d'exécution SQL comptant les requêtes de la requête en cours.
+
+    Args:
+        execute: Exécution suivante de la chaîne.
+        sql: Requête SQL.
+        params: Paramètres de la requête.
+        many: ``True`` pour ``executemany``.
+        context: Contexte d'exécution (connexion, curseur).
+
+    Returns:
+        Any: Résultat de ``execute``.
+    """
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.durations["db"] += time.perf_counter() - started
+        timings.queries += 1
+
+
+def _install(connection: BaseDatabaseWrapper, **kwargs: Any) -> None:
+    """Ajoute ``record_query`` aux wrappers d'une connexion, une seule fois."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def enable_query_timing() -> None:
+    """Installe ``record_query`` sur les connexions, présentes et futures.
+
+    Les connexions sont propres à chaque thread : celles du thread courant
+    sont équipées immédiatement, les autres (threads du serveur, de
+    ``sync_to_async``) à leur ouverture par le signal ``connection_created``.
+    """
+    connection_created.connect(_install, dispatch_uid="medical.timing")
+    for connection in connections.all():
+        _install(connection)
@@ -1,13 +1,52 @@
 from django.urls import include, path
 from rest_framework.routers import SimpleRouter
 
-from medical.views import MedicationViewSet, PatientViewSet, PrescriptionViewSet
+from medical.views import (
+    AsyncMedicationView,
+    AsyncPatientView,
+    AsyncPrescriptionView,
+    ExportJobViewSet,
+    FhirExportView,
+    MedicationViewSet,
+    PatientViewSet,
+    PrescriptionEventsView,
+    PrescriptionViewSet,
+)
 
 router = SimpleRouter(trailing_slash=False)
 router.register(r"patients", PatientViewSet, basename="patient")
 router.register(r"medications", MedicationViewSet, basename="medication")
 router.register(r"prescriptions", PrescriptionViewSet, basename="prescription")
+router.register(r"exports", ExportJobViewSet, basename="export")
+
+# Lecture asynchrone (ORM asynchrone) destinée aux déploiements ASGI.
+async_urlpatterns = [
+    path("patients", AsyncPatientView.as_view(), name="async-patient-list"),
+    path("patients/<int:pk>", AsyncPatientView.as_view(), name="async-patient-detail"),
+    path("medications", AsyncMedicationView.as_view(), name="async-medication-list"),
+    path(
+        "medications/<int:pk>",
+        AsyncMedicationView.as_view(),
+        name="async-medication-detail",
+    ),
+    path(
+        "prescriptions", AsyncPrescriptionView.as_view(), name="async-prescription-list"
+    ),
+    path(
+        "prescriptions/<int:pk>",
+        AsyncPrescriptionView.as_view(),
+        name="async-prescription-detail",
+    ),
+]
 
 urlpatterns = [
+    path("async/", include(async_urlpatterns)),
+    # Déclaré avant le routeur, dont la route de détail capturerait « events ».
+    path(
+        "prescriptions/events",
+        PrescriptionEventsView.as_view(),
+        name="prescription-events",
+    ),
+    path("fhir/$export", FhirExportView.as_view(), name="fhir-export"),
     path("", include(router.urls)),
 ]
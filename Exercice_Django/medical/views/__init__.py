@@ -1,5 +1,29 @@
+from medical.views.async_read import (
+    AsyncMedicationView,
+    AsyncPatientView,
+    AsyncPrescriptionView,
+)
+from medical.views.export_job import ExportJobViewSet
+from medical.views.events import PrescriptionEventsView
+from medical.views.fhir import FhirExportView
 from medical.views.medication import MedicationViewSet
+from medical.views.metrics import MetricsView
 from medical.views.patient import PatientViewSet
 from medical.views.prescription import PrescriptionViewSet
+from medical.views.profiles import ProfileView
+from medical.views.query_stats import QueryStatsView
 
-__all__ = ["PatientViewSet", "MedicationViewSet", "PrescriptionViewSet"]
+__all__ = [
+    "PatientViewSet",
+    "MedicationViewSet",
+    "PrescriptionViewSet",
+    "AsyncPatientView",
+    "AsyncMedicationView",
+    "AsyncPrescriptionView",
+    "PrescriptionEventsView",
+    "ExportJobViewSet",
+    "FhirExportView",
+    "MetricsView",
+    "QueryStatsView",
+    "ProfileView",
+]
@@ -0,0 +1,229 @@
+from typing import Any, cast
+
+from asgiref.sync import sync_to_async
+from django.core.paginator import InvalidPage
+from django.db.models import Model, QuerySet
+from django.http import HttpRequest, HttpResponse
+from django.views import View
+from django_filters import FilterSet
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.serializers import BaseSerializer
+
+from config.pagination import StandardPagination
+from medical.filters import MedicationFilter, PatientFilter, PrescriptionFilter
+from medical.models import Medication, Patient, Prescription
+from medical.serializers import (
+    MedicationSerializer,
+    PatientSerializer,
+    PrescriptionSerializer,
+)
+from medical.views.patient import PatientExpandMixin
+
+
+class AsyncPagination(StandardPagination):
+    """Pagination de ``StandardPagination`` calculée avec l'ORM asynchrone.
+
+    Le nombre total de lignes (``acount``) et la page (``async for``) sont lus
+    sans bloquer la boucle d'événements ; les liens ``next`` / ``previous`` et
+    les paramètres ``page`` / ``page_size`` sont ceux de l'API synchrone.
+    """
+
+    async def apaginate_queryset(
+        self, queryset: QuerySet, request: Request
+    ) -> list[Model]:
+        """Retourne les objets de la page demandée.
+
+        Args:
+            queryset: QuerySet filtré et ordonné.
+            request: Requête DRF (paramètres ``page`` et ``page_size``).
+
+        Returns:
+            list[Model]: Objets de la page.
+
+        Raises:
+            InvalidPage: Si le numéro de page est invalide ou hors limites.
+        """
+        self.request = request
+        paginator = self.django_paginator_class(queryset, self.get_page_size(request))
+        # ``count`` est une cached_property : la renseigner évite le COUNT synchrone.
+        paginator.count = await queryset.acount()
+        page = paginator.page(self.get_page_number(request, paginator))
+        # La page d'un QuerySet est une tranche non évaluée de ce QuerySet.
+        objects = [obj async for obj in cast(QuerySet, page.object_list)]
+        page.object_list = objects
+        self.page = page
+        return objects
+
+    def get_envelope(self, data: list[Any]) -> dict[str, Any]:
+        """Construit l'enveloppe de réponse de ``StandardPagination``.
+
+        Args:
+            data: Objets sérialisés de la page.
+
+        Returns:
+            dict[str, Any]: ``count``, ``next``, ``previous`` et ``results``.
+        """
+        return {
+            "count": self.get_page().paginator.count,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+
+
+class AsyncReadView(View):
+    """Vue de lecture (``list`` / ``retrieve``) entièrement asynchrone.
+
+    Réplique le comportement des ViewSets en lecture (filtrage par
+    ``filterset_class``, pagination standard, sérialisation) avec l'ORM
+    asynchrone : sous ASGI, une connexion lente n'immobilise pas un thread du
+    pool pendant l'attente du client. La sérialisation, qui peut lire le
+    catalogue des médicaments, s'exécute dans le thread de l'ORM
+    (``sync_to_async``). Ces vues ne passent pas par le cache des réponses.
+
+    Attributes:
+        queryset (QuerySet): Objets exposés.
+        serializer_class (type[BaseSerializer]): Serializer des objets.
+        filterset_class (type[FilterSet]): Filtres applicables à la liste.
+        pagination_class (type[AsyncPagination]): Pagination de la liste.
+    """
+
+    http_method_names = ["get", "head", "options"]
+
+    queryset: QuerySet
+    serializer_class: type[BaseSerializer]
+    filterset_class: type[FilterSet]
+    pagination_class: type[AsyncPagination] = AsyncPagination
+
+    def get_queryset(self) -> QuerySet:
+        """Retourne les objets exposés par la vue.
+
+        Returns:
+            QuerySet: QuerySet non évalué.
+        """
+        return self.queryset.all()
+
+    def get_serializer_context(self) -> dict[str, Any]:
+        """Retourne le contexte transmis au serializer.
+
+        Returns:
+            dict[str, Any]: Contexte du serializer.
+        """
+        return {"request": self.request, "view": self}
+
+    def render(self, data: Any, status: int = 200) -> HttpResponse:
+        """Rend ``data`` en JSON comme le ``JSONRenderer`` de DRF.
+
+        Args:
+            data: Données sérialisées.
+            status: Code HTTP de la réponse.
+
+        Returns:
+            HttpResponse: Réponse JSON.
+        """
+        renderer = JSONRenderer()
+        return HttpResponse(
+            renderer.render(data),
+            status=status,
+            content_type=renderer.media_type,
+        )
+
+    async def serialize(self, data: Any, many: bool = False) -> Any:
+        """Sérialise ``data`` hors de la boucle d'événements.
+
+        Args:
+            data: Objet ou liste d'objets à sérialiser.
+            many: ``True`` pour une liste.
+
+        Returns:
+            Any: Données sérialisées.
+        """
+
+        def run() -> Any:
+            serializer = self.serializer_class(
+                data, many=many, context=self.get_serializer_context()
+            )
+            return serializer.data
+
+        return await sync_to_async(run)()
+
+    async def get(
+        self, request: HttpRequest, pk: int | None = None, **kwargs: Any
+    ) -> HttpResponse:
+        """Dispatch vers ``list`` ou ``retrieve`` selon la présence de ``pk``.
+
+        Args:
+            request: Requête HTTP.
+            pk: Identifiant de l'objet pour le détail.
+            **kwargs: Arguments nommés de la route.
+
+        Returns:
+            HttpResponse: Réponse JSON.
+        """
+        if pk is None:
+            return await self.list(request)
+        return await self.retrieve(request, pk)
+
+    async def list(self, request: HttpRequest) -> HttpResponse:
+        """Liste filtrée et paginée.
+
+        Args:
+            request: Requête HTTP.
+
+        Returns:
+            HttpResponse: Réponse 200, 400 (filtres invalides) ou 404 (page invalide).
+        """
+        filterset = self.filterset_class(
+            request.GET, queryset=self.get_queryset(), request=request
+        )
+        if not filterset.is_valid():
+            return self.render(filterset.errors, status=400)
+        paginator = self.pagination_class()
+        try:
+            page = await paginator.apaginate_queryset(filterset.qs, Request(request))
+        except InvalidPage:
+            return self.render({"detail": paginator.invalid_page_message}, status=404)
+        data = await self.serialize(page, many=True)
+        return self.render(paginator.get_envelope(data))
+
+    async def retrieve(self, request: HttpRequest, pk: int) -> HttpResponse:
+        """Détail d'un objet.
+
+        Args:
+            request: Requête HTTP.
+            pk: Identifiant de l'objet.
+
+        Returns:
+            HttpResponse: Réponse 200 ou 404.
+        """
+        queryset = self.get_queryset()
+        obj = await queryset.filter(pk=pk).afirst()
+        if obj is None:
+            name = queryset.model._meta.object_name
+            return self.render({"detail": f"No {name} matches the given query."}, 404)
+        return self.render(await self.serialize(obj))
+
+
+class AsyncPatientView(PatientExpandMixin, AsyncReadView):
+    """Lecture asynchrone des patients (``expand`` comme ``PatientViewSet``)."""
+
+    queryset = Patient.objects.all()
+    serializer_class = PatientSerializer
+    filterset_class = PatientFilter
+
+
+class AsyncMedicationView(AsyncReadView):
+    """Lecture asynchrone des médicaments."""
+
+    queryset = Medication.objects.all()
+    serializer_class = MedicationSerializer
+    filterset_class = MedicationFilter
+
+
+class AsyncPrescriptionView(AsyncReadView):
+    """Lecture asynchrone des prescriptions (patient joint, médicament du catalogue)."""
+
+    queryset = Prescription.objects.select_related("patient").all()
+    serializer_class = PrescriptionSerializer
+    filterset_class = PrescriptionFilter
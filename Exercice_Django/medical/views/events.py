@@ -0,0 +1,110 @@
+import json
+from collections.abc import AsyncIterator
+
+from django.conf import settings
+from django.http import HttpRequest, StreamingHttpResponse
+from django.views import View
+
+from medical.events import ChangeEvent, broadcaster
+
+# Délai de reconnexion suggéré au client (millisecondes).
+RETRY_MS = 3000
+
+
+class PrescriptionEventsView(View):
+    """Flux Server-Sent Events des changements de prescriptions.
+
+    Chaque écriture validée est poussée sous la forme d'un événement
+    ``prescription`` dont les données JSON contiennent ``id``, ``operation``
+    (``create``, ``update``, ``delete``), ``status``, ``patient`` et
+    ``previous_patient``. Le paramètre ``patient`` restreint le flux aux
+    prescriptions d'un patient.
+
+    Un client qui se reconnecte avec ``Last-Event-ID`` reçoit les événements
+    manqués ; si la reprise est impossible (historique dépassé, autre
+    processus, client trop lent), un événement ``reset`` lui demande de
+    recharger ses données. Un commentaire est envoyé toutes les
+    ``MEDICAL_EVENTS_HEARTBEAT`` secondes pour maintenir la connexion.
+
+    La vue est asynchrone : elle doit être servie par ASGI, où une connexion
+    ouverte n'occupe pas de thread.
+    """
+
+    http_method_names = ["get"]
+
+    async def get(self, request: HttpRequest) -> StreamingHttpResponse:
+        """Ouvre le flux d'événements.
+
+        Args:
+            request: Requête HTTP (en-tête ``Last-Event-ID``, paramètre ``patient``).
+
+        Returns:
+            StreamingHttpResponse: Réponse ``text/event-stream``.
+        """
+        patient = request.GET.get("patient", "")
+        response = StreamingHttpResponse(
+            self.stream(
+                request.headers.get("Last-Event-ID"),
+                int(patient) if patient.isdigit() else None,
+            ),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    async def stream(
+        self, last_event_id: str | None, patient_id: int | None
+    ) -> AsyncIterator[str]:
+        """Produit les messages SSE jusqu'à la déconnexion du client.
+
+        Args:
+            last_event_id: Dernier identifiant reçu par le client, s'il reprend.
+            patient_id: Patient dont suivre les prescriptions (tous si ``None``).
+
+        Yields:
+            str: Messages au format ``text/event-stream``.
+        """
+        subscription, replay = broadcaster.subscribe(last_event_id)
+        try:
+            yield f"retry: {RETRY_MS}\n\n"
+            if replay is None:
+                yield self.reset()
+                replay = []
+            for replayed in replay:
+                if patient_id is None or replayed.concerns(patient_id):
+                    yield self.message(replayed)
+            while True:
+                event = await subscription.get(settings.MEDICAL_EVENTS_HEARTBEAT)
+                if subscription.overflowed:
+                    subscription.overflowed = False
+                    yield self.reset()
+                if event is None:
+                    yield ": keepalive\n\n"
+                elif patient_id is None or event.concerns(patient_id):
+                    yield self.message(event)
+        finally:
+            broadcaster.unsubscribe(subscription)
+
+    def message(self, event: ChangeEvent) -> str:
+        """Formate un changement en message SSE.
+
+        Args:
+            event: Événement diffusé.
+
+        Returns:
+            str: Message ``prescription`` avec son identifiant.
+        """
+        return (
+            f"id: {broadcaster.event_id(event)}\n"
+            "event: prescription\n"
+            f"data: {json.dumps(event.payload())}\n\n"
+        )
+
+    def reset(self) -> str:
+        """Formate le message demandant au client de recharger ses données.
+
+        Returns:
+            str: Message ``reset``.
+        """
+        return "event: reset\ndata: {}\n\n"
@@ -0,0 +1,174 @@
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from django.db.models import QuerySet
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.http.response import HttpResponseBase
+from django.utils import timezone
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from medical.exports import RangeNotSatisfiable, delete_export, parse_range
+from medical.exports.jobs import FILE_SUFFIXES
+from medical.models import ExportJob
+from medical.serializers import ExportJobSerializer
+from medical.views.negotiation import FirstRendererNegotiation
+
+# Taille des blocs lus pour servir une plage d'octets.
+RANGE_BLOCK_SIZE = 64 * 1024
+
+CONTENT_TYPES = {"csv": "application/gzip", "parquet": "application/vnd.apache.parquet"}
+
+
+def read_range(path: Path, start: int, length: int) -> Iterator[bytes]:
+    """Lit ``length`` octets de ``path`` à partir de ``start``, par blocs.
+
+    Args:
+        path: Fichier à lire.
+        start: Position du premier octet.
+        length: Nombre d'octets à lire.
+
+    Yields:
+        bytes: Blocs d'au plus ``RANGE_BLOCK_SIZE`` octets.
+    """
+    with path.open("rb") as file:
+        file.seek(start)
+        while length > 0:
+            block = file.read(min(RANGE_BLOCK_SIZE, length))
+            if not block:
+                return
+            length -= len(block)
+            yield block
+
+
+class ExportJobViewSet(
+    mixins.CreateModelMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.DestroyModelMixin,
+    viewsets.GenericViewSet,
+):
+    """ViewSet des exports de prescriptions en arrière-plan.
+
+    ``POST /api/exports`` soumet un extrait (format et filtres de
+    ``PrescriptionFilter``) et répond ``202`` ; le job est traité par le pool
+    d'export local et son avancement se suit sur ``GET /api/exports/<id>``.
+    Le fichier se télécharge sur ``/api/exports/<id>/download``, qui accepte
+    les requêtes ``Range`` pour reprendre un transfert interrompu. Les
+    fichiers expirent après ``MEDICAL_EXPORT_TTL`` secondes.
+    """
+
+    serializer_class = ExportJobSerializer
+    queryset: QuerySet[ExportJob] = ExportJob.objects.all()
+
+    def create(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """Soumet un job d'export.
+
+        Args:
+            request: Requête DRF (``file_format``, ``filters``).
+            *args: Arguments positionnels de l'action.
+            **kwargs: Arguments nommés de l'action.
+
+        Returns:
+            Response: Job créé (``202``), avec son URL dans ``Location``.
+        """
+        response = super().create(request, *args, **kwargs)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return response
+
+    def get_success_headers(self, data: Any) -> dict[str, str]:
+        """Désigne la ressource du job créé.
+
+        Args:
+            data: Job sérialisé.
+
+        Returns:
+            dict[str, str]: En-tête ``Location``.
+        """
+        return {"Location": self.reverse_action("detail", args=[data["id"]])}
+
+    def perform_destroy(self, instance: ExportJob) -> None:
+        """Supprime le job et son fichier.
+
+        Args:
+            instance: Job à supprimer.
+        """
+        delete_export(instance)
+
+    @action(
+        detail=True,
+        methods=["get"],
+        renderer_classes=[JSONRenderer],
+        content_negotiation_class=FirstRendererNegotiation,
+    )
+    def download(self, request: Request, *args: Any, **kwargs: Any) -> HttpResponseBase:
+        """Télécharge le fichier d'un job terminé.
+
+        Une requête ``Range: bytes=<début>-[<fin>]`` reçoit la plage demandée
+        (``206``). Avec ``If-Range``, la plage n'est servie que si l'``ETag``
+        correspond encore au fichier ; sinon le fichier complet est renvoyé.
+
+        Args:
+            request: Requête DRF.
+            *args: Arguments positionnels de l'action.
+            **kwargs: Arguments nommés de l'action.
+
+        Returns:
+            HttpResponseBase: Fichier complet, plage (``206``), ``409`` si le job
+            n'est pas terminé, ``410`` si le fichier a disparu ou ``416`` si
+            la plage est hors du fichier.
+        """
+        job = self.get_object()
+        if job.status != ExportJob.STATUS_DONE:
+            return Response(
+                {"detail": f"L'export n'est pas terminé ({job.status})."},
+                status=status.HTTP_409_CONFLICT,
+            )
+        path = job.path
+        if path is None or not path.is_file():
+            return Response(
+                {"detail": "Le fichier de l'export a expiré."},
+                status=status.HTTP_410_GONE,
+            )
+        size = path.stat().st_size
+        etag = f'"{job.pk.hex}-{size}"'
+        if_range = request.headers.get("If-Range")
+        try:
+            byte_range = (
+                parse_range(request.headers.get("Range"), size)
+                if if_range is None or if_range == etag
+                else None
+            )
+        except RangeNotSatisfiable:
+            response: HttpResponseBase = HttpResponse(
+                status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+            )
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+        content_type = CONTENT_TYPES[job.file_format]
+        if byte_range is None:
+            response = FileResponse(
+                path.open("rb"),
+                as_attachment=True,
+                filename=(
+                    f"prescriptions-{timezone.localtime(job.created_at):%Y%m%d-%H%M%S}"
+                    f".{FILE_SUFFIXES[job.file_format]}"
+                ),
+                content_type=content_type,
+            )
+        else:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                read_range(path, start, end - start + 1),
+                status=status.HTTP_206_PARTIAL_CONTENT,
+                content_type=content_type,
+            )
+            response["Content-Range"] = f"bytes {start}-{end}/{size}"
+            response["Content-Length"] = str(end - start + 1)
+        response["Accept-Ranges"] = "bytes"
+        response["ETag"] = etag
+        return response
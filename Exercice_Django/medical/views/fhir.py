@@ -0,0 +1,57 @@
+from typing import Any
+
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.views import APIView
+
+from medical.exports import gzip_stream
+from medical.fhir import RESOURCE_TYPES, iter_ndjson, iter_resources
+from medical.serializers import FhirExportQuerySerializer
+from medical.views.mixins import accepts_gzip
+from medical.views.negotiation import FirstRendererNegotiation
+
+
+class FhirExportView(APIView):
+    """Export NDJSON de ressources FHIR (``GET /api/fhir/$export``).
+
+    ``?_type=Patient|Medication|MedicationRequest`` choisit la ressource
+    (``MedicationRequest`` par défaut) et ``?_since=`` restreint aux lignes
+    modifiées depuis une date. Les ressources sont construites à partir de
+    ``values_list`` et encodées au fil de l'eau, compressées en gzip si le
+    client l'accepte. Les gros volumes s'exportent plutôt avec la commande
+    ``export_fhir``, qui découpe et parallélise par plages d'identifiants.
+    """
+
+    renderer_classes = [JSONRenderer]
+    content_negotiation_class = FirstRendererNegotiation
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> StreamingHttpResponse:
+        """Diffuse les ressources demandées.
+
+        Args:
+            request: Requête DRF (``_type``, ``_since``).
+            *args: Arguments positionnels de la vue.
+            **kwargs: Arguments nommés de la vue.
+
+        Returns:
+            StreamingHttpResponse: Flux ``application/fhir+ndjson``.
+        """
+        params = FhirExportQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        content = iter_ndjson(
+            iter_resources(
+                RESOURCE_TYPES[params.validated_data["_type"]],
+                since=params.validated_data.get("_since"),
+            )
+        )
+        gzipped = accepts_gzip(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        response = StreamingHttpResponse(
+            gzip_stream(content) if gzipped else content,
+            content_type="application/fhir+ndjson",
+        )
+        if gzipped:
+            response["Content-Encoding"] = "gzip"
+        patch_vary_headers(response, ("Accept-Encoding",))
+        return response
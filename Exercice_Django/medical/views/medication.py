@@ -5,12 +5,15 @@ from rest_framework import viewsets
 from medical.filters import MedicationFilter
 from medical.models import Medication
 from medical.serializers import MedicationSerializer
+from medical.views.mixins import CachedListMixin
 
 
-class MedicationViewSet(viewsets.ReadOnlyModelViewSet):
+class MedicationViewSet(CachedListMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet en lecture seule pour les médicaments.
 
     Expose les endpoints ``list`` et ``retrieve`` avec filtrage via ``MedicationFilter``.
+    Les lectures portent des validateurs HTTP (``ETag`` / ``Last-Modified``)
+    et les listes JSON sont mises en cache côté serveur.
     """
 
     serializer_class = MedicationSerializer
@@ -0,0 +1,56 @@
+import hmac
+
+from django.conf import settings
+from django.http import Http404, HttpRequest, HttpResponse
+from django.views import View
+
+from medical.metrics import CONTENT_TYPE_LATEST, render_metrics
+
+
+class MetricsView(View):
+    """Métriques Prometheus (``GET /metrics``).
+
+    Latences par route et par méthode, requêtes SQL par requête, tailles des
+    réponses, résultats des caches et requêtes en cours, agrégés sur tous les
+    workers lorsque ``PROMETHEUS_MULTIPROC_DIR`` est défini. Comme les
+    routes ``/debug/*``, réservée à ``DEBUG`` et aux comptes ``staff`` ; un
+    collecteur s'authentifie par ``Authorization: Bearer <MEDICAL_METRICS_TOKEN>``.
+    Répond 404 sinon, ou si ``MEDICAL_METRICS_ENABLED`` est désactivé.
+    """
+
+    http_method_names = ["get"]
+
+    def get(self, request: HttpRequest) -> HttpResponse:
+        """Retourne l'exposition texte des métriques.
+
+        Args:
+            request: Requête HTTP.
+
+        Returns:
+            HttpResponse: Métriques au format texte de Prometheus.
+
+        Raises:
+            Http404: Si l'accès n'est pas autorisé ou les métriques désactivées.
+        """
+        if not settings.MEDICAL_METRICS_ENABLED or not (
+            settings.DEBUG or request.user.is_staff or self.has_token(request)
+        ):
+            raise Http404
+        return HttpResponse(render_metrics(), content_type=CONTENT_TYPE_LATEST)
+
+    def has_token(self, request: HttpRequest) -> bool:
+        """Indique si la requête présente le jeton des collecteurs.
+
+        Args:
+            request: Requête HTTP.
+
+        Returns:
+            bool: ``True`` si ``MEDICAL_METRICS_TOKEN`` est défini et envoyé
+            en ``Authorization: Bearer``.
+        """
+        token = settings.MEDICAL_METRICS_TOKEN
+        scheme, _, credentials = request.headers.get("Authorization", "").partition(" ")
+        return bool(token) and (
+            scheme.lower() == "bearer"
+            and hmac.compare_digest(credentials.encode(), token.encode())
+        )
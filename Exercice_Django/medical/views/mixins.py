@@ -0,0 +1,451 @@
+import gzip
+import hashlib
+from collections.abc import Callable, Iterator
+from datetime import datetime
+from itertools import islice
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseBase, StreamingHttpResponse
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework import mixins, viewsets
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from config.pagination import StreamingPagination
+from medical.cache import get_table_states
+from medical.cache.responses import (
+    CachedResponse,
+    get_cached_response,
+    response_cache_key,
+    set_cached_response,
+)
+from medical.cache.singleflight import ORIGIN_LEADER, run_once
+
+GZIP_CODINGS = ("gzip", "x-gzip")
+GZIP_ETAG_SUFFIX = "-gzip"
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Indique si un en-tête ``Accept-Encoding`` autorise le codage gzip.
+
+    Les valeurs de qualité sont prises en compte : ``gzip;q=0`` refuse gzip,
+    et ``*`` s'applique à gzip lorsqu'il n'est pas cité explicitement.
+
+    Args:
+        accept_encoding: Valeur de l'en-tête (vide si absent).
+
+    Returns:
+        bool: ``True`` si la qualité retenue pour gzip est non nulle.
+    """
+    qualities: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+    for coding in (*GZIP_CODINGS, "*"):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return False
+
+
+def gzip_etag(etag: str) -> str:
+    """Retourne l'ETag de la représentation gzip d'une réponse.
+
+    Les deux représentations n'étant pas identiques octet par octet, elles ne
+    peuvent pas partager un ETag fort : le suffixe est ajouté entre les
+    guillemets (``"abc"`` devient ``"abc-gzip"``).
+
+    Args:
+        etag: ETag de la représentation non compressée.
+
+    Returns:
+        str: ETag de la représentation gzip.
+    """
+    prefix, _, opaque = etag.rpartition('"')[0].partition('"')
+    return f'{prefix}"{opaque}{GZIP_ETAG_SUFFIX}"'
+
+
+if TYPE_CHECKING:
+
+    class _ReadViewSet(
+        mixins.RetrieveModelMixin, mixins.ListModelMixin, viewsets.GenericViewSet
+    ):
+        """Actions auxquelles les mixins de ce module délèguent."""
+
+else:
+    _ReadViewSet = object
+
+
+def normalized_query(request: Request) -> list[tuple[str, str]]:
+    """Retourne les paramètres de requête triés (valeurs multiples comprises).
+
+    Args:
+        request: Requête DRF.
+
+    Returns:
+        list[tuple[str, str]]: Couples ``(clé, valeur)`` triés.
+    """
+    return sorted(
+        (key, value)
+        for key in request.query_params
+        for value in request.query_params.getlist(key)
+    )
+
+
+class ConditionalGetMixin(_ReadViewSet):
+    """Ajoute ``ETag`` / ``Last-Modified`` aux actions ``list`` et ``retrieve``.
+
+    Les validateurs sont dérivés, sans requête sur les lignes, des versions
+    du modèle principal et des tables de ``version_tables`` (données jointes :
+    patient et médicament d'une prescription...), incrémentées à chaque
+    écriture. Toute écriture sur l'une de ces tables change donc l'ETag de
+    toutes les réponses qui en dépendent, même hors de leur périmètre filtré.
+
+    Une requête conditionnelle dont les tables n'ont pas changé reçoit un 304.
+
+    Attributes:
+        version_tables (tuple[str, ...]): Tables dont le contenu apparaît dans
+            les réponses, en plus du modèle principal.
+    """
+
+    version_tables: tuple[str, ...] = ()
+
+    def get_version_tables(self) -> tuple[str, ...]:
+        """Retourne les tables jointes dont dépendent les réponses.
+
+        Returns:
+            tuple[str, ...]: Noms logiques des tables.
+        """
+        return self.version_tables
+
+    def get_tables(self) -> tuple[str, ...]:
+        """Retourne le modèle principal suivi des tables jointes.
+
+        Returns:
+            tuple[str, ...]: Noms logiques des tables lues par les réponses.
+        """
+        table = str(self.get_queryset().model._meta.model_name)
+        return (table, *self.get_version_tables())
+
+    def get_validators(self) -> tuple[str, datetime | None]:
+        """Calcule l'ETag et la date de dernière modification d'une réponse.
+
+        Returns:
+            tuple[str, datetime | None]: ETag (entre guillemets) et
+            ``Last-Modified``, si connu.
+        """
+        tables = self.get_tables()
+        states = get_table_states(tables)
+        fingerprint = repr(
+            (
+                self.request.path,
+                getattr(self.request.accepted_renderer, "format", None),
+                normalized_query(self.request),
+                [states[name].version for name in tables],
+            )
+        )
+        etag = (
+            '"%s"' % hashlib.blake2b(fingerprint.encode(), digest_size=16).hexdigest()
+        )
+        timestamps = [state.updated_at for state in states.values() if state.updated_at]
+        return etag, max(timestamps, default=None)
+
+    def conditional(
+        self,
+        request: Request,
+        handler: Callable[..., HttpResponseBase],
+        *args: Any,
+        **kwargs: Any,
+    ) -> HttpResponseBase:
+        """Répond 304 si le client est à jour, sinon délègue à ``handler``.
+
+        Les validateurs ne sont ajoutés qu'aux réponses 200 et 304 : une
+        réponse 404 n'en porte pas.
+
+        Args:
+            request: Requête DRF.
+            handler: Action DRF à exécuter si la réponse doit être produite.
+            *args: Arguments positionnels de l'action.
+            **kwargs: Arguments nommés de l'action.
+
+        Returns:
+            HttpResponseBase: Réponse 304 ou réponse de l'action avec validateurs.
+        """
+        headers = self.validator_headers(*self.get_validators())
+        response: HttpResponseBase | None = get_conditional_response(
+            request,
+            etag=headers["ETag"],
+            last_modified=parse_http_date_safe(headers.get("Last-Modified", "")),
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            for name, value in headers.items():
+                response[name] = value
+        return response
+
+    def validator_headers(
+        self, etag: str, last_modified: datetime | None
+    ) -> dict[str, str]:
+        """Retourne les en-têtes de validation d'une réponse.
+
+        ``Cache-Control: no-cache`` oblige les navigateurs à revalider plutôt
+        qu'à appliquer une durée de fraîcheur heuristique.
+
+        Args:
+            etag: ETag calculé par ``get_validators``.
+            last_modified: Date de dernière modification, si connue.
+
+        Returns:
+            dict[str, str]: En-têtes ``ETag``, ``Last-Modified`` et ``Cache-Control``.
+        """
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if last_modified is not None:
+            headers["Last-Modified"] = http_date(int(last_modified.timestamp()))
+        return headers
+
+    def list(  # type: ignore[override]
+        self, request: Request, *args: Any, **kwargs: Any
+    ) -> HttpResponseBase:
+        """Liste paginée avec validateurs HTTP.
+
+        Args:
+            request: Requête DRF.
+            *args: Arguments positionnels de l'action.
+            **kwargs: Arguments nommés de l'action.
+
+        Returns:
+            HttpResponseBase: Réponse 200 ou 304.
+        """
+        return self.conditional(request, super().list, *args, **kwargs)
+
+    def retrieve(  # type: ignore[override]
+        self, request: Request, *args: Any, **kwargs: Any
+    ) -> HttpResponseBase:
+        """Détail d'un objet avec validateurs HTTP.
+
+        Args:
+            request: Requête DRF.
+            *args: Arguments positionnels de l'action.
+            **kwargs: Arguments nommés de l'action (dont la clé de l'objet).
+
+        Returns:
+            HttpResponseBase: Réponse 200, 304 ou 404.
+        """
+        return self.conditional(request, super().retrieve, *args, **kwargs)
+
+
+class CachedListMixin(ConditionalGetMixin):
+    """Met en cache côté serveur les réponses JSON de l'action ``list``.
+
+    La clé combine la route, les paramètres de requête normalisés et la version
+    de chaque table lue (modèle principal et ``version_tables``) : toute
+    écriture sur l'une d'elles invalide précisément les listes concernées.
+    Les corps sont stockés compressés (gzip) dans le cache ``responses`` et
+    servis tels quels aux clients qui acceptent gzip. Les validateurs HTTP sont
+    stockés avec le corps, si bien qu'un succès de cache ne coûte aucune
+    requête SQL. En cas d'absence, les requêtes identiques concurrentes
+    partagent un seul calcul (``run_once``). L'API n'ayant pas d'authentification, les réponses ne
+    dépendent pas de l'utilisateur.
+    """
+
+    def list(  # type: ignore[override]
+        self, request: Request, *args: Any, **kwargs: Any
+    ) -> HttpResponseBase:
+        """Sert la liste depuis le cache ou la calcule puis la met en cache.
+
+        Args:
+            request: Requête DRF.
+            *args: Arguments positionnels de l'action.
+            **kwargs: Arguments nommés de l'action.
+
+        Returns:
+            HttpResponseBase: Réponse 200 ou 304.
+        """
+        if (
+            not settings.MEDICAL_RESPONSE_CACHE_ENABLED
+            or request.accepted_renderer.format != "json"
+        ):
+            return super().list(request, *args, **kwargs)
+        key = response_cache_key(
+            f"{self.basename}-list", self.get_tables(), normalized_query(request)
+        )
+        cached = get_cached_response(key)
+        if cached is not None:
+            return self.cached_response(request, cached, "HIT")
+        entry, origin = run_once(
+            key,
+            lambda: self.build_cached_response(request, key, *args, **kwargs),
+            lambda: get_cached_response(key),
+        )
+        status = "MISS" if origin == ORIGIN_LEADER else "SHARED"
+        return self.cached_response(request, entry, status)
+
+    def build_cached_response(
+        self, request: Request, key: str, *args: Any, **kwargs: Any
+    ) -> CachedResponse:
+        """Calcule la liste complète (sans tenir compte des en-têtes conditionnels).
+
+        Le résultat est partagé avec les requêtes identiques concurrentes : il
+        ne doit donc pas dépendre des validateurs envoyés par ce client.
+
+        Args:
+            request: Requête DRF.
+            key: Clé de cache de la réponse.
+            *args: Arguments positionnels de l'action.
+            **kwargs: Arguments nommés de l'action.
+
+        Returns:
+            CachedResponse: Entrée publiée dans le cache.
+        """
+        validators = self.get_validators()
+        response = super(ConditionalGetMixin, self).list(request, *args, **kwargs)
+        response = self.finalize_response(request, response, *args, **kwargs)
+        response.render()
+        return set_cached_response(
+            key,
+            response["Content-Type"],
+            response.content,
+            self.validator_headers(*validators),
+        )
+
+    def cached_response(
+        self, request: Request, entry: CachedResponse, status: str
+    ) -> HttpResponse:
+        """Construit la réponse (200 ou 304) correspondant à une entrée du cache.
+
+        Args:
+            request: Requête DRF.
+            entry: Entrée lue dans le cache ou calculée pour cette requête.
+            status: Valeur de l'en-tête ``X-Cache`` (``HIT``, ``MISS``, ``SHARED``).
+
+        Returns:
+            HttpResponse: Réponse prête à être renvoyée.
+        """
+        headers = dict(entry["headers"])
+        gzipped = accepts_gzip(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if gzipped and "ETag" in headers:
+            headers["ETag"] = gzip_etag(headers["ETag"])
+        response = get_conditional_response(
+            request,
+            etag=headers.get("ETag"),
+            last_modified=parse_http_date_safe(headers.get("Last-Modified", "")),
+        )
+        if response is None:
+            if gzipped:
+                response = HttpResponse(
+                    entry["body"], content_type=entry["content_type"]
+                )
+                response["Content-Encoding"] = "gzip"
+            else:
+                response = HttpResponse(
+                    gzip.decompress(entry["body"]),
+                    content_type=entry["content_type"],
+                )
+        for name, value in headers.items():
+            response[name] = value
+        response["X-Cache"] = status
+        patch_vary_headers(response, ("Accept", "Accept-Encoding"))
+        return response
+
+
+class StreamingListMixin(ConditionalGetMixin):
+    """Rend l'action ``list`` en flux lorsque ``?stream=1`` est demandé.
+
+    La page est lue par morceaux de ``MEDICAL_STREAM_CHUNK_SIZE`` lignes
+    (``QuerySet.iterator``), chaque morceau est sérialisé puis rendu avant de
+    lire le suivant : la mémoire du worker ne dépend plus de la taille de la
+    page, qui peut atteindre ``MEDICAL_STREAM_MAX_PAGE_SIZE``. L'enveloppe
+    JSON est celle de ``StandardPagination`` et les validateurs HTTP sont
+    conservés ; le cache des réponses n'est pas utilisé.
+
+    Attributes:
+        streaming_param (str): Paramètre de requête activant le flux.
+    """
+
+    streaming_param = "stream"
+
+    def list(  # type: ignore[override]
+        self, request: Request, *args: Any, **kwargs: Any
+    ) -> HttpResponseBase:
+        """Liste rendue en flux si demandée, sinon liste habituelle.
+
+        Args:
+            request: Requête DRF.
+            *args: Arguments positionnels de l'action.
+            **kwargs: Arguments nommés de l'action.
+
+        Returns:
+            HttpResponseBase: Réponse 200 (en flux ou non) ou 304.
+        """
+        if (
+            request.query_params.get(self.streaming_param) not in ("1", "true")
+            or request.accepted_renderer.format != "json"
+        ):
+            return super().list(request, *args, **kwargs)
+        return self.conditional(request, self.streaming_list, *args, **kwargs)
+
+    def streaming_list(
+        self, request: Request, *args: Any, **kwargs: Any
+    ) -> StreamingHttpResponse:
+        """Compte les lignes puis retourne la page rendue en flux.
+
+        Args:
+            request: Requête DRF.
+            *args: Arguments positionnels de l'action.
+            **kwargs: Arguments nommés de l'action.
+
+        Returns:
+            StreamingHttpResponse: Réponse JSON produite morceau par morceau.
+        """
+        paginator = StreamingPagination()
+        page = paginator.paginate_queryset_lazily(
+            self.filter_queryset(self.get_queryset()), request
+        )
+        response = StreamingHttpResponse(
+            self.render_stream(paginator.get_envelope_head(), page),
+            content_type=JSONRenderer.media_type,
+        )
+        patch_vary_headers(response, ("Accept",))
+        return response
+
+    def render_stream(self, head: dict[str, Any], page: Any) -> Iterator[bytes]:
+        """Produit le JSON de la page : enveloppe puis résultats morceau par morceau.
+
+        Args:
+            head: Enveloppe sans ``results`` (``count``, ``next``, ``previous``).
+            page: QuerySet non évalué de la page.
+
+        Yields:
+            bytes: Fragments du document JSON.
+        """
+        renderer = JSONRenderer()
+        # Un seul serializer pour toutes les lignes : en instancier un par
+        # morceau recréerait ses champs (cycles libérés tardivement par le GC).
+        serializer = self.get_serializer()
+        chunk_size = settings.MEDICAL_STREAM_CHUNK_SIZE
+        # ``{"count":…,"previous":…}`` devient ``{"count":…,"previous":…,"results":[``
+        yield renderer.render(head)[:-1] + b',"results":['
+        rows = page.iterator(chunk_size=chunk_size)
+        separator = b""
+        while chunk := list(islice(rows, chunk_size)):
+            yield separator + b",".join(
+                renderer.render(serializer.to_representation(row)) for row in chunk
+            )
+            separator = b","
+        yield b"]}"
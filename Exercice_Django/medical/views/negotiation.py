@@ -0,0 +1,48 @@
+from collections.abc import Iterable
+
+from rest_framework.negotiation import BaseContentNegotiation
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer
+from rest_framework.request import Request
+
+
+class FirstRendererNegotiation(BaseContentNegotiation):
+    """Ignore l'en-tête ``Accept`` et retient le premier renderer de la vue.
+
+    Destinée aux actions qui produisent elles-mêmes un fichier (CSV, Parquet,
+    NDJSON) : un client qui annonce ``Accept: text/csv`` ne doit pas recevoir
+    de 406, et les erreurs restent rendues en JSON.
+    """
+
+    def select_parser(
+        self, request: Request, parsers: Iterable[BaseParser]
+    ) -> BaseParser | None:
+        """Retourne le premier parser de la vue.
+
+        Args:
+            request: Requête DRF.
+            parsers: Parsers de la vue.
+
+        Returns:
+            BaseParser | None: Le premier parser.
+        """
+        return next(iter(parsers), None)
+
+    def select_renderer(
+        self,
+        request: Request,
+        renderers: Iterable[BaseRenderer],
+        format_suffix: str | None = None,
+    ) -> tuple[BaseRenderer, str]:
+        """Retourne le premier renderer de la vue.
+
+        Args:
+            request: Requête DRF.
+            renderers: Renderers de la vue.
+            format_suffix: Suffixe de format (ignoré).
+
+        Returns:
+            tuple[BaseRenderer, str]: Le renderer et son type de média.
+        """
+        renderer = next(iter(renderers))
+        return renderer, renderer.media_type
@@ -1,3 +1,5 @@
+from typing import TYPE_CHECKING, Any
+
 from django.db.models import QuerySet
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets
@@ -5,15 +7,86 @@ from rest_framework import viewsets
 from medical.filters import PatientFilter
 from medical.models import Patient
 from medical.serializers import PatientSerializer
+from medical.views.mixins import CachedListMixin
+
+if TYPE_CHECKING:
+
+    class _PatientView:
+        """Méthodes des vues auxquelles ``PatientExpandMixin`` délègue."""
+
+        # ``HttpRequest`` (vues asynchrones) ou ``Request`` DRF (viewsets) :
+        # les deux exposent ``GET``.
+        request: Any
+
+        def get_queryset(self) -> QuerySet[Patient]: ...
 
+        def get_serializer_context(self) -> dict[str, Any]: ...
+
+else:
+    _PatientView = object
+
+
+class PatientExpandMixin(_PatientView):
+    """Paramètre ``expand`` des vues de patients (synchrones et asynchrones).
+
+    ``expand`` (liste séparée par virgules) active les extensions de
+    ``PatientSerializer`` ; le résumé des prescriptions est alors joint à la
+    requête plutôt que lu patient par patient.
+    """
 
-class PatientViewSet(viewsets.ReadOnlyModelViewSet):
+    def get_expand(self) -> set[str]:
+        """Retourne les extensions demandées et supportées par le serializer.
+
+        Returns:
+            set[str]: Noms des champs à inclure.
+        """
+        requested = self.request.GET.get("expand", "")
+        names = {name.strip() for name in requested.split(",")}
+        return names & set(PatientSerializer.EXPANDABLE_FIELDS)
+
+    def get_queryset(self) -> QuerySet[Patient]:
+        """Joint le résumé des prescriptions lorsqu'il est demandé.
+
+        Returns:
+            QuerySet[Patient]: Patients à exposer.
+        """
+        queryset = super().get_queryset()
+        if "prescription_summary" in self.get_expand():
+            queryset = queryset.select_related("prescription_summary")
+        return queryset
+
+    def get_serializer_context(self) -> dict[str, Any]:
+        """Ajoute les extensions demandées au contexte du serializer.
+
+        Returns:
+            dict[str, Any]: Contexte du serializer.
+        """
+        return {**super().get_serializer_context(), "expand": self.get_expand()}
+
+
+class PatientViewSet(
+    PatientExpandMixin, CachedListMixin, viewsets.ReadOnlyModelViewSet
+):
     """ViewSet en lecture seule pour les patients.
 
     Expose les endpoints ``list`` et ``retrieve`` avec filtrage via ``PatientFilter``.
+    Le paramètre ``expand`` (liste séparée par virgules) active les extensions
+    de ``PatientSerializer``, par exemple ``?expand=prescription_summary``.
+    Les lectures portent des validateurs HTTP (``ETag`` / ``Last-Modified``)
+    et les listes JSON sont mises en cache côté serveur.
     """
 
     serializer_class = PatientSerializer
     queryset: QuerySet[Patient] = Patient.objects.all()
     filter_backends = [DjangoFilterBackend]
     filterset_class = PatientFilter
+
+    def get_version_tables(self) -> tuple[str, ...]:
+        """Ajoute les prescriptions aux dépendances lorsque le résumé est demandé.
+
+        Returns:
+            tuple[str, ...]: Noms logiques des tables jointes.
+        """
+        if "prescription_summary" in self.get_expand():
+            return ("prescription",)
+        return ()
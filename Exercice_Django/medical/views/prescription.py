@@ -1,22 +1,161 @@
+from typing import Any
+
 from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
 
+from medical.changelog import changes_since
+from medical.exports import (
+    PRESCRIPTION_COLUMNS,
+    export_rows,
+    gzip_stream,
+    iter_csv,
+    iter_parquet,
+)
 from medical.filters import PrescriptionFilter
 from medical.models import Prescription
-from medical.serializers import PrescriptionSerializer
+from medical.serializers import (
+    ChangesQuerySerializer,
+    ExportQuerySerializer,
+    PrescriptionSerializer,
+)
+from medical.serializers.exports import EXPORT_CSV
+from medical.signals import OPERATION_DELETE
+from medical.views.mixins import CachedListMixin, StreamingListMixin, accepts_gzip
+from medical.views.negotiation import FirstRendererNegotiation
 
 
-class PrescriptionViewSet(viewsets.ModelViewSet):
+class PrescriptionViewSet(StreamingListMixin, CachedListMixin, viewsets.ModelViewSet):
     """ViewSet CRUD complet pour les prescriptions médicamenteuses.
 
     Expose les endpoints ``list``, ``create``, ``retrieve``, ``update``,
     ``partial_update`` et ``destroy`` avec filtrage via ``PrescriptionFilter``.
+    Les médicaments sont servis par le catalogue en mémoire : seule la table
+    des patients est jointe. Les lectures portent des validateurs HTTP
+    (``ETag`` / ``Last-Modified``) qui dépendent aussi des patients et médicaments,
+    et les listes JSON sont mises en cache côté serveur. ``?stream=1`` rend
+    les grandes pages en flux, à mémoire constante. L'action ``changes`` sert
+    la synchronisation incrémentale et ``export`` les extraits complets.
     """
 
+    version_tables = ("patient", "medication")
+
     serializer_class = PrescriptionSerializer
     queryset: QuerySet[Prescription] = Prescription.objects.select_related(
-        "patient", "medication"
+        "patient"
     ).all()
     filter_backends = [DjangoFilterBackend]
     filterset_class = PrescriptionFilter
+
+    @action(detail=False, methods=["get"], filter_backends=[], pagination_class=None)
+    def changes(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """Prescriptions écrites depuis un curseur (``?since=<cursor>&limit=<n>``).
+
+        Chaque élément de ``results`` porte ``seq``, ``id``, ``operation`` et
+        ``data`` : l'état courant sérialisé, ou ``null`` pour une prescription
+        supprimée (``operation`` vaut alors ``delete``). Le client applique les
+        éléments dans l'ordre, mémorise ``cursor`` et rappelle l'endpoint tant
+        que ``has_more`` est vrai. Si ``reset`` est vrai, il recharge la liste
+        complète puis reprend depuis ``cursor``.
+
+        Args:
+            request: Requête DRF.
+            *args: Arguments positionnels de l'action.
+            **kwargs: Arguments nommés de l'action.
+
+        Returns:
+            Response: ``cursor``, ``reset``, ``has_more`` et ``results``.
+        """
+        params = ChangesQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        window = changes_since(
+            params.validated_data.get("since"), params.validated_data["limit"]
+        )
+        current = self.get_queryset().in_bulk(
+            [entry.prescription_id for entry in window.entries]
+        )
+        data = {
+            prescription.pk: row
+            for prescription, row in zip(
+                current.values(),
+                self.get_serializer(list(current.values()), many=True).data,
+            )
+        }
+        results = [
+            {
+                "seq": entry.seq,
+                "id": entry.prescription_id,
+                "operation": (
+                    entry.operation
+                    if entry.prescription_id in data
+                    else OPERATION_DELETE
+                ),
+                "data": data.get(entry.prescription_id),
+            }
+            for entry in window.entries
+        ]
+        return Response(
+            {
+                "cursor": window.cursor,
+                "reset": window.reset,
+                "has_more": window.has_more,
+                "results": results,
+            }
+        )
+
+    @action(
+        detail=False,
+        methods=["get"],
+        pagination_class=None,
+        renderer_classes=[JSONRenderer],
+        content_negotiation_class=FirstRendererNegotiation,
+    )
+    def export(
+        self, request: Request, *args: Any, **kwargs: Any
+    ) -> StreamingHttpResponse:
+        """Extrait complet des prescriptions filtrées (``?file_format=csv|parquet``).
+
+        Accepte les filtres de ``PrescriptionFilter``. Les lignes sont lues avec
+        ``values_list`` (patient et médicament aplatis, sans modèle ni
+        serializer) et encodées au fil de l'eau. Le CSV est compressé en gzip
+        à la volée si le client l'accepte ; le Parquet est déjà compressé.
+
+        Args:
+            request: Requête DRF.
+            *args: Arguments positionnels de l'action.
+            **kwargs: Arguments nommés de l'action.
+
+        Returns:
+            StreamingHttpResponse: Fichier en pièce jointe.
+        """
+        params = ExportQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        file_format = params.validated_data["file_format"]
+        rows = export_rows(self.filter_queryset(self.get_queryset()))
+        if file_format == EXPORT_CSV:
+            content = iter_csv(rows, PRESCRIPTION_COLUMNS)
+            content_type = "text/csv; charset=utf-8"
+        else:
+            content = iter_parquet(rows, PRESCRIPTION_COLUMNS)
+            content_type = "application/vnd.apache.parquet"
+        gzipped = file_format == EXPORT_CSV and accepts_gzip(
+            request.META.get("HTTP_ACCEPT_ENCODING", "")
+        )
+        response = StreamingHttpResponse(
+            gzip_stream(content) if gzipped else content, content_type=content_type
+        )
+        if gzipped:
+            response["Content-Encoding"] = "gzip"
+        stamp = timezone.localtime().strftime("%Y%m%d-%H%M%S")
+        response["Content-Disposition"] = (
+            f'attachment; filename="prescriptions-{stamp}.{file_format}"'
+        )
+        patch_vary_headers(response, ("Accept-Encoding",))
+        return response
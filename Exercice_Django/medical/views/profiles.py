@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.http import Http404, HttpRequest, JsonResponse
+from django.views import View
+
+from medical.profiling import list_profiles, load_profile
+
+
+class ProfileView(View):
+    """Profils enregistrés par ``ProfilingMiddleware`` (``GET /debug/profiles``).
+
+    Sans identifiant, liste les profils du plus récent au plus ancien ; avec
+    ``/debug/profiles/<id>`` (valeur de l'en-tête ``X-Profile-Id``), renvoie
+    le rapport complet : fonctions les plus coûteuses et leurs appelées,
+    lignes ayant le plus alloué. Réservée à ``DEBUG`` et aux comptes
+    ``staff`` ; répond 404 sinon, ou si ``MEDICAL_PROFILING`` est désactivé.
+    """
+
+    http_method_names = ["get"]
+
+    def get(self, request: HttpRequest, profile_id: str | None = None) -> JsonResponse:
+        """Retourne la liste des profils ou l'un d'eux.
+
+        Args:
+            request: Requête HTTP.
+            profile_id: Identifiant du profil, ``None`` pour la liste.
+
+        Returns:
+            JsonResponse: ``profiles`` ou le rapport demandé.
+
+        Raises:
+            Http404: Si l'accès n'est pas autorisé, le profilage désactivé ou
+                le profil inconnu.
+        """
+        if not settings.MEDICAL_PROFILING or not (
+            settings.DEBUG or request.user.is_staff
+        ):
+            raise Http404
+        if profile_id is None:
+            return JsonResponse({"profiles": list_profiles()})
+        report = load_profile(profile_id)
+        if report is None:
+            raise Http404
+        return JsonResponse(report)
@@ -0,0 +1,62 @@
+from django.conf import settings
+from django.http import Http404, HttpRequest, JsonResponse
+from django.views import View
+
+from medical.query_stats import SORT_KEYS, collect_stats, top_queries
+
+
+class QueryStatsView(View):
+    """Empreintes SQL les plus coûteuses (``GET /debug/query-stats``).
+
+    Cumuls (appels, temps total, moyen et maximal, lignes) par empreinte de
+    requête, agrégés sur tous les processus. Paramètres : ``limit``
+    (20 par défaut, 0 : tout), ``sort`` (``total_ms``, ``calls``,
+    ``mean_ms``, ``max_ms``, ``rows``), ``view`` (une route) et ``by_view``
+    (une ligne par route). Réservée à ``DEBUG`` et aux comptes ``staff`` ;
+    répond 404 sinon, ou si ``MEDICAL_QUERY_STATS`` est désactivé.
+    """
+
+    http_method_names = ["get"]
+
+    def get(self, request: HttpRequest) -> JsonResponse:
+        """Retourne le classement des empreintes.
+
+        Args:
+            request: Requête HTTP.
+
+        Returns:
+            JsonResponse: ``since``, ``processes``, ``dropped`` et ``queries``,
+            ou 400 si un paramètre est invalide.
+
+        Raises:
+            Http404: Si l'accès n'est pas autorisé ou les statistiques désactivées.
+        """
+        if not settings.MEDICAL_QUERY_STATS or not (
+            settings.DEBUG or request.user.is_staff
+        ):
+            raise Http404
+        sort = request.GET.get("sort", "total_ms")
+        if sort not in SORT_KEYS:
+            return JsonResponse(
+                {"detail": f"sort must be one of {', '.join(SORT_KEYS)}."}, status=400
+            )
+        limit = request.GET.get("limit", "20")
+        if not limit.isdigit():
+            return JsonResponse(
+                {"detail": "limit must be a non-negative integer."}, status=400
+            )
+        stats = collect_stats()
+        return JsonResponse(
+            {
+                "since": stats["since"],
+                "processes": stats["processes"],
+                "dropped": stats["dropped"],
+                "queries": top_queries(
+                    stats["entries"],
+                    limit=int(limit),
+                    sort=sort,
+                    view=request.GET.get("view"),
+                    by_view=request.GET.get("by_view") in ("1", "true"),
+                ),
+            }
+        )